@@ -0,0 +1,883 @@
+# Copyright (c) Quectel Wireless Solution, Co., Ltd.All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+@file      :bench_jtt808.py
+@author    :Jack Sun (jack.sun@quectel.com)
+@brief     :JTT808 message micro benchmark
+@version   :1.0.0
+@date      :2026-10-18 10:05:12
+@copyright :Copyright (c) 2022
+"""
+
+import gc
+import utime
+import uselect
+import usocket
+import ustruct
+import _thread
+import ujson
+import ubinascii
+import uasyncio as asyncio
+from usr.logging import getLogger
+from usr.common import str_fill, SerialNo
+from usr.jtt808 import JTT808
+from usr.jt_async import AsyncJTT808
+from usr.jt_capture import AllocMeter, replay
+from usr.jt_gateway import JTT808Gateway
+from usr import jt_bulk
+from usr.jt_bulk import decode_t0704_body
+from usr.jt_frame import XorChecksum, StreamDeframer, frame_encode
+from usr.jt_schema import BODY_SCHEMA
+from usr.jt_message import UPLINK_MESSAGE, DOWNLINK_MESSAGE, JTMessageParse, ProtocolContext, TerminalParams, set_jtmsg_config
+
+logger = getLogger(__name__)
+
+
+def bench_run(func, count):
+    """Run function `count` times.
+
+    Returns:
+        float: calls per second
+    """
+    start = utime.ticks_us()
+    for i in range(count):
+        func()
+    used = utime.ticks_diff(utime.ticks_us(), start)
+    return count * 1000000 / used if used > 0 else 0
+
+
+def legacy_frame_encode(message):
+    """Hex string frame pipeline before jt_frame, kept as the benchmark baseline."""
+    message = message.lower()
+    msgs = []
+    for i in range(int(len(message) / 2)):
+        code = message[i * 2:i * 2 + 2]
+        if code == "7d":
+            msgs.extend([int("7d", 16), int("01", 16)])
+        elif code == "7e":
+            msgs.extend([int("7d", 16), int("02", 16)])
+        else:
+            msgs.append(int(code, 16))
+    msgs.insert(0, int("7e", 16))
+    msgs.append(int("7e", 16))
+    return ustruct.pack("%sB" % len(msgs), *msgs)
+
+
+def legacy_frame_decode(message):
+    """Hex string unescape and check code pipeline before jt_frame, kept as the benchmark baseline."""
+    msg = "".join(str_fill(hex(i)[2:], target_len=2) for i in list(bytearray(message)))[2:-2]
+    msgs = []
+    jump = 0
+    for i in range(int(len(msg) / 2)):
+        code = msg[i * 2:i * 2 + 2]
+        if code == "7d":
+            jump = 1
+            next_code = msg[(i + 1) * 2:(i + 1) * 2 + 2]
+            msgs.append(code if next_code == "01" else "7e")
+        else:
+            if jump == 1:
+                jump = 0
+            else:
+                msgs.append(code)
+    msg = "".join(msgs)
+    codes = [int(msg[i * 2:i * 2 + 2], 16) for i in range(int(len(msg[:-2]) / 2))]
+    check_code = codes[0] ^ codes[1]
+    for i in range(2, len(codes)):
+        check_code ^= codes[i]
+    return msg, check_code == int(msg[-2:], 16)
+
+
+def legacy_frame_split(message):
+    """List based 0x7E scan of JTT808Base.parse before StreamDeframer, kept as the benchmark baseline."""
+    msgs = list(bytearray(message))
+    msg_indexs = [index for index, item in enumerate(msgs) if item == 0x7e]
+    if len(msg_indexs) > 1 and msg_indexs[1] - msg_indexs[0] == 1:
+        msg_indexs = msg_indexs[1:]
+    range_num = len(msg_indexs) if len(msg_indexs) % 2 == 0 else len(msg_indexs) - 1
+    frames = [bytes(bytearray(msgs[msg_indexs[i]:msg_indexs[i + 1] + 1])) for i in range(0, range_num, 2)]
+    message = bytes(bytearray(msgs[msg_indexs[-1]:])) if len(msg_indexs) % 2 != 0 else b""
+    return frames, message
+
+
+_legacy_serial_no_lock = _thread.allocate_lock()
+
+
+class LegacySerialNo:
+    """Process wide serial number before per-session allocators, kept as the benchmark baseline."""
+
+    def __init__(self):
+        self.__num = 0xFFFF
+        self.__iter_serial_no = iter(range(self.__num))
+
+    def get_serial_no(self):
+        try:
+            with _legacy_serial_no_lock:
+                return next(self.__iter_serial_no)
+        except StopIteration:
+            self.__iter_serial_no = iter(range(self.__num))
+            return self.get_serial_no()
+
+
+def frame_payload(frame):
+    """Remove delimiters and escape of a frame, return message hex string."""
+    data = bytes(frame[1:-1]).replace(b"\x7d\x02", b"\x7e").replace(b"\x7d\x01", b"\x7d")
+    return ubinascii.hexlify(data).decode()
+
+
+def init_loction_data(index=0):
+    return (0, 3, 31.824845 + index * 0.0001, 117.24091, 120, 36.5, 90, "220601120000", "0104000003e80202014503020000")
+
+
+def init_t0200():
+    msg_obj = UPLINK_MESSAGE[0x0200]()
+    msg_obj.set_params(*init_loction_data())
+    return msg_obj
+
+
+def init_t0704():
+    msg_obj = UPLINK_MESSAGE[0x0704]()
+    msg_obj.set_params(0)
+    for i in range(10):
+        msg_obj.set_loc_data(*init_loction_data(i))
+    return msg_obj
+
+
+def init_t0801():
+    msg_obj = UPLINK_MESSAGE[0x0801]()
+    msg_obj.set_params(1, 0, 0, 4, 1, bytes(range(256)) * 3)
+    msg_obj.set_loc_data(*init_loction_data()[:-1])
+    return msg_obj
+
+
+def bench_frame_encode(count=200):
+    """Frames/sec of hex string frame pipeline (before) and jt_frame.frame_encode (after)."""
+    for name, init_func in (("T0200", init_t0200), ("T0704", init_t0704), ("T0801", init_t0801)):
+        frame = init_func().message()[0][1]
+        payload = frame_payload(frame)
+        data = ubinascii.unhexlify(payload)
+        buf = bytearray(len(frame))
+        assert legacy_frame_encode(payload) == bytes(frame_encode(data)), "%s frame not equal" % name
+        before = bench_run(lambda: legacy_frame_encode(payload), count)
+        after = bench_run(lambda: frame_encode(ubinascii.unhexlify(payload)), count)
+        reuse = bench_run(lambda: frame_encode(data, buf), count)
+        print("%s frame %d bytes: before %.1f frames/s, after %.1f frames/s, reuse buffer %.1f frames/s" % (name, len(frame), before, after, reuse))
+
+
+def bench_frame_decode(count=200):
+    """Frames/sec of hex string set_message pipeline (before) and reused JTMessageParse (after)."""
+    msg_parser = JTMessageParse()
+    for name, init_func in (("T0200", init_t0200), ("T0704", init_t0704), ("T0801", init_t0801)):
+        frame = init_func().message()[0][1]
+        msg_parser.set_message(frame)
+        assert legacy_frame_decode(frame)[1], "%s check code error" % name
+        before = bench_run(lambda: legacy_frame_decode(frame), count)
+        after = bench_run(lambda: msg_parser.set_message(frame), count)
+        print("%s frame %d bytes: decode before %.1f frames/s, after %.1f frames/s" % (name, len(frame), before, after))
+
+SCHEMA_UPLINK_PARAMS = {
+    0x0001: (7, 0x8103, 0),
+    0x0005: (3, [1, 2, 5]),
+    0x0102: ("865306057798238", "865306057798238", "v1.0.0"),
+    0x0108: (0, 0),
+    0x0302: (3, 4),
+    0x0700: (9, 33, b"\x7e\x7d\x01" * 20),
+    0x0800: (12, 0, 0, 4, 1),
+    0x0900: (0xF0, "123456"),
+    0x0A00: (0x010001, "E5A55035C17123BF"),
+}
+
+SCHEMA_DOWNLINK_VALUES = {
+    0x8001: {"serial_no": 7, "message_id": 0x0200, "result_code": 0},
+    0x8003: {"serial_no": 7, "total_number": 3, "package_ids": [1, 4, 9]},
+    0x8100: {"serial_no": 7, "registration_result": 0, "auth_code": "865306057798238"},
+    0x8202: {"time_interval": 5, "location_tracking_validity_period": 3600},
+    0x8300: {"flag": 0x0C, "msg_type": 1, "message": "JT/T 808 text message"},
+    0x8401: {"set_type": 2, "phonebook": [{"call_type": 3, "phone": "13800000000", "concat_user": "Jack"}] * 3},
+    0x8600: {"set_attr": 1, "area_data": [{
+        "area_id": 1, "attributes": {"time_limit_enable": 1, "speed_limit_enable": 1},
+        "center_latitude": 31.824845, "center_longitude": 117.24091, "radius": 100,
+        "start_time": "220601000000", "end_time": "220701000000",
+        "speed_limit": 100, "over_speed_time": 10, "night_speed_limit": 80, "area_name": "area",
+    }] * 2},
+    0x8800: {"media_id": 9, "package_ids": [1, 2, 3]},
+    0x8801: {"channel_id": 1, "shooting_order": 1, "working_time": 10, "save_flag": 0, "resolution": 1,
+             "quality": 5, "brightness": 128, "contrast": 64, "saturation": 64, "chroma": 128},
+}
+
+
+def bench_schema(count=2000):
+    """Calls/sec of message body encode/decode on `BODY_SCHEMA`, by message object and by schema only."""
+    context = ProtocolContext("2019", "18888888888")
+    for message_id, params in sorted(SCHEMA_UPLINK_PARAMS.items()):
+        msg_obj = UPLINK_MESSAGE[message_id](context)
+        msg_obj.set_params(*params)
+        msg_obj.body_to_hex()
+        schema = BODY_SCHEMA[message_id]
+        values = schema.decode(ubinascii.unhexlify(msg_obj.get_body()), msg_obj)
+        message = bench_run(lambda: (msg_obj.set_params(*params), msg_obj.body_to_hex()), count)
+        raw = bench_run(lambda: schema.encode(values, msg_obj), count)
+        print("0x%04X encode: set_params + body_to_hex %.1f/s, schema %.1f/s" % (message_id, message, raw))
+    header = {"message_id": 0, "properties": 0x4000, "protocol_version": 1, "client_id": "18888888888",
+              "serial_no": 1, "package_total": 0, "package_no": 0}
+    for message_id, values in sorted(SCHEMA_DOWNLINK_VALUES.items()):
+        msg_obj = DOWNLINK_MESSAGE[message_id](context)
+        header["message_id"] = message_id
+        msg_obj.set_header(header)
+        schema = BODY_SCHEMA[message_id]
+        data = schema.encode(values, msg_obj)
+        body = ubinascii.hexlify(data).decode()
+        message = bench_run(lambda: msg_obj.set_body(body), count)
+        raw = bench_run(lambda: schema.decode(data, msg_obj), count)
+        print("0x%04X decode: set_body %.1f/s, schema %.1f/s" % (message_id, message, raw))
+
+
+def bench_alloc(func, count):
+    """Run function `count` times without garbage collection.
+
+    Returns:
+        float: bytes allocated by each call, -1 if `gc.mem_alloc` is not supported.
+    """
+    if not hasattr(gc, "mem_alloc"):
+        return -1
+    gc.collect()
+    gc.disable()
+    start = gc.mem_alloc()
+    for i in range(count):
+        func()
+    used = gc.mem_alloc() - start
+    gc.enable()
+    gc.collect()
+    return used / count
+
+
+def bench_encode_into(count=10000, target=100000):
+    """Reports/sec and bytes allocated of location bodies by hex string `body_to_hex` or by `encode_into` a reused buffer."""
+    context = ProtocolContext("2019", "18888888888")
+    loc_data = init_loction_data()
+    for message_id, params in ((0x0200, loc_data), (0x0201, (1,) + loc_data), (0x0500, (1,) + loc_data)):
+        msg_obj = UPLINK_MESSAGE[message_id](context)
+        msg_obj.set_params(*params)
+        buf = bytearray(msg_obj.body_size())
+        hex_report = bench_run(msg_obj.body_to_hex, count)
+        into_report = bench_run(lambda: msg_obj.encode_into(buf), count)
+        full_report = bench_run(lambda: (msg_obj.set_params(*params), msg_obj.encode_into(buf)), count)
+        print("0x%04X body_to_hex %.1f/s, encode_into %.1f/s (target %d/s) %d bytes/report, set_params + encode_into %.1f/s" % (
+            message_id, hex_report, into_report, target, bench_alloc(lambda: msg_obj.encode_into(buf), count), full_report))
+
+
+def bench_bulk_decode(count=5000, repeat=5):
+    """Location records/sec of decoding a bulk upload (0x0704) body by hex string slicing (before), by `array.array`
+    and by numpy columns."""
+    context = ProtocolContext("2019", "18888888888")
+    msg_obj = UPLINK_MESSAGE[0x0704](context)
+    msg_obj.set_params(0)
+    for i in range(count):
+        msg_obj.set_loc_data(*init_loction_data(i))
+    msg_obj.body_to_hex()
+    body_hex = msg_obj.get_body()
+    body = ubinascii.unhexlify(body_hex)
+
+    def legacy_decode():
+        data, offset = [], 6
+        for i in range(int(body_hex[:4], 16)):
+            size = int(body_hex[offset:offset + 4], 16) * 2
+            loc = body_hex[offset + 4:offset + 4 + size]
+            data.append((int(loc[:8], 16), int(loc[8:16], 16), int(loc[16:24], 16), int(loc[24:32], 16),
+                         int(loc[32:36], 16), int(loc[36:40], 16), int(loc[40:44], 16), loc[44:56], loc[56:]))
+            offset += 4 + size
+        return data
+
+    before = bench_run(legacy_decode, repeat) * count
+    by_array = bench_run(lambda: decode_t0704_body(body, False), repeat) * count
+    by_numpy = bench_run(lambda: decode_t0704_body(body, True), repeat) * count if jt_bulk.numpy is not None else 0
+    print("0x0704 %d locations decode: hex slicing %.1f/s, array %.1f/s, numpy %.1f/s" % (count, before, by_array, by_numpy))
+
+
+def bench_message_reuse(count=100):
+    """Calls/sec and bytes allocated of building hot uplink messages by a new object (before) or a reused one (after)."""
+    context = ProtocolContext("2019", "18888888888")
+    fills = {
+        0x0001: lambda msg_obj: msg_obj.set_params(7, 0x8103, 0),
+        0x0002: lambda msg_obj: None,
+        0x0200: lambda msg_obj: msg_obj.set_params(*init_loction_data()),
+        0x0704: lambda msg_obj: (msg_obj.set_params(0), [msg_obj.set_loc_data(*init_loction_data(i)) for i in range(5)]),
+    }
+    for message_id, fill in sorted(fills.items()):
+        reused = UPLINK_MESSAGE[message_id](context)
+
+        def new_message():
+            msg_obj = UPLINK_MESSAGE[message_id](context)
+            fill(msg_obj)
+            return msg_obj.message()
+
+        def reuse_message():
+            reused.reset()
+            fill(reused)
+            return reused.message()
+
+        assert [len(data) for serial_no, data in new_message()] == [len(data) for serial_no, data in reuse_message()]
+        before = bench_run(new_message, count * 10)
+        after = bench_run(reuse_message, count * 10)
+        before_alloc = bench_alloc(new_message, count)
+        after_alloc = bench_alloc(reuse_message, count)
+        print("0x%04X new object %.1f msgs/s %d bytes/msg, reused object %.1f msgs/s %d bytes/msg" % (
+            message_id, before, before_alloc, after, after_alloc))
+
+
+def bench_replay(path, speed=0, client_id="18888888888"):
+    """Replay received data of a capture file recorded by `jt_capture.CaptureWriter` into `JTT808.parse`."""
+    jtt808_obj = JTT808(ip="127.0.0.1", port=0, client_id=client_id)
+    jtt808_obj.set_callback(lambda args: None)
+    res = replay(path, jtt808_obj.parse, speed)
+    print("replay %d frames %d bytes in %.3fs, %.1f frames/s" % (res["frames"], res["bytes"], res["seconds"], res["frames_per_sec"]))
+    for message_id, stats in sorted(res["messages"].items()):
+        print("0x%04X %d frames, latency avg %.1fus max %dus, %d bytes/frame" % (
+            message_id & 0xFFFF, stats["count"], stats["latency_avg"], stats["latency_max"], stats["alloc_avg"]))
+
+
+def init_terminal_params():
+    """Terminal params of `params_report`, as `test_params_report` of test_jtt808.py."""
+    terminal_params = TerminalParams()
+    terminal_params.set_params(0x0013, "220.180.239.212:7611")
+    terminal_params.set_params(0x0001, 60)
+    terminal_params.set_params(0x0002, 30)
+    terminal_params.set_params(0x0032, 8, 12, 17, 30)
+    return {key: val["hex"] for key, val in terminal_params.get_params().items()}
+
+
+def init_polygon(points=124):
+    """Polygon area (0x8604) values, 124 points with time and speed limit is the max body of 1023 bytes."""
+    return {
+        "area_id": 2, "attributes": {"time_limit_enable": 1, "speed_limit_enable": 1},
+        "start_time": "220601000000", "end_time": "220701000000", "speed_limit": 100, "over_speed_time": 10,
+        "point_loction": [{"latitude": 31.824845 + i * 0.0001, "longitude": 117.24091 + i * 0.0001} for i in range(points)],
+        "night_speed_limit": 80, "area_name": "area",
+    }
+
+
+def init_route(points=300):
+    """Route (0x8606) values, every turning point with driving time and speed limit."""
+    return {
+        "route_id": 3, "attributes": {"time_limit_enable": 1},
+        "start_time": "220601000000", "end_time": "220701000000",
+        "turning_points": [{
+            "turning_point_id": i, "road_section_id": i, "turning_point_latitude": 31.824845 + i * 0.0001,
+            "turning_point_longitude": 117.24091 + i * 0.0001, "road_section_width": 10,
+            "attributes": {"driving_time_limit_enable": 1, "speed_limit_enable": 1},
+            "driving_too_long_time_limit": 100, "insufficient_travel_time_limit": 10,
+            "speed_limit": 100, "over_speed_time": 10, "night_speed_limit": 80,
+        } for i in range(points)],
+        "route_name": "route",
+    }
+
+
+# Fill an uplink message object before `message()`, every message id of UPLINK_MESSAGE.
+MESSAGE_UPLINK_FILLS = {
+    0x0001: lambda msg_obj: msg_obj.set_params(7, 0x8103, 0),
+    0x0002: lambda msg_obj: None,
+    0x0003: lambda msg_obj: None,
+    0x0004: lambda msg_obj: None,
+    0x0005: lambda msg_obj: msg_obj.set_params(3, [1, 2, 5]),
+    0x0100: lambda msg_obj: msg_obj.set_params("34", "0100", "quectel", "EC200U-CNAA", "866327040000001", 1, "A88888"),
+    0x0102: lambda msg_obj: msg_obj.set_params("865306057798238", "865306057798238", "v1.0.0"),
+    0x0104: lambda msg_obj: (msg_obj.set_params(7), [msg_obj.set_terminal_params(key, val) for key, val in init_terminal_params().items()]),
+    0x0107: lambda msg_obj: msg_obj.set_params(1, 1, 1, 1, 1, 0, 1, "quec", "EC200U-CNAA", "EC200UCNAA", "89860000000000000000",
+                                               "866327040000001", "EC200UCNAAR02A01M08", 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0),
+    0x0108: lambda msg_obj: msg_obj.set_params(0, 0),
+    0x0200: lambda msg_obj: msg_obj.set_params(*init_loction_data()),
+    0x0201: lambda msg_obj: msg_obj.set_params(7, *init_loction_data()),
+    0x0301: lambda msg_obj: msg_obj.set_params(1),
+    0x0302: lambda msg_obj: msg_obj.set_params(3, 4),
+    0x0303: lambda msg_obj: msg_obj.set_params(1, 1),
+    0x0500: lambda msg_obj: msg_obj.set_params(7, *init_loction_data()),
+    0x0608: lambda msg_obj: msg_obj.set_params(3, ["0000000260ff220601000000220701000000000a64000301e59bcd06fcf44e01e59bd706fcf45801e59be106fcf462"] * 4),
+    0x0700: lambda msg_obj: msg_obj.set_params(9, 33, b"\x7e\x7d\x01" * 100),
+    0x0701: lambda msg_obj: msg_obj.set_params(bytes(range(256)) * 2),
+    0x0702: lambda msg_obj: msg_obj.set_params(1, "220601120000", 0, "jack", "88888", "agency", "20220701", "340100199001011234"),
+    0x0704: lambda msg_obj: (msg_obj.set_params(0), [msg_obj.set_loc_data(*init_loction_data(i)) for i in range(20)]),
+    0x0705: lambda msg_obj: (msg_obj.set_params("1200000000"), [msg_obj.set_can_data(0, 0, 0, 0x123 + i, "0102030405060708") for i in range(20)]),
+    0x0800: lambda msg_obj: msg_obj.set_params(12, 0, 0, 4, 1),
+    0x0801: lambda msg_obj: (msg_obj.set_params(1, 0, 0, 4, 1, bytes(range(256)) * 3), msg_obj.set_loc_data(*init_loction_data()[:-1])),
+    0x0802: lambda msg_obj: (msg_obj.set_params(7), [msg_obj.set_media(i, 0, 2, 5, init_loction_data(i)[:-1]) for i in range(10)]),
+    0x0805: lambda msg_obj: msg_obj.set_params(7, 0, list(range(10))),
+    0x0900: lambda msg_obj: msg_obj.set_params(0xF0, "123456"),
+    0x0901: lambda msg_obj: msg_obj.set_params(bytes(range(256)) * 2),
+    0x0A00: lambda msg_obj: msg_obj.set_params(0x010001, "E5A55035C17123BF" * 16),
+}
+
+# Downlink message body of every message id of DOWNLINK_MESSAGE, dict is encoded by `BODY_SCHEMA`, str is body hex.
+# Message ids not here have an empty body.
+MESSAGE_DOWNLINK_BODIES = dict(SCHEMA_DOWNLINK_VALUES)
+MESSAGE_DOWNLINK_BODIES.update({
+    0x8004: {"utc_time": "220601120000"},
+    0x8103: {"params": [
+        {"param_id": 0x0001, "param_value": b"\x00\x00\x00\x3c"},
+        {"param_id": 0x0002, "param_value": b"\x00\x00\x00\x1e"},
+        {"param_id": 0x0013, "param_value": b"220.180.239.212:7611"},
+    ]},
+    0x8105: "01" + ubinascii.hexlify(b"http://upgrade;cmnet;user;password;220.180.239.212;7611;7612;QUECT;hw1;fw1;10").decode(),
+    0x8106: {"param_ids": [0x0001, 0x0002, 0x0013, 0x0032]},
+    0x8108: {"upgrade_type": 0, "manufacturer_id": "QUECT", "terminal_firmware_verion": "v1.0.1",
+             "upgrade_package": bytes(range(256)) * 3},
+    0x8203: {"alarm_msg_serial_no": 7, "alarm_type": {"emergency_alarm": 1}},
+    0x8301: {"set_type": 1, "events": [{"id": i, "data": "event %d" % i} for i in range(10)]},
+    0x8302: {"flag": {"emergency": 1, "terminal_tts_broadcast_and_read": 1}, "question_info": "question",
+             "answers": [{"id": i, "data": "answer %d" % i} for i in range(4)]},
+    0x8303: {"set_type": 1, "infos": [{"type": i, "name": "info %d" % i} for i in range(10)]},
+    0x8304: {"info_type": 1, "info_data": "information"},
+    0x8400: {"flag": 0, "phone_number": "13800000000"},
+    0x8500: {"data": [{"id": 1, "param": 1}], "control_flag": 1},
+    0x8601: {"ids": [1, 2, 3, 4]},
+    0x8602: {"set_attr": 1, "area_data": [{
+        "area_id": 1, "attributes": {"time_limit_enable": 1, "speed_limit_enable": 1},
+        "upper_left_latitude": 31.834845, "upper_left_longitude": 117.23091,
+        "lower_right_latitude": 31.814845, "lower_right_longitude": 117.25091,
+        "start_time": "220601000000", "end_time": "220701000000",
+        "speed_limit": 100, "over_speed_time": 10, "night_speed_limit": 80, "area_name": "area",
+    }] * 2},
+    0x8603: {"ids": [1, 2, 3, 4]},
+    0x8604: init_polygon(),
+    0x8605: {"ids": [1, 2, 3, 4]},
+    0x8606: init_route(),
+    0x8607: {"ids": [1, 2, 3, 4]},
+    0x8608: {"query_type": 3, "ids": [1, 2, 3]},
+    0x8700: "21",
+    0x8701: {"cmd_word": 0x82, "cmd_data": bytes(range(256))},
+    0x8802: {"media_type": 0, "channel_id": 1, "event_id": 0, "start_time": "220601000000", "end_time": "220601120000"},
+    0x8803: {"media_type": 0, "channel_id": 1, "event_code": 0, "start_time": "220601000000",
+             "end_time": "220601120000", "delete_flag": 0},
+    0x8804: {"recording_cmd": 1, "recording_time": 30, "save_flag": 0, "audio_sample_rate": 0},
+    0x8805: {"media_id": 9, "delete_flag": 0},
+    0x8900: "f0" + ubinascii.hexlify(b"transparent data" * 4).decode(),
+    0x8A00: {"e": 0x010001, "n": bytes(range(128))},
+})
+
+
+def bench_peak_alloc(func, meter):
+    """Bytes allocated by one call of `func`, measured by a `jt_capture.AllocMeter`."""
+    gc.collect()
+    meter.start()
+    func()
+    return meter.stop()
+
+
+def bench_message_result(ops, size, alloc):
+    return {"ops_per_sec": round(ops, 1), "bytes": size, "bytes_per_sec": round(ops * size, 1), "peak_alloc": alloc}
+
+
+def bench_messages(count=200, path=None, version="2019"):
+    """Ops/sec, bytes/sec and peak bytes allocated of `message()` of every uplink message and `set_header` +
+    `set_body` of every downlink message, by the fixtures of `MESSAGE_UPLINK_FILLS` and `MESSAGE_DOWNLINK_BODIES`.
+
+    `bytes` is frames size of an uplink message or body size of a downlink message. A message failed by its fixture
+    gets `error` instead of the result.
+
+    Args:
+        count(int): calls of each message. (default: {200})
+        path(str): write result to this JSON file if not None, compare runs by `bench_messages_compare`. (default: {None})
+        version(str): JT/T 808 version, 2013 or 2019. (default: {"2019"})
+
+    Returns:
+        dict: version, count, uplink and downlink results keyed by hex message id, e.g. "0x0200".
+    """
+    context = ProtocolContext(version, "18888888888")
+    header = {"message_id": 0, "properties": 0x4000 if version == "2019" else 0, "protocol_version": 1,
+              "client_id": "18888888888", "serial_no": 1, "package_total": 0, "package_no": 0}
+    meter = AllocMeter()
+    res = {"version": version, "count": count, "uplink": {}, "downlink": {}}
+    for message_id in sorted(UPLINK_MESSAGE.keys()):
+        key = "0x%04X" % message_id
+        try:
+            msg_obj = UPLINK_MESSAGE[message_id](context)
+            MESSAGE_UPLINK_FILLS[message_id](msg_obj)
+            size = sum(len(data) for serial_no, data in msg_obj.message())
+            ops = bench_run(msg_obj.message, count)
+            res["uplink"][key] = bench_message_result(ops, size, bench_peak_alloc(msg_obj.message, meter))
+        except Exception as e:
+            res["uplink"][key] = {"error": repr(e)}
+    for message_id in sorted(DOWNLINK_MESSAGE.keys()):
+        key = "0x%04X" % message_id
+        try:
+            msg_obj = DOWNLINK_MESSAGE[message_id](context)
+            header["message_id"] = message_id
+            msg_obj.set_header(header)
+            body = MESSAGE_DOWNLINK_BODIES.get(message_id, "")
+            if isinstance(body, dict):
+                body = ubinascii.hexlify(BODY_SCHEMA[message_id].encode(body, msg_obj)).decode()
+
+            def decode():
+                msg_obj.set_header(header)
+                msg_obj.set_body(body)
+
+            decode()
+            ops = bench_run(decode, count)
+            res["downlink"][key] = bench_message_result(ops, len(body) // 2, bench_peak_alloc(decode, meter))
+        except Exception as e:
+            res["downlink"][key] = {"error": repr(e)}
+    meter.close()
+    for direction in ("uplink", "downlink"):
+        for key, result in sorted(res[direction].items()):
+            if "error" in result:
+                print("%s %s error: %s" % (direction, key, result["error"]))
+            else:
+                print("%s %s %d bytes: %.1f ops/s, %.1f bytes/s, peak alloc %d bytes" % (
+                    direction, key, result["bytes"], result["ops_per_sec"], result["bytes_per_sec"], result["peak_alloc"]))
+    if path is not None:
+        with open(path, "w") as f:
+            ujson.dump(res, f)
+    return res
+
+
+def bench_messages_compare(base_path, path, threshold=0.1):
+    """Compare two JSON results of `bench_messages`, print messages slower or allocating more than `threshold`.
+
+    Returns:
+        list: (direction, message id key, field, base value, value) of regressions.
+    """
+    with open(base_path) as f:
+        base = ujson.load(f)
+    with open(path) as f:
+        res = ujson.load(f)
+    regressions = []
+    for direction in ("uplink", "downlink"):
+        for key, result in sorted(res[direction].items()):
+            base_result = base[direction].get(key, {})
+            if "error" in result and "error" not in base_result:
+                regressions.append((direction, key, "error", None, result["error"]))
+            if "error" in result or "error" in base_result or not base_result:
+                continue
+            if result["ops_per_sec"] < base_result["ops_per_sec"] * (1 - threshold):
+                regressions.append((direction, key, "ops_per_sec", base_result["ops_per_sec"], result["ops_per_sec"]))
+            if base_result["peak_alloc"] >= 0 and result["peak_alloc"] > base_result["peak_alloc"] * (1 + threshold):
+                regressions.append((direction, key, "peak_alloc", base_result["peak_alloc"], result["peak_alloc"]))
+    for item in regressions:
+        print("%s %s %s: %s -> %s" % item)
+    return regressions
+
+
+def bench_threads(func, threads):
+    """Run func(index) in `threads` threads at the same time.
+
+    Returns:
+        int: used microseconds until all threads finish.
+    """
+    lock = _thread.allocate_lock()
+    state = {"ready": 0, "go": False, "done": 0}
+
+    def run(index):
+        with lock:
+            state["ready"] += 1
+        while not state["go"]:
+            utime.sleep_ms(1)
+        func(index)
+        with lock:
+            state["done"] += 1
+
+    for i in range(threads):
+        _thread.start_new_thread(run, (i,))
+    while state["ready"] < threads:
+        utime.sleep_ms(1)
+    start = utime.ticks_us()
+    state["go"] = True
+    while state["done"] < threads:
+        utime.sleep_ms(1)
+    return utime.ticks_diff(utime.ticks_us(), start)
+
+
+def bench_serial_no(threads=4, count=10000, block=8):
+    """Serial numbers/sec of `threads` threads allocating `count` serial numbers each from one allocator.
+
+    before: process wide lock and range iterator, after: per-session allocator one by one, and in blocks of `block`
+    as subpackaged messages reserve them. `threads * count` is less than 0x10000, so every serial number must be
+    unique.
+    """
+    def one_by_one(allocator, res):
+        def run(index):
+            serial_nos = res[index]
+            for i in range(count):
+                serial_nos.append(allocator.get_serial_no())
+        return run
+
+    def in_blocks(allocator, res):
+        def run(index):
+            serial_nos = res[index]
+            for i in range(count // block):
+                first = allocator.reserve(block)
+                for j in range(block):
+                    serial_nos.append((first + j) & 0xFFFF)
+        return run
+
+    results = []
+    for name, allocator, func in (("before", LegacySerialNo(), one_by_one), ("after", SerialNo(), one_by_one),
+                                  ("after block %d" % block, SerialNo(), in_blocks)):
+        res = [[] for i in range(threads)]
+        used = bench_threads(func(allocator, res), threads)
+        total = sum(len(serial_nos) for serial_nos in res)
+        unique = len(set(serial_no for serial_nos in res for serial_no in serial_nos))
+        assert unique == total, "%s: %d duplicate serial numbers" % (name, total - unique)
+        results.append("%s %.1f serial_no/s" % (name, total * 1000000 / used if used > 0 else 0))
+    wrap = SerialNo(0xFFFE)
+    assert wrap.reserve(3) == 0xFFFE and wrap.get_serial_no() == 1
+    print("serial number %d threads x %d: %s" % (threads, count, ", ".join(results)))
+
+
+def init_stream():
+    """A received stream block of location, bulk location and media frames, about 64 KB."""
+    frames = [init_func().message()[0][1] for init_func in (init_t0200, init_t0704, init_t0801)]
+    block = b"".join(bytes(frame) for frame in frames)
+    return block * (0x10000 // len(block)), 0x10000 // len(block) * len(frames)
+
+
+def bench_stream_deframe(total=10 * 1024 * 1024, chunk=1024):
+    """MB/s and frames/s of splitting a `total` bytes stream received in `chunk` bytes reads."""
+    block, block_frames = init_stream()
+    chunks = [block[i:i + chunk] for i in range(0, len(block), chunk)]
+    loops = max(total // len(block), 1)
+
+    deframer = StreamDeframer()
+    frame_count = 0
+    start = utime.ticks_us()
+    for i in range(loops):
+        for data in chunks:
+            deframer.feed(data)
+            for frame in deframer.frames():
+                frame_count += 1
+    used = utime.ticks_diff(utime.ticks_us(), start)
+    assert frame_count == loops * block_frames, "frame count %s not equal %s" % (frame_count, loops * block_frames)
+    after = (loops * len(block) / used, frame_count * 1000000 / used)
+
+    legacy_loops = max(loops // 16, 1)
+    frame_count = 0
+    start = utime.ticks_us()
+    for i in range(legacy_loops):
+        message = b""
+        for data in chunks:
+            frames, message = legacy_frame_split(message + data)
+            frame_count += len(frames)
+    used = utime.ticks_diff(utime.ticks_us(), start)
+    before = (legacy_loops * len(block) / used, frame_count * 1000000 / used)
+
+    print("stream deframe %d bytes in %d bytes reads: before %.2f MB/s %.1f frames/s, after %.2f MB/s %.1f frames/s, dropped %d" % (
+        loops * len(block), chunk, before[0], before[1], after[0], after[1], deframer.dropped()))
+
+
+def downlink_frame(header, message_id, body, serial_no=0):
+    """Build a downlink frame to the terminal of uplink `header`, same version and client id."""
+    client_id = ubinascii.unhexlify(header["client_id"])
+    if len(client_id) == 10:
+        data = ustruct.pack(">HHB10sH", message_id, 0x4000 | len(body), header["protocol_version"], client_id, serial_no) + body
+    else:
+        data = ustruct.pack(">HH6sH", message_id, len(body), client_id, serial_no) + body
+    return frame_encode(data + bytes([XorChecksum(data).digest()]))
+
+
+def bench_platform_reply(msg_parser, frame, serial_no):
+    """Stand-in platform, answer 0x8100 to register and 0x8001 to other requests.
+
+    Returns:
+        bytearray: answer frame, None if the request needs no answer.
+    """
+    msg_parser.set_message(frame)
+    header = msg_parser.get_header()
+    if header["message_id"] == 0x0100:
+        body = ustruct.pack(">HB", header["serial_no"], 0) + b"AUTH" + header["client_id"][-4:].encode()
+        return downlink_frame(header, 0x8100, body, serial_no)
+    elif header["message_id"] not in (0x0001, 0x0003):
+        body = ustruct.pack(">HHB", header["serial_no"], header["message_id"], 0)
+        return downlink_frame(header, 0x8001, body, serial_no)
+    return None
+
+
+async def bench_server_handle(reader, writer):
+    deframer = StreamDeframer()
+    msg_parser = JTMessageParse()
+    serial_no = 0
+    while True:
+        data = await reader.read(1024)
+        if not data:
+            break
+        deframer.feed(data)
+        for frame in deframer.frames():
+            reply = bench_platform_reply(msg_parser, frame, serial_no)
+            if reply is not None:
+                writer.write(reply)
+            serial_no = (serial_no + 1) & 0xFFFF
+        await writer.drain()
+    writer.close()
+
+
+async def bench_async_terminal(index, port, reports, stats):
+    cli = AsyncJTT808(ip="127.0.0.1", port=port, version="2019", client_id="%d" % (18800000000 + index))
+    if not await cli.connect():
+        stats["failed"] += 1
+        return
+    res = await cli.register("34", "0100", "QUECTEL", "EC200U", "%07d" % index, 1, "TEST%05d" % index)
+    ok = res.get("registration_result") == 0
+    ok = ok and (await cli.authentication(res["auth_code"], "86" + "%013d" % index, "1.0.0")).get("result_code") == 0
+    for i in range(reports):
+        if not ok:
+            break
+        ok = (await cli.loction_report(None, None, 0, 3, *init_loction_data(i)[2:])).get("result_code") == 0
+    await cli.disconnect()
+    stats["requests"] += 2 + reports if ok else 0
+    stats["failed"] += 0 if ok else 1
+
+
+async def bench_async_run(count, port, reports):
+    server = await asyncio.start_server(bench_server_handle, "127.0.0.1", port)
+    stats = {"requests": 0, "failed": 0}
+    start = utime.ticks_us()
+    await asyncio.gather(*[bench_async_terminal(i, port, reports, stats) for i in range(count)])
+    used = utime.ticks_diff(utime.ticks_us(), start)
+    server.close()
+    await server.wait_closed()
+    print("async %d terminals: %.2f s, %.1f requests/s, failed %d" % (
+        count, used / 1000000, stats["requests"] * 1000000 / used if used > 0 else 0, stats["failed"]))
+
+
+def bench_async_terminals(count=5000, port=18808, reports=5):
+    """Register, authenticate and report location from `count` AsyncJTT808 clients in one event loop.
+
+    The server is a stand-in platform on the local address in the same event loop, so the result is the cost of
+    the client side and the stand-in together.
+    """
+    asyncio.run(bench_async_run(count, port, reports))
+
+
+def bench_platform_serve(port=18810, backlog=128, stop=None):
+    """Stand-in platform on a uselect poll loop, it runs until `stop()` returns True.
+
+    Run it in another process for a large session count, both sides need one socket per session.
+    """
+    server = usocket.socket(usocket.AF_INET, usocket.SOCK_STREAM)
+    server.setsockopt(usocket.SOL_SOCKET, usocket.SO_REUSEADDR, 1)
+    server.bind(usocket.getaddrinfo("0.0.0.0", port)[0][-1])
+    server.listen(backlog)
+    poller = uselect.poll()
+    poller.register(server, uselect.POLLIN)
+    conns = {}
+    msg_parser = JTMessageParse()
+    while stop is None or not stop():
+        for item in poller.poll(100):
+            sock = item[0]
+            if sock is server:
+                conn, addr = server.accept()
+                conns[conn] = StreamDeframer()
+                poller.register(conn, uselect.POLLIN)
+                continue
+            data = sock.recv(4096) if item[1] & uselect.POLLIN else b""
+            if not data:
+                poller.unregister(sock)
+                conns.pop(sock).clear()
+                sock.close()
+                continue
+            deframer = conns[sock]
+            deframer.feed(data)
+            replies = [bench_platform_reply(msg_parser, frame, 0) for frame in deframer.frames()]
+            sock.send(b"".join(bytes(reply) for reply in replies if reply is not None))
+    for sock in conns:
+        sock.close()
+    server.close()
+
+
+def bench_gateway_start(session, index, reports, stats):
+    """Register, authenticate, then send `reports` location reports at once."""
+    def report(future):
+        if (future.result() or {}).get("result_code") != 0:
+            stats["failed"] += 1
+            return False
+        stats["requests"] += 1
+        left[0] -= 1
+        if left[0] == 0:
+            stats["done"] += 1
+        return True
+
+    def authenticated(future):
+        if not report(future):
+            return
+        for i in range(reports):
+            msg_obj = session.new_message(0x0200)
+            msg_obj.set_params(*init_loction_data(i))
+            # Frames queued in one loop round are sent by one socket send.
+            session.request(msg_obj).add_done_callback(report)
+
+    def registered(future):
+        res = future.result() or {}
+        if res.get("registration_result") != 0:
+            stats["failed"] += 1
+            return
+        stats["requests"] += 1
+        msg_obj = session.new_message(0x0102)
+        msg_obj.set_params(res["auth_code"], "86" + "%013d" % index, "1.0.0")
+        session.request(msg_obj, 0x8001, False).add_done_callback(authenticated)
+
+    left = [reports + 1]
+    msg_obj = session.new_message(0x0100)
+    msg_obj.set_params("34", "0100", "QUECTEL", "EC200U", "%07d" % index, 1, "TEST%05d" % index)
+    session.request(msg_obj, 0x8100, False).add_done_callback(registered)
+
+
+def bench_gateway_sessions(count=10000, ip="127.0.0.1", port=18810, reports=3, server=True):
+    """Run `count` terminal sessions of mixed 2013 and 2019 versions on one JTT808Gateway loop.
+
+    Every session registers, authenticates and sends `reports` location reports. With `server` True the stand-in
+    platform runs in a thread of this process, so the process needs about `2 * count` sockets.
+    """
+    running = [server]
+    if server:
+        _thread.start_new_thread(bench_platform_serve, (port, 1024, lambda: not running[0]))
+        utime.sleep_ms(200)
+    gateway = JTT808Gateway(timeout=30, retry_count=1)
+    stats = {"requests": 0, "done": 0, "failed": 0}
+    start = utime.ticks_ms()
+    for i in range(count):
+        context = ProtocolContext("2013" if i % 2 else "2019", str(13800000000 + i))
+        session = gateway.add_session(ip, port, context)
+        if session is None:
+            stats["failed"] += 1
+            continue
+        bench_gateway_start(session, i, reports, stats)
+        if i % 256 == 0:
+            gateway.run_once(0)
+    while stats["done"] + stats["failed"] < count and utime.ticks_diff(utime.ticks_ms(), start) < 300000:
+        gateway.run_once(10)
+    used = utime.ticks_diff(utime.ticks_ms(), start)
+    gateway_stats = gateway.stats()
+    running[0] = False
+    print("gateway %d sessions on one loop: %.2f s, %.1f requests/s, done %d, failed %d, frames %d in %d socket sends, retransmissions %d" % (
+        count, used / 1000, stats["requests"] * 1000 / used if used > 0 else 0, stats["done"], stats["failed"],
+        gateway_stats["frames_out"], gateway_stats["writes"], gateway_stats["retransmissions"]))
+    for session in gateway.sessions():
+        gateway.remove_session(session)
+    gateway.run_once(0)
+
+
+def main():
+    set_jtmsg_config(jtt808_version="2019", client_id="18888888888")
+    bench_frame_encode()
+    bench_frame_decode()
+    bench_schema()
+    bench_messages()
+    bench_message_reuse()
+    bench_encode_into()
+    bench_bulk_decode()
+    bench_stream_deframe()
+    bench_serial_no()
+    bench_async_terminals()
+    bench_gateway_sessions()
+
+
+if __name__ == '__main__':
+    main()
@@ -30,8 +30,6 @@ from usr.logging import getLogger
 
 logger = getLogger(__name__)
 
-_serial_no_lock = _thread.allocate_lock()
-
 
 def str_fill(source, rl="l", target_len=0, fill_field="0"):
     if len(source) >= target_len or target_len <= 0:
@@ -52,10 +50,19 @@ def str_fill(source, rl="l", target_len=0, fill_field="0"):
 
 
 class SerialNo:
+    """Message serial number allocator of one terminal connection.
+
+    Serial number counts from 0 to 0xFFFF and wraps to 0. A block of continuous serial numbers can be reserved in one
+    step for all subpackages of a message.
+    """
 
-    def __init__(self):
-        self.__num = 0xFFFF
-        self.__iter_serial_no = iter(range(self.__num))
+    def __init__(self, start=0):
+        """
+        Args:
+            start(int): first serial number. (default: {0})
+        """
+        self.__next = start & 0xFFFF
+        self.__lock = _thread.allocate_lock()
 
     def get_serial_no(self):
         """Get message serial number.
@@ -63,12 +70,24 @@ class SerialNo:
         Returns:
             int: serial number
         """
-        try:
-            with _serial_no_lock:
-                return next(self.__iter_serial_no)
-        except StopIteration:
-            self.__iter_serial_no = iter(range(self.__num))
-            return self.get_serial_no()
+        with self.__lock:
+            serial_no = self.__next
+            self.__next = (serial_no + 1) & 0xFFFF
+        return serial_no
+
+    def reserve(self, count):
+        """Reserve `count` continuous serial numbers.
+
+        Args:
+            count(int): serial number count, 1 ~ 0x10000.
+
+        Returns:
+            int: first serial number, the others are `(first + i) & 0xFFFF`.
+        """
+        with self.__lock:
+            serial_no = self.__next
+            self.__next = (serial_no + count) & 0xFFFF
+        return serial_no
 
 
 class TCPUDPBase:
@@ -96,6 +115,7 @@ class TCPUDPBase:
         self.__tid = None
         self.__callback = print
         self.__stack_size = 0x2000
+        self.__capture = None
 
     def __init_addr(self):
         """Get ip and port from domain.
@@ -220,6 +240,8 @@ class TCPUDPBase:
         with self.__socket_lock:
             if self.__socket is not None:
                 try:
+                    if self.__capture is not None:
+                        self.__capture.sent(data)
                     if self.__method == "TCP":
                         write_data_num = self.__socket.write(data)
                         return (write_data_num == len(data))
@@ -248,6 +270,8 @@ class TCPUDPBase:
                     self.__socket.settimeout(0.5 if data else self.__timeout)
                     read_data = self.__socket.recv(bufsize)
                     logger.debug("read_data: %s" % read_data)
+                    if read_data and self.__capture is not None:
+                        self.__capture.received(read_data)
                 except Exception as e:
                     if e.args[0] != 110:
                         sys.print_exception(e)
@@ -260,7 +284,6 @@ class TCPUDPBase:
         return data
 
     def __wait_msg(self):
-        _msg = b""
         while self.__conn_tag:
             if self.status() != 0:
                 if self.status() != 1:
@@ -269,11 +292,10 @@ class TCPUDPBase:
                 logger.error("%s connection status is %s" % (self.__method, self.status()))
                 utime.sleep(1)
                 continue
-            logger.debug("__wait_msg _msg", repr(_msg))
-            _msg += self.__read()
+            _msg = self.__read()
             if not _msg:
                 continue
-            _msg = self.parse(_msg)
+            self.parse(_msg)
 
     def __downlink_thread_start(self):
         """This function starts a thread to read the data sent by the server"""
@@ -331,6 +353,15 @@ class TCPUDPBase:
 
         return _status
 
+    def set_capture(self, capture=None):
+        """Set capture of socket traffic.
+
+        Args:
+            capture(object): `jt_capture.CaptureWriter`, or any object has `sent(data)` and `received(data)`,
+                None is to stop capture. (default: {None})
+        """
+        self.__capture = capture
+
     def set_callback(self, callback):
         if callable(callback):
             self.__callback = callback
@@ -0,0 +1,426 @@
+# Copyright (c) Quectel Wireless Solution, Co., Ltd.All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+@file      :jt_async.py
+@author    :Jack Sun (jack.sun@quectel.com)
+@brief     :JTT808 client on uasyncio, terminal requests are coroutines
+@version   :1.0.0
+@date      :2026-10-18 14:20:00
+@copyright :Copyright (c) 2022
+"""
+
+import usys
+import uasyncio as asyncio
+from usr.logging import getLogger
+from usr.jt_frame import StreamDeframer
+from usr.jt_session import SubpackageTable
+from usr.jt_message import DOWNLINK_MESSAGE, UPLINK_MESSAGE, REUSED_MSG_ID, JTMessageParse, ProtocolContext
+
+logger = getLogger(__name__)
+
+RESPONSE_MSG_ID = (0x8001, 0x8100, 0x8003, 0x8004)
+
+
+class AsyncJTT808(object):
+    """JTT808 TCP client on uasyncio.
+
+    Many clients can run in one event loop without a thread for each one. Terminal requests have the same names
+    and arguments as `JTT808`, and are coroutines which return the server response.
+    """
+
+    def __init__(self, ip=None, port=None, timeout=30, retry_count=3, version="2019", client_id="", context=None):
+        """
+        Args:
+            ip(str): server ip address or domain. (default: {None})
+            port(int): server port. (default: {None})
+            timeout(int): server response timeout seconds. (default: {30})
+            retry_count(int): retransmission count, timeout of retransmission is `T(n+1) = T(n) * (n + 1)`. (default: {3})
+            version(str): jtt808 version. (default: {"2019"})
+            client_id(str): device sim phone number. (default: {""})
+            context(ProtocolContext): protocol config of this terminal, `version` and `client_id` are not used if it is set. (default: {None})
+
+        Raises:
+            ValueError: client_id is empty when context is None.
+        """
+        self.__ip = ip
+        self.__port = port
+        self.__timeout = timeout
+        self.__retry_count = retry_count
+        if context is None:
+            if not client_id:
+                raise ValueError("client_id is not exists.")
+            context = ProtocolContext(version, client_id)
+        self.__context = context
+        self.__client_id = context.get_client_id()
+        self.__msg_parser = JTMessageParse(context)
+        self.__deframer = StreamDeframer()
+        self.__reader = None
+        self.__writer = None
+        self.__read_task = None
+        self.__pending = {}
+        self.__subpackages = SubpackageTable(timeout * 1000)
+        self.__subpackage_task = None
+        self.__callback = None
+        self.__messages = {}
+
+    def __new_message(self, message_id):
+        # Frames are built before the first await of `__send_message`, so a hot message object is free again
+        # when the next one is needed and is reused.
+        if message_id in REUSED_MSG_ID:
+            msg_obj = self.__messages.get(message_id)
+            if msg_obj is not None:
+                msg_obj.reset()
+                return msg_obj
+            msg_obj = UPLINK_MESSAGE[message_id](self.__context)
+            self.__messages[message_id] = msg_obj
+            return msg_obj
+        return UPLINK_MESSAGE[message_id](self.__context)
+
+    async def __read_loop(self):
+        while self.__reader is not None:
+            try:
+                data = await self.__reader.read(1024)
+            except Exception as e:
+                usys.print_exception(e)
+                data = b""
+            if not data:
+                logger.debug("%s connection closed by server" % self.__client_id)
+                break
+            self.__deframer.feed(data)
+            for frame in self.__deframer.frames():
+                try:
+                    self.__handle(frame)
+                except Exception as e:
+                    usys.print_exception(e)
+        self.__reader = None
+
+    def __handle(self, frame):
+        self.__msg_parser.set_message(frame)
+        header = self.__msg_parser.get_header()
+        body = self.__msg_parser.get_body()
+        message_id = header["message_id"]
+        if DOWNLINK_MESSAGE.get(message_id) is None:
+            logger.error("message_id [%s] is not downlink message id" % message_id)
+            return
+        if header["package_total"] != 0:
+            full_data = self.__subpackages.add(header, body)
+            if full_data is None:
+                if self.__subpackage_task is None:
+                    self.__subpackage_task = asyncio.create_task(self.__subpackage_loop())
+                return
+            header, body = full_data
+        msg_obj = DOWNLINK_MESSAGE[message_id](self.__context)
+        if message_id == 0x8A00:
+            msg_obj.set_excryption(False)
+        msg_obj.set_header(header)
+        msg_obj.set_body(body)
+        data = msg_obj.body_data()
+        logger.debug("%s downlink %s: %s" % (self.__client_id, message_id, data))
+        if message_id in RESPONSE_MSG_ID:
+            self.__complete(message_id, data.get("serial_no"), data)
+        elif message_id == 0x8800:
+            if not data["package_ids"]:
+                asyncio.create_task(self.general_answer(header["serial_no"], message_id))
+        elif self.__callback is not None:
+            res = self.__callback({"header": header, "data": data})
+            # Coroutine callback runs as a task, so it can await requests of this client.
+            if res is not None and hasattr(res, "send"):
+                asyncio.create_task(res)
+        else:
+            asyncio.create_task(self.general_answer(header["serial_no"], message_id))
+
+    async def __subpackage_loop(self):
+        # Request lost subpackages by 0x0005 and drop expired ones, while some messages are unfinished.
+        while self.__reader is not None and self.__subpackages.size():
+            await asyncio.sleep(1)
+            for first_serial_no, package_ids in self.__subpackages.expire():
+                msg_obj = self.__new_message(0x0005)
+                msg_obj.set_params(first_serial_no, package_ids)
+                await self.__send_message(msg_obj, None, False)
+        self.__subpackage_task = None
+
+    def __complete(self, message_id, serial_no, data):
+        if serial_no is None:
+            keys = [key for key in self.__pending.keys() if key[0] == message_id]
+            key = min(keys, key=lambda key: key[1]) if keys else None
+        else:
+            key = (message_id, serial_no)
+        item = self.__pending.get(key)
+        if item is None:
+            logger.debug("No request waits for response %s serial no %s" % (message_id, serial_no))
+            return
+        item[1] = data
+        item[0].set()
+
+    async def __send_message(self, msg_obj, res_msg_id=0x8001, encryption=True):
+        if encryption:
+            msg_obj.set_excryption(*self.__context.get_encryption())
+        send_res = {}
+        for serial_no, data in msg_obj.message():
+            send_res = await self.send(data, res_msg_id, serial_no)
+            if not send_res or (res_msg_id is not None and send_res.get("result_code") != 0):
+                break
+        return send_res
+
+    async def connect(self):
+        """Connect server and start reading task.
+
+        Returns:
+            bool: True - success, False - failed
+        """
+        try:
+            self.__reader, self.__writer = await asyncio.open_connection(self.__ip, self.__port)
+        except Exception as e:
+            usys.print_exception(e)
+            return False
+        self.__deframer.clear()
+        self.__read_task = asyncio.create_task(self.__read_loop())
+        return True
+
+    async def disconnect(self):
+        """Close connection and stop reading task."""
+        writer = self.__writer
+        self.__reader = None
+        self.__writer = None
+        if writer is not None:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except Exception as e:
+                usys.print_exception(e)
+        if self.__read_task is not None:
+            self.__read_task.cancel()
+            self.__read_task = None
+        if self.__subpackage_task is not None:
+            self.__subpackage_task.cancel()
+            self.__subpackage_task = None
+        self.__subpackages.clear()
+        for item in self.__pending.values():
+            item[0].set()
+        return True
+
+    def status(self):
+        """Get connection status
+
+        Returns:
+            int: 0 - Connected, 2 - Disconnect
+        """
+        return 0 if self.__reader is not None else 2
+
+    def set_callback(self, callback):
+        """Set callback of server requests, callback can be a function or a coroutine function.
+
+        Args:
+            callback(function): callback({"header": header, "data": data})
+        """
+        if callable(callback):
+            self.__callback = callback
+            return True
+        return False
+
+    def set_encryption(self, encryption=False, rsa_e=None, rsa_n=None):
+        """Set server communication encryption, same as `JTT808.set_encryption`."""
+        self.__context.set_encryption(encryption, rsa_e, rsa_n)
+        return True
+
+    def get_context(self):
+        """Get ProtocolContext of this terminal."""
+        return self.__context
+
+    async def send(self, data, res_msg_id, serial_no):
+        """Send data to server and wait for server response.
+
+        Args:
+            data(bytes): message info
+            res_msg_id(int): server response message id, None if no response.
+            serial_no(int): this send message serial number.
+
+        Returns:
+            dict: Return empty dict if not get server response, eles return server response data.
+            bool: If `res_msg_id` is None, True - success, False - failed.
+        """
+        if self.__writer is None:
+            return False if res_msg_id is None else {}
+        if res_msg_id is None:
+            try:
+                self.__writer.write(data)
+                await self.__writer.drain()
+                return True
+            except Exception as e:
+                usys.print_exception(e)
+                return False
+
+        key = (res_msg_id, serial_no)
+        item = [asyncio.Event(), {}]
+        self.__pending[key] = item
+        timeout = self.__timeout
+        count = 0
+        try:
+            while count <= self.__retry_count and self.__writer is not None:
+                self.__writer.write(data)
+                await self.__writer.drain()
+                try:
+                    await asyncio.wait_for(item[0].wait(), timeout)
+                    break
+                except asyncio.TimeoutError:
+                    # T(n+1) = T(n) * (n + 1)
+                    count += 1
+                    timeout *= count + 1
+        except Exception as e:
+            usys.print_exception(e)
+        finally:
+            self.__pending.pop(key, None)
+        return item[1]
+
+    async def general_answer(self, response_serial_no, response_msg_id, result_code=0):
+        up_msg_obj = self.__new_message(0x0001)
+        up_msg_obj.set_params(response_serial_no, response_msg_id, result_code)
+        return await self.__send_message(up_msg_obj, None, False)
+
+    async def query_server_time(self):
+        return await self.__send_message(self.__new_message(0x0004), 0x8004, False)
+
+    async def register(self, province_id, city_id, manufacturer_id, terminal_model, terminal_id, license_plate_color, license_plate):
+        up_msg_obj = self.__new_message(0x0100)
+        up_msg_obj.set_params(province_id, city_id, manufacturer_id, terminal_model, terminal_id, license_plate_color, license_plate)
+        return await self.__send_message(up_msg_obj, 0x8100, False)
+
+    async def authentication(self, auth_code, imei, app_version):
+        up_msg_obj = self.__new_message(0x0102)
+        up_msg_obj.set_params(auth_code, imei, app_version)
+        return await self.__send_message(up_msg_obj, 0x8001, False)
+
+    async def heart_beat(self):
+        return await self.__send_message(self.__new_message(0x0002), 0x8001, False)
+
+    async def logout(self):
+        return await self.__send_message(self.__new_message(0x0003), None, False)
+
+    async def params_report(self, response_serial_no, terminal_params):
+        up_msg_obj = self.__new_message(0x0104)
+        up_msg_obj.set_params(response_serial_no)
+        for param_id, param_value in terminal_params.items():
+            up_msg_obj.set_terminal_params(param_id, param_value)
+        return await self.__send_message(up_msg_obj)
+
+    async def properties_report(self, *args):
+        """Same arguments as `JTT808.properties_report`."""
+        up_msg_obj = self.__new_message(0x0107)
+        up_msg_obj.set_params(*args)
+        return await self.__send_message(up_msg_obj)
+
+    async def upgrade_result_report(self, upgrade_type, result_code):
+        up_msg_obj = self.__new_message(0x0108)
+        up_msg_obj.set_params(upgrade_type, result_code)
+        return await self.__send_message(up_msg_obj)
+
+    async def loction_report(self, response_msg_id, response_serial_no, alarm_flag, loc_status, latitude, longitude, altitude,
+                             speed, direction, time, loc_additional_info):
+        params = (alarm_flag, loc_status, latitude, longitude, altitude, speed, direction, time, loc_additional_info)
+        if response_msg_id is None:
+            up_msg_obj = self.__new_message(0x0200)
+        else:
+            up_msg_obj = self.__new_message(0x0201 if response_msg_id == 0x8201 else 0x0500)
+            params = (response_serial_no,) + params
+        up_msg_obj.set_params(*params)
+        return await self.__send_message(up_msg_obj)
+
+    async def event_report(self, event_id):
+        up_msg_obj = self.__new_message(0x0301)
+        up_msg_obj.set_params(event_id)
+        return await self.__send_message(up_msg_obj)
+
+    async def issue_question_response(self, response_serial_no, answer_id):
+        up_msg_obj = self.__new_message(0x0302)
+        up_msg_obj.set_params(response_serial_no, answer_id)
+        return await self.__send_message(up_msg_obj)
+
+    async def information_demand_cancellation(self, info_type, onoff):
+        up_msg_obj = self.__new_message(0x0303)
+        up_msg_obj.set_params(info_type, onoff)
+        return await self.__send_message(up_msg_obj)
+
+    async def query_area_route_data_response(self, query_type, data):
+        up_msg_obj = self.__new_message(0x0608)
+        up_msg_obj.set_params(query_type, data)
+        return await self.__send_message(up_msg_obj)
+
+    async def driving_record_data_upload(self, response_serial_no, cmd_word, cmd_data):
+        up_msg_obj = self.__new_message(0x0700)
+        up_msg_obj.set_params(response_serial_no, cmd_word, cmd_data)
+        return await self.__send_message(up_msg_obj)
+
+    async def electronic_waybill_report(self, data):
+        up_msg_obj = self.__new_message(0x0701)
+        up_msg_obj.set_params(data)
+        return await self.__send_message(up_msg_obj)
+
+    async def driver_identity_information_report(self, *args):
+        """Same arguments as `JTT808.driver_identity_information_report`."""
+        up_msg_obj = self.__new_message(0x0702)
+        up_msg_obj.set_params(*args)
+        return await self.__send_message(up_msg_obj)
+
+    async def location_bulk_report(self, data_type, loc_datas):
+        up_msg_obj = self.__new_message(0x0704)
+        up_msg_obj.set_params(data_type)
+        for loc_data in loc_datas:
+            up_msg_obj.set_loc_data(*loc_data)
+        return await self.__send_message(up_msg_obj)
+
+    async def can_bus_data_upload(self, recive_time, can_datas):
+        up_msg_obj = self.__new_message(0x0705)
+        up_msg_obj.set_params(recive_time)
+        for can_data in can_datas:
+            up_msg_obj.set_can_data(*can_data)
+        return await self.__send_message(up_msg_obj)
+
+    async def media_event_upload(self, media_id, media_type, media_encoding, event_code, channel_id):
+        up_msg_obj = self.__new_message(0x0800)
+        up_msg_obj.set_params(media_id, media_type, media_encoding, event_code, channel_id)
+        return await self.__send_message(up_msg_obj)
+
+    async def media_data_upload(self, media_id, media_type, media_encoding, event_code, channel_id, media_data, loc_data):
+        up_msg_obj = self.__new_message(0x0801)
+        up_msg_obj.set_params(media_id, media_type, media_encoding, event_code, channel_id, media_data)
+        up_msg_obj.set_loc_data(*loc_data)
+        return await self.__send_message(up_msg_obj)
+
+    async def camera_shoots_immediately_response(self, response_serial_no, result, ids):
+        up_msg_obj = self.__new_message(0x0805)
+        up_msg_obj.set_params(response_serial_no, result, ids)
+        return await self.__send_message(up_msg_obj)
+
+    async def stored_media_data_retrieval_response(self, response_serial_no, medias):
+        up_msg_obj = self.__new_message(0x0802)
+        up_msg_obj.set_params(response_serial_no)
+        for media in medias:
+            up_msg_obj.set_media(*media)
+        return await self.__send_message(up_msg_obj)
+
+    async def data_uplink_transparent_transmission(self, data_type, data):
+        up_msg_obj = self.__new_message(0x0900)
+        up_msg_obj.set_params(data_type, data)
+        return await self.__send_message(up_msg_obj)
+
+    async def data_compression_report(self, data):
+        up_msg_obj = self.__new_message(0x0901)
+        up_msg_obj.set_params(data)
+        return await self.__send_message(up_msg_obj)
+
+    async def terminal_rsa_public_key(self, e, n):
+        up_msg_obj = self.__new_message(0x0A00)
+        up_msg_obj.set_params(e, n)
+        return await self.__send_message(up_msg_obj, 0x8001, False)
@@ -0,0 +1,296 @@
+# Copyright (c) Quectel Wireless Solution, Co., Ltd.All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+@file      :jt_bulk.py
+@author    :Jack Sun (jack.sun@quectel.com)
+@brief     :Columnar bulk decode of location data, bulk upload (0x0704) body or captured location report (0x0200) frames
+@version   :1.0.0
+@date      :2026-10-18 17:00:00
+@copyright :Copyright (c) 2022
+"""
+
+import array
+import ustruct
+import ubinascii
+from usr.jt_frame import FRAME_FLAG, StreamDeframer, frame_decode
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# alarm flag, status, latitude, longitude, altitude, speed, direction, BCD time
+LOC_FORMAT = ">IIIIHHH6s"
+LOC_SIZE = 28
+LOC_COLUMNS = (
+    ("alarm_flag", "L", ">u4"),
+    ("loc_status", "L", ">u4"),
+    ("latitude", "L", ">u4"),
+    ("longitude", "L", ">u4"),
+    ("altitude", "H", ">u2"),
+    ("speed", "H", ">u2"),
+    ("direction", "H", ">u2"),
+)
+
+
+class LocationColumns(object):
+    """Location data of many reports kept by column.
+
+    Columns are `numpy.ndarray` if numpy is usable, else `array.array`:
+        alarm_flag(int): LocAlarmWarningConfig value
+        loc_status(int): LocStatusConfig value
+        latitude(int): unit: 1e-6 degree
+        longitude(int): unit: 1e-6 degree
+        altitude(int): unit: meter
+        speed(int): unit: 0.1 km/h
+        direction(int): range: 0~359
+        time(int): GMT+8, decimal YYMMDDhhmmss, e.g. 220601120000
+        info_offset(int): additional info start offset in `get_data()`
+        info_size(int): additional info bytes size
+    """
+
+    def __init__(self, data, columns):
+        self.__data = data
+        self.__columns = columns
+
+    def count(self):
+        """Get number of location reports."""
+        return len(self.__columns["time"])
+
+    def names(self):
+        """Get column names."""
+        return tuple(self.__columns.keys())
+
+    def column(self, name):
+        """Get one column.
+
+        Args:
+            name(str): column name.
+
+        Returns:
+            numpy.ndarray/array.array: column values.
+        """
+        return self.__columns[name]
+
+    def get_data(self):
+        """Get the buffer that `info_offset` points into."""
+        return self.__data
+
+    def info(self, index):
+        """Get additional info TLV bytes of one report, can be loaded by `LocAdditionalInfoConfig`.
+
+        Args:
+            index(int): report index.
+
+        Returns:
+            memoryview: additional info TLV bytes.
+        """
+        offset = int(self.__columns["info_offset"][index])
+        return memoryview(self.__data)[offset:offset + int(self.__columns["info_size"][index])]
+
+    def row(self, index):
+        """Get one report as dict of column name to value."""
+        return {name: int(values[index]) for name, values in self.__columns.items()}
+
+
+def _bcd_time(bcd):
+    return int(ubinascii.hexlify(bcd).decode())
+
+
+def _decode_numpy(data, starts, ends):
+    buf = numpy.frombuffer(data, dtype=numpy.uint8)
+    starts = numpy.asarray(starts, dtype=numpy.int64)
+    ends = numpy.asarray(ends, dtype=numpy.int64)
+    # One gather of every fixed part, than view them as big endian records.
+    rows = buf[starts[:, None] + numpy.arange(LOC_SIZE)]
+    fixed = numpy.ascontiguousarray(rows[:, :LOC_SIZE - 6]).view(
+        [(name, dtype) for name, typecode, dtype in LOC_COLUMNS]
+    ).reshape(-1)
+    columns = {name: fixed[name].astype(dtype[1:]) for name, typecode, dtype in LOC_COLUMNS}
+    bcd = rows[:, LOC_SIZE - 6:].astype(numpy.int64)
+    digits = (bcd >> 4) * 10 + (bcd & 0x0F)
+    columns["time"] = digits.dot(numpy.array([10 ** 10, 10 ** 8, 10 ** 6, 10 ** 4, 10 ** 2, 1], dtype=numpy.int64))
+    columns["info_offset"] = starts + LOC_SIZE
+    columns["info_size"] = ends - starts - LOC_SIZE
+    return columns
+
+
+def _decode_array(data, starts, ends):
+    columns = {name: array.array(typecode) for name, typecode, dtype in LOC_COLUMNS}
+    columns["time"] = array.array("q")
+    columns["info_offset"] = array.array("L")
+    columns["info_size"] = array.array("L")
+    appends = [columns[name].append for name, typecode, dtype in LOC_COLUMNS]
+    times = columns["time"].append
+    info_offsets = columns["info_offset"].append
+    info_sizes = columns["info_size"].append
+    for i in range(len(starts)):
+        start = starts[i]
+        values = ustruct.unpack_from(LOC_FORMAT, data, start)
+        for j in range(7):
+            appends[j](values[j])
+        times(_bcd_time(values[7]))
+        info_offsets(start + LOC_SIZE)
+        info_sizes(ends[i] - start - LOC_SIZE)
+    return columns
+
+
+def decode_locations(data, starts, ends, use_numpy=None):
+    """Decode location report (0x0200) bodies kept in one buffer.
+
+    Args:
+        data(bytes/bytearray): buffer of bodies.
+        starts(list/array.array): body start offsets.
+        ends(list/array.array): body end offsets.
+        use_numpy(bool): decode by numpy, None is by numpy if it is installed. (default: {None})
+
+    Returns:
+        LocationColumns: location columns.
+
+    Raises:
+        ValueError: a body is shorter than location basic info.
+    """
+    for i in range(len(starts)):
+        if ends[i] - starts[i] < LOC_SIZE or ends[i] > len(data):
+            raise ValueError("location data %s at %s is out of range." % (i, starts[i]))
+    if use_numpy is None:
+        use_numpy = numpy is not None
+    if use_numpy:
+        columns = _decode_numpy(data, starts, ends)
+    else:
+        columns = _decode_array(data, starts, ends)
+    return LocationColumns(data, columns)
+
+
+def decode_t0704_body(body, use_numpy=None):
+    """Decode bulk upload (0x0704) body.
+
+    Args:
+        body(bytes/bytearray): 0x0704 message body.
+        use_numpy(bool): decode by numpy, None is by numpy if it is installed. (default: {None})
+
+    Returns:
+        tuple: (data_type, LocationColumns)
+
+    Raises:
+        ValueError: a location data is out of body.
+    """
+    count, data_type = ustruct.unpack_from(">HB", body, 0)
+    starts = array.array("L")
+    ends = array.array("L")
+    offset = 3
+    for i in range(count):
+        if offset + 2 > len(body):
+            raise ValueError("location data %s at %s is out of body." % (i, offset))
+        size = ustruct.unpack_from(">H", body, offset)[0]
+        starts.append(offset + 2)
+        offset += 2 + size
+        ends.append(offset)
+    return data_type, decode_locations(body, starts, ends, use_numpy)
+
+
+class LocationFrameReader(object):
+    """Collect location report (0x0200) bodies from captured terminal frames.
+
+    Frames of other messages, subpackages and frames with a wrong check code are skipped and counted.
+    """
+
+    def __init__(self, message_id=0x0200):
+        """
+        Args:
+            message_id(int): message to collect. (default: {0x0200})
+        """
+        self.__message_id = message_id
+        self.__deframer = StreamDeframer()
+        self.__frame_buf = bytearray(256)
+        self.__data = bytearray()
+        self.__starts = array.array("L")
+        self.__ends = array.array("L")
+        self.__skipped = 0
+
+    def add_frame(self, frame):
+        """Add one full frame, start and end with 0x7E.
+
+        Returns:
+            bool: True - location report is collected, False - frame is skipped.
+        """
+        if len(frame) < 14 or frame[0] != FRAME_FLAG or frame[-1] != FRAME_FLAG:
+            self.__skipped += 1
+            return False
+        if len(self.__frame_buf) < len(frame):
+            self.__frame_buf = bytearray(len(frame))
+        buf = self.__frame_buf
+        try:
+            size, check_code = frame_decode(frame, buf)
+        except TypeError:
+            self.__skipped += 1
+            return False
+        message_id, properties = ustruct.unpack_from(">HH", buf, 0)
+        offset = 17 if properties & 0x4000 else 12
+        if check_code != buf[size - 1] or message_id != self.__message_id or properties & 0x2000 \
+                or offset + LOC_SIZE > size - 1:
+            self.__skipped += 1
+            return False
+        start = len(self.__data)
+        self.__data.extend(memoryview(buf)[offset:size - 1])
+        self.__starts.append(start)
+        self.__ends.append(len(self.__data))
+        return True
+
+    def feed(self, data):
+        """Add captured stream data, frames may be split by chunks.
+
+        Args:
+            data(bytes/bytearray/memoryview): captured data.
+        """
+        self.__deframer.feed(data)
+        for frame in self.__deframer.frames():
+            self.add_frame(frame)
+
+    def skipped(self):
+        """Get number of skipped frames."""
+        return self.__skipped
+
+    def columns(self, use_numpy=None):
+        """Decode all collected location reports.
+
+        Args:
+            use_numpy(bool): decode by numpy, None is by numpy if it is installed. (default: {None})
+
+        Returns:
+            LocationColumns: location columns.
+        """
+        return decode_locations(bytes(self.__data), self.__starts, self.__ends, use_numpy)
+
+
+def decode_capture_file(path, use_numpy=None, chunk=4096):
+    """Decode a file of captured location report (0x0200) frames.
+
+    Args:
+        path(str): file path, frames as sent by terminal.
+        use_numpy(bool): decode by numpy, None is by numpy if it is installed. (default: {None})
+        chunk(int): read size. (default: {4096})
+
+    Returns:
+        LocationColumns: location columns.
+    """
+    reader = LocationFrameReader()
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(chunk)
+            if not data:
+                break
+            reader.feed(data)
+    return reader.columns(use_numpy)
@@ -0,0 +1,258 @@
+# Copyright (c) Quectel Wireless Solution, Co., Ltd.All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+@file      :jt_capture.py
+@author    :Jack Sun (jack.sun@quectel.com)
+@brief     :Capture file of JT/T 808 socket traffic and replay it into a parser
+@version   :1.0.0
+@date      :2026-10-18 17:40:00
+@copyright :Copyright (c) 2022
+"""
+
+import gc
+import utime
+import ustruct
+import _thread
+from usr.jt_frame import StreamDeframer, frame_decode
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+# Capture file is a list of records, record head is direction, timestamp and data length.
+# A start record is written each time a writer opens the file, the timestamps of the following records are
+# milliseconds from it, its data is the wall clock seconds of that time.
+CAPTURE_SENT = 0
+CAPTURE_RECEIVED = 1
+CAPTURE_START = 2
+
+_RECORD_HEAD = ">BIH"
+_RECORD_HEAD_SIZE = 7
+_MAX_RECORD_DATA = 0xFFFF
+
+
+class CaptureWriter(object):
+    """Append only capture file writer.
+
+    Set it to a connection by `TCPUDPBase.set_capture`, every sent and received data is recorded. Records are kept in
+    memory and written to file by `buffer_size`, call `flush` or `close` to write the rest.
+    """
+
+    def __init__(self, path, buffer_size=4096):
+        """
+        Args:
+            path(str): capture file path, records are appended if the file exists.
+            buffer_size(int): records size kept in memory before writing to file. (default: {4096})
+        """
+        self.__path = path
+        self.__buffer_size = buffer_size
+        self.__buf = bytearray()
+        self.__lock = _thread.allocate_lock()
+        self.__start = utime.ticks_ms()
+        self.__record(CAPTURE_START, ustruct.pack(">I", int(utime.time())))
+
+    def __record(self, direction, data):
+        timestamp = utime.ticks_diff(utime.ticks_ms(), self.__start) & 0xFFFFFFFF
+        for offset in range(0, len(data), _MAX_RECORD_DATA):
+            chunk = data[offset:offset + _MAX_RECORD_DATA]
+            self.__buf.extend(ustruct.pack(_RECORD_HEAD, direction, timestamp, len(chunk)))
+            self.__buf.extend(chunk)
+        if len(self.__buf) >= self.__buffer_size:
+            self.__flush()
+
+    def __flush(self):
+        if self.__buf:
+            with open(self.__path, "ab") as f:
+                f.write(self.__buf)
+            self.__buf = bytearray()
+
+    def record(self, direction, data):
+        """Record data.
+
+        Args:
+            direction(int): CAPTURE_SENT or CAPTURE_RECEIVED
+            data(bytes/bytearray/memoryview): socket data.
+        """
+        if not data:
+            return
+        with self.__lock:
+            self.__record(direction, data)
+
+    def sent(self, data):
+        """Record sent data."""
+        self.record(CAPTURE_SENT, data)
+
+    def received(self, data):
+        """Record received data."""
+        self.record(CAPTURE_RECEIVED, data)
+
+    def flush(self):
+        """Write records kept in memory to file."""
+        with self.__lock:
+            self.__flush()
+
+    def close(self):
+        self.flush()
+
+
+def read_capture(path):
+    """Generator of capture file records.
+
+    Args:
+        path(str): capture file path.
+
+    Yields:
+        tuple: (direction, timestamp, data), timestamp unit is millisecond from the last start record.
+
+    Raises:
+        ValueError: capture file is truncated.
+    """
+    with open(path, "rb") as f:
+        while True:
+            head = f.read(_RECORD_HEAD_SIZE)
+            if not head:
+                break
+            if len(head) < _RECORD_HEAD_SIZE:
+                raise ValueError("capture record head is truncated.")
+            direction, timestamp, size = ustruct.unpack(_RECORD_HEAD, head)
+            data = f.read(size)
+            if len(data) < size:
+                raise ValueError("capture record data is truncated.")
+            yield direction, timestamp, data
+
+
+class AllocMeter(object):
+    """Bytes allocated by a piece of code, by `gc.mem_alloc` on QuecPython or by tracemalloc peak on CPython.
+
+    Call `start` before and `stop` after the code, `stop` returns the bytes, -1 if not supported. Call `close` when
+    done, tracemalloc started by this meter slows down CPython until then.
+    """
+
+    def __init__(self):
+        self.__mem_alloc = getattr(gc, "mem_alloc", None)
+        self.__tracing = False
+        if self.__mem_alloc is None and tracemalloc is not None and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.__tracing = True
+        self.__base = 0
+
+    def start(self):
+        if self.__mem_alloc is not None:
+            gc.disable()
+            self.__base = self.__mem_alloc()
+        elif tracemalloc is not None and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            self.__base = tracemalloc.get_traced_memory()[0]
+
+    def stop(self):
+        if self.__mem_alloc is not None:
+            used = self.__mem_alloc() - self.__base
+            gc.enable()
+            return used
+        if tracemalloc is not None and tracemalloc.is_tracing():
+            return tracemalloc.get_traced_memory()[1] - self.__base
+        return -1
+
+    def close(self):
+        if self.__tracing:
+            tracemalloc.stop()
+
+
+def replay(path, parser, speed=0, direction=CAPTURE_RECEIVED):
+    """Feed recorded data into a parser, e.g. `JTT808Base.parse`, and measure it.
+
+    Data is split into frames first, every frame is parsed alone to get latency and allocation of each message id.
+    The parser may answer some messages, use a terminal which is not connected and set its callback to avoid real
+    sending and callback threads.
+
+    Args:
+        path(str): capture file path.
+        parser(function): called with each frame.
+        speed(float): 0 - as fast as possible, 1 - recorded speed, 2 - double recorded speed. (default: {0})
+        direction(int): records to replay, CAPTURE_RECEIVED - downlink of terminal. (default: {CAPTURE_RECEIVED})
+
+    Returns:
+        dict:
+            frames(int): frames parsed
+            bytes(int): data size replayed
+            seconds(float): time used, include waiting for recorded speed
+            frames_per_sec(float): frames parsed per second, exclude waiting
+            messages(dict): message id as key, value is dict of:
+                count(int): frames of this message id
+                latency_avg(float): average parse latency, unit: us
+                latency_max(int): max parse latency, unit: us
+                alloc_avg(float): average bytes allocated by parse, -1 if not supported
+    """
+    deframer = StreamDeframer()
+    buf = bytearray(256)
+    meter = AllocMeter()
+    messages = {}
+    frames = 0
+    total = 0
+    busy = 0
+    start = utime.ticks_ms()
+    base = start
+    try:
+        for _direction, timestamp, data in read_capture(path):
+            if _direction == CAPTURE_START:
+                base = utime.ticks_ms()
+                deframer.clear()
+                continue
+            if _direction != direction:
+                continue
+            if speed:
+                wait = int(timestamp / speed) - utime.ticks_diff(utime.ticks_ms(), base)
+                if wait > 0:
+                    utime.sleep_ms(wait)
+            total += len(data)
+            deframer.feed(data)
+            for frame in deframer.frames():
+                if len(buf) < len(frame):
+                    buf = bytearray(len(frame))
+                try:
+                    message_id = ustruct.unpack_from(">H", buf, 0)[0] if frame_decode(frame, buf)[0] >= 2 else -1
+                except TypeError:
+                    message_id = -1
+                frame = bytes(frame)
+                meter.start()
+                begin = utime.ticks_us()
+                parser(frame)
+                used = utime.ticks_diff(utime.ticks_us(), begin)
+                alloc = meter.stop()
+                busy += used
+                frames += 1
+                stats = messages.get(message_id)
+                if stats is None:
+                    stats = {"count": 0, "latency": 0, "latency_max": 0, "alloc": 0}
+                    messages[message_id] = stats
+                stats["count"] += 1
+                stats["latency"] += used
+                stats["alloc"] += alloc
+                if used > stats["latency_max"]:
+                    stats["latency_max"] = used
+    finally:
+        meter.close()
+    for stats in messages.values():
+        stats["latency_avg"] = stats.pop("latency") / stats["count"]
+        alloc = stats.pop("alloc")
+        stats["alloc_avg"] = alloc / stats["count"] if alloc >= 0 else -1
+    return {
+        "frames": frames,
+        "bytes": total,
+        "seconds": utime.ticks_diff(utime.ticks_ms(), start) / 1000,
+        "frames_per_sec": frames * 1000000 / busy if busy > 0 else 0,
+        "messages": messages,
+    }
@@ -0,0 +1,268 @@
+# Copyright (c) Quectel Wireless Solution, Co., Ltd.All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+@file      :jt_frame.py
+@author    :Jack Sun (jack.sun@quectel.com)
+@brief     :JT/T 808 frame encode and decode on bytes
+@version   :1.0.0
+@date      :2026-10-18 09:30:00
+@copyright :Copyright (c) 2022
+"""
+
+FRAME_FLAG = 0x7E
+ESCAPE_CHAR = 0x7D
+
+_FLAG = b"\x7e"
+_ESCAPE = b"\x7d"
+
+
+class XorChecksum(object):
+    """JT/T 808 check code, XOR of every byte from the message header to the end of the message body.
+
+    Data can be fed in chunks, so a large body does not need to be joined before checking.
+    """
+
+    def __init__(self, data=None):
+        self.__value = 0
+        if data is not None:
+            self.update(data)
+
+    def update(self, data):
+        """Feed data.
+
+        Args:
+            data(bytes/bytearray/memoryview): message data chunk.
+        """
+        value = self.__value
+        for code in memoryview(data):
+            value ^= code
+        self.__value = value
+
+    def digest(self):
+        """Get check code of all fed data.
+
+        Returns:
+            int: check code, 0 if no data fed.
+        """
+        return self.__value
+
+    def reset(self):
+        self.__value = 0
+
+
+def frame_encode(data, buf=None):
+    """Escape message data and add the frame delimiters.
+
+    0x7E is escaped to 0x7D 0x02 and 0x7D is escaped to 0x7D 0x01.
+    The output length is known before writing, so the frame is written in one pass.
+
+    Args:
+        data(bytes): message header, body and check code.
+        buf(bytearray): reusable output buffer, a new buffer is allocated if it is None or too small. (default: {None})
+
+    Returns:
+        bytearray/memoryview: full frame, memoryview of `buf` when `buf` is used.
+    """
+    size = len(data)
+    i_7d = data.find(_ESCAPE)
+    i_7e = data.find(_FLAG)
+    frame_len = size + 2
+    if i_7d != -1 or i_7e != -1:
+        frame_len += data.count(_ESCAPE) + data.count(_FLAG)
+
+    if buf is not None and len(buf) >= frame_len:
+        out = buf
+    else:
+        out = bytearray(frame_len)
+    out[0] = FRAME_FLAG
+
+    pos = 0
+    index = 1
+    while i_7d != -1 or i_7e != -1:
+        if i_7e == -1 or (i_7d != -1 and i_7d < i_7e):
+            end = i_7d
+            code = 0x01
+        else:
+            end = i_7e
+            code = 0x02
+        out[index:index + end - pos] = data[pos:end]
+        index += end - pos
+        out[index] = ESCAPE_CHAR
+        out[index + 1] = code
+        index += 2
+        pos = end + 1
+        if code == 0x01:
+            i_7d = data.find(_ESCAPE, pos)
+        else:
+            i_7e = data.find(_FLAG, pos)
+
+    out[index:index + size - pos] = data[pos:]
+    index += size - pos
+    out[index] = FRAME_FLAG
+
+    if out is buf:
+        return memoryview(buf)[:frame_len]
+    return out
+
+
+def frame_decode(frame, buf):
+    """Remove the delimiters and escape of a frame, calculate the check code in the same pass.
+
+    Args:
+        frame(bytes/bytearray/memoryview): full frame, start and end with 0x7E.
+        buf(bytearray): output buffer, length must not be less than `len(frame) - 2`.
+
+    Returns:
+        tuple: (size, check_code)
+            size(int): unescaped data length in `buf`, include the check code byte.
+            check_code(int): check code calculated from the unescaped data except the last byte.
+
+    Raises:
+        TypeError: frame escape is illegal.
+    """
+    size = 0
+    check_code = 0
+    escape = False
+    for code in memoryview(frame)[1:-1]:
+        if escape:
+            if code == 0x01:
+                code = ESCAPE_CHAR
+            elif code == 0x02:
+                code = FRAME_FLAG
+            else:
+                raise TypeError("Escape message failed. Only 01 or 02 after 7d, not %02x" % code)
+            escape = False
+        elif code == ESCAPE_CHAR:
+            escape = True
+            continue
+        buf[size] = code
+        check_code ^= code
+        size += 1
+    if size:
+        check_code ^= buf[size - 1]
+    return size, check_code
+
+
+class StreamDeframer(object):
+    """Split a received byte stream into frames.
+
+    The stream is kept in one growable bytearray. Delimiter positions are found with `bytes.find` on each received
+    chunk when it is fed, so every byte is scanned once. Frames are returned as memoryview of the buffer without
+    copying, a frame is only valid until the next `feed`.
+
+    The buffer is compacted before it grows, only the unfinished frame is moved to the buffer head. If an unfinished
+    frame is larger than `max_size`, it is dropped and the deframer waits for the next delimiter.
+    """
+
+    def __init__(self, size=1024, max_size=0x4000):
+        """
+        Args:
+            size(int): init buffer size. (default: {1024})
+            max_size(int): max buffer size, the buffer is never grown over it. (default: {0x4000})
+        """
+        self.__buf = bytearray(size)
+        self.__max_size = max_size if max_size > size else size
+        self.__end = 0
+        self.__start = -1
+        self.__flags = []
+        self.__index = 0
+        self.__dropped = 0
+
+    def __reserve(self, size):
+        """Make `size` free bytes at buffer end, compact, grow or drop the unfinished frame."""
+        if self.__end + size <= len(self.__buf):
+            return
+        # Data before the unfinished frame is no longer needed.
+        if self.__start != -1:
+            head = self.__start
+        elif self.__index < len(self.__flags):
+            head = self.__flags[self.__index]
+        else:
+            head = self.__end
+        flags = [pos - head for pos in self.__flags[self.__index:]]
+        keep = self.__end - head
+        if keep + size > self.__max_size:
+            self.__dropped += keep
+            keep = 0
+            flags = []
+            self.__start = -1
+        elif self.__start != -1:
+            self.__start -= head
+        if keep + size > len(self.__buf):
+            buf = bytearray(min(max(len(self.__buf) * 2, keep + size), max(self.__max_size, size)))
+            buf[:keep] = memoryview(self.__buf)[head:head + keep]
+            self.__buf = buf
+        elif keep and head:
+            self.__buf[:keep] = self.__buf[head:head + keep]
+        self.__end = keep
+        self.__flags = flags
+        self.__index = 0
+
+    def feed(self, data):
+        """Append received data.
+
+        Args:
+            data(bytes/bytearray/memoryview): received data.
+        """
+        size = len(data)
+        if not size:
+            return
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        self.__reserve(size)
+        end = self.__end
+        self.__buf[end:end + size] = data
+        index = data.find(_FLAG)
+        while index != -1:
+            self.__flags.append(end + index)
+            index = data.find(_FLAG, index + 1)
+        self.__end = end + size
+
+    def frames(self):
+        """Generator of full frames fed so far.
+
+        Back to back delimiters `7e7e` are the end of one frame and the start of the next, a single delimiter
+        followed directly by another one never yields an empty frame.
+
+        Yields:
+            memoryview: full frame, start and end with 0x7E.
+        """
+        buf = memoryview(self.__buf)
+        flags = self.__flags
+        while self.__index < len(flags):
+            pos = flags[self.__index]
+            self.__index += 1
+            if self.__start == -1 or pos == self.__start + 1:
+                self.__start = pos
+            else:
+                start = self.__start
+                self.__start = -1
+                yield buf[start:pos + 1]
+        del flags[:]
+        self.__index = 0
+
+    def pending(self):
+        """Get size of the unfinished frame kept in buffer."""
+        return self.__end - self.__start if self.__start != -1 else 0
+
+    def dropped(self):
+        """Get total size of data dropped because of `max_size`."""
+        return self.__dropped
+
+    def clear(self):
+        self.__end = 0
+        self.__start = -1
+        del self.__flags[:]
+        self.__index = 0
@@ -0,0 +1,491 @@
+# Copyright (c) Quectel Wireless Solution, Co., Ltd.All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+@file      :jt_gateway.py
+@author    :Jack Sun (jack.sun@quectel.com)
+@brief     :Many JTT808 terminal sessions on one uselect poll loop
+@version   :1.0.0
+@date      :2026-10-18 15:40:00
+@copyright :Copyright (c) 2022
+"""
+
+import usys
+import utime
+import uselect
+import usocket
+import _thread
+from usr.logging import getLogger
+from usr.jt_frame import StreamDeframer
+from usr.jt_session import PendingTable, RetransmitScheduler, SubpackageTable
+from usr.jt_message import DOWNLINK_MESSAGE, UPLINK_MESSAGE, JTMessageParse
+
+logger = getLogger(__name__)
+
+RESPONSE_MSG_ID = (0x8001, 0x8100, 0x8003, 0x8004)
+
+# EAGAIN, EINPROGRESS
+_EAGAIN = (11, 115)
+
+
+class GatewaySession(object):
+    """One terminal connection of JTT808Gateway.
+
+    A session has its own ProtocolContext (client id, version and serial numbers), stream deframer, subpackage
+    reassembly state and pending table. Requests do not block, they return a ResponseFuture which is completed in the
+    gateway loop thread. Frames written between two loop rounds are sent by one socket send.
+    """
+
+    def __init__(self, gateway, sock, context, lock, timeout=30):
+        """
+        Args:
+            gateway(JTT808Gateway): gateway of this session.
+            sock(usocket.socket): non-blocking socket, connecting.
+            context(ProtocolContext): protocol config of this terminal.
+            lock(lock): gateway lock, it protects the write buffer.
+            timeout(int): seconds to wait for the rest subpackages of a message. (default: {30})
+        """
+        self.__gateway = gateway
+        self.__sock = sock
+        self.__context = context
+        self.__lock = lock
+        self.__status = 1
+        self.__deframer = StreamDeframer()
+        self.__msg_parser = JTMessageParse(context)
+        self.__pending = PendingTable()
+        self.__subpackages = SubpackageTable(timeout * 1000)
+        self.__wframes = []
+        self.__dirty = False
+        self.__callback = None
+        self.__frames_in = 0
+        self.__frames_out = 0
+        self.__writes = 0
+
+    def __request_done(self, future):
+        # Remove request failed by retransmission timeout, a completed one is already removed.
+        self.__pending.remove(future.get_message_id(), future.get_serial_no())
+
+    def __handle(self, frame):
+        self.__msg_parser.set_message(frame)
+        header = self.__msg_parser.get_header()
+        body = self.__msg_parser.get_body()
+        message_id = header["message_id"]
+        if DOWNLINK_MESSAGE.get(message_id) is None:
+            logger.error("message_id [%s] is not downlink message id" % message_id)
+            return
+        if header["package_total"] != 0:
+            full_data = self.__subpackages.add(header, body)
+            if full_data is None:
+                self.__gateway.watch_subpackages(self)
+                return
+            header, body = full_data
+        msg_obj = DOWNLINK_MESSAGE[message_id](self.__context)
+        if message_id == 0x8A00:
+            msg_obj.set_excryption(False)
+        msg_obj.set_header(header)
+        msg_obj.set_body(body)
+        data = msg_obj.body_data()
+        if message_id in RESPONSE_MSG_ID:
+            self.__pending.complete(message_id, data.get("serial_no"), data)
+        elif message_id == 0x8800:
+            if not data["package_ids"]:
+                self.general_answer(header["serial_no"], message_id)
+        elif self.__callback is not None:
+            self.__callback(self, {"header": header, "data": data})
+        else:
+            self.general_answer(header["serial_no"], message_id)
+
+    def expire_subpackages(self):
+        """Request lost subpackages by 0x0005 and drop expired ones, called by gateway loop.
+
+        Returns:
+            bool: True - some messages are still unfinished.
+        """
+        for first_serial_no, package_ids in self.__subpackages.expire():
+            msg_obj = self.new_message(0x0005)
+            msg_obj.set_params(first_serial_no, package_ids)
+            self.request(msg_obj, None, False)
+        return self.__subpackages.size() > 0
+
+    def get_socket(self):
+        return self.__sock
+
+    def get_context(self):
+        return self.__context
+
+    def status(self):
+        """Get session status
+
+        Returns:
+            int: 0 - Connected, 1 - Connecting, 2 - Disconnect
+        """
+        return self.__status
+
+    def set_callback(self, callback):
+        """Set callback of server requests, it is called in gateway loop thread.
+
+        Args:
+            callback(function): callback(session, {"header": header, "data": data})
+        """
+        if callable(callback):
+            self.__callback = callback
+            return True
+        return False
+
+    def pending(self):
+        """Get count of requests waiting for server response."""
+        return self.__pending.size()
+
+    def stats(self):
+        """
+        Returns:
+            dict:
+                frames_in(int): received frames.
+                frames_out(int): written frames, retransmissions included.
+                writes(int): socket sends.
+        """
+        return {"frames_in": self.__frames_in, "frames_out": self.__frames_out, "writes": self.__writes}
+
+    def new_message(self, message_id):
+        """Create uplink message object of this terminal.
+
+        Args:
+            message_id(int): uplink message id.
+
+        Returns:
+            JTMessage: message object, set params of it and pass it to `request`.
+        """
+        return UPLINK_MESSAGE[message_id](self.__context)
+
+    def request(self, msg_obj, res_msg_id=0x8001, encryption=True):
+        """Send a message without blocking, all subpackages are sent.
+
+        Args:
+            msg_obj(JTMessage): message object from `new_message` with params set.
+            res_msg_id(int): server response message id, None if no response. (default: {0x8001})
+            encryption(bool): encrypt body if encryption is set in context. (default: {True})
+
+        Returns:
+            ResponseFuture: response of the last subpackage, result is empty dict if not get server response.
+            None: `res_msg_id` is None or session is closed.
+        """
+        if self.__status == 2:
+            return None
+        if encryption:
+            msg_obj.set_excryption(*self.__context.get_encryption())
+        future = None
+        for serial_no, data in msg_obj.message():
+            if res_msg_id is None:
+                self.write(data)
+                continue
+            # Add to pending table before the frame can be sent, the response may come at once.
+            future = self.__pending.add(res_msg_id, serial_no)
+            future.add_done_callback(self.__request_done)
+            self.write(data)
+            self.__gateway.schedule(self, future, data)
+        return future
+
+    def general_answer(self, response_serial_no, response_msg_id, result_code=0):
+        msg_obj = self.new_message(0x0001)
+        msg_obj.set_params(response_serial_no, response_msg_id, result_code)
+        return self.request(msg_obj, None, False)
+
+    def write(self, data):
+        """Queue a frame, it is sent in next loop round together with the other queued frames.
+
+        Returns:
+            bool: True - success, False - session is closed.
+        """
+        with self.__lock:
+            if self.__status == 2:
+                return False
+            # Frame buffer may be reused by its message object, keep a copy.
+            self.__wframes.append(bytes(data))
+            self.__frames_out += 1
+            notify = not self.__dirty
+            self.__dirty = True
+        if notify:
+            self.__gateway.wakeup(self)
+        return True
+
+    def flush(self):
+        """Send queued frames, called by gateway loop.
+
+        Queued frames are joined once and sent by one socket send, the data not sent is kept for the next call.
+
+        Returns:
+            bool: True - some data is not sent, wait for socket writable.
+
+        Raises:
+            OSError: socket error.
+        """
+        with self.__lock:
+            self.__dirty = False
+            if self.__status != 0 or not self.__wframes:
+                return self.__status == 1 or len(self.__wframes) > 0
+            data = self.__wframes[0] if len(self.__wframes) == 1 else b"".join(self.__wframes)
+            try:
+                sent = self.__sock.send(data)
+            except OSError as e:
+                if e.args[0] not in _EAGAIN:
+                    raise
+                sent = 0
+            self.__writes += 1
+            self.__wframes = [data[sent:]] if sent < len(data) else []
+            return len(self.__wframes) > 0
+
+    def set_connected(self):
+        if self.__status == 1:
+            self.__status = 0
+
+    def read(self):
+        """Receive and handle frames, called by gateway loop.
+
+        Returns:
+            bool: True - success, False - connection is closed.
+        """
+        try:
+            data = self.__sock.recv(4096)
+        except OSError as e:
+            if e.args[0] in _EAGAIN:
+                return True
+            usys.print_exception(e)
+            return False
+        if not data:
+            return False
+        self.__deframer.feed(data)
+        for frame in self.__deframer.frames():
+            self.__frames_in += 1
+            try:
+                self.__handle(frame)
+            except Exception as e:
+                usys.print_exception(e)
+        return True
+
+    def close(self):
+        """Close session, waiting requests get empty dict. The socket is closed by gateway loop."""
+        with self.__lock:
+            if self.__status == 2:
+                return
+            self.__status = 2
+            self.__wframes = []
+            notify = not self.__dirty
+            self.__dirty = True
+        self.__pending.clear({})
+        if notify:
+            self.__gateway.wakeup(self)
+
+
+class JTT808Gateway(object):
+    """Many terminal sessions share one uselect poll loop and one retransmission timer wheel.
+
+    `JTT808` needs a socket and a downlink thread for each terminal, the gateway needs only one thread for all
+    sessions. The loop runs in the thread of `start`, or in the caller's thread with `run_once`.
+    """
+
+    def __init__(self, timeout=30, retry_count=3, tick=1000, slots=64):
+        """
+        Args:
+            timeout(int): server response timeout seconds. (default: {30})
+            retry_count(int): retransmission count, timeout of retransmission is `T(n+1) = T(n) * (n + 1)`. (default: {3})
+            tick(int): retransmission wheel tick milliseconds. (default: {1000})
+            slots(int): retransmission wheel slot count. (default: {64})
+        """
+        self.__poller = uselect.poll()
+        self.__sessions = {}
+        self.__pollout = {}
+        self.__dirty = []
+        self.__lock = _thread.allocate_lock()
+        self.__timeout = timeout
+        self.__scheduler = RetransmitScheduler(self.__retransmit, None, timeout, retry_count, tick, slots, timer=False)
+        # Sessions which have unfinished subpackages, only used by loop thread.
+        self.__reassembling = {}
+        self.__last_tick = utime.ticks_ms()
+        self.__running = False
+        self.__tid = None
+        self.__stack_size = 0x4000
+
+    def __retransmit(self, item):
+        session, data = item
+        return session.write(data)
+
+    def __set_pollout(self, session, pollout):
+        sock = session.get_socket()
+        if self.__pollout.get(sock, False) != pollout:
+            self.__pollout[sock] = pollout
+            self.__poller.modify(sock, uselect.POLLIN | uselect.POLLOUT if pollout else uselect.POLLIN)
+
+    def __drop(self, session):
+        sock = session.get_socket()
+        if self.__sessions.pop(sock, None) is None:
+            return
+        self.__pollout.pop(sock, None)
+        self.__reassembling.pop(session, None)
+        try:
+            self.__poller.unregister(sock)
+        except Exception as e:
+            usys.print_exception(e)
+        try:
+            sock.close()
+        except Exception as e:
+            usys.print_exception(e)
+        session.close()
+        logger.debug("session %s closed" % session.get_context().get_client_id())
+
+    def __flush(self, session):
+        if session.status() == 2:
+            self.__drop(session)
+            return
+        try:
+            self.__set_pollout(session, session.flush())
+        except Exception as e:
+            usys.print_exception(e)
+            self.__drop(session)
+
+    def add_session(self, ip, port, context):
+        """Connect server for a terminal.
+
+        Requests can be sent at once, they are kept until the connection is established.
+
+        Args:
+            ip(str): server ip address.
+            port(int): server port.
+            context(ProtocolContext): protocol config of this terminal.
+
+        Returns:
+            GatewaySession: terminal session, None if failed.
+        """
+        try:
+            sock = usocket.socket(usocket.AF_INET, usocket.SOCK_STREAM)
+            sock.setblocking(False)
+        except Exception as e:
+            usys.print_exception(e)
+            return None
+        try:
+            sock.connect(usocket.getaddrinfo(ip, port)[0][-1])
+        except OSError as e:
+            if e.args[0] not in _EAGAIN:
+                usys.print_exception(e)
+                sock.close()
+                return None
+        session = GatewaySession(self, sock, context, self.__lock, self.__timeout)
+        with self.__lock:
+            self.__sessions[sock] = session
+            self.__pollout[sock] = True
+            self.__poller.register(sock, uselect.POLLIN | uselect.POLLOUT)
+        return session
+
+    def remove_session(self, session):
+        """Close a session, its socket is closed in next loop round."""
+        session.close()
+
+    def sessions(self):
+        return list(self.__sessions.values())
+
+    def schedule(self, session, future, data):
+        """Start response timeout of a request sent by session."""
+        self.__scheduler.schedule(future, (session, data))
+
+    def watch_subpackages(self, session):
+        """Check unfinished subpackages of session at each tick until it has none, called by session."""
+        self.__reassembling[session] = True
+
+    def wakeup(self, session):
+        """Mark session has data to send or is closed, called by session."""
+        with self.__lock:
+            self.__dirty.append(session)
+
+    def run_once(self, timeout=10):
+        """Run one loop round: send queued frames, poll sockets, handle received frames and retransmission timeout.
+
+        Args:
+            timeout(int): max milliseconds to wait for socket events. (default: {10})
+        """
+        with self.__lock:
+            dirty = self.__dirty
+            self.__dirty = []
+        for session in dirty:
+            self.__flush(session)
+
+        for item in self.__poller.poll(timeout if not self.__dirty else 0):
+            session = self.__sessions.get(item[0])
+            if session is None:
+                continue
+            event = item[1]
+            if event & uselect.POLLOUT:
+                session.set_connected()
+                self.__flush(session)
+            if event & uselect.POLLIN:
+                if not session.read():
+                    self.__drop(session)
+            elif event & (uselect.POLLERR | uselect.POLLHUP):
+                self.__drop(session)
+
+        tick = self.__scheduler.get_tick()
+        now = utime.ticks_ms()
+        ticked = False
+        while utime.ticks_diff(now, self.__last_tick) >= tick:
+            self.__last_tick = utime.ticks_add(self.__last_tick, tick)
+            self.__scheduler.advance()
+            ticked = True
+        if ticked and self.__reassembling:
+            for session in list(self.__reassembling.keys()):
+                if not session.expire_subpackages():
+                    self.__reassembling.pop(session)
+
+    def __run(self):
+        while self.__running:
+            try:
+                self.run_once()
+            except Exception as e:
+                usys.print_exception(e)
+        for session in self.sessions():
+            self.__drop(session)
+
+    def start(self):
+        """Run gateway loop in a new thread."""
+        if self.__running:
+            return True
+        self.__running = True
+        _thread.stack_size(self.__stack_size)
+        self.__tid = _thread.start_new_thread(self.__run, ())
+        return True
+
+    def stop(self):
+        """Stop gateway loop thread, all sessions are closed when it exits."""
+        self.__running = False
+        return True
+
+    def stats(self):
+        """Get gateway statistics.
+
+        Returns:
+            dict:
+                sessions(int): session count.
+                connected(int): connected session count.
+                frames_in(int): received frames.
+                frames_out(int): written frames.
+                writes(int): socket sends, frames written in one loop round of a session are sent together.
+                outstanding(int): requests waiting for response timeout.
+                retransmissions(int): total retransmission count.
+                failures(int): requests not get response after all retransmissions.
+        """
+        res = {"sessions": 0, "connected": 0, "frames_in": 0, "frames_out": 0, "writes": 0}
+        for session in self.sessions():
+            res["sessions"] += 1
+            res["connected"] += 1 if session.status() == 0 else 0
+            for key, value in session.stats().items():
+                res[key] += value
+        res.update(self.__scheduler.stats())
+        return res
@@ -0,0 +1,278 @@
+# Copyright (c) Quectel Wireless Solution, Co., Ltd.All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+@file      :jt_media.py
+@author    :Jack Sun (jack.sun@quectel.com)
+@brief     :Streaming multimedia data upload (0x0801), frames are built one fragment at a time
+@version   :1.0.0
+@date      :2026-10-18 20:00:00
+@copyright :Copyright (c) 2022
+"""
+
+import uos
+import ustruct
+import ubinascii
+from usr.jt_frame import XorChecksum, frame_encode
+from usr.jt_message import MAX_BODY_SIZE, T0200
+
+# media id, media type, media encoding, event id, channel id, then location basic info.
+MEDIA_HEAD_FORMAT = ">IBBBB"
+MEDIA_HEAD_SIZE = 8 + T0200.LOC_BASIC_SIZE
+MAX_FRAGMENT_SIZE = MAX_BODY_SIZE
+
+_SUBPACKAGE = 0x2000
+_VERSION = 0x4000
+
+
+class MediaUploadStream(object):
+    """Multimedia data upload (0x0801) frames of a media file or iterator, built one fragment at a time.
+
+    The message body, a media head of 36 bytes and the media data, is split into fragments of `fragment_size` bytes.
+    Each frame is read, check coded and escaped in buffers reused by the next frame, so the media is never held in
+    memory as a whole, nor expanded to a hex string.
+
+    A package can be built again by `frame` with its original serial number, from its offset in the media file or
+    buffer, to answer the retransmission request of multimedia data upload answer (0x8800). Media of an iterator can
+    only be read once.
+
+    RSA encryption is not supported.
+    """
+
+    def __init__(self, context, media_id, media_type, media_encoding, event_id, channel_id, loc_data, media,
+                 media_size=None, fragment_size=MAX_FRAGMENT_SIZE):
+        """
+        Args:
+            context(ProtocolContext): protocol config of the terminal.
+            media_id(int): media id
+            media_type(int): 0 - picture, 1 - audio, 2 - video
+            media_encoding(int): 0 - JPEG, 1 - TIF, 2 - MP3, 3 - WAV, 4 - WMV
+            event_id(int): event item code
+            channel_id(int): channel id
+            loc_data(tuple): (alarm_flag, loc_status, latitude, longitude, altitude, speed, direction, time), as
+                `T0801.set_loc_data`
+            media(str/bytes/file/iterator): media file path, media data, file object opened by "rb", or iterator of
+                bytes chunks.
+            media_size(int): media bytes size, the data or file size if None, required for an iterator. (default: {None})
+            fragment_size(int): body bytes of each subpackage, 37 ~ 1023. (default: {1023})
+
+        Raises:
+            ValueError: fragment_size is out of range, media_size is unknown or RSA encryption is enabled.
+        """
+        if not MEDIA_HEAD_SIZE < fragment_size <= MAX_FRAGMENT_SIZE:
+            raise ValueError("fragment_size must be %s ~ %s." % (MEDIA_HEAD_SIZE + 1, MAX_FRAGMENT_SIZE))
+        if context.get_encryption()[0]:
+            raise ValueError("media upload stream does not support RSA encryption.")
+        self.__path = None
+        self.__file = None
+        self.__buffer = None
+        self.__chunks = None
+        if isinstance(media, str):
+            self.__path = media
+            if media_size is None:
+                media_size = uos.stat(media)[6]
+        elif isinstance(media, (bytes, bytearray, memoryview)):
+            self.__buffer = memoryview(media)
+            if media_size is None:
+                media_size = len(media)
+        elif hasattr(media, "readinto"):
+            self.__file = media
+        else:
+            self.__chunks = iter(media)
+        if media_size is None:
+            raise ValueError("media_size is required for media of an iterator.")
+        self.__context = context
+        self.__media_size = media_size
+        self.__fragment_size = fragment_size
+        body_size = MEDIA_HEAD_SIZE + media_size
+        self.__package_total = (body_size + fragment_size - 1) // fragment_size
+        alarm_flag, loc_status, latitude, longitude, altitude, speed, direction, time = loc_data
+        self.__head = ustruct.pack(
+            MEDIA_HEAD_FORMAT + T0200.LOC_BASIC_FORMAT[1:], media_id, media_type, media_encoding, event_id, channel_id,
+            alarm_flag, loc_status, int(latitude * 10 ** 6), int(longitude * 10 ** 6), int(altitude),
+            int(speed * 10), int(direction), ubinascii.unhexlify(time)
+        )
+        version = context.get_version()
+        self.__client_id = ubinascii.unhexlify(context.get_client_id())
+        self.__header_format = ">HHB10sH" if version else ">HH6sH"
+        self.__properties = _VERSION if version else 0
+        if self.__package_total > 1:
+            self.__header_format += "HH"
+            self.__properties |= _SUBPACKAGE
+        self.__header_size = ustruct.calcsize(self.__header_format)
+        self.__media_id = media_id
+        self.__chunk = None
+        self.__chunk_offset = 0
+        self.__position = 0
+        self.__first_serial_no = None
+        self.__checksum = XorChecksum()
+        self.__data = bytearray(0)
+        self.__frame_buf = bytearray(0)
+
+    def package_total(self):
+        """Get subpackage total, 1 if the body fits one message, which is sent without subpackage."""
+        return self.__package_total
+
+    def media_size(self):
+        """Get media bytes size."""
+        return self.__media_size
+
+    def media_id(self):
+        """Get media id."""
+        return self.__media_id
+
+    def seekable(self):
+        """Check if a package can be built again by `frame`, False for media of an iterator."""
+        return self.__chunks is None
+
+    def reopenable(self):
+        """Check if a package can be built again after the upload returns, True for media of a path or of bytes.
+
+        A file object belongs to the caller, who may close it after the upload, so it is not read again.
+        """
+        return self.__path is not None or self.__buffer is not None
+
+    def fragment(self, package_no):
+        """Get where a package is in the media.
+
+        Args:
+            package_no(int): 1 ~ package_total
+
+        Returns:
+            tuple: (serial_no, offset, size), offset and size of the media data in this package.
+        """
+        body_start = (package_no - 1) * self.__fragment_size
+        body_end = min(body_start + self.__fragment_size, MEDIA_HEAD_SIZE + self.__media_size)
+        offset = max(body_start - MEDIA_HEAD_SIZE, 0)
+        return self.serial_no(package_no), offset, body_end - MEDIA_HEAD_SIZE - offset
+
+    def serial_no(self, package_no):
+        """Get serial number of a package, serial numbers are reserved when `frames` starts.
+
+        Args:
+            package_no(int): 1 ~ package_total
+
+        Returns:
+            int: serial number, None if not reserved yet.
+        """
+        if self.__first_serial_no is None:
+            return None
+        return (self.__first_serial_no + package_no - 1) & 0xFFFF
+
+    def __read_into(self, view, offset):
+        """Fill view with media data from offset, feeding the check code with each read piece."""
+        if self.__buffer is not None:
+            if offset + len(view) > len(self.__buffer):
+                raise ValueError("media data is shorter than media_size %s." % self.__media_size)
+            view[:] = self.__buffer[offset:offset + len(view)]
+            self.__checksum.update(view)
+            return
+        if self.__path is not None and self.__file is None:
+            self.__file = open(self.__path, "rb")
+            self.__position = 0
+        if offset != self.__position:
+            if self.__chunks is not None:
+                raise ValueError("media of an iterator can not be read again.")
+            self.__file.seek(offset)
+        self.__position = offset + len(view)
+        pos = 0
+        while pos < len(view):
+            if self.__file is not None:
+                size = self.__file.readinto(view[pos:])
+                if not size:
+                    raise ValueError("media data is shorter than media_size %s." % self.__media_size)
+                self.__checksum.update(view[pos:pos + size])
+                pos += size
+                continue
+            if self.__chunk is None or self.__chunk_offset >= len(self.__chunk):
+                try:
+                    self.__chunk = memoryview(next(self.__chunks))
+                except StopIteration:
+                    raise ValueError("media data is shorter than media_size %s." % self.__media_size)
+                self.__chunk_offset = 0
+            size = min(len(view) - pos, len(self.__chunk) - self.__chunk_offset)
+            view[pos:pos + size] = self.__chunk[self.__chunk_offset:self.__chunk_offset + size]
+            self.__checksum.update(view[pos:pos + size])
+            self.__chunk_offset += size
+            pos += size
+
+    def frame(self, package_no):
+        """Build the frame of one package, with the serial number reserved by `frames`.
+
+        Args:
+            package_no(int): 1 ~ package_total
+
+        Returns:
+            memoryview: frame of a reused buffer, valid until the next frame is built.
+
+        Raises:
+            ValueError: package_no is out of range, serial numbers are not reserved, media data is shorter than
+                media_size or media of an iterator is read again.
+        """
+        if not 1 <= package_no <= self.__package_total or self.__first_serial_no is None:
+            raise ValueError("package %s of media %s can not be built." % (package_no, self.__media_id))
+        serial_no, offset, media_size = self.fragment(package_no)
+        body_size = media_size + (MEDIA_HEAD_SIZE if package_no == 1 else 0)
+        size = self.__header_size + body_size + 1
+        if len(self.__data) != size:
+            # Every fragment but the last has the same size, so the buffer is allocated at most twice.
+            self.__data = bytearray(size)
+        if not self.__frame_buf:
+            self.__frame_buf = bytearray(2 * (self.__header_size + self.__fragment_size + 1) + 2)
+        data = self.__data
+        view = memoryview(data)
+        properties = self.__properties | body_size
+        if self.__context.get_version():
+            values = (0x0801, properties, self.__context.get_protocol_version(), self.__client_id, serial_no)
+        else:
+            values = (0x0801, properties, self.__client_id, serial_no)
+        if self.__package_total > 1:
+            values += (self.__package_total, package_no)
+        ustruct.pack_into(self.__header_format, data, 0, *values)
+        self.__checksum.reset()
+        self.__checksum.update(view[:self.__header_size])
+        start = self.__header_size
+        if package_no == 1:
+            data[start:start + MEDIA_HEAD_SIZE] = self.__head
+            self.__checksum.update(self.__head)
+            start += MEDIA_HEAD_SIZE
+        self.__read_into(view[start:size - 1], offset)
+        data[size - 1] = self.__checksum.digest()
+        return frame_encode(data, self.__frame_buf)
+
+    def frames(self):
+        """Generator of frames, serial numbers of all packages are reserved at the start.
+
+        A frame is valid until the next one is built, copy it to keep it longer.
+
+        Yields:
+            tuple: (serial_no, package_no, frame), frame is memoryview of a reused buffer.
+
+        Raises:
+            ValueError: media data is shorter than media_size.
+        """
+        self.__first_serial_no = self.__context.get_serial_no_obj().reserve(self.__package_total)
+        try:
+            for package_no in range(1, self.__package_total + 1):
+                yield self.serial_no(package_no), package_no, self.frame(package_no)
+        finally:
+            self.close()
+
+    def close(self):
+        """Close media file opened by path and free frame buffers, `frame` opens and allocates them again."""
+        if self.__path is not None and self.__file is not None:
+            self.__file.close()
+            self.__file = None
+        self.__data = bytearray(0)
+        self.__frame_buf = bytearray(0)
@@ -27,6 +27,9 @@ import ustruct
 import ubinascii
 from usr.logging import getLogger
 from usr.common import str_fill, SerialNo
+from usr.jt_frame import FRAME_FLAG, XorChecksum, frame_encode, frame_decode
+from usr.jt_schema import BODY_SCHEMA
+from usr.jt_bulk import decode_t0704_body
 
 logger = getLogger(__name__)
 
@@ -36,6 +39,9 @@ JTT808_VERSION = {
     "2019": 1,
 }
 
+# Body length of message properties is 10 bits, a longer body is sent by subpackages.
+MAX_BODY_SIZE = 1023
+
 _BPS_CODE = {
     4800: 0x00,
     9600: 0x01,
@@ -72,13 +78,6 @@ _FREQUENCY_CODE = {
 
 _serial_no_obj = SerialNo()
 
-_jtt808_version = "2019"
-_protocol_version = 1  # [2019]Protocol version
-_version = True  # Message Body Properties - Version Flag
-_client_id = ""  # Terminal Phone
-_server_public_rsa_e = ""
-_server_public_rsa_n = ""
-
 _TERMINAL_PARAMS = {
     "STRING": [
         0x0010, 0x0011, 0x0012, 0x0013, 0x0014, 0x0015, 0x0016, 0x0017, 0x001A,
@@ -116,8 +115,98 @@ _RESERVATION_TERMINAL_PARAM_ID = list(range(0x0008, 0x0010)) + \
     list(range(0xF000, 0x10000))
 
 
+class ProtocolContext(object):
+    """Protocol config of one terminal, used by the messages of this terminal.
+
+    It holds jtt808 version, client id, serial number source and server rsa public key. Each `JTT808` instance
+    owns one, so terminals of different versions and client ids can work in one process.
+    """
+
+    def __init__(self, jtt808_version="2019", client_id="", serial_no_obj=None):
+        """
+        Args:
+            jtt808_version(str): 2011, 2013 or 2019. (default: {"2019"})
+            client_id(str): device sim phone number, empty if the context is only used to parse messages. (default: {""})
+            serial_no_obj(SerialNo): serial number source, a new one if None. (default: {None})
+
+        Raises:
+            ValueError: jtt808_version is not supported.
+        """
+        if JTT808_VERSION.get(jtt808_version) is None:
+            raise ValueError("JT808 version only in 2011, 2013, 2019. not %s" % jtt808_version)
+        self.__jtt808_version = jtt808_version
+        # [2019]Protocol version, empty string before 2019 because header has no version field.
+        self.__protocol_version = JTT808_VERSION[jtt808_version] if JTT808_VERSION[jtt808_version] > 0 else ""
+        # Message Body Properties - Version Flag
+        self.__version = self.__protocol_version != ""
+        self.__client_id = str_fill(client_id, target_len=20 if self.__version else 12)
+        self.__serial_no_obj = serial_no_obj if serial_no_obj is not None else SerialNo()
+        self.__encryption = False
+        self.__rsa_e = None
+        self.__rsa_n = None
+        self.__max_body_size = MAX_BODY_SIZE
+
+    def get_jtt808_version(self):
+        return self.__jtt808_version
+
+    def get_protocol_version(self):
+        return self.__protocol_version
+
+    def get_version(self):
+        return self.__version
+
+    def get_client_id(self):
+        return self.__client_id
+
+    def get_serial_no_obj(self):
+        return self.__serial_no_obj
+
+    def get_serial_no(self):
+        return self.__serial_no_obj.get_serial_no()
+
+    def set_encryption(self, encryption=False, rsa_e=None, rsa_n=None):
+        """Set server rsa public key for message body encryption.
+
+        Args:
+            encryption(bool): True - encryption, False - not encryption (default: {False})
+            rsa_e(int): Server rsa public key e (default: {None})
+            rsa_n(str): Server rsa public key n (default: {None})
+        """
+        self.__encryption = encryption
+        self.__rsa_e = rsa_e
+        self.__rsa_n = rsa_n
+
+    def get_encryption(self):
+        """
+        Returns:
+            tuple: (encryption, rsa_e, rsa_n)
+        """
+        return self.__encryption, self.__rsa_e, self.__rsa_n
+
+    def set_max_body_size(self, size=MAX_BODY_SIZE):
+        """Set max body bytes of one message, a longer uplink body is sent by subpackages.
+
+        Args:
+            size(int): 1 ~ 1023 (default: {1023})
+
+        Raises:
+            ValueError: size is out of range.
+        """
+        if not 0 < size <= MAX_BODY_SIZE:
+            raise ValueError("max body size must be 1 ~ %s, not %s." % (MAX_BODY_SIZE, size))
+        self.__max_body_size = size
+
+    def get_max_body_size(self):
+        return self.__max_body_size
+
+
+# Context of the messages created without context, set by `set_jtmsg_config`.
+_context = ProtocolContext(serial_no_obj=_serial_no_obj)
+
+
 def set_jtmsg_config(jtt808_version="2019", client_id=""):
-    """Set JTT808 message global config
+    """Set JTT808 message global config, it is used by the messages created without `ProtocolContext`.
+
     Args:
         jtt808_version(str): (default: {"2019"})
         client_id(str): (default: {""})
@@ -125,35 +214,20 @@ def set_jtmsg_config(jtt808_version="2019", client_id=""):
     Raises:
         ValueError: [description]
     """
-    global _jtt808_version
-    global _protocol_version
-    global _client_id
-    global _version
-
-    _jtt808_version = jtt808_version
-
-    if JTT808_VERSION.get(jtt808_version) is None:
-        raise ValueError("JT808 version only in 2011, 2013, 2019. not %s" % jtt808_version)
-    _protocol_version = JTT808_VERSION.get(jtt808_version) if JTT808_VERSION.get(jtt808_version) > 0 else ""
-
-    _version = True if _protocol_version != "" and _protocol_version > 0 else False
+    global _context
 
     if not client_id:
         raise ValueError("client_id is not exists.")
-    client_id_len = 20 if _protocol_version and _protocol_version > 0 else 12
-    _client_id = str_fill(client_id, target_len=client_id_len)
+    _context = ProtocolContext(jtt808_version, client_id, _serial_no_obj)
 
 
 def get_jtmsg_config():
     """Get JTT808 message global config
 
     Returns:
-        tuple: (_jtt808_version, _client_id)
+        tuple: (jtt808_version, client_id)
     """
-    global _jtt808_version
-    global _client_id
-
-    return _jtt808_version, _client_id
+    return _context.get_jtt808_version(), _context.get_client_id()
 
 
 class ResultCode(object):
@@ -1075,10 +1149,73 @@ class LocAlarmWarningConfig(object):
 
 
 class LocAdditionalInfoConfig(object):
-    """Location additional info config"""
+    """Location additional info config
 
-    def __init__(self):
+    Items are kept as hex strings in `additional_info`, `to_bytes` keeps TLV bytes of each item and encodes
+    again only the changed items. Inbound TLV bytes given by `load` are parsed when they are first read.
+    """
+
+    def __init__(self, data=None):
         self.additional_info = dict()
+        self.__tlvs = {}
+        self.__data = b""
+        self.__hex = ""
+        self.__raw = None
+        if data is not None:
+            self.load(data)
+
+    def __info(self):
+        raw = self.__raw
+        if raw is not None:
+            self.__raw = None
+            info = {}
+            pos = 0
+            size = len(raw)
+            while pos < size:
+                end = pos + 2 + raw[pos + 1] if pos + 1 < size else size + 1
+                if end > size:
+                    raise ValueError("additional info %s length is out of data." % raw[pos])
+                info[raw[pos]] = ubinascii.hexlify(raw[pos + 2:end]).decode()
+                self.__tlvs[raw[pos]] = (info[raw[pos]], bytes(raw[pos:end]))
+                pos = end
+            # Items set after `load` take the place of loaded ones.
+            info.update(self.additional_info)
+            self.additional_info = info
+        return self.additional_info
+
+    def load(self, data):
+        """Load inbound additional info TLV bytes, e.g. the tail of a location report (0x0200) body.
+
+        Items are parsed when first read by getters, `get_item` reads one item without parsing the others.
+
+        Args:
+            data(bytes/bytearray/memoryview): additional info TLV bytes.
+        """
+        self.additional_info = dict()
+        self.__tlvs = {}
+        self.__data = None
+        self.__raw = bytes(data)
+
+    def get_item(self, _id):
+        """Get value bytes of one additional info item.
+
+        Args:
+            _id(int): additional info id.
+
+        Returns:
+            bytes: item value, None if not exists.
+        """
+        raw = self.__raw
+        if raw is not None and _id not in self.additional_info:
+            pos = 0
+            while pos + 1 < len(raw):
+                end = pos + 2 + raw[pos + 1]
+                if raw[pos] == _id:
+                    return raw[pos + 2:end]
+                pos = end
+            return None
+        val = self.additional_info.get(_id)
+        return ubinascii.unhexlify(val) if val is not None else None
 
     def set_mileage(self, value):
         """Odometer reading
@@ -1099,8 +1236,8 @@ class LocAdditionalInfoConfig(object):
         Returns:
             float: mileage, no value return -1
         """
-        if self.additional_info.get(0x01) is not None:
-            return int(self.additional_info[0x01], 16) / 10
+        if self.__info().get(0x01) is not None:
+            return int(self.__info()[0x01], 16) / 10
         return -1
 
     def set_oil_quantity(self, value):
@@ -1122,8 +1259,8 @@ class LocAdditionalInfoConfig(object):
         Returns:
             float: mileage, no value return -1
         """
-        if self.additional_info.get(0x02) is not None:
-            return int(self.additional_info[0x02], 16)
+        if self.__info().get(0x02) is not None:
+            return int(self.__info()[0x02], 16)
         return -1
 
     def set_speed(self, value):
@@ -1145,8 +1282,8 @@ class LocAdditionalInfoConfig(object):
         Returns:
             float: mileage, no value return -1
         """
-        if self.additional_info.get(0x03) is not None:
-            return int(self.additional_info[0x03], 16)
+        if self.__info().get(0x03) is not None:
+            return int(self.__info()[0x03], 16)
         return -1
 
     def set_manually_confirm_the_alarm_event_id(self, value):
@@ -1168,8 +1305,8 @@ class LocAdditionalInfoConfig(object):
         Returns:
             int: no value return -1
         """
-        if self.additional_info.get(0x04) is not None:
-            return int(self.additional_info[0x04], 16)
+        if self.__info().get(0x04) is not None:
+            return int(self.__info()[0x04], 16)
         return -1
 
     def set_tire_pressure(self, values):
@@ -1193,8 +1330,8 @@ class LocAdditionalInfoConfig(object):
             list: tire pressure list.
         """
         data = []
-        if self.additional_info.get(0x05) is not None:
-            tire_pressure = self.additional_info[0x05]
+        if self.__info().get(0x05) is not None:
+            tire_pressure = self.__info()[0x05]
             data = [int(tire_pressure[i * 2:(i + 1) * 2], 16) for i in range(int(len(tire_pressure) / 2)) if tire_pressure[i * 2:(i + 1) * 2].lower() != "ff"]
         return data
 
@@ -1207,7 +1344,7 @@ class LocAdditionalInfoConfig(object):
             value(int): temperature
         """
         try:
-            self.additional_info[0x06] = str_fill(bin(int(bin(value & 0xFFFF), 2))[2:], target_len=4)
+            self.additional_info[0x06] = str_fill(hex(value & 0xFFFF)[2:], target_len=4)
             return True
         except Exception as e:
             sys.print_exception(e)
@@ -1219,8 +1356,8 @@ class LocAdditionalInfoConfig(object):
         Returns:
             int: temperature
         """
-        if self.additional_info.get(0x06) is not None:
-            temp = int(self.additional_info[0x06], 16)
+        if self.__info().get(0x06) is not None:
+            temp = int(self.__info()[0x06], 16)
             if temp > 0x8000:
                 return temp - (2 ** len(bin(temp)[2:]))
             else:
@@ -1259,11 +1396,11 @@ class LocAdditionalInfoConfig(object):
                 area_segment_id(int/None)
         """
         data = {}
-        if self.additional_info.get(0x11) is not None:
-            loc_type = int(self.additional_info.get(0x11)[:2], 16)
+        if self.__info().get(0x11) is not None:
+            loc_type = int(self.__info().get(0x11)[:2], 16)
             area_segment_id = None
             if loc_type != 0:
-                area_segment_id = int(self.additional_info.get(0x11)[2:], 16)
+                area_segment_id = int(self.__info().get(0x11)[2:], 16)
             data = {"loc_type": loc_type, "area_segment_id": area_segment_id}
         return data
 
@@ -1300,8 +1437,8 @@ class LocAdditionalInfoConfig(object):
                 direction(int)
         """
         data = {}
-        if self.additional_info.get(0x12) is not None:
-            alarm_info = self.additional_info[0x12]
+        if self.__info().get(0x12) is not None:
+            alarm_info = self.__info()[0x12]
             data["loc_type"] = int(alarm_info[:2], 16)
             data["area_segment_id"] = int(alarm_info[2:10], 16)
             data["direction"] = int(alarm_info[10:], 16)
@@ -1336,8 +1473,8 @@ class LocAdditionalInfoConfig(object):
                 result(int)
         """
         data = {}
-        if self.additional_info.get(0x13) is not None:
-            alarm_info = self.additional_info[0x13]
+        if self.__info().get(0x13) is not None:
+            alarm_info = self.__info()[0x13]
             data["road_id"] = int(alarm_info[:8], 16)
             data["travel_time"] = int(alarm_info[8:12], 16)
             data["result"] = int(alarm_info[12:], 16)
@@ -1402,8 +1539,8 @@ class LocAdditionalInfoConfig(object):
                 clutch(int)
         """
         data = {}
-        if self.additional_info.get(0x25) is not None:
-            vehicle_signal_status = str_fill(bin(int(self.additional_info[0x25], 16))[2:], target_len=15)
+        if self.__info().get(0x25) is not None:
+            vehicle_signal_status = str_fill(bin(int(self.__info()[0x25], 16))[2:], target_len=15)
             vehicle_signal_status = list(vehicle_signal_status)
             vehicle_signal_status.reverse()
             vehicle_signal_status = list(map(int, vehicle_signal_status))
@@ -1450,8 +1587,8 @@ class LocAdditionalInfoConfig(object):
                 sleep(int)
         """
         data = {}
-        if self.additional_info.get(0x2A) is not None:
-            io_status = str_fill(bin(int(self.additional_info[0x2A], 16))[2:], target_len=2)
+        if self.__info().get(0x2A) is not None:
+            io_status = str_fill(bin(int(self.__info()[0x2A], 16))[2:], target_len=2)
             data = {
                 "deep_sleep": int(io_status[-1]),
                 "sleep": int(io_status[-2]),
@@ -1483,9 +1620,9 @@ class LocAdditionalInfoConfig(object):
                 ad1(int)
         """
         data = {}
-        if self.additional_info.get(0x2B) is not None:
-            data["ad0"] = int(self.additional_info[0x2B][:2], 16)
-            data["ad1"] = int(self.additional_info[0x2B][2:], 16)
+        if self.__info().get(0x2B) is not None:
+            data["ad0"] = int(self.__info()[0x2B][:2], 16)
+            data["ad1"] = int(self.__info()[0x2B][2:], 16)
         return data
 
     def set_wireless_communication_network_signal_strength(self, value):
@@ -1507,8 +1644,8 @@ class LocAdditionalInfoConfig(object):
         Returns:
             int: strength
         """
-        if self.additional_info.get(0x30) is not None:
-            return int(self.additional_info[0x30], 16)
+        if self.__info().get(0x30) is not None:
+            return int(self.__info()[0x30], 16)
         return -1
 
     def set_number_of_satellites(self, value):
@@ -1525,106 +1662,148 @@ class LocAdditionalInfoConfig(object):
         Returns:
             int: number of satellites
         """
-        if self.additional_info.get(0x31) is not None:
-            return int(self.additional_info[0x31], 16)
+        if self.__info().get(0x31) is not None:
+            return int(self.__info()[0x31], 16)
         return -1
 
+    def to_bytes(self):
+        """Get TLV bytes of all set over additional infos, to be spliced into location report (0x0200) body.
+
+        Returns:
+            bytes: additional infos, the same object is returned while no item is changed.
+        """
+        info = self.__info()
+        tlvs = self.__tlvs
+        changed = self.__data is None
+        if len(tlvs) != len(info):
+            for _id in [_id for _id in tlvs if _id not in info]:
+                tlvs.pop(_id)
+            changed = True
+        for _id, _val in info.items():
+            tlv = tlvs.get(_id)
+            if tlv is None or tlv[0] != _val:
+                data = ubinascii.unhexlify(_val)
+                tlvs[_id] = (_val, bytes((_id, len(data))) + data)
+                changed = True
+        if changed:
+            self.__data = b"".join([tlvs[_id][1] for _id in info])
+            self.__hex = None
+        return self.__data
+
     def value(self):
         """Format all set over additional infos
 
         Returns:
             string: additional infos
         """
-        loc_additional_info = ""
-        for _id_ in self.additional_info.keys():
-            _id = str_fill(hex(_id_)[2:], target_len=2)
-            _val = self.additional_info[_id_]
-            _len = str_fill(hex(int(len(_val) / 2))[2:], target_len=2)
-            loc_additional_info += "{}{}{}".format(_id, _len, _val)
-        return loc_additional_info
+        data = self.to_bytes()
+        if self.__hex is None:
+            self.__hex = ubinascii.hexlify(data).decode()
+        return self.__hex
 
 
 class JTMessage(object):
+    """Message base class.
+
+    An object can be reused for the next message of the same id, call `reset` before setting new params.
+    Subpackage tables are only allocated for subpackaged messages.
+    """
+    __slots__ = (
+        "__jtt808_version", "__protocol_version", "__client_id", "__version", "__encryption",
+        "__server_pub_rsa_e", "__server_pub_rsa_n", "__properties", "__message_id", "__serial_no",
+        "__serial_no_obj", "__package_total", "__package_no", "__body", "__check_code", "__bodys",
+        "__body_data", "__context", "__frame_data",
+    )
+
     __body_length_ = 0b0000001111111111
     __encryption_ = 0b0001110000000000
     __subpackage_ = 0b0010000000000000
     __version_ = 0b0100000000000000
     __reserved_ = 0b1000000000000000
 
-    def __init__(self):
-        global _jtt808_version
-        global _protocol_version
-        global _client_id
-        global _version
-
-        self.__jtt808_version = _jtt808_version
-        self.__protocol_version = _protocol_version
-        self.__client_id = _client_id
-        self.__version = _version
+    def __init__(self, context=None):
+        """
+        Args:
+            context(ProtocolContext): protocol config of the terminal, the global config if None. (default: {None})
+        """
+        if context is None:
+            context = _context
+        self.__context = context
+        self.__jtt808_version = context.get_jtt808_version()
+        self.__protocol_version = context.get_protocol_version()
+        self.__client_id = context.get_client_id()
+        self.__version = context.get_version()
+        self.__serial_no_obj = context.get_serial_no_obj()
+        self.__message_id = 0x0000
+        self.__body_data = {}
+        # Header, body and check code of the last built frame, reused while the frame size is not changed.
+        self.__frame_data = bytearray(0)
+        JTMessage.reset(self)
+
+    def reset(self):
+        """Clear message state, so the object can be used for a new message.
+
+        Protocol config, serial number allocator and message id are kept.
+        """
         self.__encryption = False
         self.__server_pub_rsa_e = None
         self.__server_pub_rsa_n = None
-
-        self.__properties = 0b0000000000000000
-        if self.__version:
-            self.__properties |= self.__version_
-        else:
-            self.__properties ^= (self.__properties & self.__version_)
-
-        self.__properties = self.__properties ^ (self.__properties & self.__encryption_) | (self.__encryption << 10)
-
-        self.__message_id = 0x0000
+        self.__properties = self.__version_ if self.__version else 0b0000000000000000
         self.__serial_no = 0
-        self.__serial_no_obj = _serial_no_obj
         self.__package_total = 0
         self.__package_no = 0
-
-        self.__header = None
         self.__body = ""
         self.__check_code = ""
+        self.__bodys = None
+        if self.__body_data:
+            self.__body_data = {}
 
-        self.__headers = {}
-        self.__bodys = {}
-        self.__check_codes = {}
-
-        self.__message = ""
-        self.__body_data = {}
+    def __frame(self, body, serial_no, package_no=0, buf=None):
+        """Pack header, body and check code on bytes, then escape them into a frame.
 
-    def __splice_header(self, **kwargs):
-        return (int(kwargs["serial_no"], 16), "{message_id}{properties}{version}{client_id}{serial_no}{package_total}{package_no}".format(**kwargs))
+        Args:
+            body(bytes/memoryview): message body.
+            serial_no(int): serial number
+            package_no(int): package number, 0 - not subpackage. (default: {0})
+            buf(bytearray): reusable frame buffer, see `frame_encode`. (default: {None})
 
-    def __init_check_code(self, header, body):
-        message = "{header}{body}".format(header=header, body=body)
-        data = [int(message[i * 2:i * 2 + 2], 16) for i in range(int(len(message) / 2))]
-        check_code = data[0] ^ data[1]
-        for i in range(2, len(data)):
-            check_code = check_code ^ data[i]
-        return hex(check_code)[2:]
+        Returns:
+            bytearray/memoryview: full frame.
+        """
+        header_size = self.__pack_header(len(body), serial_no, package_no)
+        self.__frame_data[header_size:header_size + len(body)] = body
+        return self.__seal(buf)
 
-    def __message_to_hex(self, header, body, check_code):
-        kwargs = {
-            "header": header,
-            "body": body,
-            "check_code": check_code,
-        }
-        message = "{header}{body}{check_code}".format(**kwargs).lower()
-        logger.debug("[__message_to_hex] message: %s" % message)
-        msgs = []
-        for i in range(int(len(message) / 2)):
-            code = message[i * 2:i * 2 + 2]
-            if code == "7d":
-                msgs.extend([int("7d", 16), int("01", 16)])
-            elif code == "7e":
-                msgs.extend([int("7d", 16), int("02", 16)])
-            else:
-                msgs.append(int(code, 16))
-        msgs.insert(0, int("7e", 16))
-        msgs.append(int("7e", 16))
-        logger.debug("[__message_to_hex] msgs: %s" % msgs)
-        msg = ustruct.pack("%sB" % len(msgs), *msgs)
-        logger.debug("[__message_to_hex] msg: %s" % msg)
+    def __pack_header(self, body_size, serial_no, package_no=0):
+        """Pack header into the kept frame data, which is sized for header, body and check code.
 
-        return msg
+        Returns:
+            int: header size, the body is written from it.
+        """
+        self.set_body_len(body_size)
+        client_id = ubinascii.unhexlify(self.__client_id)
+        if self.__version:
+            header_format = ">HHB10sH"
+            values = (self.__message_id, self.__properties, self.__protocol_version, client_id, serial_no)
+        else:
+            header_format = ">HH6sH"
+            values = (self.__message_id, self.__properties, client_id, serial_no)
+        if package_no:
+            header_format += "HH"
+            values += (self.__package_total, package_no)
+        header_size = ustruct.calcsize(header_format)
+        size = header_size + body_size + 1
+        if len(self.__frame_data) != size:
+            self.__frame_data = bytearray(size)
+        ustruct.pack_into(header_format, self.__frame_data, 0, *values)
+        return header_size
+
+    def __seal(self, buf=None):
+        """Write check code of the kept frame data, then escape it into a frame."""
+        data = self.__frame_data
+        size = len(data)
+        data[size - 1] = XorChecksum(memoryview(data)[:size - 1]).digest()
+        return frame_encode(data, buf)
 
     def get_body_len(self):
         return self.__properties & self.__body_length_
@@ -1668,62 +1847,31 @@ class JTMessage(object):
         """
         self.__serial_no = serial_no
 
-    def header_to_hex(self):
-        kwargs = {
-            "message_id": str_fill(hex(self.__message_id)[2:], target_len=4),
-            "version": str_fill(hex(self.__protocol_version)[2:], target_len=2) if self.__protocol_version else self.__protocol_version,
-            "client_id": self.__client_id,
-            "package_total": "",
-            "package_no": "",
-        }
-        logger.debug("header_to_hex: %s" % str(kwargs))
-        if self.is_subpackage() and self.__bodys:
-            # Init properties
-            for package_no in self.__bodys.keys():
-                body_len = int(len(self.__bodys[package_no]) / 2)
-                self.set_body_len(body_len)
-                kwargs.update({
-                    "serial_no": str_fill(hex(self.__serial_no_obj.get_serial_no())[2:], target_len=4),
-                    "properties": str_fill(hex(self.__properties)[2:], target_len=4),
-                    "package_total": str_fill(hex(self.__package_total)[2:], target_len=4),
-                    "package_no": str_fill(hex(package_no)[2:], target_len=4),
-                })
-                self.__headers[package_no] = self.__splice_header(**kwargs)
-        else:
-            self.set_body_len(int(len(self.__body) / 2))
-            kwargs.update({
-                "properties": str_fill(hex(self.__properties)[2:], target_len=4),
-                "serial_no": str_fill(hex(self.__serial_no_obj.get_serial_no())[2:], target_len=4),
-            })
-            self.__header = self.__splice_header(**kwargs)
-
-    def init_check_code(self):
-        if self.is_subpackage() and self.__bodys:
-            for package_no in self.__bodys.keys():
-                header = self.__headers[package_no][1]
-                body = self.__bodys[package_no]
-                self.__check_codes[package_no] = self.__init_check_code(header, body)
-        else:
-            self.__check_code = self.__init_check_code(self.__header[1], self.__body)
+    def message(self, buf=None):
+        """Build frames of this message, serial numbers of subpackages are reserved in one block.
 
-    def message(self):
+        Args:
+            buf(bytearray): reusable frame buffer of a message without subpackage, the frame is a memoryview of it
+                and valid until `buf` is used again. A new frame is allocated if None. (default: {None})
+
+        Returns:
+            list: item is (serial_no, frame)
+        """
         # Init body
         self.body_to_hex()
         # encrypt body
         self.rsa_encryption()
         # subcontract body
         self.body_subcontract()
-        # Init header
-        self.header_to_hex()
-        # Init check code
-        self.init_check_code()
-
         if self.is_subpackage() and self.__bodys:
-            msgs = [(self.__headers[package_no][0], self.__message_to_hex(self.__headers[package_no][1], self.__bodys[package_no], self.__check_codes[package_no])) for package_no in self.__bodys.keys()]
+            first_serial_no = self.__serial_no_obj.reserve(len(self.__bodys))
+            msgs = []
+            for index, body in enumerate(self.__bodys):
+                serial_no = (first_serial_no + index) & 0xFFFF
+                msgs.append((serial_no, self.__frame(body, serial_no, index + 1)))
             return msgs
-        else:
-            msg = self.__message_to_hex(self.__header[1], self.__body, self.__check_code)
-            return [(self.__header[0], msg)]
+        serial_no = self.__serial_no_obj.get_serial_no()
+        return [(serial_no, self.__frame(ubinascii.unhexlify(self.__body), serial_no, 0, buf))]
 
     def set_body(self, body):
         self.__body = body
@@ -1746,17 +1894,32 @@ class JTMessage(object):
         return self.__body_data
 
     def body_subcontract(self):
+        """Split body into subpackages numbered from 1, each one is not longer than max body size of the context.
+
+        A body longer than max body size is subpackaged without `set_subpackage`, which can ask for more packages.
+        Subpackage bodies are memoryview slices of the body bytes, not copies.
+
+        Raises:
+            ValueError: package total of `set_subpackage` is not greater than 0.
+        """
+        self.__bodys = None
+        max_body_size = self.__context.get_max_body_size()
+        body_size = len(self.__body) // 2
         if self.is_subpackage():
             if self.__package_total <= 0:
                 raise ValueError("Packge total num must greater than 0.")
-            subpkg_len = int(int(len(self.__body) / 2) / self.__package_total)
-            for i in range(1, self.__package_total + 2):
-                start_num = i * subpkg_len * 2
-                end_num = (i + 1) * subpkg_len * 2
-                if self.__body[start_num:end_num]:
-                    self.__bodys[i] = self.__body[start_num:end_num]
-        logger.debug("is_subpackage: %s" % self.is_subpackage())
-        logger.debug("__bodys: %s" % self.__bodys)
+            fragment_size = min((body_size + self.__package_total - 1) // self.__package_total, max_body_size)
+        elif body_size > max_body_size:
+            fragment_size = max_body_size
+        else:
+            logger.debug("is_subpackage: False")
+            return
+        fragment_size = max(fragment_size, 1)
+        package_total = max((body_size + fragment_size - 1) // fragment_size, 1)
+        self.set_subpackage(True, package_total)
+        body = memoryview(ubinascii.unhexlify(self.__body))
+        self.__bodys = [body[offset:offset + fragment_size] for offset in range(0, package_total * fragment_size, fragment_size)]
+        logger.debug("is_subpackage: True, package_total: %s, fragment_size: %s" % (package_total, fragment_size))
 
     def body_to_hex(self):
         pass
@@ -1764,6 +1927,22 @@ class JTMessage(object):
     def body_from_hex(self):
         pass
 
+    def schema_to_hex(self, values):
+        """Encode body by `BODY_SCHEMA` of this message id.
+
+        Args:
+            values(dict): body field values.
+        """
+        self.__body = ubinascii.hexlify(BODY_SCHEMA[self.__message_id].encode(values, self)).decode()
+
+    def schema_from_hex(self):
+        """Decode body by `BODY_SCHEMA` of this message id.
+
+        Returns:
+            dict: body field values.
+        """
+        return BODY_SCHEMA[self.__message_id].decode(ubinascii.unhexlify(self.__body), self)
+
     def rsa_encryption(self):
         if self.get_encryption():
             logger.debug("body before rsa_encryption:\n%s" % self.__body)
@@ -1788,86 +1967,58 @@ class JTMessage(object):
 
 
 class JTMessageParse(JTMessage):
-    """This class use to get server hex message header."""
+    """This class use to get server hex message header.
 
-    def __init__(self):
-        super().__init__()
-
-    def __escape_message(self):
-        msgs = []
-        jump = 0
-        for i in range(int(len(self.__message) / 2)):
-            code = self.__message[i * 2:i * 2 + 2]
-            if code == "7d":
-                jump = 1
-                next_code = self.__message[(i + 1) * 2:(i + 1) * 2 + 2]
-                if next_code == "01":
-                    msgs.append(code)
-                elif next_code == "02":
-                    msgs.append("7e")
-                else:
-                    raise TypeError("Escape message failed. Only 01 or 02 after 7d, not %s" % next_code)
-            else:
-                if jump == 1:
-                    jump = 0
-                else:
-                    msgs.append(code)
-        self.__message = "".join(msgs)
-
-    def __parse_check_code(self):
-        self.__check_code = int(self.__message[-2:], 16)
+    One instance can be reused for every received frame, the unescape buffer is kept and grown as needed.
+    """
 
-    def __check_code_check(self):
-        msgs = [int(self.__message[i * 2:i * 2 + 2], 16) for i in range(int(len(self.__message[:-2]) / 2))]
-        check_code = msgs[0] ^ msgs[1]
-        for i in range(2, len(msgs)):
-            check_code ^= msgs[i]
-        if check_code != self.__check_code:
-            raise TypeError("check code is not compare. message check_code[%s], calculate check_code[%s]" % (self.__check_code, check_code))
+    def __init__(self, context=None):
+        super().__init__(context)
+        self.__default_protocol_version = self.__protocol_version
+        self.__frame_buf = bytearray(256)
 
-    def __parse_header(self):
-        self.__message_id = int(self.__message[:4], 16)
-        self.__properties = int(self.__message[4:8], 16)
-        if self.is_version():
-            self.__protocol_version = int(self.__message[8:10], 16)
-            self.__client_id = self.__message[10:30]
-            self.__serial_no = int(self.__message[30:34], 16)
-            if self.is_subpackage():
-                self.__package_total = int(self.__message[34:38], 16)
-                self.__package_no = int(self.__message[38:42], 16)
-        else:
-            self.__client_id = self.__message[8:20]
-            self.__serial_no = int(self.__message[20:24], 16)
-            if self.is_subpackage():
-                self.__package_total = int(self.__message[24:28], 16)
-                self.__package_no = int(self.__message[28:32], 16)
-
-    def __parse_body(self):
+    def __parse_header(self, buf):
+        self.__message_id, self.__properties = ustruct.unpack_from(">HH", buf, 0)
+        self.__package_total = 0
+        self.__package_no = 0
         if self.is_version():
-            if self.is_subpackage():
-                self.__body = self.__message[42:-2]
-            else:
-                self.__body = self.__message[34:-2]
+            self.__protocol_version, client_id, self.__serial_no = ustruct.unpack_from(">B10sH", buf, 4)
+            offset = 17
         else:
-            if self.is_subpackage():
-                self.__body = self.__message[32:-2]
-            else:
-                self.__body = self.__message[24:-2]
+            self.__protocol_version = self.__default_protocol_version
+            client_id, self.__serial_no = ustruct.unpack_from(">6sH", buf, 4)
+            offset = 12
+        self.__client_id = ubinascii.hexlify(client_id).decode()
+        if self.is_subpackage():
+            self.__package_total, self.__package_no = ustruct.unpack_from(">HH", buf, offset)
+            offset += 4
+        return offset
 
     def set_message(self, message):
-        msg = "".join(str_fill(hex(i)[2:], target_len=2) for i in list(bytearray(message)))
-        logger.debug("set_message msg: %s" % msg)
-        if msg.startswith("7e") and msg.endswith("7e"):
-            self.__message = msg[2:-2]
-            logger.debug("self.__message: %s" % self.__message)
-            self.__escape_message()
-            self.__parse_check_code()
-            self.__check_code_check()
-            self.__parse_header()
-            self.__parse_body()
-            self.rsa_decryption()
-            return True
-        return False
+        """Parse a received frame.
+
+        Args:
+            message(bytes/bytearray/memoryview): full frame, start and end with 0x7E.
+
+        Returns:
+            bool: True - success, False - not a full frame.
+
+        Raises:
+            TypeError: frame escape is illegal or check code is not compare.
+        """
+        if len(message) < 2 or message[0] != FRAME_FLAG or message[-1] != FRAME_FLAG:
+            return False
+        if len(self.__frame_buf) < len(message):
+            self.__frame_buf = bytearray(len(message))
+        buf = self.__frame_buf
+        size, check_code = frame_decode(message, buf)
+        self.__check_code = buf[size - 1] if size else -1
+        if check_code != self.__check_code:
+            raise TypeError("check code is not compare. message check_code[%s], calculate check_code[%s]" % (self.__check_code, check_code))
+        offset = self.__parse_header(buf)
+        self.__body = ubinascii.hexlify(memoryview(buf)[offset:size - 1]).decode()
+        self.rsa_decryption()
+        return True
 
     def get_header(self):
         header = {
@@ -1887,9 +2038,10 @@ class JTMessageParse(JTMessage):
 
 class T0001(JTMessage):
     """Terminal general answer"""
+    __slots__ = ("__values",)
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x0001
 
     def set_params(self, response_serial_no, response_msg_id, result_code):
@@ -1904,24 +2056,21 @@ class T0001(JTMessage):
                 3 - not support
                 4 - alarm processing confirmation
         """
-        self.__response_serial_no = str_fill(hex(response_serial_no)[2:], target_len=4)
-        self.__response_msg_id = str_fill(hex(response_msg_id)[2:], target_len=4)
-        self.__result_code = str_fill(hex(result_code)[2:], target_len=2)
+        self.__values = {
+            "response_serial_no": response_serial_no,
+            "response_msg_id": response_msg_id,
+            "result_code": result_code,
+        }
 
     def body_to_hex(self):
-        kwargs = {
-            "response_serial_no": self.__response_serial_no,
-            "response_msg_id": self.__response_msg_id,
-            "result_code": self.__result_code,
-        }
-        self.__body = "{response_serial_no}{response_msg_id}{result_code}".format(**kwargs)
+        self.schema_to_hex(self.__values)
 
 
 class T8001(JTMessage):
     """Platform universal Response"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8001
 
     def body_from_hex(self):
@@ -1936,34 +2085,31 @@ class T8001(JTMessage):
                 3 - not support
                 4 - alarm processing confirmation
         """
-        self.__body_data = {
-            "serial_no": int(self.__body[:4], 16),
-            "message_id": int(self.__body[4:8], 16),
-            "result_code": int(self.__body[8:10], 16),
-        }
+        self.__body_data = self.schema_from_hex()
 
 
 class T0002(JTMessage):
     """Terminal heartbeat"""
+    __slots__ = ()
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x0002
 
 
 class T0004(JTMessage):
     """Search server time request"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x0004
 
 
 class T8004(JTMessage):
     """Search server time response"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8004
 
     def body_from_hex(self):
@@ -1971,17 +2117,17 @@ class T8004(JTMessage):
         body_data:
             utc_time(str): YYYY-MM-DD HH:mm:ss
         """
-        time_item = [self.__body[i * 2:(i + 1) * 2] for i in range(int(len(self.__body) / 2))]
+        utc_time = self.schema_from_hex()["utc_time"]
         self.__body_data = {
-            "utc_time": "20%s-%s-%s %s:%s:%s" % tuple(time_item)
+            "utc_time": "20%s-%s-%s %s:%s:%s" % tuple([utc_time[i:i + 2] for i in range(0, 12, 2)])
         }
 
 
 class T8003(JTMessage):
     """Server supplementary subcontracting request"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8003
 
     def body_from_hex(self):
@@ -1992,27 +2138,14 @@ class T8003(JTMessage):
             package_ids(list): retransmission packet id list.
                 item(int): retransmission packet id.
         """
-        source_serial_no = int(self.__body[:4], 16)
-        if self.is_version():
-            total_number = int(self.__body[4:8], 16)
-            pkids = self.__body[8:]
-        else:
-            total_number = int(self.__body[4:6], 16)
-            pkids = self.__body[6:]
-        package_ids = [int(pkids[i * 2:(i + 1) * 2]) for i in range(int(len(pkids) / 2))]
-
-        self.__body_data = {
-            "serial_no": source_serial_no,
-            "total_number": total_number,
-            "package_ids": package_ids
-        }
+        self.__body_data = self.schema_from_hex()
 
 
 class T0005(JTMessage):
     """Terminal supplementary subcontracting request"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x0005
 
     def set_params(self, source_serial_no, package_ids):
@@ -2025,19 +2158,17 @@ class T0005(JTMessage):
         self.__package_ids = package_ids
 
     def body_to_hex(self):
-        kwargs = {
-            "source_serial_no": str_fill(hex(self.__source_serial_no)[2:], target_len=4),
-            "retransmission_num": str_fill(hex(len(self.__package_ids))[2:], target_len=4),
-            "package_ids": "".join([str_fill(hex(pkg_id)[2:], target_len=4) for pkg_id in self.__package_ids]),
-        }
-        self.__body = "{source_serial_no}{retransmission_num}{package_ids}".format(**kwargs)
+        self.schema_to_hex({
+            "source_serial_no": self.__source_serial_no,
+            "package_ids": self.__package_ids,
+        })
 
 
 class T0100(JTMessage):
     """Terminal registration request"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x0100
 
     def set_params(self, province_id, city_id, manufacturer_id, terminal_model, terminal_id, license_plate_color, license_plate):
@@ -2093,8 +2224,8 @@ class T0100(JTMessage):
 class T8100(JTMessage):
     """Terminal registration response"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8100
 
     def body_from_hex(self):
@@ -2109,26 +2240,22 @@ class T8100(JTMessage):
                 4 - the terminal does not exist in the database
             auth_code(str): authentication code. This field is only available when the registration is successful.
         """
-        self.__body_data = {
-            "serial_no": int(self.__body[:4], 16),
-            "registration_result": int(self.__body[4:6], 16),
-            "auth_code": ubinascii.unhexlify(self.__body[6:].encode("gbk")).decode("gbk"),
-        }
+        self.__body_data = self.schema_from_hex()
 
 
 class T0003(JTMessage):
     """Terminal log out"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x0003
 
 
 class T0102(JTMessage):
     """Terminal authentication"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x0102
 
     def set_params(self, auth_code, imei, app_version):
@@ -2138,30 +2265,21 @@ class T0102(JTMessage):
             imei(str): terminal imei
             app_version(str): Manufacturer-defined software version number
         """
-        self.__auth_code = ubinascii.hexlify(auth_code.encode("gbk")).decode("gbk")
-        self.__auth_len = ""
-        self.__imei = ""
-        self.__app_version = ""
-        if self.is_version():
-            self.__auth_len = str_fill(hex(int(len(self.__auth_code) / 2))[2:], target_len=2)
-            self.__imei = str_fill(ubinascii.hexlify(imei.encode("gbk")).decode("gbk"), target_len=30)
-            self.__app_version = str_fill(ubinascii.hexlify(app_version.encode("gbk")).decode("gbk"), rl="r", target_len=40)
+        self.__values = {
+            "auth_code": auth_code,
+            "imei": imei,
+            "app_version": app_version,
+        }
 
     def body_to_hex(self):
-        kwargs = {
-            "auth_len": self.__auth_len,
-            "auth_code": self.__auth_code,
-            "imei": self.__imei,
-            "app_version": self.__app_version,
-        }
-        self.__body = "{auth_len}{auth_code}{imei}{app_version}".format(**kwargs)
+        self.schema_to_hex(self.__values)
 
 
 class T8103(JTMessage):
     """Set terminal parameters"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8103
 
     def body_from_hex(self):
@@ -2172,16 +2290,11 @@ class T8103(JTMessage):
                     param_id: terminal param id
                     real_value: terminal param value
         """
-        param_count = int(self.__body[:2], 16)
-        param_body = self.__body[2:]
+        terminal_params = TerminalParams()
         params = []
-        for i in range(param_count):
-            param_id = int(param_body[:8], 16)
-            param_len = int(param_body[8:10], 16)
-            param_value = param_body[10:param_len * 2]
-            real_value = TerminalParams().parse(param_id, param_value)
-            params.append((param_id, real_value))
-            param_body = param_body[param_len * 2:]
+        for item in self.schema_from_hex()["params"]:
+            param_value = ubinascii.hexlify(item["param_value"]).decode()
+            params.append((item["param_id"], terminal_params.parse(item["param_id"], param_value)))
         self.__body_data = {
             "params": params
         }
@@ -2190,16 +2303,16 @@ class T8103(JTMessage):
 class T8104(JTMessage):
     """Query terminal params"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8104
 
 
 class T8106(JTMessage):
     """Query the specified terminal parameters"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8106
 
     def body_from_hex(self):
@@ -2208,22 +2321,14 @@ class T8106(JTMessage):
             param_ids(list):
                 item(int): param id
         """
-        param_count = int(self.__body[:2], 16)
-        param_ids_body = self.__body[2:]
-        param_ids = []
-        for i in range(param_count):
-            param_id = int(param_ids_body[i * 8:(i + 1) * 8], 16)
-            param_ids.append(param_id)
-        self.__body_data = {
-            "param_ids": param_ids
-        }
+        self.__body_data = self.schema_from_hex()
 
 
 class T0104(JTMessage):
     """Query terminal params response"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x0104
         self.__params = []
 
@@ -2257,8 +2362,8 @@ class T0104(JTMessage):
 class T8105(JTMessage):
     """Terminal control"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8105
 
     def body_from_hex(self):
@@ -2341,16 +2446,16 @@ class T8105(JTMessage):
 class T8107(JTMessage):
     """Query terminal attribute request"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8107
 
 
 class T0107(JTMessage):
     """Query terminal attribute response"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x0107
 
     def set_params(self, applicable_passenger_vehicles, applicable_to_dangerous_goods_vehicles,
@@ -2406,8 +2511,8 @@ class T0107(JTMessage):
         else:
             __terminal_model_len = 40
             __terminal_id_len = 14
-        self.__terminal_model = str_fill(ubinascii.hexlify(str(terminal_model[:__terminal_model_len / 2]).encode("gbk")).decode("gbk"), rl="r", target_len=__terminal_model_len)
-        self.__terminal_id = str_fill(ubinascii.hexlify(str(terminal_id[:__terminal_id_len / 2]).encode("gbk")).decode("gbk"), rl="r", target_len=__terminal_id_len)
+        self.__terminal_model = str_fill(ubinascii.hexlify(str(terminal_model[:__terminal_model_len // 2]).encode("gbk")).decode("gbk"), rl="r", target_len=__terminal_model_len)
+        self.__terminal_id = str_fill(ubinascii.hexlify(str(terminal_id[:__terminal_id_len // 2]).encode("gbk")).decode("gbk"), rl="r", target_len=__terminal_id_len)
         self.__iccid = iccid
         self.__hardware_version = ubinascii.hexlify(str(hardware_version).encode("gbk")).decode("gbk") if hardware_version else ""
         self.__hardware_version_len = str_fill(hex(int(len(self.__hardware_version) / 2))[2:], target_len=2)
@@ -2456,8 +2561,8 @@ class T0107(JTMessage):
 class T8108(JTMessage):
     """Issue the terminal upgrade package"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8108
 
     def body_from_hex(self):
@@ -2471,25 +2576,14 @@ class T8108(JTMessage):
             terminal_firmware_verion(str): terminal firmware verion
             upgrade_package(str): upgrade package file with full path.
         """
-        upgrade_type = int(self.__body[:2], 16)
-        manufacturer_id = ubinascii.unhexlify(self.__body[2:12].encode("gbk")).decode("gbk")
-        terminal_firmware_verion_len = int(self.__body[12:14], 16)
-        terminal_firmware_verion = ubinascii.unhexlify(self.__body[14:(terminal_firmware_verion_len * 2 + 14)].encode("gbk")).decode("gbk")
-        upgrade_package_len = int(self.__body[(terminal_firmware_verion_len * 2 + 14):(terminal_firmware_verion_len * 2 + 22)], 16)
-        upgrade_package = ubinascii.unhexlify(self.__body[(terminal_firmware_verion_len * 2 + 22):(terminal_firmware_verion_len * 2 + 22 + upgrade_package_len * 2)].encode("gbk"))
-        self.__body_data = {
-            "upgrade_type": upgrade_type,
-            "manufacturer_id": manufacturer_id,
-            "terminal_firmware_verion": terminal_firmware_verion,
-            "upgrade_package": upgrade_package,
-        }
+        self.__body_data = self.schema_from_hex()
 
 
 class T0108(JTMessage):
     """Terminal upgrade result response"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x0108
 
     def set_params(self, upgrade_type, result_code):
@@ -2504,15 +2598,13 @@ class T0108(JTMessage):
                 1 - failed
                 2 - cancel
         """
-        self.__upgrade_type = str_fill(hex(upgrade_type)[2:], target_len=2)
-        self.__result_code = str_fill(hex(result_code)[2:], target_len=2)
+        self.__values = {
+            "upgrade_type": upgrade_type,
+            "result_code": result_code,
+        }
 
     def body_to_hex(self):
-        kwargs = {
-            "upgrade_type": self.__upgrade_type,
-            "result_code": self.__result_code,
-        }
-        self.__body = "{upgrade_type}{result_code}".format(**kwargs)
+        self.schema_to_hex(self.__values)
 
 
 class T0200(JTMessage):
@@ -2520,10 +2612,26 @@ class T0200(JTMessage):
 
     When an alarm occurs, the vehicle should report a piece of location information immediately,
     and add the alarm status to the location information.
+
+    The body can be packed straight into a caller buffer by `encode_into`, without hex strings, `message` packs it
+    into the frame data the same way.
     """
-    def __init__(self):
-        super().__init__()
+    __slots__ = (
+        "__response_serial_no", "__alarm_flag", "__loc_status", "__latitude", "__longitude", "__altitude",
+        "__speed", "__direction", "__time", "__time_bcd", "__loc_additional_info", "__loc_additional_data",
+    )
+    # alarm flag, status, latitude, longitude, altitude, speed, direction, BCD time
+    LOC_BASIC_FORMAT = ">IIIIHHH6s"
+    LOC_BASIC_SIZE = 28
+
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x0200
+        self.__response_serial_no = None
+        self.__time = None
+        self.__time_bcd = b""
+        self.__loc_additional_info = None
+        self.__loc_additional_data = b""
 
     def set_params(self, alarm_flag, loc_status, latitude, longitude, altitude, speed, direction, time, loc_additional_info):
         """
@@ -2536,46 +2644,96 @@ class T0200(JTMessage):
             speed(float): unit: km/h, Accurate to 0.1
             direction(int): range: 0~359, 0 is true North, Clockwise.
             time(str): GMT+8, format: YYMMDDhhmmss
-            loc_additional_info(str): LocAdditonalInfoConfig().value()
+            loc_additional_info(str/bytes/bytearray): LocAdditonalInfoConfig().value(), hex string or raw bytes.
+        """
+        self.__alarm_flag = alarm_flag
+        self.__loc_status = loc_status
+        self.__latitude = int(latitude * 1000000)
+        self.__longitude = int(longitude * 1000000)
+        self.__altitude = int(altitude)
+        self.__speed = int(speed * 10)
+        self.__direction = int(direction)
+        # BCD time and additional info are converted only when changed, a steady report does not allocate them again.
+        if time != self.__time:
+            self.__time = time
+            self.__time_bcd = ubinascii.unhexlify(time)
+        if isinstance(loc_additional_info, str):
+            if loc_additional_info != self.__loc_additional_info:
+                self.__loc_additional_info = loc_additional_info
+                self.__loc_additional_data = ubinascii.unhexlify(loc_additional_info)
+        else:
+            self.__loc_additional_info = None
+            self.__loc_additional_data = loc_additional_info
+
+    def body_size(self):
+        """Get body size packed by `encode_into`.
+
+        Returns:
+            int: body bytes size.
         """
-        self.__alarm_flag = str_fill(hex(alarm_flag)[2:], target_len=8)
-        self.__loc_status = str_fill(hex(loc_status)[2:], target_len=8)
-        self.__latitude = str_fill(hex(int(latitude * (10 ** 6)))[2:], target_len=8)
-        self.__longitude = str_fill(hex(int(longitude * (10 ** 6)))[2:], target_len=8)
-        self.__altitude = str_fill(hex(int(altitude))[2:], target_len=4)
-        self.__speed = str_fill(hex(int(speed * 10))[2:], target_len=4)
-        self.__direction = str_fill(hex(int(direction))[2:], target_len=4)
-        self.__time = time
-        self.__loc_additional_info = loc_additional_info
+        size = self.LOC_BASIC_SIZE + len(self.__loc_additional_data)
+        return size if self.__response_serial_no is None else size + 2
+
+    def encode_into(self, buf, offset=0):
+        """Pack message body into buffer.
+
+        Args:
+            buf(bytearray): buffer to write, must have `body_size()` bytes from offset.
+            offset(int): buffer offset to start writing (default: {0})
+
+        Returns:
+            int: buffer offset after the body.
+        """
+        if self.__response_serial_no is not None:
+            ustruct.pack_into(">H", buf, offset, self.__response_serial_no)
+            offset += 2
+        ustruct.pack_into(
+            self.LOC_BASIC_FORMAT, buf, offset, self.__alarm_flag, self.__loc_status, self.__latitude,
+            self.__longitude, self.__altitude, self.__speed, self.__direction, self.__time_bcd
+        )
+        offset += self.LOC_BASIC_SIZE
+        end = offset + len(self.__loc_additional_data)
+        buf[offset:end] = self.__loc_additional_data
+        return end
 
     def body_to_hex(self):
-        kwargs = {
-            "alarm_flag": self.__alarm_flag,
-            "loc_status": self.__loc_status,
-            "latitude": self.__latitude,
-            "longitude": self.__longitude,
-            "altitude": self.__altitude,
-            "speed": self.__speed,
-            "direction": self.__direction,
-            "time": self.__time,
-            "loc_additional_info": self.__loc_additional_info,
-        }
-        logger.debug("kwargs: %s" % str(kwargs))
-        self.__body = "{alarm_flag}{loc_status}{latitude}{longitude}{altitude}{speed}{direction}{time}{loc_additional_info}".format(**kwargs)
+        buf = bytearray(self.body_size())
+        self.encode_into(buf)
+        self.__body = ubinascii.hexlify(buf).decode()
+
+    def message(self, buf=None):
+        """Build frame of this message, the body is packed by `encode_into` right after the header, without hex strings.
+
+        An encrypted body or a body which needs subpackages is built by hex string.
+
+        Args:
+            buf(bytearray): reusable frame buffer, see `JTMessage.message`. (default: {None})
+
+        Returns:
+            list: item is (serial_no, frame)
+        """
+        size = self.body_size()
+        if self.get_encryption() or self.is_subpackage() or size > self.__context.get_max_body_size():
+            return super().message(buf)
+        serial_no = self.__serial_no_obj.get_serial_no()
+        offset = self.__pack_header(size, serial_no)
+        self.encode_into(self.__frame_data, offset)
+        return [(serial_no, self.__seal(buf))]
 
 
 class T8201(JTMessage):
     """Location information query message body"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8201
 
 
-class T0201(JTMessage):
+class T0201(T0200):
     """Location information query response"""
-    def __init__(self):
-        super().__init__()
+
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x0201
 
     def set_params(self, response_serial_no, alarm_flag, loc_status, latitude, longitude, altitude, speed, direction, time, loc_additional_info):
@@ -2590,41 +2748,17 @@ class T0201(JTMessage):
             speed(float): unit: km/h, Accurate to 0.1
             direction(int): range: 0~359, 0 is true North, Clockwise.
             time(str): GMT+8, format: YYMMDDhhmmss
-            loc_additional_info(str): LocAdditonalInfoConfig().value()
+            loc_additional_info(str/bytes/bytearray): LocAdditonalInfoConfig().value(), hex string or raw bytes.
         """
-        self.__response_serial_no = str_fill(hex(response_serial_no)[2:], target_len=4)
-        self.__alarm_flag = str_fill(hex(alarm_flag)[2:], target_len=8)
-        self.__loc_status = str_fill(hex(loc_status)[2:], target_len=8)
-        self.__latitude = str_fill(hex(int(latitude * (10 ** 6)))[2:], target_len=8)
-        self.__longitude = str_fill(hex(int(longitude * (10 ** 6)))[2:], target_len=8)
-        self.__altitude = str_fill(hex(int(altitude))[2:], target_len=4)
-        self.__speed = str_fill(hex(int(speed * 10))[2:], target_len=4)
-        self.__direction = str_fill(hex(int(direction))[2:], target_len=4)
-        self.__time = time
-        self.__loc_additional_info = loc_additional_info
-
-    def body_to_hex(self):
-        kwargs = {
-            "response_serial_no": self.__response_serial_no,
-            "alarm_flag": self.__alarm_flag,
-            "loc_status": self.__loc_status,
-            "latitude": self.__latitude,
-            "longitude": self.__longitude,
-            "altitude": self.__altitude,
-            "speed": self.__speed,
-            "direction": self.__direction,
-            "time": self.__time,
-            "loc_additional_info": self.__loc_additional_info,
-        }
-        logger.debug("kwargs: %s" % str(kwargs))
-        self.__body = "{response_serial_no}{alarm_flag}{loc_status}{latitude}{longitude}{altitude}{speed}{direction}{time}{loc_additional_info}".format(**kwargs)
+        super().set_params(alarm_flag, loc_status, latitude, longitude, altitude, speed, direction, time, loc_additional_info)
+        self.__response_serial_no = response_serial_no
 
 
 class T8202(JTMessage):
     """Temporary position tracking control"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8202
 
     def body_from_hex(self):
@@ -2633,21 +2767,14 @@ class T8202(JTMessage):
             time_interval(int): unit: seconds
             location_tracking_validity_period(int): unit: seconds
         """
-        time_interval = int(self.__body[:4], 16)
-        location_tracking_validity_period = -1
-        if time_interval != 0:
-            location_tracking_validity_period = int(self.__body[4:], 16)
-        self.__body_data = {
-            "time_interval": time_interval,
-            "location_tracking_validity_period": location_tracking_validity_period,
-        }
+        self.__body_data = self.schema_from_hex()
 
 
 class T8203(JTMessage):
     """Manual confirmation alarm message data format"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8203
 
     def body_from_hex(self):
@@ -2663,40 +2790,24 @@ class T8203(JTMessage):
             vehicle_illegal_ignition_alarm: 1 - confirm
             vehicle_illegal_displacement_alarm: 1 - confirm
         """
-        alarm_msg_serial_no = int(self.__body[:4], 16)
-        alarm_type = str_fill(bin(int(self.__body[4:], 16))[2:], target_len=32)
-        emergency_alarm = int(alarm_type[-1])
-        hazard_alarm = int(alarm_type[-4])
-        in_out_area_alarm = int(alarm_type[-21])
-        in_out_road_alarm = int(alarm_type[-22])
-        insufficient_or_too_long_travel_time_on_the_road_alarm = int(alarm_type[-23])
-        vehicle_illegal_ignition_alarm = int(alarm_type[-28])
-        vehicle_illegal_displacement_alarm = int(alarm_type[-29])
-        self.__body_data = {
-            "alarm_msg_serial_no": alarm_msg_serial_no,
-            "emergency_alarm": emergency_alarm,
-            "hazard_alarm": hazard_alarm,
-            "in_out_area_alarm": in_out_area_alarm,
-            "in_out_road_alarm": in_out_road_alarm,
-            "insufficient_or_too_long_travel_time_on_the_road_alarm": insufficient_or_too_long_travel_time_on_the_road_alarm,
-            "vehicle_illegal_ignition_alarm": vehicle_illegal_ignition_alarm,
-            "vehicle_illegal_displacement_alarm": vehicle_illegal_displacement_alarm,
-        }
+        body_data = self.schema_from_hex()
+        body_data.update(body_data.pop("alarm_type"))
+        self.__body_data = body_data
 
 
 class T8204(JTMessage):
     """Link detection"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8204
 
 
 class T8300(JTMessage):
     """Text message delivery"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8300
 
     def body_from_hex(self):
@@ -2709,28 +2820,20 @@ class T8300(JTMessage):
             msg_type(int): 1 - notice, 2 - service
             message(str): message infomation
         """
-        flag = str_fill(bin(int(self.__body[:2], 16))[2:], target_len=8)
-        flag_type = int(flag[-2:], 2) if self.is_version() else int(flag[-1], 2)
-        terminal_display = int(flag[-3])
-        terminal_tts_broadcast_and_read = int(flag[-4])
-        flag_msg_type = int(flag[-6])
-        msg_type = int(self.__body[2:4], 16) if self.is_version() else 0
-        message = ubinascii.unhexlify(self.__body[4 if self.is_version() else 2:]).decode("gbk")
-        self.__body_data = {
-            "flag_type": flag_type,
-            "terminal_display": terminal_display,
-            "terminal_tts_broadcast_and_read": terminal_tts_broadcast_and_read,
-            "flag_msg_type": flag_msg_type,
-            "msg_type": msg_type,
-            "message": message,
-        }
+        body_data = self.schema_from_hex()
+        flag = body_data.pop("flag")
+        body_data["flag_type"] = flag & 0x03 if self.is_version() else flag & 0x01
+        body_data["terminal_display"] = (flag >> 2) & 1
+        body_data["terminal_tts_broadcast_and_read"] = (flag >> 3) & 1
+        body_data["flag_msg_type"] = (flag >> 5) & 1
+        self.__body_data = body_data
 
 
 class T8301(JTMessage):
     """Set event"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8301
 
     def body_from_hex(self):
@@ -2747,28 +2850,14 @@ class T8301(JTMessage):
                     id(int): event id
                     data(str): event infomation
         """
-        set_type = int(self.__body[:2], 16)
-        total_num = int(self.__body[2:4], 16)
-        event_body = self.__body[4:]
-        events = []
-        for i in range(total_num):
-            event = {}
-            event["id"] = int(event_body[:2], 16)
-            event_info_len = int(event_body[2:4], 16)
-            event["data"] = ubinascii.unhexlify(event_body[4:4 + event_info_len * 2]).decode("gbk")
-            event_body = event_body[4 + event_info_len * 2:]
-            events.append(event)
-        self.__body_data = {
-            "set_type": set_type,
-            "events": events,
-        }
+        self.__body_data = self.schema_from_hex()
 
 
 class T0301(JTMessage):
     """Event report"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x0301
 
     def set_params(self, event_id):
@@ -2776,20 +2865,19 @@ class T0301(JTMessage):
         Args:
             event_id(int): event id.
         """
-        self.__event_id = str_fill(hex(event_id)[2:], target_len=2)
+        self.__values = {
+            "event_id": event_id,
+        }
 
     def body_to_hex(self):
-        kwargs = {
-            "event_id": self.__event_id,
-        }
-        self.__body = "{event_id}".format(**kwargs)
+        self.schema_to_hex(self.__values)
 
 
 class T8302(JTMessage):
     """Issue a question"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8302
 
     def body_from_hex(self):
@@ -2805,37 +2893,14 @@ class T8302(JTMessage):
                     id(int): answer id
                     data(str): answer infomation
         """
-        flag = str_fill(bin(int(self.__body[:2], 16))[2:], target_len=8)
-        emergency = int(flag[-1])
-        terminal_tts_broadcast_and_read = int(flag[-4])
-        advertising_screen_display = int(flag[-5])
-        question_info_len = int(self.__body[2:4], 16)
-        question_info = ubinascii.unhexlify(self.__body[4: 4 + question_info_len * 2]).decode("gbk")
-        answers = []
-        answer_body = self.__body[4 + question_info_len * 2:]
-        while answer_body:
-            answer = {}
-            answer["id"] = int(answer_body[:2], 16)
-            answer_len = int(answer_body[2:6], 16)
-            answer["data"] = ubinascii.unhexlify(answer_body[6:6 + answer_len * 2]).decode("gbk")
-            answer_body = answer_body[6 + answer_len * 2:]
-            answers.append(answer)
-        self.__body_data = {
-            "flag": {
-                "emergency": emergency,
-                "terminal_tts_broadcast_and_read": terminal_tts_broadcast_and_read,
-                "advertising_screen_display": advertising_screen_display,
-            },
-            "question_info": question_info,
-            "answers": answers,
-        }
+        self.__body_data = self.schema_from_hex()
 
 
 class T0302(JTMessage):
     """Issue a question response"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x0302
 
     def set_params(self, response_serial_no, answer_id):
@@ -2844,22 +2909,20 @@ class T0302(JTMessage):
             response_serial_no(int): response serial no.
             answer_id(int): event id.
         """
-        self.__response_serial_no = str_fill(hex(response_serial_no)[2:], target_len=4)
-        self.__answer_id = str_fill(hex(answer_id)[2:], target_len=2)
+        self.__values = {
+            "response_serial_no": response_serial_no,
+            "answer_id": answer_id,
+        }
 
     def body_to_hex(self):
-        kwargs = {
-            "response_serial_no": self.__response_serial_no,
-            "answer_id": self.__answer_id,
-        }
-        self.__body = "{response_serial_no}{answer_id}".format(**kwargs)
+        self.schema_to_hex(self.__values)
 
 
 class T8303(JTMessage):
     """Information on demand menu settings"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8303
 
     def body_from_hex(self):
@@ -2875,28 +2938,14 @@ class T8303(JTMessage):
                     type(int): info type
                     name(str): info name
         """
-        set_type = int(self.__body[:2], 16)
-        total_num = int(self.__body[2:4], 16)
-        info_body = self.__body[4:]
-        infos = []
-        for i in range(total_num):
-            info = {}
-            info["type"] = int(info_body[:2], 16)
-            info_name_len = int(info_body[2:6], 16)
-            info["name"] = ubinascii.unhexlify(info_body[6:6 + info_name_len * 2]).decode("gbk")
-            info_body = info_body[6 + info_name_len * 2:]
-            infos.append(info)
-        self.__body_data = {
-            "set_type": set_type,
-            "infos": infos,
-        }
+        self.__body_data = self.schema_from_hex()
 
 
 class T0303(JTMessage):
     """Information on demand/cancellation"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x0303
 
     def set_params(self, info_type, onoff):
@@ -2907,22 +2956,20 @@ class T0303(JTMessage):
                 0 - cancel
                 1 - demand
         """
-        self.__info_type = str_fill(hex(info_type)[2:], target_len=2)
-        self.__onoff = str_fill(hex(onoff)[2:], target_len=2)
+        self.__values = {
+            "info_type": info_type,
+            "onoff": onoff,
+        }
 
     def body_to_hex(self):
-        kwargs = {
-            "info_type": self.__info_type,
-            "onoff": self.__onoff,
-        }
-        self.__body = "{info_type}{onoff}".format(**kwargs)
+        self.schema_to_hex(self.__values)
 
 
 class T8304(JTMessage):
     """Information service"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8304
 
     def body_from_hex(self):
@@ -2931,36 +2978,25 @@ class T8304(JTMessage):
             info_type(int): info type
             info_data(str): info data
         """
-        info_type = int(self.__body[:2], 16)
-        info_len = int(self.__body[2:6], 16)
-        info_data = ubinascii.unhexlify(self.__body[6:6 + info_len * 2]).decode("gbk")
-        self.__body_data = {
-            "info_type": info_type,
-            "info_data": info_data,
-        }
+        self.__body_data = self.schema_from_hex()
 
 
 class T8400(JTMessage):
     """Call back"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8400
 
     def body_from_hex(self):
-        flag = int(self.__body[:2], 16)
-        phone_number = ubinascii.unhexlify(self.__body[2:]).decode("gbk")
-        self.__body_data = {
-            "flag": flag,
-            "phone_number": phone_number,
-        }
+        self.__body_data = self.schema_from_hex()
 
 
 class T8401(JTMessage):
     """Set up phonebook"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8401
 
     def body_from_hex(self):
@@ -2980,23 +3016,7 @@ class T8401(JTMessage):
                     phone(str): phone number
                     concat_user(str): concat user name
         """
-        set_type = int(self.__body[:2], 16)
-        total_concat = int(self.__body[2:4], 16)
-        concat_infos = self.__body[4:]
-        phonebook = []
-        for i in range(total_concat):
-            item = {}
-            item["call_type"] = int(concat_infos[:2], 16)
-            phone_len = int(concat_infos[2:4], 16)
-            item["phone"] = ubinascii.unhexlify(concat_infos[4:(4 + phone_len * 2)]).decode("gbk")
-            concat_user_len = int(concat_infos[(4 + phone_len * 2):(6 + phone_len * 2)], 16)
-            item["concat_user"] = ubinascii.unhexlify(concat_infos[(6 + phone_len * 2):(6 + phone_len * 2 + concat_user_len * 2)]).decode("gbk")
-            concat_infos = concat_infos[6 + phone_len * 2 + concat_user_len * 2:]
-            phonebook.append(item)
-        self.__body_data = {
-            "set_type": set_type,
-            "phonebook": phonebook,
-        }
+        self.__body_data = self.schema_from_hex()
 
 
 class T8500(JTMessage):
@@ -3005,8 +3025,8 @@ class T8500(JTMessage):
     The message depends on the specific control information data defined by the server
     """
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8500
 
     def body_from_hex(self):
@@ -3020,28 +3040,17 @@ class T8500(JTMessage):
                     id(int): control type id.
                     param(int): control param.
         """
-        control_infos = []
-        if self.is_version():
-            control_num = int(self.__body[:4], 16)
-            control_data = self.__body[4:]
-            for i in range(control_num):
-                _id = int(control_data[:4], 16)
-                # TODO: This param length depends on server, default 2.
-                _param = int(control_data[4:6], 16)
-                control_infos.append(({"id": _id, "param": _param}))
-        else:
-            control_flag = bin(int(self.__body[:2], 16))[2:]
-            control_infos.append({"id": 0x0001, "param": int(control_flag[-1])})
-        self.__body_data = {
-            "data": control_infos
-        }
+        body_data = self.schema_from_hex()
+        if not self.is_version():
+            body_data = {"data": [{"id": 0x0001, "param": body_data["control_flag"] & 0x01}]}
+        self.__body_data = body_data
 
 
 class T0500(T0201):
     """Vehicle control response"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x0500
 
 
@@ -3051,8 +3060,8 @@ class T8600(JTMessage):
     NOTE: This message's source body need to save for 0x8608 message query.
     """
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8600
 
     def body_from_hex(self):
@@ -3084,65 +3093,16 @@ class T8600(JTMessage):
                     night_speed_limit(int): Top speed at night, unit: km/h. value is -1 if speed_limit_enable is 0
                     area_name(str): area name
         """
-        set_attr = int(self.__body[:2], 16)
-        total_area = int(self.__body[2:4], 16)
-        area_info = self.__body[4:]
-        area_data = []
-        for i in range(total_area):
-            area_item = {}
-            area_item["area_id"] = int(area_info[:8], 16)
-            area_attr = str_fill(bin(int(area_info[8:12], 16))[2:], target_len=16)
-            area_item["attributes"] = {}
-            area_item["attributes"]["time_limit_enable"] = int(area_attr[-1])
-            area_item["attributes"]["speed_limit_enable"] = int(area_attr[-2])
-            area_item["attributes"]["alert_driver_when_entering_area"] = int(area_attr[-3])
-            area_item["attributes"]["alert_platform_when_entering_area"] = int(area_attr[-4])
-            area_item["attributes"]["alert_driver_when_leaving_area"] = int(area_attr[-5])
-            area_item["attributes"]["alert_platform_when_leaving_area"] = int(area_attr[-6])
-            area_item["attributes"]["latitude_direction"] = int(area_attr[-7])
-            area_item["attributes"]["longitude_direction"] = int(area_attr[-8])
-            area_item["attributes"]["open_the_door_enable"] = int(area_attr[-9])
-            area_item["attributes"]["communication_module_enable_when_entering_area"] = int(area_attr[-15])
-            area_item["attributes"]["gnss_enable_when_entering_area"] = int(area_attr[-16])
-            area_item["center_latitude"] = int(area_info[12:20], 16) / (10 ** 6)
-            area_item["center_longitude"] = int(area_info[20:28], 16) / (10 ** 6)
-            area_item["radius"] = int(area_info[28:36], 16)
-            area_info = area_info[36:]
-            area_item["start_time"] = ""
-            area_item["end_time"] = ""
-            if area_item["attributes"]["time_limit_enable"] == 1:
-                area_item["start_time"] = area_info[:12]
-                area_item["end_time"] = area_info[12:24]
-                area_info = area_info[24:]
-            area_item["speed_limit"] = 0
-            area_item["over_speed_time"] = 0
-            area_item["night_speed_limit"] = 0
-            area_item["area_name"] = ""
-            if area_item["attributes"]["speed_limit_enable"] == 1:
-                area_item["speed_limit"] = int(area_info[:4], 16)
-                area_item["over_speed_time"] = int(area_info[4:6], 16)
-                if self.is_version() is True:
-                    area_item["night_speed_limit"] = int(area_info[6:10], 16) if area_info[6:10] else 0
-                    area_info = area_info[10:]
-                else:
-                    area_info = area_info[6:]
-            if self.is_version() is True:
-                area_name_len = int(area_info[:4], 16) if area_info[:4] else 0
-                area_item["area_name"] = ubinascii.unhexlify(area_info[4:4 + area_name_len * 2]).decode("gbk")
-                area_info = area_info[4 + area_name_len * 2:]
-            area_data.append(area_item)
-        self.__body_data = {
-            "set_attr": set_attr,
-            "area_data": area_data,
-            "source_body": self.__body,
-        }
+        body_data = self.schema_from_hex()
+        body_data["source_body"] = self.__body
+        self.__body_data = body_data
 
 
 class T8601(JTMessage):
     """Delete the prototype area"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8601
 
     def body_from_hex(self):
@@ -3152,12 +3112,10 @@ class T8601(JTMessage):
             area_ids(list): empty list if all is 1
                 item(int): area id
         """
-        area_num = int(self.__body[:2], 16)
-        area_id_data = self.__body[2:]
-        area_ids = [int(area_id_data[i * 8:(i + 1) * 8], 16) for i in range(area_num)]
+        ids = self.schema_from_hex()["ids"]
         self.__body_data = {
-            "all": 1 if area_num == 0 else 0,
-            "area_ids": area_ids,
+            "all": 1 if not ids else 0,
+            "area_ids": ids,
         }
 
 
@@ -3167,8 +3125,8 @@ class T8602(JTMessage):
     NOTE: This message's source body need to save for 0x8608 message query.
     """
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8602
 
     def body_from_hex(self):
@@ -3201,66 +3159,16 @@ class T8602(JTMessage):
                     night_speed_limit(int): Top speed at night, unit: km/h. value is -1 if speed_limit_enable is 0
                     area_name(str): area name
         """
-        set_attr = int(self.__body[:2], 16)
-        total_area = int(self.__body[2:4], 16)
-        area_info = self.__body[4:]
-        area_data = []
-        for i in range(total_area):
-            area_item = {}
-            area_item["area_id"] = int(area_info[:8], 16)
-            area_attr = str_fill(bin(int(area_info[8:12], 16))[2:], target_len=16)
-            area_item["attributes"] = {}
-            area_item["attributes"]["time_limit_enable"] = int(area_attr[-1])
-            area_item["attributes"]["speed_limit_enable"] = int(area_attr[-2])
-            area_item["attributes"]["alert_driver_when_entering_area"] = int(area_attr[-3])
-            area_item["attributes"]["alert_platform_when_entering_area"] = int(area_attr[-4])
-            area_item["attributes"]["alert_driver_when_leaving_area"] = int(area_attr[-5])
-            area_item["attributes"]["alert_platform_when_leaving_area"] = int(area_attr[-6])
-            area_item["attributes"]["latitude_direction"] = int(area_attr[-7])
-            area_item["attributes"]["longitude_direction"] = int(area_attr[-8])
-            area_item["attributes"]["open_the_door_enable"] = int(area_attr[-9])
-            area_item["attributes"]["communication_module_enable_when_entering_area"] = int(area_attr[-15])
-            area_item["attributes"]["gnss_enable_when_entering_area"] = int(area_attr[-16])
-            area_item["upper_left_latitude"] = int(area_info[12:20], 16) / (10 ** 6)
-            area_item["upper_left_longitude"] = int(area_info[20:28], 16) / (10 ** 6)
-            area_item["lower_right_latitude"] = int(area_info[28:36], 16) / (10 ** 6)
-            area_item["lower_right_longitude"] = int(area_info[36:44], 16) / (10 ** 6)
-            area_info = area_info[44:]
-            area_item["start_time"] = ""
-            area_item["end_time"] = ""
-            if area_item["attributes"]["time_limit_enable"] == 1:
-                area_item["start_time"] = area_info[:12]
-                area_item["end_time"] = area_info[12:24]
-                area_info = area_info[24:]
-            area_item["speed_limit"] = 0
-            area_item["over_speed_time"] = 0
-            area_item["night_speed_limit"] = 0
-            area_item["area_name"] = ""
-            if area_item["attributes"]["speed_limit_enable"] == 1:
-                area_item["speed_limit"] = int(area_info[:4], 16)
-                area_item["over_speed_time"] = int(area_info[4:6], 16)
-                if self.is_version() is True:
-                    area_item["night_speed_limit"] = int(area_info[6:10], 16) if area_info[6:10] else 0
-                    area_info = area_info[10:]
-                else:
-                    area_info = area_info[6:]
-            if self.is_version() is True:
-                area_name_len = int(area_info[:4], 16) if area_info[:4] else 0
-                area_item["area_name"] = ubinascii.unhexlify(area_info[4:4 + area_name_len * 2]).decode("gbk")
-                area_info = area_info[4 + area_name_len * 2:]
-            area_data.append(area_item)
-        self.__body_data = {
-            "set_attr": set_attr,
-            "area_data": area_data,
-            "source_body": self.__body,
-        }
+        body_data = self.schema_from_hex()
+        body_data["source_body"] = self.__body
+        self.__body_data = body_data
 
 
 class T8603(T8601):
     """Delete the rectangular area"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8603
 
 
@@ -3270,8 +3178,8 @@ class T8604(JTMessage):
     NOTE: This message's source body need to save for 0x8608 message query.
     """
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8604
 
     def body_from_hex(self):
@@ -3302,58 +3210,8 @@ class T8604(JTMessage):
                 night_speed_limit(int): Top speed at night, unit: km/h. value is -1 if speed_limit_enable is 0
                 area_name(str): area name
         """
-        area_info = self.__body
-        area_data = {}
-        area_data["area_id"] = int(area_info[:8], 16)
-        area_attr = str_fill(bin(int(area_info[8:12], 16))[2:], target_len=16)
-        area_data["attributes"] = {}
-        area_data["attributes"]["time_limit_enable"] = int(area_attr[-1])
-        area_data["attributes"]["speed_limit_enable"] = int(area_attr[-2])
-        area_data["attributes"]["alert_driver_when_entering_area"] = int(area_attr[-3])
-        area_data["attributes"]["alert_platform_when_entering_area"] = int(area_attr[-4])
-        area_data["attributes"]["alert_driver_when_leaving_area"] = int(area_attr[-5])
-        area_data["attributes"]["alert_platform_when_leaving_area"] = int(area_attr[-6])
-        area_data["attributes"]["latitude_direction"] = int(area_attr[-7])
-        area_data["attributes"]["longitude_direction"] = int(area_attr[-8])
-        area_data["attributes"]["open_the_door_enable"] = int(area_attr[-9])
-        area_data["attributes"]["communication_module_enable_when_entering_area"] = int(area_attr[-15])
-        area_data["attributes"]["gnss_enable_when_entering_area"] = int(area_attr[-16])
-        area_info = area_info[12:]
-        area_data["start_time"] = ""
-        area_data["end_time"] = ""
-        if area_data["attributes"]["time_limit_enable"] == 1:
-            area_data["start_time"] = area_info[:12]
-            area_data["end_time"] = area_info[12:24]
-            area_info = area_info[24:]
-        area_data["speed_limit"] = 0
-        area_data["over_speed_time"] = 0
-        if area_data["attributes"]["speed_limit_enable"] == 1:
-            area_data["speed_limit"] = int(area_info[:4], 16)
-            area_data["over_speed_time"] = int(area_info[4:6], 16)
-            area_info = area_info[6:]
-
-        area_point_num = int(area_info[:4], 16)
-        area_info = area_info[4:]
-        area_data["point_loction"] = []
-        for i in range(area_point_num):
-            latitude = int(area_info[:8], 16) / (10 ** 6)
-            longitude = int(area_info[8:16], 16) / (10 ** 6)
-            area_data["point_loction"].append({"latitude": latitude, "longitude": longitude})
-            area_info = area_info[16:]
-
-        area_data["night_speed_limit"] = 0
-        area_data["area_name"] = ""
-        if area_data["attributes"]["speed_limit_enable"] == 1:
-            if self.is_version() is True:
-                area_data["night_speed_limit"] = int(area_info[:4], 16)
-                area_info = area_info[4:]
-
-        if self.is_version() is True:
-            area_name_len = int(area_info[:4], 16) if area_info[:4] else 0
-            area_data["area_name"] = ubinascii.unhexlify(area_info[4:4 + area_name_len * 2]).decode("gbk")
-
         self.__body_data = {
-            "area_data": area_data,
+            "area_data": self.schema_from_hex(),
             "source_body": self.__body,
         }
 
@@ -3361,8 +3219,8 @@ class T8604(JTMessage):
 class T8605(T8601):
     """Delete the polygon area"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8605
 
 
@@ -3372,8 +3230,8 @@ class T8606(JTMessage):
     NOTE: This message's source body need to save for 0x8608 message query.
     """
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8606
 
     def body_from_hex(self):
@@ -3408,66 +3266,8 @@ class T8606(JTMessage):
                         night_speed_limit(int): unit: km/h, , value is -1 if speed_limit_enable is 0
                 route_name(str): area name
         """
-        route_info = self.__body
-        route_data = {}
-        route_data["route_id"] = int(route_info[:8], 16)
-        area_attr = str_fill(bin(int(route_info[8:12], 16))[2:], target_len=16)
-        route_data["attributes"] = {}
-        route_data["attributes"]["time_limit_enable"] = int(area_attr[-1])
-        route_data["attributes"]["alert_driver_when_entering_route"] = int(area_attr[-3])
-        route_data["attributes"]["alert_platform_when_entering_route"] = int(area_attr[-4])
-        route_data["attributes"]["alert_driver_when_leaving_route"] = int(area_attr[-5])
-        route_data["attributes"]["alert_platform_when_leaving_route"] = int(area_attr[-6])
-        route_info = route_info[12:]
-        route_data["start_time"] = ""
-        route_data["end_time"] = ""
-        if route_data["attributes"]["time_limit_enable"] == 1:
-            route_data["start_time"] = route_info[:12]
-            route_data["end_time"] = route_info[12:24]
-            route_info = route_info[24:]
-
-        route_turning_points = int(route_info[:4], 16)
-        route_info = route_info[4:]
-        route_data["turning_points"] = []
-        for i in range(route_turning_points):
-            item = {}
-            item["turning_point_id"] = int(route_info[:8], 16)
-            item["road_section_id"] = int(route_info[8:16], 16)
-            item["turning_point_latitude"] = int(route_info[16:24], 16) / (10 ** 6)
-            item["turning_point_longitude"] = int(route_info[24:32], 16) / (10 ** 6)
-            item["road_section_width"] = int(route_info[32:34], 16)
-            road_section_attr = str_fill(bin(int(route_info[34:36], 16))[2:], target_len=8)
-            item["attributes"] = {}
-            item["attributes"]["driving_time_limit_enable"] = int(road_section_attr[-1])
-            item["attributes"]["speed_limit_enable"] = int(road_section_attr[-2])
-            item["attributes"]["latitude_direction"] = int(road_section_attr[-3])
-            item["attributes"]["longitude_direction"] = int(road_section_attr[-4])
-            route_info = route_info[36:]
-            item["driving_too_long_time_limit"] = -1
-            item["insufficient_travel_time_limit"] = -1
-            if item["attributes"]["driving_time_limit_enable"] == 1:
-                item["driving_too_long_time_limit"] = int(route_info[:4], 16)
-                item["insufficient_travel_time_limit"] = int(route_info[4:8], 16)
-                route_info = route_info[8:]
-            item["speed_limit"] = 0
-            item["over_speed_time"] = 0
-            item["night_speed_limit"] = 0
-            if item["attributes"]["speed_limit_enable"] == 1:
-                item["speed_limit"] = int(route_info[:4], 16)
-                item["over_speed_time"] = int(route_info[4:6], 16)
-                if self.is_version() is True:
-                    item["night_speed_limit"] = int(route_info[6:10], 16)
-                    route_info = route_info[10:]
-                else:
-                    route_info = route_info[6:]
-            route_data["turning_points"].append(item)
-
-        route_data["route_name"] = ""
-        if self.is_version() is True:
-            area_name_len = int(route_info[:4], 16) if route_info[:4] else 0
-            route_data["route_name"] = ubinascii.unhexlify(route_info[4:4 + area_name_len * 2]).decode("gbk")
         self.__body_data = {
-            "route_data": route_data,
+            "route_data": self.schema_from_hex(),
             "source_body": self.__body,
         }
 
@@ -3475,8 +3275,8 @@ class T8606(JTMessage):
 class T8607(JTMessage):
     """Delete the route"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8607
 
     def body_from_hex(self):
@@ -3486,20 +3286,18 @@ class T8607(JTMessage):
             route_ids(list): empty list if all is 1
                 item(int): route id
         """
-        route_num = int(self.__body[:2], 16)
-        route_id_data = self.__body[2:]
-        route_ids = [int(route_id_data[i * 8:(i + 1) * 8], 16) for i in range(route_num)]
+        ids = self.schema_from_hex()["ids"]
         self.__body_data = {
-            "all": 1 if route_num == 0 else 0,
-            "route_ids": route_ids,
+            "all": 1 if not ids else 0,
+            "route_ids": ids,
         }
 
 
 class T8608(JTMessage):
     """Query area or route data"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8608
 
     def body_from_hex(self):
@@ -3513,21 +3311,14 @@ class T8608(JTMessage):
             ids(list):
                 item(int): area or route id
         """
-        query_type = int(self.__body[:2], 16)
-        query_num = int(self.__body[2:10], 16)
-        query_id_info = self.__body[10:]
-        ids = [int(query_id_info[i * 8:(i + 1) * 8], 16) for i in range(query_num)]
-        self.__body_data = {
-            "query_type": query_type,
-            "ids": ids,
-        }
+        self.__body_data = self.schema_from_hex()
 
 
 class T0608(JTMessage):
     """Query area or route data response"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x0608
 
     def set_params(self, query_type, data):
@@ -3561,8 +3352,8 @@ class T0608(JTMessage):
 class T8700(JTMessage):
     """Driving record data collection"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8700
 
     def body_from_hex(self):
@@ -3589,8 +3380,8 @@ class T8700(JTMessage):
 class T0700(JTMessage):
     """Driving record data upload"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x0700
 
     def set_params(self, response_serial_no, cmd_word, cmd_data):
@@ -3605,24 +3396,21 @@ class T0700(JTMessage):
                 37: logging record
             cmd_data(bytes): read record file bytes data
         """
-        self.__response_serial_no = str_fill(hex(response_serial_no)[2:], target_len=4)
-        self.__cmd_word = str_fill(hex(cmd_word)[2:], target_len=2)
-        self.__cmd_data = ubinascii.hexlify(cmd_data).decode("gbk")
+        self.__values = {
+            "response_serial_no": response_serial_no,
+            "cmd_word": cmd_word,
+            "cmd_data": cmd_data,
+        }
 
     def body_to_hex(self):
-        kwargs = {
-            "response_serial_no": self.__response_serial_no,
-            "cmd_word": self.__cmd_word,
-            "cmd_data": self.__cmd_data,
-        }
-        self.__body = "{response_serial_no}{cmd_word}{cmd_data}".format(**kwargs)
+        self.schema_to_hex(self.__values)
 
 
 class T8701(JTMessage):
     """Form record parameter download"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8701
 
     def body_from_hex(self):
@@ -3636,21 +3424,14 @@ class T8701(JTMessage):
                 37: logging record
             cmd_data(bytes): record file bytes data
         """
-        cmd_word = int(self.__body[:2], 16)
-        cmd_data = b""
-        if self.__body[2:]:
-            cmd_data = ubinascii.unhexlify(self.__body[2:])
-        self.__body_data = {
-            "cmd_word": cmd_word,
-            "cmd_data": cmd_data,
-        }
+        self.__body_data = self.schema_from_hex()
 
 
 class T0701(JTMessage):
     """Electronic Waybill Reporting"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x0701
 
     def set_params(self, data):
@@ -3658,30 +3439,27 @@ class T0701(JTMessage):
         Args:
             data(bytes): Electronic Waybill data.
         """
-        self.__data = ubinascii.hexlify(data).decode("gbk")
-        self.__data_len = str_fill(hex(int(len(self.__data) / 2))[2:], target_len=8)
+        self.__values = {
+            "data": data,
+        }
 
     def body_to_hex(self):
-        kwargs = {
-            "data_len": self.__data_len,
-            "data": self.__data,
-        }
-        self.__body = "{data_len}{data}".format(**kwargs)
+        self.schema_to_hex(self.__values)
 
 
 class T8702(JTMessage):
     """Report driver identification information request"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8702
 
 
 class T0702(JTMessage):
     """Collect and report driver identity information"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x0702
 
     def set_params(self, status, time, ic_read_result, driver_name, qualification_certificate_code,
@@ -3745,12 +3523,18 @@ class T0702(JTMessage):
 
 class T0704(JTMessage):
     """Bulk upload of positioning data"""
+    __slots__ = ("__data_type", "__datas")
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x0704
+        self.__data_type = "00"
         self.__datas = []
 
+    def reset(self):
+        super().reset()
+        self.__datas.clear()
+
     def set_params(self, data_type):
         """
         Args:
@@ -3771,33 +3555,43 @@ class T0704(JTMessage):
             speed(float): unit: km/h, Accurate to 0.1
             direction(int): range: 0~359, 0 is true North, Clockwise.
             time(str): GMT+8, format: YYMMDDhhmmss
-            loc_additional_info(str): LocAdditonalInfoConfig().value()
+            loc_additional_info(str/bytes/bytearray): LocAdditonalInfoConfig().value(), hex string or raw bytes.
         """
-        self.__alarm_flag = str_fill(hex(alarm_flag)[2:], target_len=8)
-        self.__loc_status = str_fill(hex(loc_status)[2:], target_len=8)
-        self.__latitude = str_fill(hex(int(latitude * (10 ** 6)))[2:], target_len=8)
-        self.__longitude = str_fill(hex(int(longitude * (10 ** 6)))[2:], target_len=8)
-        self.__altitude = str_fill(hex(int(altitude))[2:], target_len=4)
-        self.__speed = str_fill(hex(int(speed * 10))[2:], target_len=4)
-        self.__direction = str_fill(hex(int(direction))[2:], target_len=4)
-        self.__time = time
-        self.__loc_additional_info = loc_additional_info
-
+        if not isinstance(loc_additional_info, str):
+            loc_additional_info = ubinascii.hexlify(loc_additional_info).decode()
         kwargs = {
-            "alarm_flag": self.__alarm_flag,
-            "loc_status": self.__loc_status,
-            "latitude": self.__latitude,
-            "longitude": self.__longitude,
-            "altitude": self.__altitude,
-            "speed": self.__speed,
-            "direction": self.__direction,
-            "time": self.__time,
-            "loc_additional_info": self.__loc_additional_info,
+            "alarm_flag": str_fill(hex(alarm_flag)[2:], target_len=8),
+            "loc_status": str_fill(hex(loc_status)[2:], target_len=8),
+            "latitude": str_fill(hex(int(latitude * (10 ** 6)))[2:], target_len=8),
+            "longitude": str_fill(hex(int(longitude * (10 ** 6)))[2:], target_len=8),
+            "altitude": str_fill(hex(int(altitude))[2:], target_len=4),
+            "speed": str_fill(hex(int(speed * 10))[2:], target_len=4),
+            "direction": str_fill(hex(int(direction))[2:], target_len=4),
+            "time": time,
+            "loc_additional_info": loc_additional_info,
         }
         logger.debug("kwargs: %s" % str(kwargs))
         loc_data = "{alarm_flag}{loc_status}{latitude}{longitude}{altitude}{speed}{direction}{time}{loc_additional_info}".format(**kwargs)
         self.__datas.append("{}{}".format(str_fill(hex(int(len(loc_data) / 2))[2:], target_len=4), loc_data))
 
+    def set_loc_body(self, loc_body):
+        """Add a location data which is already a location report (0x0200) message body.
+
+        Args:
+            loc_body(str): 0x0200 message body hex string.
+        """
+        self.__datas.append("{}{}".format(str_fill(hex(int(len(loc_body) / 2))[2:], target_len=4), loc_body))
+
+    def body_from_hex(self):
+        """Decode a received bulk upload on platform side.
+
+        body_data:
+            data_type(int): 0 - batch report, 1 - blind spot supplementary report
+            locations(LocationColumns): location data columns, see `jt_bulk.LocationColumns`
+        """
+        data_type, locations = decode_t0704_body(ubinascii.unhexlify(self.__body))
+        self.__body_data = {"data_type": data_type, "locations": locations}
+
     def body_to_hex(self):
         kwargs = {
             "data_len": str_fill(hex(len(self.__datas))[2:], target_len=4),
@@ -3810,8 +3604,8 @@ class T0704(JTMessage):
 class T0705(JTMessage):
     """CAN bus data upload"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x0705
         self.__datas = []
 
@@ -3863,8 +3657,8 @@ class T0705(JTMessage):
 class T0800(JTMessage):
     """Multimedia event information upload"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x0800
 
     def set_params(self, media_id, media_type, media_encoding, event_id, channel_id):
@@ -3892,29 +3686,23 @@ class T0800(JTMessage):
                 7 - Take pictures at a fixed distance
             channel_id(int): channel id
         """
-        self.__media_id = str_fill(hex(media_id)[2:], target_len=8)
-        self.__media_type = str_fill(hex(media_type)[2:], target_len=2)
-        self.__media_encoding = str_fill(hex(media_encoding)[2:], target_len=2)
-        self.__event_id = str_fill(hex(event_id)[2:], target_len=2)
-        self.__channel_id = str_fill(hex(channel_id)[2:], target_len=2)
-
-    def body_to_hex(self):
-        kwargs = {
-            "media_id": self.__media_id,
-            "media_type": self.__media_type,
-            "media_encoding": self.__media_encoding,
-            "event_id": self.__event_id,
-            "channel_id": self.__channel_id,
+        self.__values = {
+            "media_id": media_id,
+            "media_type": media_type,
+            "media_encoding": media_encoding,
+            "event_id": event_id,
+            "channel_id": channel_id,
         }
 
-        self.__body = "{media_id}{media_type}{media_encoding}{event_id}{channel_id}".format(**kwargs)
+    def body_to_hex(self):
+        self.schema_to_hex(self.__values)
 
 
 class T0801(JTMessage):
     """Multimedia data upload"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x0801
         self.__loc_data = ""
 
@@ -4002,8 +3790,8 @@ class T0801(JTMessage):
 class T8800(JTMessage):
     """Multimedia data upload response"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8800
 
     def body_from_hex(self):
@@ -4013,21 +3801,14 @@ class T8800(JTMessage):
             package_ids(list):
                 item(int): package id
         """
-        media_id = int(self.__body[:8], 16)
-        retransmission_num = int(self.__body[8:10], 16)
-        ids_data = self.__body[10:]
-        package_ids = [ids_data[i * 4:(i + 1) * 4] for i in range(retransmission_num)]
-        self.__body_data = {
-            "media_id": media_id,
-            "package_ids": package_ids,
-        }
+        self.__body_data = self.schema_from_hex()
 
 
 class T8801(JTMessage):
     """The camera shoots the command immediately"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8801
 
     def body_from_hex(self):
@@ -4059,35 +3840,14 @@ class T8801(JTMessage):
             saturation(int): range: [0:127]
             chroma(int): range: [0:255]
         """
-        channel_id = int(self.__body[:2], 16)
-        shooting_order = int(self.__body[2:6], 16)
-        working_time = int(self.__body[6:10], 16)
-        save_flag = int(self.__body[10:12], 16)
-        resolution = int(self.__body[12:14], 16)
-        quality = int(self.__body[14:16], 16)
-        brightness = int(self.__body[16:18], 16)
-        contrast = int(self.__body[18:20], 16)
-        saturation = int(self.__body[20:22], 16)
-        chroma = int(self.__body[22:24], 16)
-        self.__body_data = {
-            "channel_id": channel_id,
-            "shooting_order": shooting_order,
-            "working_time": working_time,
-            "save_flag": save_flag,
-            "resolution": resolution,
-            "quality": quality,
-            "brightness": brightness,
-            "contrast": contrast,
-            "saturation": saturation,
-            "chroma": chroma,
-        }
+        self.__body_data = self.schema_from_hex()
 
 
 class T0805(JTMessage):
     """The camera shoots the command immediately response"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x0805
 
     def set_params(self, response_serial_no, result, ids):
@@ -4123,8 +3883,8 @@ class T0805(JTMessage):
 class T8802(JTMessage):
     """Stored multimedia data retrieval"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8802
 
     def body_from_hex(self):
@@ -4143,25 +3903,14 @@ class T8802(JTMessage):
             start_time(str): YYMMDDhhmmss
             end_time(str): YYMMDDhhmmss
         """
-        media_type = int(self.__body[:2], 16)
-        channel_id = int(self.__body[2:4], 16)
-        event_id = int(self.__body[4:6], 16)
-        start_time = self.__body[6:18]
-        end_time = self.__body[18:30]
-        self.__body_data = {
-            "media_type": media_type,
-            "channel_id": channel_id,
-            "event_id": event_id,
-            "start_time": start_time,
-            "end_time": end_time,
-        }
+        self.__body_data = self.schema_from_hex()
 
 
 class T0802(JTMessage):
     """Stored multimedia data retrieval response"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x0802
         self.__media_datas = []
 
@@ -4249,8 +3998,8 @@ class T0802(JTMessage):
 class T8803(JTMessage):
     """Store multimedia upload commands"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8803
 
     def body_from_hex(self):
@@ -4275,27 +4024,14 @@ class T8803(JTMessage):
             delete_flag(int):
                 0 - hold, 1 - delete
         """
-        media_type = int(self.__body[:2], 16)
-        channel_id = int(self.__body[2:4], 16)
-        event_code = int(self.__body[4:6], 16)
-        start_time = self.__body[6:18]
-        end_time = self.__body[18:30]
-        delete_flag = int(self.__body[30:32], 16)
-        self.__body_data = {
-            "media_type": media_type,
-            "channel_id": channel_id,
-            "event_code": event_code,
-            "start_time": start_time,
-            "end_time": end_time,
-            "delete_flag": delete_flag,
-        }
+        self.__body_data = self.schema_from_hex()
 
 
 class T8804(JTMessage):
     """Recording start command"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8804
 
     def body_from_hex(self):
@@ -4314,23 +4050,14 @@ class T8804(JTMessage):
                 2 - 23K
                 3 - 32K
         """
-        recording_cmd = int(self.__body[:2], 16)
-        recording_time = int(self.__body[2:6], 16)
-        save_flag = int(self.__body[6:8], 16)
-        audio_sample_rate = int(self.__body[8:10], 16)
-        self.__body_data = {
-            "recording_cmd": recording_cmd,
-            "recording_time": recording_time,
-            "save_flag": save_flag,
-            "audio_sample_rate": audio_sample_rate,
-        }
+        self.__body_data = self.schema_from_hex()
 
 
 class T8805(JTMessage):
     """One-on-one storage multimedia data retrieval upload command"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8805
 
     def body_from_hex(self):
@@ -4340,19 +4067,14 @@ class T8805(JTMessage):
             delete_flag(int):
                 0 - hold, 1 - delete
         """
-        media_id = int(self.__body[:8], 16)
-        delete_flag = int(self.__body[8:10], 16)
-        self.__body_data = {
-            "media_id": media_id,
-            "delete_flag": delete_flag,
-        }
+        self.__body_data = self.schema_from_hex()
 
 
 class T8900(JTMessage):
     """Data downlink transparent transmission"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8900
 
     def body_from_hex(self):
@@ -4368,7 +4090,7 @@ class T8900(JTMessage):
                 Transparent transmission of message content
         """
         data_type = int(self.__body[:2], 16)
-        data = ubinascii.hexlify(self.__body[2:]).decode("gbk")
+        data = ubinascii.unhexlify(self.__body[2:]).decode("gbk")
         self.__body_data = {
             "data_type": data_type,
             "data": data,
@@ -4378,8 +4100,8 @@ class T8900(JTMessage):
 class T0900(JTMessage):
     """Data uplink transparent transmission"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x0900
 
     def set_params(self, data_type, data):
@@ -4393,22 +4115,20 @@ class T0900(JTMessage):
                 0xF0~0xFF - User-defined transparent message
             data(str): Transparent transmission of message content
         """
-        self.__data_type = str_fill(hex(data_type)[2:], target_len=2)
-        self.__data = ubinascii.hexlify(str(data).encode("gbk")).decode("gbk")
+        self.__values = {
+            "data_type": data_type,
+            "data": data,
+        }
 
     def body_to_hex(self):
-        kwargs = {
-            "data_type": self.__data_type,
-            "data": self.__data,
-        }
-        self.__body = "{data_type}{data}".format(**kwargs)
+        self.schema_to_hex(self.__values)
 
 
 class T0901(JTMessage):
     """data compression report"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x0901
 
     def set_params(self, data):
@@ -4416,22 +4136,19 @@ class T0901(JTMessage):
         Args:
             data(str): data compression
         """
-        self.__data = ubinascii.hexlify(data).decode("gbk")
-        self.__data_len = str_fill(hex(int(len(self.__data) / 2))[2:], target_len=8)
+        self.__values = {
+            "data": data,
+        }
 
     def body_to_hex(self):
-        kwargs = {
-            "data_len": self.__data_len,
-            "data": self.__data,
-        }
-        self.__body = "{data_len}{data}".format(**kwargs)
+        self.schema_to_hex(self.__values)
 
 
 class T8A00(JTMessage):
     """Platform RSA public key"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x8A00
 
     def body_from_hex(self):
@@ -4440,19 +4157,16 @@ class T8A00(JTMessage):
             e(int): e of Platform RSA public key {e, n}
             n(str): n of Platform RSA public key {e, n}
         """
-        e = int(self.__body[:8], 16)
-        n = int(self.__body[8:], 16)
-        self.__body_data = {
-            "e": e,
-            "n": n,
-        }
+        body_data = self.schema_from_hex()
+        body_data["n"] = int(ubinascii.hexlify(body_data["n"]).decode(), 16)
+        self.__body_data = body_data
 
 
 class T0A00(JTMessage):
     """Terminal RSA public key"""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, context=None):
+        super().__init__(context)
         self.__message_id = 0x0A00
 
     def set_params(self, e, n):
@@ -4461,15 +4175,13 @@ class T0A00(JTMessage):
             e(int): e of terminal RAS public key {e, n}
             n(str): n of terminal RAS public key {e, n}
         """
-        self.__e = str_fill(hex(e)[2:], target_len=8)
-        self.__n = n
+        self.__values = {
+            "e": e,
+            "n": ubinascii.unhexlify(n),
+        }
 
     def body_to_hex(self):
-        kwargs = {
-            "e": self.__e,
-            "n": self.__n,
-        }
-        self.__body = "{e}{n}".format(**kwargs)
+        self.schema_to_hex(self.__values)
 
 
 DOWNLINK_MESSAGE = {
@@ -4548,3 +4260,6 @@ UPLINK_MESSAGE = {
     0x0901: T0901,
     0x0A00: T0A00,
 }
+
+# Hot uplink messages, clients keep one object of each and `reset` it for the next message.
+REUSED_MSG_ID = (0x0001, 0x0002, 0x0200, 0x0704)
@@ -0,0 +1,705 @@
+# Copyright (c) Quectel Wireless Solution, Co., Ltd.All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+@file      :jt_schema.py
+@author    :Jack Sun (jack.sun@quectel.com)
+@brief     :Declarative message body schemas, compiled to ustruct formats and closures at import
+@version   :1.0.0
+@date      :2026-10-18 15:20:00
+@copyright :Copyright (c) 2022
+"""
+
+import ustruct
+import ubinascii
+from usr.common import str_fill
+
+_NUMBER = 0
+_BCD = 1
+_STRING = 2
+_BYTES = 3
+_GROUP = 4
+_IF = 5
+
+BYTE = (_NUMBER, "B")
+WORD = (_NUMBER, "H")
+DWORD = (_NUMBER, "I")
+
+
+def BCD(size):
+    """BCD[size] field, value is a digit string, e.g. `YYMMDDhhmmss` for BCD(6)."""
+    return (_BCD, size)
+
+
+def STRING(size=0, prefix=None, fill="r"):
+    """GBK string field.
+
+    Args:
+        size(int): fixed byte size, 0 for a length prefixed field or the rest of the body. (default: {0})
+        prefix(str): ustruct format char of the length before the string, `B`, `H` or `I`. (default: {None})
+        fill(str): zero bytes side of a fixed size field, `l` - left, `r` - right. (default: {"r"})
+    """
+    return (_STRING, size, prefix, fill)
+
+
+def BYTES(size=0, prefix=None, fill="r"):
+    """Raw bytes field, same arguments as `STRING`."""
+    return (_BYTES, size, prefix, fill)
+
+
+def GROUP(fields, prefix=None, count=None):
+    """Repeated group field, value is a list of dict.
+
+    A group of one field named None is a list of the field values, e.g. `GROUP([(None, WORD)])`.
+
+    Args:
+        fields(list): fields of one item.
+        prefix(str): ustruct format char of the item count before the items. (default: {None})
+        count(str): name of a field decoded before holding the item count. (default: {None})
+            Items are read to the end of the body if both prefix and count are None.
+    """
+    return (_GROUP, fields, prefix, count)
+
+
+def IF(cond, fields, other=None, default=None):
+    """Conditional fields.
+
+    Args:
+        cond(function): `cond(values, msg)`, values are the fields decoded or given before,
+            msg is the message object passed to `Schema.decode` and `Schema.encode`.
+        fields(list): fields used if cond is True.
+        other(list): fields used if cond is False. (default: {None})
+        default(dict): values set if cond is False when decoding. (default: {None})
+    """
+    return (None, (_IF, cond, fields, other or [], default or {}))
+
+
+def BITS(table):
+    """Converter of a number field to a dict of bits.
+
+    Args:
+        table(tuple): (name, bit) of each bit.
+
+    Returns:
+        tuple: (decode, encode) converter.
+    """
+    def decode(value):
+        return {name: (value >> bit) & 1 for name, bit in table}
+
+    def encode(value):
+        res = 0
+        for name, bit in table:
+            res |= (value.get(name, 0) & 1) << bit
+        return res
+
+    return (decode, encode)
+
+
+def SCALE(factor):
+    """Converter of a number field scaled by factor, e.g. latitude in 1/10^6 degree."""
+    return (lambda value: value / factor, lambda value: int(round(value * factor)))
+
+
+def _gbk_decode(value):
+    return bytes(value).decode("gbk")
+
+
+def _gbk_encode(value):
+    return str(value).encode("gbk")
+
+
+def _bcd_decode(value):
+    return ubinascii.hexlify(value).decode()
+
+
+def _fixed_encoder(size, fill, text):
+    def encode(value):
+        value = _gbk_encode(value)[:size] if text else bytes(value[:size])
+        zero = b"\x00" * (size - len(value))
+        return zero + value if fill == "l" else value + zero
+    return encode
+
+
+def _bcd_encoder(size):
+    def encode(value):
+        return ubinascii.unhexlify(str_fill(value, target_len=size * 2)[-size * 2:])
+    return encode
+
+
+def _fixed_op(fmt, fields):
+    """Closures of consecutive fixed size fields packed by one ustruct format."""
+    fmt = ">" + fmt
+    size = ustruct.calcsize(fmt)
+    fields = tuple(fields)
+    names = tuple([name for name, dec, enc in fields])
+
+    if not [field for field in fields if field[1] or field[2]]:
+        def decode(data, offset, values, msg):
+            values.update(zip(names, ustruct.unpack_from(fmt, data, offset)))
+            return offset + size
+
+        def encode(values, msg, out):
+            out.append(ustruct.pack(fmt, *[values[name] for name in names]))
+
+        return (decode, encode)
+
+    def decode(data, offset, values, msg):
+        items = ustruct.unpack_from(fmt, data, offset)
+        index = 0
+        for name, dec, enc in fields:
+            values[name] = dec(items[index]) if dec else items[index]
+            index += 1
+        return offset + size
+
+    def encode(values, msg, out):
+        out.append(ustruct.pack(fmt, *[enc(values[name]) if enc else values[name] for name, dec, enc in fields]))
+
+    return (decode, encode)
+
+
+def _var_op(name, prefix, text):
+    """Closures of a length prefixed field, or a field to the end of the body if prefix is None."""
+    prefix_fmt = ">" + prefix if prefix else None
+    prefix_size = ustruct.calcsize(prefix_fmt) if prefix else 0
+
+    def decode(data, offset, values, msg):
+        if prefix_fmt:
+            size = ustruct.unpack_from(prefix_fmt, data, offset)[0]
+            offset += prefix_size
+            end = offset + size
+            if end > len(data):
+                raise ValueError("field %s length %s is out of body." % (name, size))
+        else:
+            end = len(data)
+        values[name] = _gbk_decode(data[offset:end]) if text else bytes(data[offset:end])
+        return end
+
+    def encode(values, msg, out):
+        value = _gbk_encode(values[name]) if text else values[name]
+        if prefix_fmt:
+            out.append(ustruct.pack(prefix_fmt, len(value)))
+        out.append(value)
+
+    return (decode, encode)
+
+
+def _group_op(name, ops, prefix, count, scalar):
+    """Closures of a repeated group."""
+    decoders, encoders = ops
+    prefix_fmt = ">" + prefix if prefix else None
+    prefix_size = ustruct.calcsize(prefix_fmt) if prefix else 0
+
+    def decode(data, offset, values, msg):
+        if prefix_fmt:
+            num = ustruct.unpack_from(prefix_fmt, data, offset)[0]
+            offset += prefix_size
+        elif count:
+            num = values[count]
+        else:
+            num = -1
+        items = []
+        while (num < 0 and offset < len(data)) or len(items) < num:
+            item = {}
+            for dec in decoders:
+                offset = dec(data, offset, item, msg)
+            items.append(item[None] if scalar else item)
+        values[name] = items
+        return offset
+
+    def encode(values, msg, out):
+        items = values[name]
+        if prefix_fmt:
+            out.append(ustruct.pack(prefix_fmt, len(items)))
+        for item in items:
+            if scalar:
+                item = {None: item}
+            for enc in encoders:
+                enc(item, msg, out)
+
+    return (decode, encode)
+
+
+def _if_op(cond, ops, other_ops, default):
+    """Closures of conditional fields."""
+    decoders, encoders = ops
+    other_decoders, other_encoders = other_ops
+
+    def decode(data, offset, values, msg):
+        if cond(values, msg):
+            for dec in decoders:
+                offset = dec(data, offset, values, msg)
+        else:
+            values.update(default)
+            for dec in other_decoders:
+                offset = dec(data, offset, values, msg)
+        return offset
+
+    def encode(values, msg, out):
+        for enc in (encoders if cond(values, msg) else other_encoders):
+            enc(values, msg, out)
+
+    return (decode, encode)
+
+
+def _compile(fields):
+    """Compile fields to decoder and encoder closures.
+
+    Returns:
+        tuple: (decoders, encoders)
+            decoders(list): `decode(data, offset, values, msg)` of each op, returns the next offset.
+            encoders(list): `encode(values, msg, out)` of each op, appends bytes to out.
+    """
+    ops = []
+    fmt = ""
+    fixed = []
+    for field in fields:
+        name, kind = field[0], field[1]
+        dec, enc = field[2] if len(field) > 2 else (None, None)
+        if kind[0] == _NUMBER:
+            fmt += kind[1]
+            fixed.append((name, dec, enc))
+            continue
+        if kind[0] == _BCD:
+            fmt += "%ss" % kind[1]
+            fixed.append((name, _bcd_decode, _bcd_encoder(kind[1])))
+            continue
+        if kind[0] in (_STRING, _BYTES) and kind[1]:
+            fmt += "%ss" % kind[1]
+            fixed.append((name, _gbk_decode if kind[0] == _STRING else None, _fixed_encoder(kind[1], kind[3], kind[0] == _STRING)))
+            continue
+        if fixed:
+            ops.append(_fixed_op(fmt, fixed))
+            fmt = ""
+            fixed = []
+        if kind[0] in (_STRING, _BYTES):
+            ops.append(_var_op(name, kind[2], kind[0] == _STRING))
+        elif kind[0] == _GROUP:
+            scalar = len(kind[1]) == 1 and kind[1][0][0] is None
+            ops.append(_group_op(name, _compile(kind[1]), kind[2], kind[3], scalar))
+        elif kind[0] == _IF:
+            ops.append(_if_op(kind[1], _compile(kind[2]), _compile(kind[3]), kind[4]))
+        else:
+            raise ValueError("unknown field type %s of %s." % (kind[0], name))
+    if fixed:
+        ops.append(_fixed_op(fmt, fixed))
+    return ([op[0] for op in ops], [op[1] for op in ops])
+
+
+class Schema(object):
+    """Message body schema.
+
+    Fields are `(name, type)` or `(name, type, (decode, encode))` with value converters, type is one of
+    `BYTE`, `WORD`, `DWORD`, `BCD(n)`, `STRING()`, `BYTES()`, `GROUP()`, and `IF()` adds conditional fields.
+    Consecutive fixed size fields are packed by one ustruct format, the schema is compiled when created.
+    """
+
+    def __init__(self, fields):
+        """
+        Args:
+            fields(list): body fields in order.
+        """
+        decoders, encoders = _compile(fields)
+        self.__decoders = tuple(decoders)
+        self.__encoders = tuple(encoders)
+
+    def decode(self, data, msg=None):
+        """Decode body bytes.
+
+        Args:
+            data(bytes/bytearray/memoryview): message body.
+            msg(object): message object passed to the conditions of `IF` fields. (default: {None})
+
+        Returns:
+            dict: field values.
+        """
+        values = {}
+        offset = 0
+        for dec in self.__decoders:
+            offset = dec(data, offset, values, msg)
+        return values
+
+    def encode(self, values, msg=None):
+        """Encode body bytes.
+
+        Args:
+            values(dict): field values.
+            msg(object): message object passed to the conditions of `IF` fields. (default: {None})
+
+        Returns:
+            bytes: message body.
+        """
+        out = []
+        for enc in self.__encoders:
+            enc(values, msg, out)
+        return b"".join(out)
+
+
+def _version(values, msg):
+    return msg.is_version()
+
+
+_AREA_ATTRIBUTES = BITS((
+    ("time_limit_enable", 0),
+    ("speed_limit_enable", 1),
+    ("alert_driver_when_entering_area", 2),
+    ("alert_platform_when_entering_area", 3),
+    ("alert_driver_when_leaving_area", 4),
+    ("alert_platform_when_leaving_area", 5),
+    ("latitude_direction", 6),
+    ("longitude_direction", 7),
+    ("open_the_door_enable", 8),
+    ("communication_module_enable_when_entering_area", 14),
+    ("gnss_enable_when_entering_area", 15),
+))
+
+_ROUTE_ATTRIBUTES = BITS((
+    ("time_limit_enable", 0),
+    ("alert_driver_when_entering_route", 2),
+    ("alert_platform_when_entering_route", 3),
+    ("alert_driver_when_leaving_route", 4),
+    ("alert_platform_when_leaving_route", 5),
+))
+
+_ROAD_SECTION_ATTRIBUTES = BITS((
+    ("driving_time_limit_enable", 0),
+    ("speed_limit_enable", 1),
+    ("latitude_direction", 2),
+    ("longitude_direction", 3),
+))
+
+_ALARM_CONFIRM = BITS((
+    ("emergency_alarm", 0),
+    ("hazard_alarm", 3),
+    ("in_out_area_alarm", 20),
+    ("in_out_road_alarm", 21),
+    ("insufficient_or_too_long_travel_time_on_the_road_alarm", 22),
+    ("vehicle_illegal_ignition_alarm", 27),
+    ("vehicle_illegal_displacement_alarm", 28),
+))
+
+_TEXT_FLAG = BITS((
+    ("terminal_display", 2),
+    ("terminal_tts_broadcast_and_read", 3),
+    ("flag_msg_type", 5),
+))
+
+_QUESTION_FLAG = BITS((
+    ("emergency", 0),
+    ("terminal_tts_broadcast_and_read", 3),
+    ("advertising_screen_display", 4),
+))
+
+_DEGREE = SCALE(10 ** 6)
+
+
+def _attribute(key):
+    def cond(values, msg):
+        return values["attributes"].get(key) == 1
+    return cond
+
+
+def _speed_limit_and_version(values, msg):
+    return values["attributes"].get("speed_limit_enable") == 1 and msg.is_version()
+
+
+_TIME_LIMIT = IF(_attribute("time_limit_enable"), [
+    ("start_time", BCD(6)),
+    ("end_time", BCD(6)),
+], default={"start_time": "", "end_time": ""})
+
+_SPEED_LIMIT = IF(_attribute("speed_limit_enable"), [
+    ("speed_limit", WORD),
+    ("over_speed_time", BYTE),
+    IF(_version, [("night_speed_limit", WORD)], default={"night_speed_limit": 0}),
+], default={"speed_limit": 0, "over_speed_time": 0, "night_speed_limit": 0})
+
+_AREA_NAME = IF(_version, [("area_name", STRING(prefix="H"))], default={"area_name": ""})
+
+_DELETE_IDS = [("ids", GROUP([(None, DWORD)], prefix="B"))]
+
+BODY_SCHEMA = {
+    0x0001: Schema([
+        ("response_serial_no", WORD),
+        ("response_msg_id", WORD),
+        ("result_code", BYTE),
+    ]),
+    0x8001: Schema([
+        ("serial_no", WORD),
+        ("message_id", WORD),
+        ("result_code", BYTE),
+    ]),
+    0x8004: Schema([
+        ("utc_time", BCD(6)),
+    ]),
+    0x8003: Schema([
+        ("serial_no", WORD),
+        IF(_version, [("total_number", WORD)], other=[("total_number", BYTE)]),
+        ("package_ids", GROUP([(None, WORD)], count="total_number")),
+    ]),
+    0x0005: Schema([
+        ("source_serial_no", WORD),
+        ("package_ids", GROUP([(None, WORD)], prefix="H")),
+    ]),
+    0x8100: Schema([
+        ("serial_no", WORD),
+        ("registration_result", BYTE),
+        ("auth_code", STRING()),
+    ]),
+    0x0102: Schema([
+        IF(_version, [
+            ("auth_code", STRING(prefix="B")),
+            ("imei", STRING(15, fill="l")),
+            ("app_version", STRING(20)),
+        ], other=[
+            ("auth_code", STRING()),
+        ]),
+    ]),
+    0x8103: Schema([
+        ("params", GROUP([
+            ("param_id", DWORD),
+            ("param_value", BYTES(prefix="B")),
+        ], prefix="B")),
+    ]),
+    0x8106: Schema([
+        ("param_ids", GROUP([(None, DWORD)], prefix="B")),
+    ]),
+    0x8108: Schema([
+        ("upgrade_type", BYTE),
+        ("manufacturer_id", STRING(5)),
+        ("terminal_firmware_verion", STRING(prefix="B")),
+        ("upgrade_package", BYTES(prefix="I")),
+    ]),
+    0x0108: Schema([
+        ("upgrade_type", BYTE),
+        ("result_code", BYTE),
+    ]),
+    0x8202: Schema([
+        ("time_interval", WORD),
+        IF(lambda values, msg: values["time_interval"] != 0, [
+            ("location_tracking_validity_period", DWORD),
+        ], default={"location_tracking_validity_period": -1}),
+    ]),
+    0x8203: Schema([
+        ("alarm_msg_serial_no", WORD),
+        ("alarm_type", DWORD, _ALARM_CONFIRM),
+    ]),
+    0x8300: Schema([
+        ("flag", BYTE),
+        IF(_version, [("msg_type", BYTE)], default={"msg_type": 0}),
+        ("message", STRING()),
+    ]),
+    0x8301: Schema([
+        ("set_type", BYTE),
+        ("events", GROUP([
+            ("id", BYTE),
+            ("data", STRING(prefix="B")),
+        ], prefix="B")),
+    ]),
+    0x0301: Schema([
+        ("event_id", BYTE),
+    ]),
+    0x8302: Schema([
+        ("flag", BYTE, _QUESTION_FLAG),
+        ("question_info", STRING(prefix="B")),
+        ("answers", GROUP([
+            ("id", BYTE),
+            ("data", STRING(prefix="H")),
+        ])),
+    ]),
+    0x0302: Schema([
+        ("response_serial_no", WORD),
+        ("answer_id", BYTE),
+    ]),
+    0x8303: Schema([
+        ("set_type", BYTE),
+        ("infos", GROUP([
+            ("type", BYTE),
+            ("name", STRING(prefix="H")),
+        ], prefix="B")),
+    ]),
+    0x0303: Schema([
+        ("info_type", BYTE),
+        ("onoff", BYTE),
+    ]),
+    0x8304: Schema([
+        ("info_type", BYTE),
+        ("info_data", STRING(prefix="H")),
+    ]),
+    0x8400: Schema([
+        ("flag", BYTE),
+        ("phone_number", STRING()),
+    ]),
+    0x8401: Schema([
+        ("set_type", BYTE),
+        ("phonebook", GROUP([
+            ("call_type", BYTE),
+            ("phone", STRING(prefix="B")),
+            ("concat_user", STRING(prefix="B")),
+        ], prefix="B")),
+    ]),
+    0x8500: Schema([
+        IF(_version, [
+            ("data", GROUP([
+                ("id", WORD),
+                ("param", BYTE),
+            ], prefix="H")),
+        ], other=[
+            ("control_flag", BYTE),
+        ]),
+    ]),
+    0x8600: Schema([
+        ("set_attr", BYTE),
+        ("area_data", GROUP([
+            ("area_id", DWORD),
+            ("attributes", WORD, _AREA_ATTRIBUTES),
+            ("center_latitude", DWORD, _DEGREE),
+            ("center_longitude", DWORD, _DEGREE),
+            ("radius", DWORD),
+            _TIME_LIMIT,
+            _SPEED_LIMIT,
+            _AREA_NAME,
+        ], prefix="B")),
+    ]),
+    0x8601: Schema(_DELETE_IDS),
+    0x8602: Schema([
+        ("set_attr", BYTE),
+        ("area_data", GROUP([
+            ("area_id", DWORD),
+            ("attributes", WORD, _AREA_ATTRIBUTES),
+            ("upper_left_latitude", DWORD, _DEGREE),
+            ("upper_left_longitude", DWORD, _DEGREE),
+            ("lower_right_latitude", DWORD, _DEGREE),
+            ("lower_right_longitude", DWORD, _DEGREE),
+            _TIME_LIMIT,
+            _SPEED_LIMIT,
+            _AREA_NAME,
+        ], prefix="B")),
+    ]),
+    0x8603: Schema(_DELETE_IDS),
+    0x8604: Schema([
+        ("area_id", DWORD),
+        ("attributes", WORD, _AREA_ATTRIBUTES),
+        _TIME_LIMIT,
+        IF(_attribute("speed_limit_enable"), [
+            ("speed_limit", WORD),
+            ("over_speed_time", BYTE),
+        ], default={"speed_limit": 0, "over_speed_time": 0}),
+        ("point_loction", GROUP([
+            ("latitude", DWORD, _DEGREE),
+            ("longitude", DWORD, _DEGREE),
+        ], prefix="H")),
+        IF(_speed_limit_and_version, [("night_speed_limit", WORD)], default={"night_speed_limit": 0}),
+        _AREA_NAME,
+    ]),
+    0x8605: Schema(_DELETE_IDS),
+    0x8606: Schema([
+        ("route_id", DWORD),
+        ("attributes", WORD, _ROUTE_ATTRIBUTES),
+        _TIME_LIMIT,
+        ("turning_points", GROUP([
+            ("turning_point_id", DWORD),
+            ("road_section_id", DWORD),
+            ("turning_point_latitude", DWORD, _DEGREE),
+            ("turning_point_longitude", DWORD, _DEGREE),
+            ("road_section_width", BYTE),
+            ("attributes", BYTE, _ROAD_SECTION_ATTRIBUTES),
+            IF(_attribute("driving_time_limit_enable"), [
+                ("driving_too_long_time_limit", WORD),
+                ("insufficient_travel_time_limit", WORD),
+            ], default={"driving_too_long_time_limit": -1, "insufficient_travel_time_limit": -1}),
+            _SPEED_LIMIT,
+        ], prefix="H")),
+        IF(_version, [("route_name", STRING(prefix="H"))], default={"route_name": ""}),
+    ]),
+    0x8607: Schema(_DELETE_IDS),
+    0x8608: Schema([
+        ("query_type", BYTE),
+        ("ids", GROUP([(None, DWORD)], prefix="I")),
+    ]),
+    0x0700: Schema([
+        ("response_serial_no", WORD),
+        ("cmd_word", BYTE),
+        ("cmd_data", BYTES()),
+    ]),
+    0x8701: Schema([
+        ("cmd_word", BYTE),
+        ("cmd_data", BYTES()),
+    ]),
+    0x0701: Schema([
+        ("data", BYTES(prefix="I")),
+    ]),
+    0x0800: Schema([
+        ("media_id", DWORD),
+        ("media_type", BYTE),
+        ("media_encoding", BYTE),
+        ("event_id", BYTE),
+        ("channel_id", BYTE),
+    ]),
+    0x8800: Schema([
+        ("media_id", DWORD),
+        ("package_ids", GROUP([(None, WORD)], prefix="B")),
+    ]),
+    0x8801: Schema([
+        ("channel_id", BYTE),
+        ("shooting_order", WORD),
+        ("working_time", WORD),
+        ("save_flag", BYTE),
+        ("resolution", BYTE),
+        ("quality", BYTE),
+        ("brightness", BYTE),
+        ("contrast", BYTE),
+        ("saturation", BYTE),
+        ("chroma", BYTE),
+    ]),
+    0x8802: Schema([
+        ("media_type", BYTE),
+        ("channel_id", BYTE),
+        ("event_id", BYTE),
+        ("start_time", BCD(6)),
+        ("end_time", BCD(6)),
+    ]),
+    0x8803: Schema([
+        ("media_type", BYTE),
+        ("channel_id", BYTE),
+        ("event_code", BYTE),
+        ("start_time", BCD(6)),
+        ("end_time", BCD(6)),
+        ("delete_flag", BYTE),
+    ]),
+    0x8804: Schema([
+        ("recording_cmd", BYTE),
+        ("recording_time", WORD),
+        ("save_flag", BYTE),
+        ("audio_sample_rate", BYTE),
+    ]),
+    0x8805: Schema([
+        ("media_id", DWORD),
+        ("delete_flag", BYTE),
+    ]),
+    0x0900: Schema([
+        ("data_type", BYTE),
+        ("data", STRING()),
+    ]),
+    0x0901: Schema([
+        ("data", BYTES(prefix="I")),
+    ]),
+    0x8A00: Schema([
+        ("e", DWORD),
+        ("n", BYTES()),
+    ]),
+    0x0A00: Schema([
+        ("e", DWORD),
+        ("n", BYTES()),
+    ]),
+}
@@ -0,0 +1,543 @@
+# Copyright (c) Quectel Wireless Solution, Co., Ltd.All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+@file      :jt_session.py
+@author    :Jack Sun (jack.sun@quectel.com)
+@brief     :JT/T 808 terminal request and platform response correlation
+@version   :1.0.0
+@date      :2026-10-18 11:20:00
+@copyright :Copyright (c) 2022
+"""
+
+import usys
+import utime
+import osTimer
+import _thread
+from usr.logging import getLogger
+
+logger = getLogger(__name__)
+
+_future_lock = _thread.allocate_lock()
+
+
+class ResponseFuture(object):
+    """Waitable result of one terminal request.
+
+    The wait lock is held from creation until the response arrives, so a waiting thread is blocked on the lock and
+    wakes up the moment the downlink thread sets the result.
+    """
+
+    def __init__(self, message_id, serial_no):
+        """
+        Args:
+            message_id(int): server response message id.
+            serial_no(int): terminal request serial number.
+        """
+        self.__message_id = message_id
+        self.__serial_no = serial_no
+        self.__result = None
+        self.__retries = 0
+        self.__done = False
+        self.__wake = False
+        self.__timed_wait = False
+        self.__callbacks = []
+        self.__wait_lock = _thread.allocate_lock()
+        self.__wait_lock.acquire()
+
+    def __wakeup(self):
+        # Called with _future_lock held, release wait lock only once for one wait.
+        if not self.__wake:
+            self.__wake = True
+            self.__wait_lock.release()
+
+    def __wait_timeout(self, args):
+        with _future_lock:
+            # A timer fired after the result or after the wait returned must not release the wait lock again.
+            if self.__timed_wait and not self.__done:
+                self.__wakeup()
+
+    def get_message_id(self):
+        return self.__message_id
+
+    def get_serial_no(self):
+        return self.__serial_no
+
+    def get_retries(self):
+        """Get retransmission count of this request."""
+        return self.__retries
+
+    def set_retries(self, retries):
+        self.__retries = retries
+
+    def done(self):
+        return self.__done
+
+    def result(self):
+        """Get server response data.
+
+        Returns:
+            dict: server response data, None if not done.
+        """
+        return self.__result
+
+    def set_result(self, result):
+        """Set server response data, wake up waiting thread and call done callbacks.
+
+        Args:
+            result(dict): server response data.
+
+        Returns:
+            bool: True - success, False - result is already set.
+        """
+        with _future_lock:
+            if self.__done:
+                return False
+            self.__result = result
+            self.__done = True
+            self.__wakeup()
+            callbacks = self.__callbacks
+            self.__callbacks = []
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception as e:
+                usys.print_exception(e)
+        return True
+
+    def add_done_callback(self, callback):
+        """Add done callback, callback is called at once if result is already set.
+
+        Args:
+            callback(function): callback(future), called in the thread which sets the result.
+        """
+        with _future_lock:
+            if not self.__done:
+                self.__callbacks.append(callback)
+                return
+        callback(self)
+
+    def wait(self, timeout=None):
+        """Wait server response data.
+
+        Only one thread should wait with timeout at the same time.
+
+        Args:
+            timeout(int): wait seconds, wait until result is set if None. (default: {None})
+
+        Returns:
+            dict: server response data, None if timeout.
+        """
+        if self.__done:
+            return self.__result
+        timer = None
+        if timeout is not None:
+            timer = osTimer()
+            with _future_lock:
+                self.__timed_wait = True
+            timer.start(int(timeout * 1000), 0, self.__wait_timeout)
+        self.__wait_lock.acquire()
+        with _future_lock:
+            self.__timed_wait = False
+            self.__wake = False
+            if self.__done:
+                # Keep the lock released for other waiting threads.
+                self.__wakeup()
+        if timer is not None:
+            # Timer handles are limited, delete it instead of leaving it to gc.
+            timer.stop()
+            timer.delete_timer()
+        return self.__result
+
+
+class PendingTable(object):
+    """Outstanding terminal requests keyed by (response message id, serial number)."""
+
+    def __init__(self):
+        self.__pending = {}
+        self.__lock = _thread.allocate_lock()
+
+    def add(self, message_id, serial_no):
+        """Register a request which waits for server response.
+
+        Args:
+            message_id(int): server response message id.
+            serial_no(int): terminal request serial number.
+
+        Returns:
+            ResponseFuture: response waitable object.
+        """
+        future = ResponseFuture(message_id, serial_no)
+        with self.__lock:
+            self.__pending[(message_id, serial_no)] = future
+        return future
+
+    def remove(self, message_id, serial_no):
+        """Remove a request from table.
+
+        Returns:
+            ResponseFuture: removed object, None if not exists.
+        """
+        with self.__lock:
+            return self.__pending.pop((message_id, serial_no), None)
+
+    def complete(self, message_id, serial_no, data):
+        """Complete the request of a server response.
+
+        Args:
+            message_id(int): server response message id.
+            serial_no(int): response terminal serial number. If server response has no serial number (0x8004),
+                            the request with the lowest serial number of this response message id is completed.
+            data(dict): server response data.
+
+        Returns:
+            bool: True - a request is completed, False - no request waits for this response.
+        """
+        with self.__lock:
+            if serial_no is None:
+                keys = [key for key in self.__pending.keys() if key[0] == message_id]
+                future = self.__pending.pop(min(keys, key=lambda key: key[1]), None) if keys else None
+            else:
+                future = self.__pending.pop((message_id, serial_no), None)
+        if future is None:
+            logger.debug("No request waits for response %s serial no %s" % (message_id, serial_no))
+            return False
+        return future.set_result(data)
+
+    def size(self):
+        return len(self.__pending)
+
+    def clear(self, result=None):
+        """Remove all requests and wake up waiting threads.
+
+        Args:
+            result(dict): result set to all removed requests. (default: {None})
+        """
+        with self.__lock:
+            futures = list(self.__pending.values())
+            self.__pending.clear()
+        for future in futures:
+            future.set_result(result)
+
+
+class SubpackageTable(object):
+    """Reassembly of downlink subpackages, one unfinished message of each message id.
+
+    An unfinished message is kept for `timeout` from its first package. When it times out, `expire` gives its lost
+    package ids to request them again by 0x0005, and the message is dropped if it is still unfinished after another
+    `timeout`. A package of another message with the same message id replaces the unfinished one, unless lost
+    packages of it are requested. It is used by one thread, so it has no lock.
+    """
+
+    def __init__(self, timeout=30000):
+        """
+        Args:
+            timeout(int): milliseconds to wait for the rest packages. (default: {30000})
+        """
+        self.__timeout = timeout
+        # message_id: [first serial no, package total, {package_no: (header, body)}, start ticks, requested]
+        self.__messages = {}
+
+    def add(self, header, body):
+        """Keep a subpackage.
+
+        Args:
+            header(dict): subpackage header.
+            body(str): subpackage body.
+
+        Returns:
+            tuple: (header, body) of the full message, None if it is unfinished.
+        """
+        message_id = header["message_id"]
+        first_serial_no = (header["serial_no"] - header["package_no"] + 1) & 0xFFFF
+        item = self.__messages.get(message_id)
+        if item is None or (not item[4] and (item[0] != first_serial_no or item[1] != header["package_total"])):
+            item = [first_serial_no, header["package_total"], {}, utime.ticks_ms(), False]
+            self.__messages[message_id] = item
+        packages = item[2]
+        packages[header["package_no"]] = (header, body)
+        if len(packages) < item[1]:
+            return None
+        self.__messages.pop(message_id)
+        header = dict(packages[1][0]) if 1 in packages else dict(header)
+        header["package_total"] = 0
+        header["package_no"] = 0
+        return header, "".join([packages[i][1] for i in range(1, item[1] + 1)])
+
+    def expire(self):
+        """Request lost packages of timeout messages, and drop the ones which are requested already.
+
+        Returns:
+            list: item is (first serial number, lost package ids) to request by 0x0005.
+        """
+        now = utime.ticks_ms()
+        requests = []
+        for message_id in list(self.__messages.keys()):
+            item = self.__messages[message_id]
+            if utime.ticks_diff(now, item[3]) < self.__timeout:
+                continue
+            if item[4]:
+                logger.debug("drop unfinished subpackages of %s" % message_id)
+                self.__messages.pop(message_id)
+                continue
+            item[3] = now
+            item[4] = True
+            requests.append((item[0], [i for i in range(1, item[1] + 1) if i not in item[2]]))
+        return requests
+
+    def size(self):
+        """Get count of unfinished messages."""
+        return len(self.__messages)
+
+    def clear(self):
+        self.__messages.clear()
+
+
+class RetransmitScheduler(object):
+    """Retransmit requests which get no server response, driven by one timer wheel.
+
+    The wheel has `slots` slots and moves one slot every `tick` milliseconds, a request waiting longer than one wheel
+    round is kept with the remaining rounds. The timeout of every retransmission follows JT/T 808
+    `T(n+1) = T(n) * (n + 1)`, T(1) is the response timeout. A timeout is never shorter than it, and may be up to one
+    tick longer. When the retry count is used up, the request is removed from the pending table and its result is
+    set to an empty dict.
+
+    Without timer, the wheel is moved by the caller's event loop with `advance`.
+    """
+
+    def __init__(self, send_func, pending, timeout=30, retry_count=3, tick=1000, slots=64, timer=True):
+        """
+        Args:
+            send_func(function): send_func(data), send a frame to server, return bool.
+            pending(PendingTable): pending table which is completed by downlink thread, None if the requests are
+                                   removed from their tables by done callbacks.
+            timeout(int): response timeout seconds, terminal param 0x0002 (TCP) or 0x0004 (UDP). (default: {30})
+            retry_count(int): retransmission count, terminal param 0x0003 (TCP) or 0x0005 (UDP). (default: {3})
+            tick(int): wheel tick milliseconds. (default: {1000})
+            slots(int): wheel slot count. (default: {64})
+            timer(bool): True - move the wheel by an osTimer, False - by calling `advance`. (default: {True})
+        """
+        self.__send_func = send_func
+        self.__pending = pending
+        self.__timeout = timeout
+        self.__retry_count = retry_count
+        self.__tick = tick
+        self.__wheel = [[] for i in range(slots)]
+        self.__cursor = 0
+        self.__count = 0
+        self.__retransmissions = 0
+        self.__failures = 0
+        self.__lock = _thread.allocate_lock()
+        self.__timer = osTimer() if timer else None
+        self.__timer_run = False
+
+    def __add(self, entry, timeout, between=False):
+        # Called with self.__lock held. entry: [future, data, retries, timeout, rounds]
+        ticks = (timeout + self.__tick - 1) // self.__tick
+        if ticks < 1:
+            ticks = 1
+        if between:
+            # Added between two ticks, the next tick may come at once, wait one more tick so it is never early.
+            ticks += 1
+        slots = len(self.__wheel)
+        entry[3] = timeout
+        entry[4] = (ticks - 1) // slots
+        self.__wheel[(self.__cursor + ticks) % slots].append(entry)
+        self.__count += 1
+        if not self.__timer_run and self.__timer is not None:
+            self.__timer_run = True
+            self.__timer.start(self.__tick, 1, self.__on_tick)
+
+    def __on_tick(self, args):
+        items = []
+        failed = []
+        with self.__lock:
+            self.__cursor = (self.__cursor + 1) % len(self.__wheel)
+            slot = self.__wheel[self.__cursor]
+            self.__wheel[self.__cursor] = []
+            for entry in slot:
+                self.__count -= 1
+                future = entry[0]
+                if future.done():
+                    continue
+                if entry[4] > 0:
+                    entry[4] -= 1
+                    self.__wheel[self.__cursor].append(entry)
+                    self.__count += 1
+                elif entry[2] >= self.__retry_count:
+                    failed.append(future)
+                else:
+                    # T(n+1) = T(n) * (n + 1)
+                    entry[2] += 1
+                    future.set_retries(entry[2])
+                    self.__add(entry, entry[3] * (entry[2] + 1))
+                    items.append(entry)
+            self.__retransmissions += len(items)
+            self.__failures += len(failed)
+            if self.__count == 0 and self.__timer_run:
+                self.__timer_run = False
+                self.__timer.stop()
+        for entry in items:
+            send_res = self.__send_func(entry[1])
+            logger.debug("retransmit %s serial no %s count %s res: %s" % (entry[0].get_message_id(), entry[0].get_serial_no(), entry[2], send_res))
+        for future in failed:
+            if self.__pending is not None:
+                self.__pending.remove(future.get_message_id(), future.get_serial_no())
+            future.set_result({})
+
+    def advance(self):
+        """Move the wheel one tick, call it every `tick` milliseconds when the scheduler has no timer."""
+        self.__on_tick(None)
+
+    def get_tick(self):
+        return self.__tick
+
+    def schedule(self, future, data):
+        """Start response timeout of a sent request.
+
+        Args:
+            future(ResponseFuture): request from pending table.
+            data(bytes): request frame, sent again when response timeout.
+        """
+        with self.__lock:
+            # The wheel is aligned to this request if the timer is started by it.
+            between = self.__timer is None or self.__timer_run
+            self.__add([future, data, 0, 0, 0], int(self.__timeout * 1000), between)
+
+    def set_params(self, timeout=None, retry_count=None):
+        """Set response timeout and retransmission count, used by requests scheduled later.
+
+        Args:
+            timeout(int): response timeout seconds. (default: {None})
+            retry_count(int): retransmission count. (default: {None})
+        """
+        if timeout is not None and timeout > 0:
+            self.__timeout = timeout
+        if retry_count is not None and retry_count >= 0:
+            self.__retry_count = retry_count
+
+    def get_params(self):
+        return {"timeout": self.__timeout, "retry_count": self.__retry_count}
+
+    def outstanding(self):
+        """Get count of requests waiting for response timeout."""
+        return self.__count
+
+    def stats(self):
+        """Get scheduler statistics.
+
+        Returns:
+            dict:
+                outstanding(int): requests waiting for response timeout.
+                retransmissions(int): total retransmission count.
+                failures(int): requests not get response after all retransmissions.
+        """
+        return {"outstanding": self.__count, "retransmissions": self.__retransmissions, "failures": self.__failures}
+
+
+class WindowSender(object):
+    """Send requests without waiting for the response of the previous one.
+
+    At most `window` requests wait for server response at the same time, the others are queued in order.
+    Retransmission of the sent requests is done by RetransmitScheduler.
+    """
+
+    def __init__(self, send_func, pending, scheduler, window=8):
+        """
+        Args:
+            send_func(function): send_func(data), send a frame to server, return bool.
+            pending(PendingTable): pending table which is completed by downlink thread.
+            scheduler(RetransmitScheduler): retransmission scheduler.
+            window(int): max count of requests waiting for server response. (default: {8})
+        """
+        self.__send_func = send_func
+        self.__pending = pending
+        self.__scheduler = scheduler
+        self.__window = window
+        self.__inflight = {}
+        self.__queue = []
+        self.__lock = _thread.allocate_lock()
+
+    def __transmit(self, items):
+        for future, data in items:
+            send_res = self.__send_func(data)
+            logger.debug("window send %s serial no %s res: %s" % (future.get_message_id(), future.get_serial_no(), send_res))
+            self.__scheduler.schedule(future, data)
+
+    def __start(self, future, data):
+        # Called with self.__lock held, return the item to transmit.
+        self.__inflight[(future.get_message_id(), future.get_serial_no())] = future
+        return (future, data)
+
+    def __on_done(self, future):
+        items = []
+        with self.__lock:
+            if self.__inflight.pop((future.get_message_id(), future.get_serial_no()), None) is None:
+                # Completed before sent, e.g. pending table is cleared.
+                self.__queue = [item for item in self.__queue if item[0] is not future]
+            while self.__queue and len(self.__inflight) < self.__window:
+                items.append(self.__start(*self.__queue.pop(0)))
+        self.__transmit(items)
+
+    def send(self, data, res_msg_id, serial_no):
+        """Send a request without blocking.
+
+        Args:
+            data(bytes): message info
+            res_msg_id(int): server response message id
+            serial_no(int): this send message serial number.
+
+        Returns:
+            ResponseFuture: result is server response data, or empty dict if not get server response.
+        """
+        future = self.__pending.add(res_msg_id, serial_no)
+        items = []
+        with self.__lock:
+            if len(self.__inflight) < self.__window and not self.__queue:
+                items.append(self.__start(future, data))
+            else:
+                self.__queue.append((future, data))
+        future.add_done_callback(self.__on_done)
+        self.__transmit(items)
+        return future
+
+    def set_window(self, window):
+        """Set max count of requests waiting for server response.
+
+        Args:
+            window(int): window size, must be greater than 0.
+
+        Returns:
+            bool: True - success, False - failed.
+        """
+        if not isinstance(window, int) or window <= 0:
+            return False
+        items = []
+        with self.__lock:
+            self.__window = window
+            while self.__queue and len(self.__inflight) < self.__window:
+                items.append(self.__start(*self.__queue.pop(0)))
+        self.__transmit(items)
+        return True
+
+    def get_window(self):
+        return self.__window
+
+    def inflight(self):
+        """Get count of requests waiting for server response."""
+        return len(self.__inflight)
+
+    def queued(self):
+        """Get count of requests waiting for a free window."""
+        return len(self.__queue)
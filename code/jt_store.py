@@ -0,0 +1,254 @@
+# Copyright (c) Quectel Wireless Solution, Co., Ltd.All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+@file      :jt_store.py
+@author    :Jack Sun (jack.sun@quectel.com)
+@brief     :File backed FIFO for uplink reports kept while server is not connected
+@version   :1.0.0
+@date      :2026-10-18 13:10:00
+@copyright :Copyright (c) 2022
+"""
+
+import uos
+import usys
+import ql_fs
+import ustruct
+import _thread
+from usr.logging import getLogger
+from usr.jt_frame import XorChecksum
+
+logger = getLogger(__name__)
+
+_SEGMENT_SUFFIX = ".dat"
+_HEAD_FILE = "head"
+
+
+class OfflineStore(object):
+    """Persistent FIFO of records, one record is the message body of a location report (0x0200).
+
+    Records are appended to segment files in the store directory, each record is `length(2) + check code(1) + data`.
+    A record is flushed right after it is written, and a record cut off by power down fails the length or check code
+    check when read, so it is discarded with the rest of its segment and the next append starts a new segment.
+
+    Read position is kept in `head` file as `segment offset`, it is written to a temp file and renamed after the
+    records are confirmed, so a record is never lost but may be read again after power down.
+
+    Disk usage is bounded by `max_size`, the oldest segment is removed when it is exceeded.
+    """
+
+    def __init__(self, path="/usr/jt808_offline", max_size=0x10000, segment_size=0x2000):
+        """
+        Args:
+            path(str): store directory. (default: {"/usr/jt808_offline"})
+            max_size(int): max total size of segment files. (default: {0x10000})
+            segment_size(int): max size of one segment file. (default: {0x2000})
+        """
+        self.__path = path if not path.endswith("/") else path[:-1]
+        self.__max_size = max_size
+        self.__segment_size = segment_size if segment_size < max_size else max_size
+        self.__segments = []
+        self.__sizes = {}
+        self.__head = (0, 0)
+        self.__count = 0
+        self.__dropped = 0
+        self.__new_segment = False
+        self.__lock = _thread.allocate_lock()
+        self.__load()
+
+    def __segment_file(self, segment):
+        return "%s/%08d%s" % (self.__path, segment, _SEGMENT_SUFFIX)
+
+    def __scan(self, segment, offset=0):
+        """Read records of a segment from offset.
+
+        Returns:
+            tuple: (records, end)
+                records(list): (offset, data) of each valid record.
+                end(int): offset after the last valid record.
+        """
+        records = []
+        if not self.__sizes.get(segment):
+            return records, offset
+        with open(self.__segment_file(segment), "rb") as f:
+            data = f.read()
+        end = offset
+        while end + 3 <= len(data):
+            size, check_code = ustruct.unpack_from(">HB", data, end)
+            if end + 3 + size > len(data):
+                break
+            record = data[end + 3:end + 3 + size]
+            if XorChecksum(record).digest() != check_code:
+                break
+            records.append((end, record))
+            end += 3 + size
+        return records, end
+
+    def __load(self):
+        if not ql_fs.path_exists(self.__path):
+            uos.mkdir(self.__path)
+        self.__segments = sorted([int(name[:-len(_SEGMENT_SUFFIX)]) for name in uos.listdir(self.__path) if name.endswith(_SEGMENT_SUFFIX)])
+        head_file = self.__path + "/" + _HEAD_FILE
+        if ql_fs.path_exists(head_file):
+            try:
+                with open(head_file, "r") as f:
+                    segment, offset = f.read().split()
+                self.__head = (int(segment), int(offset))
+            except Exception as e:
+                usys.print_exception(e)
+        for segment in self.__segments[:]:
+            if segment < self.__head[0]:
+                self.__remove_segment(segment)
+                continue
+            self.__sizes[segment] = ql_fs.path_getsize(self.__segment_file(segment))
+            records, end = self.__scan(segment, self.__head[1] if segment == self.__head[0] else 0)
+            self.__count += len(records)
+            if end != self.__sizes[segment]:
+                logger.error("offline store segment %s is broken at %s, size %s" % (segment, end, self.__sizes[segment]))
+                self.__new_segment = True
+        if self.__segments and self.__head[0] < self.__segments[0]:
+            self.__head = (self.__segments[0], 0)
+        logger.debug("offline store segments %s, head %s, records %s" % (self.__segments, self.__head, self.__count))
+
+    def __remove_segment(self, segment):
+        try:
+            uos.remove(self.__segment_file(segment))
+        except Exception as e:
+            usys.print_exception(e)
+        if segment in self.__segments:
+            self.__segments.remove(segment)
+        self.__sizes.pop(segment, None)
+
+    def __save_head(self):
+        head_file = self.__path + "/" + _HEAD_FILE
+        with open(head_file + ".tmp", "w") as f:
+            f.write("%s %s" % self.__head)
+        uos.rename(head_file + ".tmp", head_file)
+
+    def __drop_oldest(self):
+        segment = self.__segments[0]
+        offset = self.__head[1] if segment == self.__head[0] else 0
+        records, end = self.__scan(segment, offset)
+        self.__count -= len(records)
+        self.__dropped += len(records)
+        logger.error("offline store is full, drop %s records" % len(records))
+        self.__remove_segment(segment)
+        self.__head = (self.__segments[0], 0) if self.__segments else (segment + 1, 0)
+        self.__save_head()
+
+    def append(self, record):
+        """Append a record.
+
+        Args:
+            record(bytes): record data, length must be less than 0x10000.
+
+        Returns:
+            bool: True - success, False - failed.
+        """
+        size = len(record) + 3
+        if size - 3 > 0xFFFF or size > self.__segment_size:
+            return False
+        with self.__lock:
+            try:
+                if not self.__segments or self.__new_segment or self.__sizes[self.__segments[-1]] + size > self.__segment_size:
+                    segment = self.__segments[-1] + 1 if self.__segments else self.__head[0]
+                    self.__segments.append(segment)
+                    self.__sizes[segment] = 0
+                    self.__new_segment = False
+                while sum(self.__sizes.values()) + size > self.__max_size and len(self.__segments) > 1:
+                    self.__drop_oldest()
+                segment = self.__segments[-1]
+                with open(self.__segment_file(segment), "ab") as f:
+                    f.write(ustruct.pack(">HB", len(record), XorChecksum(record).digest()))
+                    f.write(record)
+                    f.flush()
+                self.__sizes[segment] += size
+                self.__count += 1
+                return True
+            except Exception as e:
+                usys.print_exception(e)
+                # The segment tail may be broken, write next record to a new segment.
+                self.__new_segment = True
+        return False
+
+    def peek(self, max_size, max_count=0xFFFF):
+        """Read records from head without removing them.
+
+        Args:
+            max_size(int): max total size of records, `2 + len(data)` for each record.
+            max_count(int): max count of records. (default: {0xFFFF})
+
+        Returns:
+            tuple: (records, position)
+                records(list): record data list.
+                position(tuple): pass to `commit` to remove these records.
+        """
+        with self.__lock:
+            if not self.__count:
+                return [], self.__head
+            segment, offset = self.__head
+            if segment not in self.__segments:
+                segment, offset = self.__segments[0], 0
+            records, end = self.__scan(segment, offset)
+            res = []
+            total = 0
+            position = (segment, offset)
+            for start, record in records:
+                if total + 2 + len(record) > max_size or len(res) >= max_count:
+                    break
+                res.append(record)
+                total += 2 + len(record)
+                position = (segment, start + 3 + len(record))
+            if not records:
+                # Broken or fully read segment, move to the next one.
+                position = (segment, self.__sizes.get(segment, 0))
+            return res, position
+
+    def commit(self, position, count):
+        """Remove records read by `peek`.
+
+        Args:
+            position(tuple): position from `peek`.
+            count(int): count of records read by `peek`.
+        """
+        with self.__lock:
+            segment, offset = position
+            self.__count -= count if count < self.__count else self.__count
+            if segment in self.__segments and offset >= self.__sizes[segment] and segment != self.__segments[-1]:
+                self.__remove_segment(segment)
+                self.__head = (self.__segments[0], 0)
+            elif segment in self.__segments and offset >= self.__sizes[segment] and not self.__count:
+                # All records are read, start a new segment for later records.
+                self.__remove_segment(segment)
+                self.__head = (segment + 1, 0)
+            else:
+                self.__head = (segment, offset)
+            self.__save_head()
+
+    def count(self):
+        """Get count of records in store."""
+        return self.__count
+
+    def dropped(self):
+        """Get count of records dropped because store is full."""
+        return self.__dropped
+
+    def clear(self):
+        with self.__lock:
+            for segment in self.__segments[:]:
+                self.__remove_segment(segment)
+            self.__head = (self.__head[0] + 1, 0)
+            self.__count = 0
+            self.__new_segment = False
+            self.__save_head()
@@ -26,9 +26,13 @@ import usys
 import utime
 import osTimer
 import _thread
+import ubinascii
 from usr.logging import getLogger
 from usr.common import TCPUDPBase
-from usr.jt_message import DOWNLINK_MESSAGE, UPLINK_MESSAGE, JTMessageParse, set_jtmsg_config
+from usr.jt_frame import StreamDeframer
+from usr.jt_media import MAX_FRAGMENT_SIZE, MediaUploadStream
+from usr.jt_session import PendingTable, RetransmitScheduler, WindowSender
+from usr.jt_message import DOWNLINK_MESSAGE, UPLINK_MESSAGE, REUSED_MSG_ID, JTMessageParse, ProtocolContext
 
 logger = getLogger(__name__)
 
@@ -40,12 +44,15 @@ GENERAL_ANSWER_MSG_ID = (
     0x8606, 0x8607, 0x8701, 0x8803, 0x8804, 0x8805, 0x8900, 0x8A00
 )
 
+# Media uploads kept for multimedia data upload answer (0x8800) retransmission requests, the oldest is dropped first.
+MEDIA_RETRANSMIT_KEPT = 4
+
 
 class JTT808Base(TCPUDPBase):
     """This class is base option for JTT808."""
 
     def __init__(self, ip=None, port=None, domain=None, method="TCP", timeout=30,
-                 retry_count=3, version="2019", client_id=""):
+                 retry_count=3, version="2019", client_id="", context=None):
         """
         Args:
             ip: server ip address (default: {None})
@@ -56,18 +63,35 @@ class JTT808Base(TCPUDPBase):
             retry_count: socket send data retry count. (default: {3})
             version: jtt808 version (default: {"2019"})
             client_id: device sim phone number. (default: {""})
+            context: protocol config of this terminal, `version` and `client_id` are not used if it is set. (default: {None})
+
+        Raises:
+            ValueError: client_id is empty when context is None.
         """
         super().__init__(ip=ip, port=port, domain=domain, method=method, timeout=timeout)
-        set_jtmsg_config(jtt808_version=version, client_id=client_id)
-        self.__retry_count = retry_count
-        self.__response_res = {}
+        if context is None:
+            if not client_id:
+                raise ValueError("client_id is not exists.")
+            context = ProtocolContext(version, client_id)
+        self.__context = context
+        self.__pending = PendingTable()
+        self.__scheduler = RetransmitScheduler(self.__send, self.__pending, timeout, retry_count)
+        self.__window_sender = None
+        self.__authenticated = False
         self.__response_subpkg = {}
         self.__subpkg_timer = {}
         self.__subpkg_msg_ids = []
         self.__resend_subpkg_msg_ids = []
-        self.__encryption = False
-        self.__rsa_e = None
-        self.__rsa_n = None
+        self.__msg_parser = JTMessageParse(self.__context)
+        self.__deframer = StreamDeframer()
+        self.__media_streams = []
+        self.__media_lock = _thread.allocate_lock()
+        # Media packages are sent by one thread at a time, resent packages follow the upload still sending.
+        self.__media_send_lock = _thread.allocate_lock()
+        self.__media_stats = {"requests": 0, "packages": 0, "failures": 0}
+        # Retransmission requests (0x8800) are handled in order by one worker thread.
+        self.__media_requests = []
+        self.__media_worker = False
 
     def __splice_subpackage(self, header, source_body):
         """This function to splice server subpackage request
@@ -140,37 +164,6 @@ class JTT808Base(TCPUDPBase):
                 package_ids = [i for i in range(1, self.__response_subpkg[msg_id]["total_num"]) if i not in self.__response_subpkg[msg_id]["subpackage"].keys()]
                 self.__resend_subpackage(source_serial_no, package_ids)
 
-    def __get_response(self, message_id, serial_no, timeout):
-        """Get server response data.
-
-        Args:
-            message_id(int): server response message id.
-            serial_no(int): terminal request serial number.
-            timeout(int): read result timeout.
-
-        Returns:
-            dict: server response data
-        """
-        data = {}
-        count = 0
-        while count < timeout * 10:
-            if self.status() != 0:
-                break
-            if self.__response_res.get(message_id) is not None:
-                if self.__response_res[message_id].get(serial_no) is not None:
-                    data = self.__response_res[message_id].pop(serial_no)
-                    if self.__response_res.get(message_id) is not None:
-                        self.__response_res.pop(message_id)
-                    break
-                elif self.__response_res[message_id].get(message_id) is not None:
-                    data = self.__response_res[message_id].pop(message_id)
-                    if self.__response_res.get(message_id) is not None:
-                        self.__response_res.pop(message_id)
-                    break
-            utime.sleep_ms(100)
-            count += 1
-        return data
-
     def __resend_subpackage(self, source_serial_no, package_ids):
         """Rquest resend subpackage for server.
 
@@ -179,7 +172,7 @@ class JTT808Base(TCPUDPBase):
             package_ids(list):
                 item(int): loss packet id.
         """
-        up_msg_obj = UPLINK_MESSAGE[0x0005]()
+        up_msg_obj = UPLINK_MESSAGE[0x0005](self.__context)
         up_msg_obj.set_params(source_serial_no, package_ids)
         msgs = up_msg_obj.message()
         for serial_no, data in msgs:
@@ -187,6 +180,105 @@ class JTT808Base(TCPUDPBase):
             send_res = self.send(data, None, serial_no)
             logger.debug("__resend_subpackage send res: %s" % send_res)
 
+    def __keep_media_stream(self, stream):
+        """Keep a sent media upload for retransmission requests, only its source and offsets are kept, not frames.
+
+        Only media of a path or of bytes is kept, a file object of the caller may be closed after the upload.
+        """
+        if not stream.reopenable() or stream.package_total() < 2:
+            return
+        with self.__media_lock:
+            self.__media_streams = [item for item in self.__media_streams if item.media_id() != stream.media_id()]
+            self.__media_streams.append(stream)
+            if len(self.__media_streams) > MEDIA_RETRANSMIT_KEPT:
+                self.__media_streams.pop(0)
+
+    def __drop_media_stream(self, media_id):
+        with self.__media_lock:
+            self.__media_streams = [item for item in self.__media_streams if item.media_id() != media_id]
+
+    def __queue_media_request(self, media_id, package_ids):
+        with self.__media_lock:
+            self.__media_requests.append((media_id, package_ids))
+            if self.__media_worker:
+                return
+            self.__media_worker = True
+        _thread.start_new_thread(self.__media_resend_thread, ())
+
+    def __media_resend_thread(self):
+        while True:
+            with self.__media_lock:
+                if not self.__media_requests:
+                    self.__media_worker = False
+                    return
+                media_id, package_ids = self.__media_requests.pop(0)
+            try:
+                self.__resend_media(media_id, package_ids)
+            except Exception as e:
+                usys.print_exception(e)
+
+    def __resend_media(self, media_id, package_ids):
+        """Resend lost packages of a media upload with their original serial numbers.
+
+        Args:
+            media_id(int): media id of multimedia data upload answer (0x8800)
+            package_ids(list):
+                item(int): package number to resend.
+        """
+        with self.__media_send_lock:
+            with self.__media_lock:
+                self.__media_stats["requests"] += 1
+                streams = [item for item in self.__media_streams if item.media_id() == media_id]
+            if not streams:
+                logger.error("media %s is not kept, packages %s can not be resent." % (media_id, package_ids))
+                self.__count_media_stats(failures=len(package_ids))
+                return
+            stream = streams[0]
+            windowed = self.__window_sender is not None
+            try:
+                for package_no in package_ids:
+                    frame = stream.frame(package_no)
+                    logger.debug("__resend_media media %s package %s/%s" % (media_id, package_no, stream.package_total()))
+                    self.__count_media_stats(packages=1)
+                    send_res = self.send(bytes(frame) if windowed else frame, 0x8001, stream.serial_no(package_no))
+                    if self.__send_failed(send_res):
+                        self.__count_media_stats(failures=1)
+            except Exception as e:
+                usys.print_exception(e)
+                self.__count_media_stats(failures=1)
+            finally:
+                stream.close()
+
+    def __count_media_stats(self, packages=0, failures=0):
+        with self.__media_lock:
+            self.__media_stats["packages"] += packages
+            self.__media_stats["failures"] += failures
+
+    def get_media_retransmit_stats(self):
+        """Get statistics of media packages resent for multimedia data upload answer (0x8800).
+
+        Returns:
+            dict:
+                kept(int): media uploads kept for retransmission.
+                requests(int): retransmission requests received.
+                packages(int): packages resent.
+                failures(int): packages not resent or not answered.
+        """
+        with self.__media_lock:
+            stats = dict(self.__media_stats)
+            stats["kept"] = len(self.__media_streams)
+        return stats
+
+    def get_context(self):
+        """Get ProtocolContext of this terminal."""
+        return self.__context
+
+    def connect(self):
+        # Drop unfinished frame of the last connection.
+        self.__deframer.clear()
+        self.__authenticated = False
+        return super().connect()
+
     def set_encryption(self, encryption=False, rsa_e=None, rsa_n=None):
         """Set server communication encryption
 
@@ -203,9 +295,7 @@ class JTT808Base(TCPUDPBase):
             OSError: RSA private key file is not exist when encryption is True.
         """
         try:
-            self.__encryption = encryption
-            self.__rsa_e = rsa_e
-            self.__rsa_n = rsa_n
+            self.__context.set_encryption(encryption, rsa_e, rsa_n)
             if encryption is True:
                 if not rsa_e or not rsa_n:
                     raise ValueError("rsa_e and rsa_n is required fields when encryption is True.")
@@ -216,74 +306,156 @@ class JTT808Base(TCPUDPBase):
         return False
 
     def parse(self, message):
-        """This function is downlink thread function."""
-        try:
-            if message:
-                # Check how many packets are in this message
-                msgs = list(bytearray(message))
-                msg_indexs = [index for index, item in enumerate(msgs) if item == 0x7e]
-                if msg_indexs[1] - msg_indexs[0] == 1:
-                    msg_indexs = msg_indexs[1:]
-                range_num = len(msg_indexs) if len(msg_indexs) % 2 == 0 else len(msg_indexs) - 1
-                # Parse each packet in order
-                for i in range(0, range_num, 2):
-                    msg = bytearray(msgs[msg_indexs[i]:msg_indexs[i + 1] + 1]).decode().encode()
-                    logger.debug("__read_response: %s" % msg)
-                    jtmessageparse_obj = JTMessageParse()
-                    jtmessageparse_obj.set_message(msg)
-                    header = jtmessageparse_obj.get_header()
-                    logger.debug("__read_response header: %s" % header)
-                    if DOWNLINK_MESSAGE.get(header["message_id"]) is None:
-                        logger.error("message_id [%s] is not downlink message id" % header["message_id"])
-                        continue
-                    msg_obj = DOWNLINK_MESSAGE.get(header["message_id"])()
-                    if header["message_id"] == 0x8A00:
-                        msg_obj.set_excryption(False)
-                    resp_body = jtmessageparse_obj.get_body()
-                    logger.debug("__read_response resp_body: %s" % resp_body)
-
-                    # Check subpackage
-                    full_body_flag = True
-                    if header["package_total"] != 0:
-                        if self.__subpkg_timer.get(header["message_id"]) is None:
-                            self.__subpkg_timer[header["message_id"]] = osTimer()
-                            self.__subpkg_timer[header["message_id"]].start(self.__timeout * 1000, 0, self.__check_subpackage)
-                        if header["message_id"] not in self.__subpkg_msg_ids:
-                            self.__subpkg_msg_ids.append(header["message_id"])
-                        full_data = self.__splice_subpackage(header, resp_body)
-                        if not full_data:
-                            full_body_flag = False
+        """This function is downlink thread function.
+
+        Args:
+            message(bytes): received data, an unfinished frame is kept by the stream deframer until the rest arrives.
+
+        Returns:
+            bytes: always empty, no data need to be kept by caller.
+        """
+        self.__deframer.feed(message)
+        # Parse each packet in order
+        for frame in self.__deframer.frames():
+            try:
+                self.__msg_parser.set_message(frame)
+                header = self.__msg_parser.get_header()
+                logger.debug("__read_response header: %s" % header)
+                if DOWNLINK_MESSAGE.get(header["message_id"]) is None:
+                    logger.error("message_id [%s] is not downlink message id" % header["message_id"])
+                    continue
+                msg_obj = DOWNLINK_MESSAGE.get(header["message_id"])(self.__context)
+                if header["message_id"] == 0x8A00:
+                    msg_obj.set_excryption(False)
+                resp_body = self.__msg_parser.get_body()
+                logger.debug("__read_response resp_body: %s" % resp_body)
+
+                # Check subpackage
+                full_body_flag = True
+                if header["package_total"] != 0:
+                    if self.__subpkg_timer.get(header["message_id"]) is None:
+                        self.__subpkg_timer[header["message_id"]] = osTimer()
+                        self.__subpkg_timer[header["message_id"]].start(self.__timeout * 1000, 0, self.__check_subpackage)
+                    if header["message_id"] not in self.__subpkg_msg_ids:
+                        self.__subpkg_msg_ids.append(header["message_id"])
+                    full_data = self.__splice_subpackage(header, resp_body)
+                    if not full_data:
+                        full_body_flag = False
+                    else:
+                        header = full_data["header"]
+                        resp_body = full_data["body"]
+
+                # If this message can parse full body, than notify user by callback function.
+                if full_body_flag:
+                    msg_obj.set_header(header)
+                    msg_obj.set_body(resp_body)
+                    data = msg_obj.body_data()
+                    logger.debug("__read_response body_data: %s" % data)
+                    if header["message_id"] in (0x8001, 0x8100, 0x8003, 0x8004):
+                        self.__pending.complete(header["message_id"], data.get("serial_no"), data)
+                    elif header["message_id"] == 0x8800:
+                        if not data["package_ids"]:
+                            self.__drop_media_stream(data["media_id"])
+                            self.general_answer(header["serial_no"], header["message_id"])
                         else:
-                            header = full_data["header"]
-                            resp_body = full_data["body"]
-
-                    # If this message can parse full body, than notify user by callback function.
-                    if full_body_flag:
-                        msg_obj.set_header(header)
-                        msg_obj.set_body(resp_body)
-                        data = msg_obj.body_data()
-                        logger.debug("__read_response body_data: %s" % data)
-                        if header["message_id"] in (0x8001, 0x8100, 0x8003, 0x8004):
-                            self.__response_res[header["message_id"]] = {data["serial_no"] if data.get("serial_no") is not None else header["message_id"]: data}
-                        elif header["message_id"] == 0x8800:
-                            if not data["package_ids"]:
-                                self.general_answer(header["serial_no"], header["message_id"])
-                            else:
-                                # TODO: When media upload set subpackage, than server may issued this message
-                                # Now media upload do not set subpackage.
-                                pass
+                            # Resent packages wait for answers read by this thread, so one worker sends them.
+                            self.__queue_media_request(data["media_id"], data["package_ids"])
+                    else:
+                        if header["message_id"] == 0x8103:
+                            # Response timeout and retransmission count params are used by the terminal itself.
+                            self.set_retransmit_params({param_id: {"value": value} for param_id, value in data["params"]})
+                        if self.__callback:
+                            # User to ack general_answer in callback for GENERAL_ANSWER_MSG_ID.
+                            _thread.start_new_thread(self.__callback, ({"header": header, "data": data},))
                         else:
-                            if self.__callback:
-                                # User to ack general_answer in callback for GENERAL_ANSWER_MSG_ID.
-                                _thread.start_new_thread(self.__callback, ({"header": header, "data": data},))
-                            else:
-                                # If not set callback, than auto ack general_answer
-                                self.general_answer(header["serial_no"], header["message_id"])
-
-                message = bytearray(msgs[msg_indexs[-1]:]).decode().encode() if len(msg_indexs) % 2 != 0 else b""
+                            # If not set callback, than auto ack general_answer
+                            self.general_answer(header["serial_no"], header["message_id"])
+            except Exception as e:
+                usys.print_exception(e)
+        return b""
+
+    def set_retransmit_params(self, terminal_params):
+        """Set response timeout and retransmission count by terminal params.
+
+        TCP uses 0x0002 (response timeout) and 0x0003 (retransmission count),
+        UDP uses 0x0004 (response timeout) and 0x0005 (retransmission count).
+        It is called with the params of each set terminal params (0x8103) message, a param not given is not changed.
+
+        Args:
+            terminal_params(TerminalParams/dict): TerminalParams object or data from `TerminalParams.get_params()`.
+
+        Returns:
+            bool: True - success, False - failed.
+        """
+        try:
+            params = terminal_params if isinstance(terminal_params, dict) else terminal_params.get_params()
+            timeout_id, retry_id = (0x0002, 0x0003) if self.__method == "TCP" else (0x0004, 0x0005)
+            timeout = params[timeout_id]["value"] if params.get(timeout_id) else None
+            retry_count = params[retry_id]["value"] if params.get(retry_id) else None
+            self.__scheduler.set_params(timeout, retry_count)
+            logger.debug("retransmit params: %s" % self.__scheduler.get_params())
+            return True
         except Exception as e:
             usys.print_exception(e)
-        return message
+        return False
+
+    def get_retransmit_params(self):
+        """Get response timeout and retransmission count used by requests sent later.
+
+        Returns:
+            dict:
+                timeout(int): response timeout seconds.
+                retry_count(int): retransmission count.
+        """
+        return self.__scheduler.get_params()
+
+    def get_retransmit_stats(self):
+        """Get retransmission scheduler statistics.
+
+        Returns:
+            dict:
+                outstanding(int): requests waiting for server response.
+                retransmissions(int): total retransmission count.
+                failures(int): requests not get server response after all retransmissions.
+        """
+        return self.__scheduler.stats()
+
+    def set_send_window(self, window=0):
+        """Set windowed send mode.
+
+        When window is greater than 0, requests which need server response are sent without waiting for the
+        response of the previous one, at most `window` requests wait for response at the same time. Terminal request
+        functions return a `ResponseFuture` instead of the response data in this mode, use `wait()` to get the
+        response data or `add_done_callback()` to get notified.
+
+        Args:
+            window(int): max count of requests waiting for server response, 0 - disable windowed send mode. (default: {0})
+
+        Returns:
+            bool: True - success, False - failed.
+        """
+        if not isinstance(window, int) or window < 0:
+            return False
+        if window == 0:
+            self.__window_sender = None
+        elif self.__window_sender is None:
+            self.__window_sender = WindowSender(self.__send, self.__pending, self.__scheduler, window)
+        else:
+            self.__window_sender.set_window(window)
+        return True
+
+    def get_send_window(self):
+        """Get windowed send mode window size, 0 - windowed send mode is disabled."""
+        return self.__window_sender.get_window() if self.__window_sender is not None else 0
+
+    def __send_failed(self, send_res):
+        """Check the response of one subpackage, the rest subpackages are not sent if it failed.
+
+        In windowed send mode the response is not known yet, so all subpackages are sent.
+        """
+        if isinstance(send_res, dict):
+            return send_res.get("result_code") != 0
+        return False
 
     def send(self, data, res_msg_id, serial_no):
         """Send data to server
@@ -295,33 +467,33 @@ class JTT808Base(TCPUDPBase):
 
         Returns:
             dict: Return empty dict if not get server response, eles return server response data.
+            ResponseFuture: In windowed send mode, return it at once if `res_msg_id` is not None.
         """
-        resp_res = {}
-        count = 0
-        _timeout = self.__timeout * (count + 1)
-        while count <= self.__retry_count:
+        if res_msg_id is None:
             send_res = self.__send(data)
             logger.debug("__send res: %s" % send_res)
-            if res_msg_id is not None:
-                resp_res = self.__get_response(res_msg_id, serial_no, _timeout)
-                logger.debug("__get_response res: %s" % resp_res)
-                if not resp_res:
-                    count += 1
-                    _timeout += _timeout * (count + 1)
-                else:
-                    break
-            else:
-                resp_res = send_res
-                break
-
-        return resp_res
+            return send_res
+        if self.__window_sender is not None:
+            return self.__window_sender.send(data, res_msg_id, serial_no)
+
+        future = self.__pending.add(res_msg_id, serial_no)
+        send_res = self.__send(data)
+        logger.debug("__send res: %s" % send_res)
+        if self.status() != 0:
+            self.__pending.remove(res_msg_id, serial_no)
+            return {}
+        # Retransmission is done by scheduler timer, this thread only waits for the result.
+        self.__scheduler.schedule(future, data)
+        resp_res = future.wait()
+        logger.debug("response res: %s (retries %s)" % (resp_res, future.get_retries()))
+        return resp_res if resp_res else {}
 
 
 class JTT808(JTT808Base):
     """This class is incloud terminal request for JTT808."""
 
     def __init__(self, ip=None, port=None, domain=None, method="TCP", timeout=30, retry_count=3,
-                 version="2019", client_id=""):
+                 version="2019", client_id="", context=None):
         """
         Args:
             ip(str): server ip address (default: {None})
@@ -332,11 +504,257 @@ class JTT808(JTT808Base):
             retry_count(int): socket send data retry count. (default: {3})
             version(str): jtt808 version (default: {"2019"})
             client_id(str): device sim phone number. (default: {""})
+            context(ProtocolContext): protocol config of this terminal, `version` and `client_id` are not used if it is set. (default: {None})
         """
         super().__init__(
             ip=ip, port=port, domain=domain, method=method, timeout=timeout, retry_count=retry_count,
-            version=version, client_id=client_id
+            version=version, client_id=client_id, context=context
         )
+        self.__offline_store = None
+        self.__offline_interval = 1000
+        self.__offline_tid = None
+        self.__offline_lock = _thread.allocate_lock()
+        self.__replaying = False
+        self.__report_waits = 0
+        self.__batch_count = 0
+        self.__batch_interval = 0
+        self.__batch_bodys = []
+        self.__batch_body_size = 0
+        self.__batch_lock = _thread.allocate_lock()
+        self.__batch_timer = osTimer()
+        self.__batch_stats = {
+            "batches": 0,
+            "reports": 0,
+            "max_batch_size": 0,
+            "reasons": {"count": 0, "time": 0, "size": 0, "alarm": 0, "flush": 0},
+        }
+        self.__messages = {}
+        self.__frame_bufs = {}
+
+    def __take_message(self, message_id):
+        """Get the kept object of a hot uplink message, or a new one if it is used by another thread.
+
+        The object is put back by `__give_message` after its frames are built.
+        """
+        # dict pop and set are atomic, no lock is needed.
+        msg_obj = self.__messages.pop(message_id, None)
+        if msg_obj is None:
+            return UPLINK_MESSAGE[message_id](self.__context)
+        msg_obj.reset()
+        return msg_obj
+
+    def __give_message(self, message_id, msg_obj):
+        if message_id in REUSED_MSG_ID:
+            self.__messages[message_id] = msg_obj
+
+    def __batch_add(self, body):
+        # 0x0704 body: data count(2) + data type(1) + datas, each data is length(2) + 0x0200 body, max 1023.
+        size = 2 + len(body) // 2
+        if self.__batch_body_size + size > 1020:
+            self.__batch_flush("size")
+        with self.__batch_lock:
+            self.__batch_bodys.append(body)
+            self.__batch_body_size += size
+            full = len(self.__batch_bodys) >= self.__batch_count
+            if not full and len(self.__batch_bodys) == 1 and self.__batch_interval > 0:
+                self.__batch_timer.start(self.__batch_interval * 1000, 0, self.__batch_timeout)
+        if full:
+            return self.__batch_flush("count")
+        return {}
+
+    def __batch_timeout(self, args):
+        _thread.start_new_thread(self.__batch_flush, ("time",))
+
+    def __batch_flush(self, reason):
+        with self.__batch_lock:
+            self.__batch_timer.stop()
+            bodys = self.__batch_bodys
+            self.__batch_bodys = []
+            self.__batch_body_size = 0
+            if bodys:
+                self.__batch_stats["batches"] += 1
+                self.__batch_stats["reports"] += len(bodys)
+                self.__batch_stats["reasons"][reason] += 1
+                if len(bodys) > self.__batch_stats["max_batch_size"]:
+                    self.__batch_stats["max_batch_size"] = len(bodys)
+        if not bodys:
+            return {}
+        logger.debug("location batch flush %s reports, reason %s" % (len(bodys), reason))
+        up_msg_obj = self.__take_message(0x0704)
+        up_msg_obj.set_params(0)
+        for body in bodys:
+            up_msg_obj.set_loc_body(body)
+        up_msg_obj.set_excryption(*self.__context.get_encryption())
+        msgs = up_msg_obj.message()
+        self.__give_message(0x0704, up_msg_obj)
+        send_res = {}
+        for serial_no, data in msgs:
+            logger.debug("location batch data: %s" % data)
+            send_res = self.send(data, 0x8001, serial_no)
+            if self.__send_failed(send_res):
+                break
+        self.__offline_keep(send_res, bodys)
+        return send_res
+
+    def set_location_batch(self, count=0, interval=0):
+        """Set location report batching mode.
+
+        In batching mode, location reports (0x0200) of `loction_report` are kept and sent by bulk upload of
+        positioning data (0x0704) with data type 0 (batch report of normal position). A batch is sent when it has
+        `count` reports, when `interval` seconds passed since its first report, or when the next report can not be
+        put in one message body. A report with alarm flag sends the kept batch at once and is sent as 0x0200 itself.
+
+        Args:
+            count(int): max reports of one batch, 0 - disable batching mode and send kept reports. (default: {0})
+            interval(int): max seconds a report is kept, 0 - no time limit. (default: {0})
+
+        Returns:
+            bool: True - success, False - failed.
+        """
+        if not isinstance(count, int) or count < 0 or not isinstance(interval, int) or interval < 0:
+            return False
+        self.__batch_count = count
+        self.__batch_interval = interval
+        if count == 0:
+            self.__batch_flush("flush")
+        return True
+
+    def flush_location_batch(self):
+        """Send kept location reports of batching mode at once.
+
+        Returns:
+            dict: server response of 0x0704, empty dict if no kept report or get server response failed.
+        """
+        return self.__batch_flush("flush")
+
+    def get_location_batch_stats(self):
+        """Get location report batching statistics.
+
+        Returns:
+            dict:
+                batches(int): sent batch count.
+                reports(int): sent report count in batches.
+                max_batch_size(int): max report count of one batch.
+                reasons(dict): batch count of each send reason.
+                    count - batch is full.
+                    time - batch interval timeout.
+                    size - message body length limit.
+                    alarm - report with alarm flag.
+                    flush - `flush_location_batch` or batching mode disabled.
+        """
+        return self.__batch_stats
+
+    def __offline_keep(self, send_res, bodys):
+        """Save location report bodys to offline store if no server response is got.
+
+        In windowed send mode the response is not known yet, bodys are saved by the done callback of the future.
+        """
+        store = self.__offline_store
+        if store is None:
+            return
+
+        def keep(res):
+            if res == {}:
+                for body in bodys:
+                    store.append(ubinascii.unhexlify(body))
+
+        def done(future):
+            try:
+                keep(future.result())
+            finally:
+                with self.__offline_lock:
+                    self.__report_waits -= 1
+
+        if isinstance(send_res, dict):
+            keep(send_res)
+        else:
+            # Replay waits until the live report is answered, so it does not run on a link which may be lost.
+            with self.__offline_lock:
+                self.__report_waits += 1
+            send_res.add_done_callback(done)
+
+    def __offline_replay_thread(self):
+        while self.__offline_store is not None:
+            try:
+                if self.status() == 0 and self.__authenticated and not self.__report_waits and \
+                        self.__offline_store.count():
+                    if self.offline_replay():
+                        # Limit replay rate, let live reports go first.
+                        utime.sleep_ms(self.__offline_interval)
+                        continue
+            except Exception as e:
+                usys.print_exception(e)
+            utime.sleep(1)
+        self.__offline_tid = None
+
+    def set_offline_store(self, store=None, interval=1000):
+        """Keep location reports while server is not connected and replay them after authentication.
+
+        When store is set, `loction_report` location report (0x0200) is saved to store if server is not connected,
+        not authenticated or no server response. A thread replays saved reports by bulk upload of positioning data
+        (0x0704) with data type 1 (blind spot supplementary report), as many reports as one message body can hold.
+        Replay pauses while a location report of windowed send mode waits for server response.
+
+        Args:
+            store(OfflineStore): offline store object, None - disable. (default: {None})
+            interval(int): replay interval milliseconds between two 0x0704 messages. (default: {1000})
+
+        Returns:
+            bool: True - success, False - failed.
+        """
+        if not isinstance(interval, int) or interval < 0:
+            return False
+        self.__offline_store = store
+        self.__offline_interval = interval
+        if store is not None and (self.__offline_tid is None or not _thread.threadIsRunning(self.__offline_tid)):
+            _thread.stack_size(0x2000)
+            self.__offline_tid = _thread.start_new_thread(self.__offline_replay_thread, ())
+        return True
+
+    def offline_replay(self):
+        """Replay saved location reports by one 0x0704 blind spot supplementary report.
+
+        One block of reports is in flight at a time, it is sent again only after it gets no server response when all
+        retransmissions are used up, or gets a failed result.
+
+        Returns:
+            bool: True - reports are confirmed by server and removed from store, False - failed, no report or another
+                replay is in flight.
+        """
+        if self.__offline_store is None:
+            return False
+        with self.__offline_lock:
+            if self.__replaying:
+                return False
+            self.__replaying = True
+        try:
+            return self.__replay_block()
+        finally:
+            self.__replaying = False
+
+    def __replay_block(self):
+        # Message body max length 1023: data count(2) + data type(1) + datas, each data is length(2) + 0x0200 body.
+        records, position = self.__offline_store.peek(1020)
+        if not records:
+            self.__offline_store.commit(position, 0)
+            return False
+        up_msg_obj = self.__take_message(0x0704)
+        up_msg_obj.set_params(1)
+        for record in records:
+            up_msg_obj.set_loc_body(ubinascii.hexlify(record).decode())
+        up_msg_obj.set_excryption(*self.__context.get_encryption())
+        msgs = up_msg_obj.message()
+        self.__give_message(0x0704, up_msg_obj)
+        for serial_no, data in msgs:
+            logger.debug("offline_replay data: %s" % data)
+            send_res = self.send(data, 0x8001, serial_no)
+            if not isinstance(send_res, dict):
+                send_res = send_res.wait()
+            if self.__send_failed(send_res):
+                return False
+        self.__offline_store.commit(position, len(records))
+        logger.debug("offline_replay %s reports, %s left" % (len(records), self.__offline_store.count()))
+        return True
 
     def general_answer(self, response_serial_no, response_msg_id, result_code=0):
         """Terminal general answer
@@ -349,9 +767,10 @@ class JTT808(JTT808Base):
         Returns:
             bool: True - success, False - failed.
         """
-        up_msg_obj = UPLINK_MESSAGE[0x0001]()
+        up_msg_obj = self.__take_message(0x0001)
         up_msg_obj.set_params(response_serial_no, response_msg_id, result_code)
         msgs = up_msg_obj.message()
+        self.__give_message(0x0001, up_msg_obj)
         serial_no, data = msgs[0]
         logger.debug("general_answer data: %s" % data)
         send_res = self.send(data, None, serial_no)
@@ -366,7 +785,7 @@ class JTT808(JTT808Base):
                 utc_time(str): YYYY-MM-DD HH:mm:ss
             return empty dict if get server response failed.
         """
-        up_msg_obj = UPLINK_MESSAGE[0x0004]()
+        up_msg_obj = UPLINK_MESSAGE[0x0004](self.__context)
         msgs = up_msg_obj.message()
         serial_no, data = msgs[0]
         logger.debug("query_server_time data: %s" % data)
@@ -396,7 +815,7 @@ class JTT808(JTT808Base):
                 auth_code(str): authentication code. This field is only available when the registration is successful.
             return empty dict if get server response failed.
         """
-        up_msg_obj = UPLINK_MESSAGE[0x0100]()
+        up_msg_obj = UPLINK_MESSAGE[0x0100](self.__context)
         up_msg_obj.set_params(province_id, city_id, manufacturer_id, terminal_model, terminal_id, license_plate_color, license_plate)
         msgs = up_msg_obj.message()
         serial_no, data = msgs[0]
@@ -424,20 +843,28 @@ class JTT808(JTT808Base):
                     4 - alarm processing confirmation
             return empty dict if get server response failed.
         """
-        up_msg_obj = UPLINK_MESSAGE[0x0102]()
+        up_msg_obj = UPLINK_MESSAGE[0x0102](self.__context)
         up_msg_obj.set_params(auth_code, imei, app_version)
         msgs = up_msg_obj.message()
         serial_no, data = msgs[0]
         logger.debug("authentication data: %s" % data)
         send_res = self.send(data, 0x8001, serial_no)
+        if isinstance(send_res, dict):
+            self.__authenticated = send_res.get("result_code") == 0
+        else:
+            send_res.add_done_callback(self.__authentication_done)
         return send_res
 
+    def __authentication_done(self, future):
+        self.__authenticated = (future.result() or {}).get("result_code") == 0
+
     def heart_beat(self):
         """Heart beat to server."""
         send_res = False
         if self.status() == 0:
-            up_msg_obj = UPLINK_MESSAGE[0x0002]()
+            up_msg_obj = self.__take_message(0x0002)
             msgs = up_msg_obj.message()
+            self.__give_message(0x0002, up_msg_obj)
             serial_no, data = msgs[0]
             logger.debug("heart_beat data: %s" % data)
             send_res = self.send(data, 0x8001, serial_no)
@@ -449,7 +876,7 @@ class JTT808(JTT808Base):
         Returns:
             bool: True - success, False - falied
         """
-        up_msg_obj = UPLINK_MESSAGE[0x0003]()
+        up_msg_obj = UPLINK_MESSAGE[0x0003](self.__context)
         msgs = up_msg_obj.message()
         serial_no, data = msgs[0]
         logger.debug("log_out data: %s" % data)
@@ -482,17 +909,16 @@ class JTT808(JTT808Base):
                     4 - alarm processing confirmation
             return empty dict if get server response failed.
         """
-        up_msg_obj = UPLINK_MESSAGE[0x0104]()
+        up_msg_obj = UPLINK_MESSAGE[0x0104](self.__context)
         up_msg_obj.set_params(response_serial_no)
         for param_id, param_value in terminal_params.items():
             up_msg_obj.set_terminal_params(param_id, param_value)
-        if self.__encryption:
-            up_msg_obj.set_excryption(self.__encryption, self.__rsa_e, self.__rsa_n)
+        up_msg_obj.set_excryption(*self.__context.get_encryption())
         msgs = up_msg_obj.message()
         for serial_no, data in msgs:
             logger.debug("params_report data: %s" % data)
             send_res = self.send(data, 0x8001, serial_no)
-            if send_res["result_code"] != 0:
+            if self.__send_failed(send_res):
                 break
 
         return send_res
@@ -543,7 +969,7 @@ class JTT808(JTT808Base):
                     4 - alarm processing confirmation
             return empty dict if get server response failed.
         """
-        up_msg_obj = UPLINK_MESSAGE[0x0107]()
+        up_msg_obj = UPLINK_MESSAGE[0x0107](self.__context)
         up_msg_obj.set_params(applicable_passenger_vehicles, applicable_to_dangerous_goods_vehicles,
                               applicable_to_ordinary_freight_vehicles, applicable_to_taxi, support_hard_disk_video,
                               machine_type, applicable_to_trailer, manufacturer_id, terminal_model, terminal_id,
@@ -551,13 +977,12 @@ class JTT808(JTT808Base):
                               support_galileo, support_gprs, support_cdma, support_td_scdma, support_wcdma,
                               support_cdma2000, support_td_lte, support_other_communication)
 
-        if self.__encryption:
-            up_msg_obj.set_excryption(self.__encryption, self.__rsa_e, self.__rsa_n)
+        up_msg_obj.set_excryption(*self.__context.get_encryption())
         msgs = up_msg_obj.message()
         for serial_no, data in msgs:
             logger.debug("properties_report data: %s" % data)
             send_res = self.send(data, 0x8001, serial_no)
-            if send_res["result_code"] != 0:
+            if self.__send_failed(send_res):
                 break
 
         return send_res
@@ -587,16 +1012,15 @@ class JTT808(JTT808Base):
                     4 - alarm processing confirmation
             return empty dict if get server response failed.
         """
-        up_msg_obj = UPLINK_MESSAGE[0x0108]()
+        up_msg_obj = UPLINK_MESSAGE[0x0108](self.__context)
         up_msg_obj.set_params(upgrade_type, result_code)
 
-        if self.__encryption:
-            up_msg_obj.set_excryption(self.__encryption, self.__rsa_e, self.__rsa_n)
+        up_msg_obj.set_excryption(*self.__context.get_encryption())
         msgs = up_msg_obj.message()
         for serial_no, data in msgs:
             logger.debug("upgrade_result_report data: %s" % data)
             send_res = self.send(data, 0x8001, serial_no)
-            if send_res["result_code"] != 0:
+            if self.__send_failed(send_res):
                 break
 
         return send_res
@@ -632,28 +1056,57 @@ class JTT808(JTT808Base):
                     3 - not support
                     4 - alarm processing confirmation
             return empty dict if get server response failed.
+            If offline store is set by `set_offline_store`, location report (0x0200) is saved to it when this function
+            returns empty dict, and replayed later.
+            In batching mode set by `set_location_batch`, return empty dict when location report (0x0200) is kept, or
+            return server response of 0x0704 when the batch is sent.
         """
+        params = (alarm_flag, loc_status, latitude, longitude, altitude, speed, direction, time, loc_additional_info)
         if response_msg_id is None:
-            up_msg_obj = UPLINK_MESSAGE[0x0200]()
-            params = (alarm_flag, loc_status, latitude, longitude, altitude, speed, direction, time, loc_additional_info)
-        elif response_msg_id == 0x8201:
-            up_msg_obj = UPLINK_MESSAGE[0x0201]()
-            params = (response_serial_no, alarm_flag, loc_status, latitude, longitude, altitude, speed, direction, time, loc_additional_info)
-        elif response_msg_id == 0x8500:
-            up_msg_obj = UPLINK_MESSAGE[0x0500]()
-            params = (response_serial_no, alarm_flag, loc_status, latitude, longitude, altitude, speed, direction, time, loc_additional_info)
-
+            message_id = 0x0200
+        else:
+            message_id = 0x0201 if response_msg_id == 0x8201 else 0x0500
+            params = (response_serial_no,) + params
+        up_msg_obj = self.__take_message(message_id)
         up_msg_obj.set_params(*params)
 
-        if self.__encryption:
-            up_msg_obj.set_excryption(self.__encryption, self.__rsa_e, self.__rsa_n)
-        msgs = up_msg_obj.message()
+        body = None
+        if response_msg_id is None and (self.__offline_store is not None or self.__batch_count):
+            up_msg_obj.body_to_hex()
+            body = up_msg_obj.get_body()
+            if self.__offline_store is not None and (self.status() != 0 or not self.__authenticated):
+                self.__give_message(message_id, up_msg_obj)
+                self.__offline_store.append(ubinascii.unhexlify(body))
+                return {}
+            if self.__batch_count:
+                if not alarm_flag:
+                    self.__give_message(message_id, up_msg_obj)
+                    return self.__batch_add(body)
+                # Send batched reports first, than send alarm report at once.
+                self.__batch_flush("alarm")
+
+        up_msg_obj.set_excryption(*self.__context.get_encryption())
+        # Body is packed into the frame by `encode_into`, the frame is written to a reused buffer of this message id,
+        # which is taken like the message object, so two threads do not share it.
+        buf = self.__frame_bufs.pop(message_id, None)
+        if buf is None:
+            buf = bytearray(128)
+        msgs = up_msg_obj.message(buf)
+        self.__give_message(message_id, up_msg_obj)
+        # Windowed send keeps the frame for retransmission after this function returns.
+        windowed = self.__window_sender is not None
         for serial_no, data in msgs:
             logger.debug("loction_report data: %s" % data)
-            send_res = self.send(data, 0x8001, serial_no)
-            if send_res["result_code"] != 0:
+            send_res = self.send(bytes(data) if windowed else data, 0x8001, serial_no)
+            if self.__send_failed(send_res):
                 break
+            if isinstance(data, bytearray) and len(data) > len(buf):
+                # A frame longer than the buffer is allocated, keep it as the buffer of next report.
+                buf = data
+        self.__frame_bufs[message_id] = buf
 
+        if body is not None:
+            self.__offline_keep(send_res, (body,))
         return send_res
 
     def event_report(self, event_id):
@@ -674,16 +1127,15 @@ class JTT808(JTT808Base):
                     4 - alarm processing confirmation
             return empty dict if get server response failed.
         """
-        up_msg_obj = UPLINK_MESSAGE[0x0301]()
+        up_msg_obj = UPLINK_MESSAGE[0x0301](self.__context)
         up_msg_obj.set_params(event_id)
 
-        if self.__encryption:
-            up_msg_obj.set_excryption(self.__encryption, self.__rsa_e, self.__rsa_n)
+        up_msg_obj.set_excryption(*self.__context.get_encryption())
         msgs = up_msg_obj.message()
         for serial_no, data in msgs:
             logger.debug("event_report data: %s" % data)
             send_res = self.send(data, 0x8001, serial_no)
-            if send_res["result_code"] != 0:
+            if self.__send_failed(send_res):
                 break
 
         return send_res
@@ -707,16 +1159,15 @@ class JTT808(JTT808Base):
                     4 - alarm processing confirmation
             return empty dict if get server response failed.
         """
-        up_msg_obj = UPLINK_MESSAGE[0x0302]()
+        up_msg_obj = UPLINK_MESSAGE[0x0302](self.__context)
         up_msg_obj.set_params(response_serial_no, answer_id)
 
-        if self.__encryption:
-            up_msg_obj.set_excryption(self.__encryption, self.__rsa_e, self.__rsa_n)
+        up_msg_obj.set_excryption(*self.__context.get_encryption())
         msgs = up_msg_obj.message()
         for serial_no, data in msgs:
             logger.debug("issue_question_response data: %s" % data)
             send_res = self.send(data, 0x8001, serial_no)
-            if send_res["result_code"] != 0:
+            if self.__send_failed(send_res):
                 break
 
         return send_res
@@ -742,16 +1193,15 @@ class JTT808(JTT808Base):
                     4 - alarm processing confirmation
             return empty dict if get server response failed.
         """
-        up_msg_obj = UPLINK_MESSAGE[0x0303]()
+        up_msg_obj = UPLINK_MESSAGE[0x0303](self.__context)
         up_msg_obj.set_params(info_type, onoff)
 
-        if self.__encryption:
-            up_msg_obj.set_excryption(self.__encryption, self.__rsa_e, self.__rsa_n)
+        up_msg_obj.set_excryption(*self.__context.get_encryption())
         msgs = up_msg_obj.message()
         for serial_no, data in msgs:
             logger.debug("information_demand_cancellation data: %s" % data)
             send_res = self.send(data, 0x8001, serial_no)
-            if send_res["result_code"] != 0:
+            if self.__send_failed(send_res):
                 break
 
         return send_res
@@ -784,16 +1234,15 @@ class JTT808(JTT808Base):
                     4 - alarm processing confirmation
             return empty dict if get server response failed.
         """
-        up_msg_obj = UPLINK_MESSAGE[0x0608]()
+        up_msg_obj = UPLINK_MESSAGE[0x0608](self.__context)
         up_msg_obj.set_params(query_type, data)
 
-        if self.__encryption:
-            up_msg_obj.set_excryption(self.__encryption, self.__rsa_e, self.__rsa_n)
+        up_msg_obj.set_excryption(*self.__context.get_encryption())
         msgs = up_msg_obj.message()
         for serial_no, data in msgs:
             logger.debug("query_area_route_data_response data: %s" % data)
             send_res = self.send(data, 0x8001, serial_no)
-            if send_res["result_code"] != 0:
+            if self.__send_failed(send_res):
                 break
 
         return send_res
@@ -823,16 +1272,15 @@ class JTT808(JTT808Base):
                     4 - alarm processing confirmation
             return empty dict if get server response failed.
         """
-        up_msg_obj = UPLINK_MESSAGE[0x0700]()
+        up_msg_obj = UPLINK_MESSAGE[0x0700](self.__context)
         up_msg_obj.set_params(response_serial_no, cmd_word, cmd_data)
 
-        if self.__encryption:
-            up_msg_obj.set_excryption(self.__encryption, self.__rsa_e, self.__rsa_n)
+        up_msg_obj.set_excryption(*self.__context.get_encryption())
         msgs = up_msg_obj.message()
         for serial_no, data in msgs:
             logger.debug("driving_record_data_upload data: %s" % data)
             send_res = self.send(data, 0x8001, serial_no)
-            if send_res["result_code"] != 0:
+            if self.__send_failed(send_res):
                 break
 
         return send_res
@@ -855,16 +1303,15 @@ class JTT808(JTT808Base):
                     4 - alarm processing confirmation
             return empty dict if get server response failed.
         """
-        up_msg_obj = UPLINK_MESSAGE[0x0701]()
+        up_msg_obj = UPLINK_MESSAGE[0x0701](self.__context)
         up_msg_obj.set_params(data)
 
-        if self.__encryption:
-            up_msg_obj.set_excryption(self.__encryption, self.__rsa_e, self.__rsa_n)
+        up_msg_obj.set_excryption(*self.__context.get_encryption())
         msgs = up_msg_obj.message()
         for serial_no, data in msgs:
             logger.debug("electronic_waybill_report data: %s" % data)
             send_res = self.send(data, 0x8001, serial_no)
-            if send_res["result_code"] != 0:
+            if self.__send_failed(send_res):
                 break
 
         return send_res
@@ -902,17 +1349,16 @@ class JTT808(JTT808Base):
                     4 - alarm processing confirmation
             return empty dict if get server response failed.
         """
-        up_msg_obj = UPLINK_MESSAGE[0x0702]()
+        up_msg_obj = UPLINK_MESSAGE[0x0702](self.__context)
         up_msg_obj.set_params(status, time, ic_read_result, driver_name, qualification_certificate_code,
                               issuing_agency_name, certificate_validity, driver_id_number)
 
-        if self.__encryption:
-            up_msg_obj.set_excryption(self.__encryption, self.__rsa_e, self.__rsa_n)
+        up_msg_obj.set_excryption(*self.__context.get_encryption())
         msgs = up_msg_obj.message()
         for serial_no, data in msgs:
             logger.debug("driver_identity_information_report data: %s" % data)
             send_res = self.send(data, 0x8001, serial_no)
-            if send_res["result_code"] != 0:
+            if self.__send_failed(send_res):
                 break
 
         return send_res
@@ -948,18 +1394,18 @@ class JTT808(JTT808Base):
                     4 - alarm processing confirmation
             return empty dict if get server response failed.
         """
-        up_msg_obj = UPLINK_MESSAGE[0x0704]()
+        up_msg_obj = self.__take_message(0x0704)
         up_msg_obj.set_params(data_type)
         for loc_data in loc_datas:
             up_msg_obj.set_loc_data(*loc_data)
 
-        if self.__encryption:
-            up_msg_obj.set_excryption(self.__encryption, self.__rsa_e, self.__rsa_n)
+        up_msg_obj.set_excryption(*self.__context.get_encryption())
         msgs = up_msg_obj.message()
+        self.__give_message(0x0704, up_msg_obj)
         for serial_no, data in msgs:
             logger.debug("location_bulk_report data: %s" % data)
             send_res = self.send(data, 0x8001, serial_no)
-            if send_res["result_code"] != 0:
+            if self.__send_failed(send_res):
                 break
 
         return send_res
@@ -995,18 +1441,17 @@ class JTT808(JTT808Base):
                     4 - alarm processing confirmation
             return empty dict if get server response failed.
         """
-        up_msg_obj = UPLINK_MESSAGE[0x0705]()
+        up_msg_obj = UPLINK_MESSAGE[0x0705](self.__context)
         up_msg_obj.set_params(recive_time)
         for can_data in can_datas:
             up_msg_obj.set_can_data(*can_data)
 
-        if self.__encryption:
-            up_msg_obj.set_excryption(self.__encryption, self.__rsa_e, self.__rsa_n)
+        up_msg_obj.set_excryption(*self.__context.get_encryption())
         msgs = up_msg_obj.message()
         for serial_no, data in msgs:
             logger.debug("can_bus_data_upload data: %s" % data)
             send_res = self.send(data, 0x8001, serial_no)
-            if send_res["result_code"] != 0:
+            if self.__send_failed(send_res):
                 break
 
         return send_res
@@ -1049,16 +1494,15 @@ class JTT808(JTT808Base):
                     4 - alarm processing confirmation
             return empty dict if get server response failed.
         """
-        up_msg_obj = UPLINK_MESSAGE[0x0800]()
+        up_msg_obj = UPLINK_MESSAGE[0x0800](self.__context)
         up_msg_obj.set_params(media_id, media_type, media_encoding, event_code, channel_id)
 
-        if self.__encryption:
-            up_msg_obj.set_excryption(self.__encryption, self.__rsa_e, self.__rsa_n)
+        up_msg_obj.set_excryption(*self.__context.get_encryption())
         msgs = up_msg_obj.message()
         for serial_no, data in msgs:
             logger.debug("media_event_upload data: %s" % data)
             send_res = self.send(data, 0x8001, serial_no)
-            if send_res["result_code"] != 0:
+            if self.__send_failed(send_res):
                 break
 
         return send_res
@@ -1111,21 +1555,67 @@ class JTT808(JTT808Base):
                     4 - alarm processing confirmation
             return empty dict if get server response failed.
         """
-        up_msg_obj = UPLINK_MESSAGE[0x0801]()
+        up_msg_obj = UPLINK_MESSAGE[0x0801](self.__context)
         up_msg_obj.set_params(media_id, media_type, media_encoding, event_code, channel_id, media_data)
         up_msg_obj.set_loc_data(*loc_data)
 
-        if self.__encryption:
-            up_msg_obj.set_excryption(self.__encryption, self.__rsa_e, self.__rsa_n)
+        up_msg_obj.set_excryption(*self.__context.get_encryption())
         msgs = up_msg_obj.message()
         for serial_no, data in msgs:
             logger.debug("media_data_upload data: %s" % data)
             send_res = self.send(data, 0x8001, serial_no)
-            if send_res["result_code"] != 0:
+            if self.__send_failed(send_res):
                 break
 
         return send_res
 
+    def media_data_stream_upload(self, media_id, media_type, media_encoding, event_code, channel_id, media, loc_data,
+                                 media_size=None, fragment_size=MAX_FRAGMENT_SIZE):
+        """Multimedia data upload from a file or an iterator of chunks
+
+        Subpackaged frames are built one by one while sending, so the media is never read into memory as a whole.
+        RSA encryption is not supported.
+
+        Media of a file path is kept by its offsets for the last `MEDIA_RETRANSMIT_KEPT` uploads, packages listed by
+        multimedia data upload answer (0x8800) are read from the file and sent again with their original serial
+        numbers, by one thread in order of the requests. Media of a file object or an iterator can not be sent
+        again, the caller may close the file object after this function returns.
+
+        Args:
+            media_id(int): media id
+            media_type(int): as `media_data_upload`
+            media_encoding(int): as `media_data_upload`
+            event_code(int): as `media_data_upload`
+            channel_id(int): channel id
+            media(str/file/iterator): media file path, file object opened by "rb", or iterator of bytes chunks.
+            loc_data(tuple): as `media_data_upload`
+            media_size(int): media bytes size, the file size if None, required for an iterator. (default: {None})
+            fragment_size(int): body bytes of each subpackage, 37 ~ 1023. (default: {1023})
+
+        Returns:
+            dict: server response of the last sent package, as `media_data_upload`.
+                return empty dict if get server response failed.
+
+        Raises:
+            ValueError: fragment_size is out of range, media_size is unknown, media data is shorter than media_size
+                or RSA encryption is enabled.
+        """
+        stream = MediaUploadStream(self.__context, media_id, media_type, media_encoding, event_code, channel_id,
+                                   loc_data, media, media_size, fragment_size)
+        windowed = self.get_send_window() > 0
+        send_res = {}
+        # Kept before sending, the answer (0x8800) of the last package may come before `send` returns.
+        self.__keep_media_stream(stream)
+        with self.__media_send_lock:
+            for serial_no, package_no, frame in stream.frames():
+                logger.debug("media_data_stream_upload package %s/%s" % (package_no, stream.package_total()))
+                # The frame buffer is reused by the next package, the windowed sender keeps frames until they are answered.
+                send_res = self.send(bytes(frame) if windowed else frame, 0x8001, serial_no)
+                if self.__send_failed(send_res):
+                    break
+            stream.close()
+        return send_res
+
     def camera_shoots_immediately_response(self, response_serial_no, result, ids):
         """The camera shoots the command immediately response
 
@@ -1150,16 +1640,15 @@ class JTT808(JTT808Base):
                     4 - alarm processing confirmation
             return empty dict if get server response failed.
         """
-        up_msg_obj = UPLINK_MESSAGE[0x0805]()
+        up_msg_obj = UPLINK_MESSAGE[0x0805](self.__context)
         up_msg_obj.set_params(response_serial_no, result, ids)
 
-        if self.__encryption:
-            up_msg_obj.set_excryption(self.__encryption, self.__rsa_e, self.__rsa_n)
+        up_msg_obj.set_excryption(*self.__context.get_encryption())
         msgs = up_msg_obj.message()
         for serial_no, data in msgs:
             logger.debug("camera_shoots_immediately_response data: %s" % data)
             send_res = self.send(data, 0x8001, serial_no)
-            if send_res["result_code"] != 0:
+            if self.__send_failed(send_res):
                 break
 
         return send_res
@@ -1196,18 +1685,17 @@ class JTT808(JTT808Base):
                     4 - alarm processing confirmation
             return empty dict if get server response failed.
         """
-        up_msg_obj = UPLINK_MESSAGE[0x0802]()
+        up_msg_obj = UPLINK_MESSAGE[0x0802](self.__context)
         up_msg_obj.set_params(response_serial_no)
         for media in medias:
             up_msg_obj.set_media(*media)
 
-        if self.__encryption:
-            up_msg_obj.set_excryption(self.__encryption, self.__rsa_e, self.__rsa_n)
+        up_msg_obj.set_excryption(*self.__context.get_encryption())
         msgs = up_msg_obj.message()
         for serial_no, data in msgs:
             logger.debug("stored_media_data_retrieval_response data: %s" % data)
             send_res = self.send(data, 0x8001, serial_no)
-            if send_res["result_code"] != 0:
+            if self.__send_failed(send_res):
                 break
 
         return send_res
@@ -1236,16 +1724,15 @@ class JTT808(JTT808Base):
                     4 - alarm processing confirmation
             return empty dict if get server response failed.
         """
-        up_msg_obj = UPLINK_MESSAGE[0x0900]()
+        up_msg_obj = UPLINK_MESSAGE[0x0900](self.__context)
         up_msg_obj.set_params(data_type, data)
 
-        if self.__encryption:
-            up_msg_obj.set_excryption(self.__encryption, self.__rsa_e, self.__rsa_n)
+        up_msg_obj.set_excryption(*self.__context.get_encryption())
         msgs = up_msg_obj.message()
         for serial_no, data in msgs:
             logger.debug("data_uplink_transparent_transmission data: %s" % data)
             send_res = self.send(data, 0x8001, serial_no)
-            if send_res["result_code"] != 0:
+            if self.__send_failed(send_res):
                 break
 
         return send_res
@@ -1268,16 +1755,15 @@ class JTT808(JTT808Base):
                     4 - alarm processing confirmation
             return empty dict if get server response failed.
         """
-        up_msg_obj = UPLINK_MESSAGE[0x0901]()
+        up_msg_obj = UPLINK_MESSAGE[0x0901](self.__context)
         up_msg_obj.set_params(data)
 
-        if self.__encryption:
-            up_msg_obj.set_excryption(self.__encryption, self.__rsa_e, self.__rsa_n)
+        up_msg_obj.set_excryption(*self.__context.get_encryption())
         msgs = up_msg_obj.message()
         for serial_no, data in msgs:
             logger.debug("data_compression_report data: %s" % data)
             send_res = self.send(data, 0x8001, serial_no)
-            if send_res["result_code"] != 0:
+            if self.__send_failed(send_res):
                 break
 
         return send_res
@@ -1301,7 +1787,7 @@ class JTT808(JTT808Base):
                     4 - alarm processing confirmation
             return empty dict if get server response failed.
         """
-        up_msg_obj = UPLINK_MESSAGE[0x0A00]()
+        up_msg_obj = UPLINK_MESSAGE[0x0A00](self.__context)
         up_msg_obj.set_params(e, n)
         msgs = up_msg_obj.message()
         serial_no, data = msgs[0]
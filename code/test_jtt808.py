@@ -24,23 +24,43 @@
 import rsa
 import sim
 import modem
+import uos
 import utime
+import ustruct
+import ubinascii
+import uasyncio as asyncio
 from usr.jtt808 import JTT808, GENERAL_ANSWER_MSG_ID
 from usr.logging import getLogger
+from usr.common import SerialNo
+from usr.jt_async import AsyncJTT808
+from usr.jt_gateway import JTT808Gateway
+from usr import jt_bulk
+from usr.jt_bulk import LocationFrameReader, decode_t0704_body
+from usr.jt_frame import XorChecksum, StreamDeframer, frame_encode, frame_decode
+from usr.jt_capture import CaptureWriter, CAPTURE_START, CAPTURE_SENT, CAPTURE_RECEIVED, read_capture, replay
+from usr.jt_media import MediaUploadStream
+from usr.jt_store import OfflineStore
+from usr.jt_schema import BODY_SCHEMA
+from usr.jt_session import PendingTable, RetransmitScheduler, WindowSender, SubpackageTable
 from usr.jt_message import LicensePlateColor, TerminalParams, \
-    LocAlarmWarningConfig, LocStatusConfig, LocAdditionalInfoConfig
+    LocAlarmWarningConfig, LocStatusConfig, LocAdditionalInfoConfig, \
+    ProtocolContext, UPLINK_MESSAGE, DOWNLINK_MESSAGE, JTMessageParse
 
 
 logger = getLogger(__name__)
 
 jtt808_obj = None
 
+# Run tools/jt_platform.py on a PC and set its address here to test without the public platform.
+PLATFORM_IP = "220.180.239.212"
+PLATFORM_PORT = 7611
+
 
 def test_init():
     global jtt808_obj
     method = "TCP"
-    ip = "220.180.239.212"
-    port = 7611
+    ip = PLATFORM_IP
+    port = PLATFORM_PORT
     client_id = "18888888888"
     version = "2019"
 
@@ -335,7 +355,629 @@ def test_terminal_rsa_public_key():
     jtt808_obj.terminal_rsa_public_key(e, n)
 
 
+def test_xor_checksum():
+    data = bytes(range(256)) * 4
+    assert XorChecksum().digest() == 0
+    assert XorChecksum(b"\x7e").digest() == 0x7e
+    checksum = XorChecksum()
+    for i in range(0, len(data), 100):
+        checksum.update(memoryview(data)[i:i + 100])
+    assert checksum.digest() == XorChecksum(data).digest()
+    checksum.reset()
+    checksum.update(b"\x01\x02\x04")
+    assert checksum.digest() == 0x07
+    # frame_decode calculates the check code while unescaping.
+    data = bytes(range(120, 130)) + b"\x7e\x7d"
+    buf = bytearray(32)
+    size, check_code = frame_decode(frame_encode(data + bytes((XorChecksum(data).digest(),))), buf)
+    assert buf[:size - 1] == data and check_code == buf[size - 1] == XorChecksum(data).digest()
+
+
+def test_stream_deframer():
+    frames = [b"\x7e\x01\x7d\x02\x03\x7e", b"\x7e\x04\x05\x7e", b"\x7e" + b"\x06" * 100 + b"\x7e"]
+    stream = b"\x00\x7e" + b"".join(frames)
+    deframer = StreamDeframer(size=16, max_size=256)
+    res = []
+    for i in range(0, len(stream), 7):
+        deframer.feed(stream[i:i + 7])
+        res.extend([bytes(frame) for frame in deframer.frames()])
+    assert res == frames, res
+    assert deframer.pending() == 0
+    deframer.feed(b"\x7e" + b"\x00" * 300)
+    deframer.feed(b"\x00\x7e" + frames[0])
+    assert [bytes(frame) for frame in deframer.frames()] == [frames[0]]
+    assert deframer.dropped() > 0
+
+
+def test_pending_table():
+    pending = PendingTable()
+    futures = [pending.add(0x8001, serial_no) for serial_no in range(100)]
+    for serial_no in range(99, -1, -1):
+        assert pending.complete(0x8001, serial_no, {"serial_no": serial_no, "result_code": 0})
+    assert [future.wait(1)["serial_no"] for future in futures] == list(range(100))
+    assert pending.complete(0x8001, 0, {}) is False
+    future = pending.add(0x8004, 1)
+    start = utime.ticks_ms()
+    assert future.wait(1) is None
+    assert utime.ticks_diff(utime.ticks_ms(), start) >= 900
+    # The timer of the last wait does not wake the next one.
+    start = utime.ticks_ms()
+    assert future.wait(0.3) is None
+    assert utime.ticks_diff(utime.ticks_ms(), start) >= 250
+    pending.complete(0x8004, None, {"utc_time": "2022-06-01 12:00:00"})
+    assert future.done() and pending.size() == 0
+
+
+def test_retransmit_scheduler():
+    pending = PendingTable()
+    sent = {}
+
+    def send_func(data):
+        sent.setdefault(data, []).append(utime.ticks_ms())
+        return True
+
+    # T(1) = 200ms, T(2) = 400ms, T(3) = 1200ms, retransmit at 200ms and 600ms, failed at 1800ms.
+    scheduler = RetransmitScheduler(send_func, pending, timeout=0.2, retry_count=2, tick=100, slots=8)
+    start = utime.ticks_ms()
+    futures = []
+    for serial_no in range(300):
+        future = pending.add(0x8001, serial_no)
+        send_func(serial_no)
+        scheduler.schedule(future, serial_no)
+        futures.append(future)
+    assert scheduler.outstanding() == 300
+    utime.sleep_ms(400)
+    for serial_no in range(0, 300, 2):
+        pending.complete(0x8001, serial_no, {"serial_no": serial_no, "result_code": 0})
+    assert [future.wait(5) for future in futures[1::2]] == [{}] * 150
+    used = utime.ticks_diff(utime.ticks_ms(), start)
+    assert 1700 <= used <= 2500, used
+    for serial_no in range(300):
+        retries = 1 if serial_no % 2 == 0 else 2
+        assert futures[serial_no].get_retries() == retries
+        assert len(sent[serial_no]) == retries + 1
+    for serial_no in range(1, 300, 2):
+        assert 200 <= utime.ticks_diff(sent[serial_no][1], sent[serial_no][0]) <= 400
+        assert 400 <= utime.ticks_diff(sent[serial_no][2], sent[serial_no][1]) <= 600
+    stats = scheduler.stats()
+    assert stats["retransmissions"] == 450 and stats["failures"] == 150 and pending.size() == 0
+
+
+def test_retransmit_timeout():
+    pending = PendingTable()
+
+    def send_func(data):
+        return True
+
+    # Scheduled between two ticks, the timeout is never shorter than requested.
+    scheduler = RetransmitScheduler(send_func, pending, timeout=0.2, retry_count=0, tick=100, slots=8)
+    # A long request keeps the wheel running.
+    scheduler.set_params(timeout=60)
+    keeper = pending.add(0x8001, 0)
+    scheduler.schedule(keeper, 0)
+    scheduler.set_params(timeout=0.2)
+    for serial_no in range(1, 11):
+        utime.sleep_ms(serial_no * 9)
+        future = pending.add(0x8001, serial_no)
+        start = utime.ticks_ms()
+        scheduler.schedule(future, serial_no)
+        assert future.wait(5) == {}
+        used = utime.ticks_diff(utime.ticks_ms(), start)
+        assert 200 <= used <= 350, used
+    pending.complete(0x8001, 0, {})
+    # Without timer, the first advance may come at once after schedule.
+    scheduler = RetransmitScheduler(send_func, pending, timeout=0.2, retry_count=0, tick=100, slots=8, timer=False)
+    future = pending.add(0x8001, 20)
+    scheduler.schedule(future, 20)
+    for i in range(2):
+        scheduler.advance()
+        assert not future.done()
+    scheduler.advance()
+    assert future.result() == {}
+
+
+def test_subpackage_table():
+    def header(serial_no, package_no, package_total=3):
+        return {"message_id": 0x8300, "serial_no": serial_no, "package_no": package_no, "package_total": package_total}
+
+    table = SubpackageTable(200)
+    assert table.add(header(10, 1), "01") is None and table.add(header(12, 3), "03") is None
+    assert table.expire() == [] and table.size() == 1
+    # Lost package 2 is requested once after timeout, the message is dropped after another timeout.
+    utime.sleep_ms(250)
+    assert table.expire() == [(10, [2])] and table.size() == 1
+    assert table.expire() == []
+    utime.sleep_ms(250)
+    assert table.expire() == [] and table.size() == 0
+    # A package of another message with the same id replaces the unfinished one.
+    table.add(header(20, 1), "aa")
+    assert table.add(header(31, 2), "bb") is None and table.add(header(30, 1), "cc") is None
+    full_header, body = table.add(header(32, 3), "dd")
+    assert body == "ccbbdd" and full_header["serial_no"] == 30 and full_header["package_total"] == 0
+    assert table.size() == 0
+    # Requested packages are kept for the requested message.
+    table.add(header(40, 1, 2), "01")
+    utime.sleep_ms(250)
+    assert table.expire() == [(40, [2])]
+    assert table.add(header(50, 2, 2), "02")[1] == "0102"
+
+
+def test_window_sender():
+    pending = PendingTable()
+    sent = []
+
+    def send_func(data):
+        sent.append(data)
+        return True
+
+    scheduler = RetransmitScheduler(send_func, pending, timeout=1, retry_count=1)
+    sender = WindowSender(send_func, pending, scheduler, window=4)
+    futures = [sender.send(serial_no, 0x8001, serial_no) for serial_no in range(10)]
+    assert sent == [0, 1, 2, 3] and sender.queued() == 6
+    for serial_no in range(10):
+        pending.complete(0x8001, serial_no, {"serial_no": serial_no})
+    assert sent == list(range(10)) and sender.inflight() == 0
+    assert [future.wait(1)["serial_no"] for future in futures] == list(range(10))
+    # Retransmit once after 1s, than failed after 2s more.
+    future = sender.send(10, 0x8001, 10)
+    assert future.wait(5) == {} and sent[10:] == [10, 10]
+
+
+def test_retransmit_params():
+    for method, timeout_id, retry_id in (("TCP", 0x0002, 0x0003), ("UDP", 0x0004, 0x0005)):
+        jtt808_obj = JTT808(ip=PLATFORM_IP, port=PLATFORM_PORT, method=method, client_id="18888888888")
+        jtt808_obj.set_callback(lambda args: None)
+        terminal_params = TerminalParams()
+        terminal_params.set_params(timeout_id, 10)
+        terminal_params.set_params(retry_id, 2)
+        assert jtt808_obj.set_retransmit_params(terminal_params)
+        assert jtt808_obj.get_retransmit_params() == {"timeout": 10, "retry_count": 2}
+        # Params of set terminal params (0x8103) are applied when it is received.
+        body = ustruct.pack(">BIBIIBI", 2, timeout_id, 4, 20, retry_id, 4, 5)
+        data = ustruct.pack(">HHB10sH", 0x8103, 0x4000 | len(body), 1, ubinascii.unhexlify("00000000018888888888"), 1)
+        data += body
+        jtt808_obj.parse(bytes(frame_encode(data + bytes((XorChecksum(data).digest(),)))))
+        assert jtt808_obj.get_retransmit_params() == {"timeout": 20, "retry_count": 5}
+
+
+def test_serial_no():
+    serial_no_obj = SerialNo(0xFFFD)
+    assert serial_no_obj.get_serial_no() == 0xFFFD
+    # A block crossing 0xFFFF wraps to 0 without losing numbers.
+    assert serial_no_obj.reserve(4) == 0xFFFE
+    assert serial_no_obj.get_serial_no() == 2
+    for i in range(0x10000):
+        serial_no_obj.get_serial_no()
+    assert serial_no_obj.get_serial_no() == 3
+
+
+def test_protocol_context():
+    contexts = [ProtocolContext("2019", "18888888888"), ProtocolContext("2013", "13999999999")]
+    for i in range(3):
+        for context in contexts:
+            msg_obj = UPLINK_MESSAGE[0x0002](context)
+            serial_no, data = msg_obj.message()[0]
+            # Each terminal has its own serial number.
+            assert serial_no == i
+            msg_parser = JTMessageParse(context)
+            msg_parser.set_message(data)
+            header = msg_parser.get_header()
+            assert header["client_id"] == context.get_client_id()
+            assert header["protocol_version"] == context.get_protocol_version()
+            assert msg_parser.is_version() == context.get_version()
+
+
+def test_message_schema():
+    header = {"message_id": 0x8600, "properties": 0, "protocol_version": "", "client_id": "018888888888",
+              "serial_no": 1, "package_total": 0, "package_no": 0}
+    area = {
+        "area_id": 1, "attributes": {"time_limit_enable": 0, "speed_limit_enable": 1},
+        "center_latitude": 31.824845, "center_longitude": 117.24091, "radius": 100,
+        "speed_limit": 100, "over_speed_time": 10, "night_speed_limit": 80, "area_name": "area",
+    }
+    for version, properties in (("2019", 0x4000), ("2013", 0)):
+        context = ProtocolContext(version, "18888888888")
+        msg_obj = DOWNLINK_MESSAGE[0x8600](context)
+        header["properties"] = properties
+        msg_obj.set_header(header)
+        body = BODY_SCHEMA[0x8600].encode({"set_attr": 1, "area_data": [area, area]}, msg_obj)
+        # Time range is not in body when time limit bit is 0, night speed and name are only in 2019.
+        assert len(body) == (2 + 2 * (18 + 3 + 2 + 2 + 4) if properties else 2 + 2 * (18 + 3))
+        msg_obj.set_body(ubinascii.hexlify(body).decode())
+        item = msg_obj.body_data()["area_data"][1]
+        assert item["start_time"] == "" and item["speed_limit"] == 100
+        assert item["area_name"] == ("area" if properties else "")
+        assert item["center_latitude"] == 31.824845
+
+        # Retransmission count is WORD in 2019, BYTE in 2013.
+        header["message_id"] = 0x8003
+        msg_obj = DOWNLINK_MESSAGE[0x8003](context)
+        msg_obj.set_header(header)
+        msg_obj.set_body("0007" + ("0002" if properties else "02") + "0003000a")
+        assert msg_obj.body_data() == {"serial_no": 7, "total_number": 2, "package_ids": [3, 10]}
+        header["message_id"] = 0x8600
+
+        msg_obj = UPLINK_MESSAGE[0x0005](context)
+        msg_obj.set_params(7, [3, 10])
+        msg_obj.body_to_hex()
+        assert msg_obj.get_body() == "00070002" + "0003000a"
+
+
+def test_message_reuse():
+    context = ProtocolContext("2019", "18888888888")
+    loc_data = (0, 3, 31.824845, 117.24091, 120, 36.5, 90, "220601120000", "01040000006402020145")
+    msg_obj = UPLINK_MESSAGE[0x0704](context)
+    for i in range(2):
+        msg_obj.reset()
+        msg_obj.set_params(0)
+        msg_obj.set_loc_data(*loc_data)
+        msgs = msg_obj.message()
+        new_obj = UPLINK_MESSAGE[0x0704](context)
+        new_obj.set_params(0)
+        new_obj.set_loc_data(*loc_data)
+        new_msgs = new_obj.message()
+        assert len(msgs) == 1 and new_msgs[0][0] == msgs[0][0] + 1
+        # Same body, the data of last message is cleared by reset.
+        msg_parser = JTMessageParse(context)
+        msg_parser.set_message(msgs[0][1])
+        body = msg_parser.get_body()
+        msg_parser.set_message(new_msgs[0][1])
+        assert body == msg_parser.get_body()
+    # A frame built into a reused buffer is the same as a new one.
+    buf = bytearray(256)
+    msg_obj = UPLINK_MESSAGE[0x0002](ProtocolContext("2019", "18888888888", SerialNo(7)))
+    frame = msg_obj.message(buf)[0][1]
+    msg_obj = UPLINK_MESSAGE[0x0002](ProtocolContext("2019", "18888888888", SerialNo(7)))
+    assert isinstance(frame, memoryview) and bytes(frame) == bytes(msg_obj.message()[0][1])
+
+
+def test_loc_additional_info():
+    config = LocAdditionalInfoConfig()
+    config.set_mileage(100)
+    config.set_speed(32.5)
+    config.set_temperature(-5)
+    data = config.to_bytes()
+    assert data == b"\x01\x04\x00\x00\x03\xe8\x03\x02\x01\x45\x06\x02\xff\xfb"
+    assert config.value() == ubinascii.hexlify(data).decode()
+    # Unchanged items return the cached bytes, a changed item is encoded again.
+    assert config.to_bytes() is data
+    config.set_speed(36.5)
+    assert config.to_bytes() == data[:8] + b"\x01\x6d" + data[10:]
+    # Inbound items are parsed on first read.
+    loaded = LocAdditionalInfoConfig(config.to_bytes())
+    assert loaded.get_item(0x03) == b"\x01\x6d" and loaded.get_item(0x02) is None
+    assert loaded.get_mileage() == 100 and loaded.get_temperature() == -5
+    assert loaded.to_bytes() == config.to_bytes()
+    loaded.load(b"\x31\x01\x09")
+    loaded.set_mileage(1)
+    assert loaded.get_number_of_satellites() == 9
+    assert loaded.to_bytes() == b"\x31\x01\x09\x01\x04\x00\x00\x00\x0a"
+
+
+def test_location_encode_into():
+    context = ProtocolContext("2019", "18888888888")
+    loc_data = (1, 3, 31.824845, 117.24091, 120, 36.5, 90, "220601120000", "01040000006402020145")
+    msg_obj = UPLINK_MESSAGE[0x0200](context)
+    msg_obj.set_params(*loc_data)
+    msg_obj.body_to_hex()
+    body = ubinascii.unhexlify(msg_obj.get_body())
+    assert body[:4] == b"\x00\x00\x00\x01" and body[22:28] == b"\x22\x06\x01\x12\x00\x00"
+    buf = bytearray(64)
+    end = msg_obj.encode_into(buf, 3)
+    assert end == 3 + msg_obj.body_size() and buf[3:end] == body
+    # Raw bytes additional info packs the same body.
+    msg_obj.set_params(*(loc_data[:-1] + (ubinascii.unhexlify(loc_data[-1]),)))
+    assert msg_obj.encode_into(buf) == len(body) and buf[:len(body)] == body
+    for message_id in (0x0201, 0x0500):
+        msg_obj = UPLINK_MESSAGE[message_id](context)
+        msg_obj.set_params(0x1234, *loc_data)
+        end = msg_obj.encode_into(buf)
+        assert end == len(body) + 2 and buf[:end] == b"\x12\x34" + body
+    # Frame of message is packed by encode_into into the reused buffer.
+    for version, client_id in (("2019", "18888888888"), ("2013", "13999999999")):
+        context = ProtocolContext(version, client_id, SerialNo(7))
+        msg_obj = UPLINK_MESSAGE[0x0200](context)
+        msg_obj.set_params(*loc_data)
+        buf = bytearray(128)
+        serial_no, frame = msg_obj.message(buf)[0]
+        assert serial_no == 7 and isinstance(frame, memoryview)
+        msg_parser = JTMessageParse(context)
+        msg_parser.set_message(frame)
+        header = msg_parser.get_header()
+        assert header["message_id"] == 0x0200 and header["serial_no"] == 7
+        assert msg_parser.get_body() == ubinascii.hexlify(body).decode()
+
+
+def test_bulk_decode():
+    context = ProtocolContext("2019", "18888888888")
+    loc_datas = [
+        (0, 3, 31.824845, 117.24091, 120, 36.5, 90, "220601120000", "01040000006402020145"),
+        (1, 2, 31.824945, 117.24191, 121, 0, 359, "220601120030", ""),
+        (4, 3, 31.825045, 117.24291, 122, 120.3, 0, "221231235959", "310109"),
+    ]
+    msg_obj = UPLINK_MESSAGE[0x0704](context)
+    msg_obj.set_params(1)
+    frames = b""
+    for loc_data in loc_datas:
+        msg_obj.set_loc_data(*loc_data)
+        loc_obj = UPLINK_MESSAGE[0x0200](context)
+        loc_obj.set_params(*loc_data)
+        frames += loc_obj.message()[0][1]
+    msg_obj.body_to_hex()
+    body = ubinascii.unhexlify(msg_obj.get_body())
+    heart_beat = UPLINK_MESSAGE[0x0002](context).message()[0][1]
+    reader = LocationFrameReader()
+    # Frames split by chunks, frames of other messages are skipped.
+    data = heart_beat + frames
+    for i in range(0, len(data), 7):
+        reader.feed(data[i:i + 7])
+    assert reader.skipped() == 1
+    results = [decode_t0704_body(body, False), (1, reader.columns(False))]
+    if jt_bulk.numpy is not None:
+        results.append(decode_t0704_body(body, True))
+    for data_type, columns in results:
+        assert data_type == 1 and columns.count() == 3
+        assert list(columns.column("latitude")) == [31824845, 31824945, 31825045]
+        assert list(columns.column("speed")) == [365, 0, 1203]
+        assert list(columns.column("direction")) == [90, 359, 0]
+        assert list(columns.column("time")) == [220601120000, 220601120030, 221231235959]
+        assert list(columns.column("info_size")) == [10, 0, 3]
+        assert bytes(columns.info(2)) == b"\x31\x01\x09"
+        assert LocAdditionalInfoConfig(columns.info(0)).get_mileage() == 10
+        assert columns.row(1)["alarm_flag"] == 1 and columns.row(1)["loc_status"] == 2
+
+
+def test_capture():
+    path = "/usr/jt808_capture_test"
+    if path.split("/")[-1] in uos.listdir("/usr"):
+        uos.remove(path)
+    frames = []
+    for message_id, body in ((0x8001, b"\x00\x01\x02\x00\x00"), (0x8004, b"\x22\x06\x01\x12\x00\x00")):
+        data = ustruct.pack(">HHB10sH", message_id, 0x4000 | len(body), 1, ubinascii.unhexlify("00000000018888888888"), 1) + body
+        frames.append(bytes(frame_encode(data + bytes([XorChecksum(data).digest()]))))
+    capture = CaptureWriter(path, buffer_size=16)
+    capture.sent(b"\x7e\x00\x02\x7e")
+    # Received data is split in the middle of a frame.
+    data = frames[0] + frames[1] + frames[0]
+    capture.received(data[:10])
+    capture.received(data[10:])
+    capture.close()
+    records = list(read_capture(path))
+    assert [record[0] for record in records] == [CAPTURE_START, CAPTURE_SENT, CAPTURE_RECEIVED, CAPTURE_RECEIVED]
+    assert b"".join([record[2] for record in records[2:]]) == data
+    parsed = []
+    res = replay(path, parsed.append)
+    assert parsed == [frames[0], frames[1], frames[0]]
+    assert res["frames"] == 3 and res["bytes"] == len(data)
+    assert res["messages"][0x8001]["count"] == 2 and res["messages"][0x8004]["count"] == 1
+    uos.remove(path)
+
+
+def test_media_upload_stream():
+    path = "/usr/jt808_media_test"
+    media = bytes(range(256)) * 12 + b"\x7e\x7d" * 10
+    with open(path, "wb") as f:
+        f.write(media)
+    loc_data = (0, 3, 31.824845, 117.24091, 120, 36.5, 90, "220601120000")
+    msg_obj = UPLINK_MESSAGE[0x0801](ProtocolContext("2019", "18888888888"))
+    msg_obj.set_params(14, 0, 0, 4, 1, media)
+    msg_obj.set_loc_data(*loc_data)
+    msg_obj.body_to_hex()
+    body = ubinascii.unhexlify(msg_obj.get_body())
+    msg_parser = JTMessageParse()
+    frames = []
+    for media_src in (path, [media[i:i + 100] for i in range(0, len(media), 100)]):
+        context = ProtocolContext("2019", "18888888888", SerialNo(0xFFFE))
+        stream = MediaUploadStream(context, 14, 0, 0, 4, 1, loc_data, media_src, len(media), 500)
+        assert stream.package_total() == (len(body) + 499) // 500
+        bodys = []
+        res = []
+        for serial_no, package_no, frame in stream.frames():
+            # Frame check code and escape are verified by the parser.
+            msg_parser.set_message(bytes(frame))
+            header = msg_parser.get_header()
+            assert header["message_id"] == 0x0801 and header["serial_no"] == serial_no
+            assert header["package_total"] == stream.package_total() and header["package_no"] == package_no
+            assert serial_no == (0xFFFE + package_no - 1) & 0xFFFF
+            bodys.append(ubinascii.unhexlify(msg_parser.get_body()))
+            res.append(bytes(frame))
+        assert b"".join(bodys) == body
+        assert [len(item) for item in bodys[:-1]] == [500] * (len(bodys) - 1)
+        frames.append(res)
+    # File and chunks of another size build the same frames.
+    assert frames[0] == frames[1]
+    # One package is sent without subpackage.
+    stream = MediaUploadStream(ProtocolContext("2013", "18888888888"), 14, 0, 0, 4, 1, loc_data, [media[:100]], 100)
+    frames = list(bytes(frame) for serial_no, package_no, frame in stream.frames())
+    msg_parser.set_message(frames[0])
+    assert len(frames) == 1 and msg_parser.get_header()["package_total"] == 0
+    assert ubinascii.unhexlify(msg_parser.get_body()) == body[:36 + 100]
+    stream = MediaUploadStream(ProtocolContext("2019", "18888888888"), 14, 0, 0, 4, 1, loc_data, [media[:100]], 2000)
+    try:
+        list(stream.frames())
+        assert False, "short media is not found"
+    except ValueError:
+        pass
+    uos.remove(path)
+
+
+def test_body_subcontract():
+    media = bytes(range(256)) * 10 + b"\x7e\x7d" * 10
+    loc_data = (0, 3, 31.824845, 117.24091, 120, 36.5, 90, "220601120000")
+    msg_parser = JTMessageParse()
+    # (version, max body size, package total set by `set_subpackage`, expected package total)
+    for version, max_body_size, package_total, expected in (
+        ("2019", 1023, 0, 3), ("2013", 1023, 0, 3), ("2019", 500, 0, 6), ("2019", 1023, 4, 4), ("2019", 100, 4, 27),
+    ):
+        context = ProtocolContext(version, "18888888888", SerialNo(0xFFFE))
+        context.set_max_body_size(max_body_size)
+        msg_obj = UPLINK_MESSAGE[0x0801](context)
+        msg_obj.set_params(14, 0, 0, 4, 1, media)
+        msg_obj.set_loc_data(*loc_data)
+        if package_total:
+            msg_obj.set_subpackage(True, package_total)
+        msgs = msg_obj.message()
+        body = ubinascii.unhexlify(msg_obj.get_body())
+        assert len(msgs) == expected
+        bodys = []
+        for index, (serial_no, frame) in enumerate(msgs):
+            msg_parser.set_message(bytes(frame))
+            header = msg_parser.get_header()
+            assert header["serial_no"] == serial_no == (0xFFFE + index) & 0xFFFF
+            assert header["package_total"] == expected and header["package_no"] == index + 1
+            assert header["properties"] & 0x3FF <= max_body_size
+            bodys.append(ubinascii.unhexlify(msg_parser.get_body()))
+        assert b"".join(bodys) == body
+        assert context.get_serial_no() == (0xFFFE + expected) & 0xFFFF
+    # A body of max body size is not subpackaged.
+    msg_obj = UPLINK_MESSAGE[0x0801](ProtocolContext("2019", "18888888888"))
+    msg_obj.set_params(14, 0, 0, 4, 1, media[:1023 - 36])
+    msg_obj.set_loc_data(*loc_data)
+    msgs = msg_obj.message()
+    msg_parser.set_message(bytes(msgs[0][1]))
+    assert len(msgs) == 1 and msg_parser.get_header()["package_total"] == 0
+    try:
+        ProtocolContext().set_max_body_size(1024)
+        assert False, "max body size 1024 is set"
+    except ValueError:
+        pass
+
+
+def test_offline_store():
+    store = OfflineStore("/usr/jt808_offline_test", max_size=0x800, segment_size=0x200)
+    store.clear()
+    records = [bytes([i]) * 40 for i in range(60)]
+    for record in records:
+        assert store.append(record)
+    # 0x800 bytes hold 4 segments of 11 records, older records are dropped.
+    assert store.count() + store.dropped() == 60
+    kept = records[60 - store.count():]
+    res = []
+    while store.count():
+        datas, position = store.peek(1020)
+        res.extend(datas)
+        store.commit(position, len(datas))
+        # Read position is kept after reopen.
+        store = OfflineStore("/usr/jt808_offline_test", max_size=0x800, segment_size=0x200)
+    assert res == kept
+
+
+def test_offline_report(auth_code):
+    store = OfflineStore("/usr/jt808_offline_report")
+    store.clear()
+    jtt808_obj.set_offline_store(store, interval=1000)
+    frames = []
+    send = jtt808_obj.send
+
+    def record_send(data, res_msg_id, serial_no):
+        frames.append(bytes(data))
+        return send(data, res_msg_id, serial_no)
+
+    jtt808_obj.send = record_send
+    try:
+        # Report is saved while server is not connected, and replayed after authentication.
+        jtt808_obj.disconnect()
+        test_loction_report()
+        assert store.count() == 1
+        test_connect()
+        test_authentication(auth_code)
+        count = 0
+        while store.count() and count < 30:
+            utime.sleep(1)
+            count += 1
+        assert store.count() == 0
+    finally:
+        jtt808_obj.send = send
+    buf = bytearray(1100)
+    data_types = []
+    for frame in frames:
+        size = frame_decode(frame, buf)[0]
+        if ustruct.unpack_from(">H", buf, 0)[0] == 0x0704:
+            # 2019 version message header is 17 bytes.
+            data_types.append(decode_t0704_body(buf[17:size - 1], False)[0])
+    assert data_types == [1], data_types
+
+
+def test_location_batch():
+    jtt808_obj.set_location_batch(count=5, interval=10)
+    for i in range(6):
+        test_loction_report()
+    jtt808_obj.set_location_batch(0)
+    stats = jtt808_obj.get_location_batch_stats()
+    logger.debug("location batch stats: %s" % stats)
+    assert stats["reports"] == 6 and stats["reasons"]["count"] == 1 and stats["reasons"]["flush"] == 1
+
+
+async def async_client_run():
+    cli = AsyncJTT808(ip=PLATFORM_IP, port=PLATFORM_PORT, version="2019", client_id="18888888888")
+    assert await cli.connect()
+    register_res = await cli.register("34", "0100", "quectel", "EC200U-CNAA", modem.getDevImei(), LicensePlateColor.blue, "皖A88888")
+    logger.debug("async register_res: %s" % register_res)
+    auth_res = await cli.authentication("865306057798238", modem.getDevImei(), "v1.0.0")
+    logger.debug("async auth_res: %s" % auth_res)
+    res = await asyncio.gather(cli.heart_beat(), cli.query_server_time(), cli.heart_beat())
+    logger.debug("async heart_beat and query_server_time res: %s" % res)
+    await cli.disconnect()
+    return auth_res
+
+
+def test_async_client():
+    auth_res = asyncio.run(async_client_run())
+    assert auth_res.get("result_code") == 0
+
+
+def test_gateway():
+    gateway = JTT808Gateway(timeout=10, retry_count=1)
+    gateway.start()
+    futures = []
+    for version, client_id in (("2019", "18888888888"), ("2013", "13999999999")):
+        session = gateway.add_session(PLATFORM_IP, PLATFORM_PORT, ProtocolContext(version, client_id))
+        msg_obj = session.new_message(0x0102)
+        msg_obj.set_params("865306057798238", modem.getDevImei(), "v1.0.0")
+        futures.append(session.request(msg_obj, 0x8001, False))
+        futures.append(session.request(session.new_message(0x0002)))
+    res = [future.wait(30) for future in futures]
+    logger.debug("gateway res: %s, stats: %s" % (res, gateway.stats()))
+    gateway.stop()
+    assert all(res)
+
+
 def test_jtt808():
+    test_xor_checksum()
+
+    test_stream_deframer()
+
+    test_pending_table()
+
+    test_retransmit_scheduler()
+    test_retransmit_timeout()
+    test_retransmit_params()
+
+    test_window_sender()
+
+    test_subpackage_table()
+
+    test_offline_store()
+
+    test_serial_no()
+
+    test_protocol_context()
+
+    test_message_schema()
+
+    test_message_reuse()
+
+    test_location_encode_into()
+
+    test_loc_additional_info()
+
+    test_bulk_decode()
+
+    test_capture()
+
+    test_media_upload_stream()
+    test_body_subcontract()
+
     test_init()
 
     test_connect()
@@ -347,6 +989,8 @@ def test_jtt808():
     auth_code = "865306057798238"
     test_authentication(auth_code)
 
+    test_offline_report(auth_code)
+
     test_set_encryption()
 
     test_heart_beat()
@@ -357,6 +1001,8 @@ def test_jtt808():
 
     test_loction_report()
 
+    test_location_batch()
+
     test_event_report(0)
 
     test_information_demand_cancellation(12, 1)
@@ -379,6 +1025,10 @@ def test_jtt808():
 
     test_logout()
 
+    test_async_client()
+
+    test_gateway()
+
 
 def main():
     test_jtt808()
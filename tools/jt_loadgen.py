@@ -0,0 +1,320 @@
+# Copyright (c) Quectel Wireless Solution, Co., Ltd.All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+@file      :jt_loadgen.py
+@author    :Jack Sun (jack.sun@quectel.com)
+@brief     :Load generator of many virtual JTT808 terminals, run by CPython
+@version   :1.0.0
+@date      :2026-10-18 19:00:00
+@copyright :Copyright (c) 2022
+
+Usage:
+    python3 tools/jt_loadgen.py --terminals 100 --duration 60 --location 1 --alarm 30 --media 0
+    python3 tools/jt_loadgen.py --target 192.168.1.10:7611 --terminals 500 --json
+
+Every virtual terminal is a `JTT808` object of code/ with its own client id. It registers, authenticates, sends heart
+beat by the terminal param 0x0001 interval, and reports location, alarm, bulk location, CAN and media data by the
+given intervals. Without `--target`, a local `jt_platform.MockPlatform` is started.
+
+Each terminal uses two threads, its request thread and the downlink thread of `JTT808`.
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+
+import qpy_compat
+
+qpy_compat.install()
+
+from usr.jtt808 import JTT808  # noqa: E402
+from usr.logging import setLogDebug, setLogLevel  # noqa: E402
+from usr.jt_message import LocAlarmWarningConfig, LocStatusConfig, LocAdditionalInfoConfig  # noqa: E402
+from jt_platform import MockPlatform  # noqa: E402
+
+REPORTS = ("heart_beat", "location", "alarm", "bulk", "can", "media")
+
+
+def init_loction_data(index=0, alarm=False):
+    """Location report params as `test_init_loction_data` of test_jtt808.py, position differs by index."""
+    loc_status = LocStatusConfig()
+    loc_status.set_config("acc_onoff", 1)
+    loc_status.set_config("loc_status", 1)
+    alarm_config = LocAlarmWarningConfig()
+    if alarm:
+        alarm_config.set_alarm("emergency_alarm", onoff=1)
+    additional_info = LocAdditionalInfoConfig()
+    additional_info.set_mileage(100 + index)
+    additional_info.set_oil_quantity(32.5)
+    additional_info.set_speed(36.5)
+    now = time.localtime()
+    loc_time = "{:02d}{:02d}{:02d}{:02d}{:02d}{:02d}".format(now[0] % 100, *now[1:6])
+    return (alarm_config.value()[0], loc_status.value(), 31.824845 + index * 0.0001, 117.24091 + index * 0.0001,
+            120, 36.5, 90, loc_time, additional_info.to_bytes())
+
+
+def percentile(values, rate):
+    if not values:
+        return 0
+    return values[min(len(values) - 1, int(len(values) * rate))]
+
+
+class LoadStats(object):
+    """Counters of all virtual terminals."""
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__latency = {name: [] for name in REPORTS}
+        self.__failures = {name: 0 for name in REPORTS}
+        self.__frames_out = 0
+        self.__bytes_in = 0
+        self.__reconnects = 0
+        self.__logins = 0
+
+    def add(self, name, latency):
+        with self.__lock:
+            if latency is None:
+                self.__failures[name] += 1
+            else:
+                self.__latency[name].append(latency)
+
+    def sent(self, data):
+        """Capture hook of `TCPUDPBase.set_capture`, one send is one frame."""
+        with self.__lock:
+            self.__frames_out += 1
+
+    def received(self, data):
+        with self.__lock:
+            self.__bytes_in += len(data)
+
+    def reconnect(self):
+        with self.__lock:
+            self.__reconnects += 1
+
+    def login(self):
+        with self.__lock:
+            self.__logins += 1
+
+    def summary(self, seconds):
+        """Get result.
+
+        Args:
+            seconds(float): load time.
+
+        Returns:
+            dict: frames, frames_per_sec, acks, failures, reconnects, logins, p50/p99/max ack latency (unit: ms)
+                and the same of each report.
+        """
+        with self.__lock:
+            res = {"seconds": round(seconds, 3), "frames": self.__frames_out, "bytes_in": self.__bytes_in,
+                   "frames_per_sec": round(self.__frames_out / seconds, 1) if seconds > 0 else 0,
+                   "reconnects": self.__reconnects, "logins": self.__logins, "reports": {}}
+            every = []
+            for name in REPORTS:
+                values = sorted(self.__latency[name])
+                every.extend(values)
+                if values or self.__failures[name]:
+                    res["reports"][name] = {
+                        "acks": len(values), "failures": self.__failures[name],
+                        "p50_ms": round(percentile(values, 0.5) * 1000, 2),
+                        "p99_ms": round(percentile(values, 0.99) * 1000, 2),
+                        "max_ms": round(values[-1] * 1000, 2) if values else 0,
+                    }
+        every.sort()
+        res["acks"] = len(every)
+        res["failures"] = sum([report["failures"] for report in res["reports"].values()])
+        res["p50_ms"] = round(percentile(every, 0.5) * 1000, 2)
+        res["p99_ms"] = round(percentile(every, 0.99) * 1000, 2)
+        return res
+
+
+class VirtualTerminal(object):
+    """One terminal sending reports by intervals until stopped."""
+
+    def __init__(self, index, ip, port, args, stats):
+        self.__index = index
+        self.__args = args
+        self.__stats = stats
+        self.__client_id = str(args.client_id_base + index)
+        self.__jtt808 = JTT808(ip=ip, port=port, timeout=args.timeout, retry_count=args.retry,
+                               version=args.version, client_id=self.__client_id)
+        self.__jtt808.set_callback(self.__callback)
+        self.__jtt808.set_capture(stats)
+        self.__thread = None
+        self.__running = False
+        self.__media_id = 0
+
+    def __callback(self, args):
+        header = args["header"]
+        self.__jtt808.general_answer(header["serial_no"], header["message_id"])
+
+    def __login(self):
+        if not self.__jtt808.connect() and self.__jtt808.status() != 0:
+            return False
+        res = self.__jtt808.register(31, 100, "QUECT", "LOADGEN", self.__client_id[-7:], 1, "LOAD%04d" % self.__index)
+        if not res or res.get("registration_result") != 0:
+            return False
+        res = self.__jtt808.authentication(res["auth_code"], "86%013d" % self.__index, "1.0.0")
+        if res.get("result_code") != 0:
+            return False
+        self.__stats.login()
+        return True
+
+    def __relogin(self):
+        self.__jtt808.disconnect()
+        time.sleep(min(self.__args.timeout, 1))
+        return self.__login()
+
+    def __report(self, name):
+        jtt808 = self.__jtt808
+        if name == "heart_beat":
+            return jtt808.heart_beat()
+        loc_data = init_loction_data(self.__index, name == "alarm")
+        if name in ("location", "alarm"):
+            return jtt808.loction_report(None, None, *loc_data)
+        if name == "bulk":
+            return jtt808.location_bulk_report(0, [loc_data] * self.__args.bulk_size)
+        if name == "can":
+            now = time.localtime()
+            recive_time = "{:02d}{:02d}{:02d}0000".format(*now[3:6])
+            return jtt808.can_bus_data_upload(recive_time, [(0, 0, 0, 0x123, "0102030405060708")] * 4)
+        if name == "media":
+            self.__media_id += 1
+            media_data = bytes(bytearray(i & 0xFF for i in range(self.__args.media_size)))
+            return jtt808.media_data_upload(self.__media_id, 0, 0, 1, 1, media_data, loc_data[:-1])
+
+    def __run(self):
+        args = self.__args
+        intervals = {name: getattr(args, name) for name in REPORTS if getattr(args, name) > 0}
+        logged_in = self.__login()
+        while self.__running and not logged_in:
+            logged_in = self.__relogin()
+        now = time.monotonic()
+        # Spread the first report of each terminal over the interval.
+        due = {name: now + random.random() * interval for name, interval in intervals.items()}
+        while self.__running and due:
+            name = min(due, key=due.get)
+            wait = due[name] - time.monotonic()
+            if wait > 0:
+                time.sleep(min(wait, 0.5))
+                continue
+            due[name] += intervals[name]
+            start = time.monotonic()
+            res = self.__report(name)
+            self.__stats.add(name, time.monotonic() - start if res else None)
+            if not res and self.__running and self.__jtt808.status() != 0:
+                # One reconnect is counted for each lost connection, however many tries it takes.
+                self.__stats.reconnect()
+                while self.__running and not self.__relogin():
+                    pass
+
+    def start(self):
+        self.__running = True
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        self.__running = False
+
+    def join(self, timeout=None):
+        self.__thread.join(timeout)
+        self.__jtt808.disconnect()
+
+
+def run(args):
+    """Run load by parsed command line args.
+
+    Returns:
+        dict: `LoadStats.summary`, with `platform` stats if the local mock platform is used.
+    """
+    setLogDebug(False)
+    setLogLevel("CRITICAL")
+    platform = None
+    if args.target:
+        ip, port = args.target.rsplit(":", 1)
+        port = int(port)
+    else:
+        platform = MockPlatform(port=0, latency=args.latency, jitter=args.jitter, loss=args.loss,
+                                reorder=args.reorder, seed=args.seed)
+        platform.start()
+        ip, port = "127.0.0.1", platform.get_port()
+    random.seed(args.seed)
+    stats = LoadStats()
+    terminals = [VirtualTerminal(i, ip, port, args, stats) for i in range(args.terminals)]
+    start = time.monotonic()
+    for terminal in terminals:
+        terminal.start()
+        if args.ramp:
+            time.sleep(args.ramp / args.terminals)
+    time.sleep(max(args.duration - (time.monotonic() - start), 0))
+    for terminal in terminals:
+        terminal.stop()
+    res = stats.summary(time.monotonic() - start)
+    for terminal in terminals:
+        terminal.join(args.timeout * (args.retry + 1))
+    if platform is not None:
+        res["platform"] = platform.stats()
+        platform.stop()
+    return res
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load generator of virtual JTT808 terminals.")
+    parser.add_argument("--target", help="platform host:port, default is a local mock platform")
+    parser.add_argument("--terminals", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--ramp", type=float, default=0, help="seconds to start all terminals")
+    parser.add_argument("--version", default="2019", choices=("2013", "2019"))
+    parser.add_argument("--client-id-base", type=int, default=13800000000)
+    parser.add_argument("--timeout", type=int, default=5, help="response timeout seconds of each try")
+    parser.add_argument("--retry", type=int, default=3)
+    parser.add_argument("--heart_beat", "--heartbeat", dest="heart_beat", type=float, default=30,
+                        help="heart beat interval seconds, terminal param 0x0001, 0 - off")
+    parser.add_argument("--location", type=float, default=1, help="location report interval seconds, 0 - off")
+    parser.add_argument("--alarm", type=float, default=0, help="alarm location report interval seconds, 0 - off")
+    parser.add_argument("--bulk", type=float, default=0, help="bulk location report interval seconds, 0 - off")
+    parser.add_argument("--bulk-size", type=int, default=10)
+    parser.add_argument("--can", type=float, default=0, help="CAN data upload interval seconds, 0 - off")
+    parser.add_argument("--media", type=float, default=0, help="media data upload interval seconds, 0 - off")
+    parser.add_argument("--media-size", type=int, default=512)
+    parser.add_argument("--latency", type=float, default=0, help="local mock platform answer delay seconds")
+    parser.add_argument("--jitter", type=float, default=0, help="local mock platform random delay seconds")
+    parser.add_argument("--loss", type=float, default=0, help="local mock platform frame loss probability")
+    parser.add_argument("--reorder", type=float, default=0, help="local mock platform reorder probability")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--json", action="store_true", help="print result as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    res = run(args)
+    if args.json:
+        print(json.dumps(res, sort_keys=True))
+        return 0
+    print("%d terminals %.1fs: %d frames %.1f frames/s, %d acks %d failures, ack latency p50 %.2fms p99 %.2fms, "
+          "%d reconnects" % (args.terminals, res["seconds"], res["frames"], res["frames_per_sec"], res["acks"],
+                             res["failures"], res["p50_ms"], res["p99_ms"], res["reconnects"]))
+    for name, report in sorted(res["reports"].items()):
+        print("  %-10s %6d acks %4d failures, p50 %.2fms p99 %.2fms max %.2fms" % (
+            name, report["acks"], report["failures"], report["p50_ms"], report["p99_ms"], report["max_ms"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,540 @@
+# Copyright (c) Quectel Wireless Solution, Co., Ltd.All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+@file      :jt_platform.py
+@author    :Jack Sun (jack.sun@quectel.com)
+@brief     :Mock JT/T 808 platform server for integration and load tests, run by CPython
+@version   :1.0.0
+@date      :2026-10-18 18:20:00
+@copyright :Copyright (c) 2022
+
+Usage:
+    python3 tools/jt_platform.py --port 7611 --latency 0.05 --jitter 0.02 --loss 0.01 --reorder 0.05
+
+The platform answers registration (0x0100/0x8100), authentication (0x0102), query server time (0x0004/0x8004),
+general answer (0x8001) of every other uplink message, subpackage retransmit request (0x8003) for lost subpackages and multimedia data upload answer
+(0x8800). Scripted downlink commands are sent to each terminal after authentication, terminal general answers
+(0x0001) of them are used to measure command latency.
+"""
+
+import sys
+import json
+import heapq
+import random
+import socket
+import struct
+import argparse
+import threading
+import selectors
+import time
+
+VERSION_FLAG = 0x4000
+SUBPACKAGE_FLAG = 0x2000
+BODY_LENGTH = 0x03FF
+
+
+def xor_checksum(data):
+    value = 0
+    for code in data:
+        value ^= code
+    return value
+
+
+def encode_frame(message_id, body, client_id, serial_no, protocol_version=None, package=None):
+    """Build an escaped frame.
+
+    Args:
+        message_id(int): message id.
+        body(bytes): message body.
+        client_id(bytes): BCD client id, 10 bytes for 2019 or 6 bytes for 2013.
+        serial_no(int): message serial number.
+        protocol_version(int): None is 2013 version header. (default: {None})
+        package(tuple): (package_total, package_no) of a subpackage, None is not subpackage. (default: {None})
+
+    Returns:
+        bytes: frame, start and end with 0x7E.
+    """
+    properties = len(body) & BODY_LENGTH
+    if package is not None:
+        properties |= SUBPACKAGE_FLAG
+    if protocol_version is not None:
+        head = struct.pack(">HHB10sH", message_id, properties | VERSION_FLAG, protocol_version, client_id, serial_no)
+    else:
+        head = struct.pack(">HH6sH", message_id, properties, client_id, serial_no)
+    if package is not None:
+        head += struct.pack(">HH", *package)
+    data = head + body
+    data += bytes((xor_checksum(data),))
+    return b"\x7e" + data.replace(b"\x7d", b"\x7d\x01").replace(b"\x7e", b"\x7d\x02") + b"\x7e"
+
+
+def decode_frame(frame):
+    """Parse a frame.
+
+    Args:
+        frame(bytes): frame, start and end with 0x7E.
+
+    Returns:
+        dict: None if check code or length is wrong.
+            message_id(int), properties(int), protocol_version(int/None), client_id(bytes), serial_no(int),
+            package_total(int), package_no(int), body(bytes)
+    """
+    data = frame[1:-1].replace(b"\x7d\x02", b"\x7e").replace(b"\x7d\x01", b"\x7d")
+    if len(data) < 13 or xor_checksum(data[:-1]) != data[-1]:
+        return None
+    message_id, properties = struct.unpack_from(">HH", data, 0)
+    if properties & VERSION_FLAG:
+        if len(data) < 18:
+            return None
+        protocol_version, client_id, serial_no = struct.unpack_from(">B10sH", data, 4)
+        offset = 17
+    else:
+        protocol_version = None
+        client_id, serial_no = struct.unpack_from(">6sH", data, 4)
+        offset = 12
+    package_total = package_no = 0
+    if properties & SUBPACKAGE_FLAG:
+        if len(data) < offset + 5:
+            return None
+        package_total, package_no = struct.unpack_from(">HH", data, offset)
+        offset += 4
+    return {
+        "message_id": message_id,
+        "properties": properties,
+        "protocol_version": protocol_version,
+        "client_id": client_id,
+        "serial_no": serial_no,
+        "package_total": package_total,
+        "package_no": package_no,
+        "body": data[offset:-1],
+    }
+
+
+def split_frames(buf):
+    """Take full frames from the head of a receive buffer.
+
+    Args:
+        buf(bytearray): received data, full frames are removed from it.
+
+    Returns:
+        list: frames, start and end with 0x7E.
+    """
+    frames = []
+    start = buf.find(b"\x7e")
+    while start != -1:
+        end = buf.find(b"\x7e", start + 1)
+        if end == -1:
+            break
+        if end == start + 1:
+            # Back to back delimiters, the second one starts the frame.
+            start = end
+            continue
+        frames.append(bytes(buf[start:end + 1]))
+        start = buf.find(b"\x7e", end + 1)
+    if start == -1:
+        del buf[:]
+    else:
+        del buf[:start]
+    return frames
+
+
+class _Session(object):
+    """One connected terminal."""
+
+    def __init__(self, sock, addr):
+        self.sock = sock
+        self.addr = addr
+        self.inbuf = bytearray()
+        self.outbuf = bytearray()
+        self.client_id = None
+        self.protocol_version = None
+        self.authenticated = False
+        self.serial_no = 0
+        self.subpackages = {}
+        self.requested = set()
+        self.commands = {}
+        self.closed = False
+
+    def next_serial_no(self):
+        serial_no = self.serial_no
+        self.serial_no = (serial_no + 1) & 0xFFFF
+        return serial_no
+
+
+class MockPlatform(object):
+    """Mock platform server.
+
+    One thread serves every terminal by `selectors`. Each frame in both directions is dropped with probability
+    `loss`, each sent frame waits for `latency` plus a random time up to `jitter`, and waits `reorder_delay` more
+    with probability `reorder`, so frames sent after it arrive first.
+
+    `fragment_loss` forgets a subpackage after answering it, as if it was lost behind the answer, so the terminal has
+    to resend it for 0x8003 or 0x8800. The last subpackage, the first one of 0x0801 and packages resent after a request
+    are never forgotten.
+    """
+
+    def __init__(self, host="127.0.0.1", port=7611, latency=0, jitter=0, loss=0, reorder=0, reorder_delay=0.2,
+                 auth_code="jt808auth", script=None, seed=None, fragment_loss=0):
+        """
+        Args:
+            host(str): listen address. (default: {"127.0.0.1"})
+            port(int): listen port, 0 is any free port, see `get_port`. (default: {7611})
+            latency(float): answer delay, unit: second. (default: {0})
+            jitter(float): max random delay added to latency, unit: second. (default: {0})
+            loss(float): probability of dropping a frame. (default: {0})
+            reorder(float): probability of delaying a sent frame by `reorder_delay`. (default: {0})
+            reorder_delay(float): unit: second. (default: {0.2})
+            auth_code(str): auth code given by registration and checked by authentication. (default: {"jt808auth"})
+            script(list): downlink commands sent after authentication, item is (delay, message_id, body),
+                delay unit is second from authentication, body is bytes. (default: {None})
+            seed(int): random seed for repeatable loss and delay. (default: {None})
+            fragment_loss(float): probability of forgetting an answered subpackage. (default: {0})
+        """
+        self.__host = host
+        self.__port = port
+        self.__latency = latency
+        self.__jitter = jitter
+        self.__loss = loss
+        self.__reorder = reorder
+        self.__reorder_delay = reorder_delay
+        self.__fragment_loss = fragment_loss
+        self.__auth_code = auth_code
+        self.__script = list(script or [])
+        self.__random = random.Random(seed)
+        self.__selector = None
+        self.__server = None
+        self.__thread = None
+        self.__running = False
+        self.__lock = threading.Lock()
+        self.__timers = []
+        self.__timer_index = 0
+        self.__sessions = {}
+        self.__stats = {}
+        self.__command_latency = []
+        self.reset_stats()
+
+    def __count(self, name, value=1):
+        self.__stats[name] = self.__stats.get(name, 0) + value
+
+    def __later(self, delay, func, *args):
+        self.__timer_index += 1
+        heapq.heappush(self.__timers, (time.monotonic() + delay, self.__timer_index, func, args))
+
+    def __write(self, session, frame):
+        if session.closed:
+            return
+        session.outbuf.extend(frame)
+        self.__count("frames_out")
+        self.__flush(session)
+
+    def __flush(self, session):
+        try:
+            size = session.sock.send(session.outbuf)
+            del session.outbuf[:size]
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError:
+            self.__close(session)
+            return
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if session.outbuf else 0)
+        self.__selector.modify(session.sock, events, session)
+
+    def __send(self, session, message_id, body, package=None):
+        """Send a downlink message through loss, latency and reorder injection.
+
+        Returns:
+            int: serial number of the message.
+        """
+        serial_no = session.next_serial_no()
+        frame = encode_frame(message_id, body, session.client_id, serial_no, session.protocol_version, package)
+        if self.__random.random() < self.__loss:
+            self.__count("dropped_out")
+            return serial_no
+        delay = self.__latency + (self.__random.random() * self.__jitter if self.__jitter else 0)
+        if self.__reorder and self.__random.random() < self.__reorder:
+            delay += self.__reorder_delay
+            self.__count("reordered")
+        if delay > 0:
+            self.__later(delay, self.__write, session, frame)
+        else:
+            self.__write(session, frame)
+        return serial_no
+
+    def __general_answer(self, session, header, result=0):
+        body = struct.pack(">HHB", header["serial_no"], header["message_id"], result)
+        self.__send(session, 0x8001, body)
+
+    def __command(self, session, message_id, body):
+        if session.closed:
+            return
+        serial_no = self.__send(session, message_id, body)
+        session.commands[serial_no] = (message_id, time.monotonic())
+        self.__count("commands")
+
+    def __check_subpackage(self, session, header):
+        """Keep a subpackage, ask lost ones by 0x8003 when the last one arrives, answer 0x0801 by 0x8800."""
+        first_serial_no = (header["serial_no"] - header["package_no"] + 1) & 0xFFFF
+        key = (header["message_id"], first_serial_no)
+        total = header["package_total"]
+        # Media id of 0x8800 is in the first package of 0x0801, which is kept.
+        kept = header["package_no"] == total or (header["message_id"] == 0x0801 and header["package_no"] == 1)
+        if not kept and key not in session.requested and self.__fragment_loss and \
+                self.__random.random() < self.__fragment_loss:
+            self.__count("fragments_lost")
+            return
+        packages = session.subpackages.setdefault(key, {})
+        packages[header["package_no"]] = header["body"]
+        if header["package_no"] != total and len(packages) != total:
+            return
+        lost = [i for i in range(1, total + 1) if i not in packages]
+        if header["message_id"] == 0x0801:
+            media_id = struct.unpack_from(">I", packages[1], 0)[0] if 1 in packages else 0
+            body = struct.pack(">IB", media_id, len(lost)) + b"".join([struct.pack(">H", i) for i in lost])
+            self.__send(session, 0x8800, body)
+        elif lost:
+            count = struct.pack(">H" if session.protocol_version is not None else ">B", len(lost))
+            body = struct.pack(">H", first_serial_no) + count + b"".join([struct.pack(">H", i) for i in lost])
+            self.__send(session, 0x8003, body)
+        if lost:
+            session.requested.add(key)
+            self.__count("subpackage_lost", len(lost))
+        else:
+            session.subpackages.pop(key)
+            session.requested.discard(key)
+            self.__count("subpackage_messages")
+
+    def __handle(self, session, header):
+        message_id = header["message_id"]
+        session.client_id = header["client_id"]
+        session.protocol_version = header["protocol_version"]
+        self.__count("msg_%04X" % message_id)
+        if header["package_total"]:
+            self.__general_answer(session, header)
+            self.__check_subpackage(session, header)
+            return
+        body = header["body"]
+        if message_id == 0x0100:
+            auth_code = self.__auth_code.encode()
+            self.__send(session, 0x8100, struct.pack(">HB", header["serial_no"], 0) + auth_code)
+        elif message_id == 0x0102:
+            code = body[1:1 + body[0]] if session.protocol_version is not None and body else body
+            result = 0 if code == self.__auth_code.encode() else 1
+            self.__general_answer(session, header, result)
+            if result == 0 and not session.authenticated:
+                session.authenticated = True
+                self.__count("authenticated")
+                for delay, command_id, command_body in self.__script:
+                    self.__later(delay, self.__command, session, command_id, command_body)
+        elif message_id == 0x0004:
+            # Server time of 0x8004 is UTC in BCD, YYMMDDhhmmss.
+            self.__send(session, 0x8004, bytes.fromhex(time.strftime("%y%m%d%H%M%S", time.gmtime())))
+        elif message_id == 0x0704:
+            self.__count("msg_0704_type%d" % body[2])
+            self.__count("loc_0704_type%d" % body[2], struct.unpack_from(">H", body, 0)[0])
+            self.__general_answer(session, header)
+        elif message_id == 0x0001:
+            response_serial_no, response_msg_id, result = struct.unpack_from(">HHB", body, 0)
+            command = session.commands.pop(response_serial_no, None)
+            if command is not None and command[0] == response_msg_id:
+                self.__command_latency.append(time.monotonic() - command[1])
+        else:
+            self.__general_answer(session, header)
+
+    def __accept(self):
+        try:
+            sock, addr = self.__server.accept()
+        except OSError:
+            return
+        sock.setblocking(False)
+        session = _Session(sock, addr)
+        self.__sessions[sock] = session
+        self.__selector.register(sock, selectors.EVENT_READ, session)
+        self.__count("connections")
+
+    def __close(self, session):
+        if session.closed:
+            return
+        session.closed = True
+        self.__sessions.pop(session.sock, None)
+        try:
+            self.__selector.unregister(session.sock)
+        except (KeyError, ValueError):
+            pass
+        session.sock.close()
+        self.__count("disconnections")
+
+    def __read(self, session):
+        try:
+            data = session.sock.recv(4096)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self.__close(session)
+            return
+        session.inbuf.extend(data)
+        for frame in split_frames(session.inbuf):
+            if self.__random.random() < self.__loss:
+                self.__count("dropped_in")
+                continue
+            header = decode_frame(frame)
+            if header is None:
+                self.__count("bad_frames")
+                continue
+            self.__count("frames_in")
+            try:
+                self.__handle(session, header)
+            except (struct.error, IndexError):
+                self.__count("bad_frames")
+
+    def __run_timers(self):
+        now = time.monotonic()
+        while self.__timers and self.__timers[0][0] <= now:
+            due, index, func, args = heapq.heappop(self.__timers)
+            func(*args)
+        return self.__timers[0][0] - now if self.__timers else 0.05
+
+    def start(self):
+        """Listen and serve in a background thread."""
+        self.__selector = selectors.DefaultSelector()
+        self.__server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.__server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.__server.bind((self.__host, self.__port))
+        self.__server.listen(1024)
+        self.__server.setblocking(False)
+        self.__port = self.__server.getsockname()[1]
+        self.__selector.register(self.__server, selectors.EVENT_READ, None)
+        self.__running = True
+        self.__thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.__thread.start()
+
+    def serve_forever(self):
+        while self.__running:
+            with self.__lock:
+                timeout = min(self.__run_timers(), 0.05)
+            events = self.__selector.select(max(timeout, 0))
+            with self.__lock:
+                for key, mask in events:
+                    if key.data is None:
+                        self.__accept()
+                        continue
+                    if mask & selectors.EVENT_WRITE and key.data.outbuf:
+                        self.__flush(key.data)
+                    if mask & selectors.EVENT_READ and not key.data.closed:
+                        self.__read(key.data)
+        for session in list(self.__sessions.values()):
+            self.__close(session)
+        self.__selector.unregister(self.__server)
+        self.__server.close()
+        self.__selector.close()
+
+    def stop(self):
+        self.__running = False
+        if self.__thread is not None and self.__thread is not threading.current_thread():
+            self.__thread.join()
+        self.__thread = None
+
+    def set_loss(self, loss):
+        """Change the probability of dropping a frame while serving, 1 makes the platform silent."""
+        with self.__lock:
+            self.__loss = loss
+
+    def get_port(self):
+        """Get listening port, the real port if port 0 is given."""
+        return self.__port
+
+    def send_command(self, client_id, message_id, body):
+        """Send a downlink command to a connected terminal at once, out of the script.
+
+        Args:
+            client_id(bytes): BCD client id.
+            message_id(int): message id.
+            body(bytes): message body.
+
+        Returns:
+            bool: True - sent, False - terminal is not connected.
+        """
+        with self.__lock:
+            for session in self.__sessions.values():
+                if session.client_id == client_id:
+                    self.__later(0, self.__command, session, message_id, body)
+                    return True
+        return False
+
+    def reset_stats(self):
+        with self.__lock:
+            self.__stats = {}
+            self.__command_latency = []
+
+    def stats(self):
+        """Get counters.
+
+        Returns:
+            dict: frames_in, frames_out, dropped_in, dropped_out, reordered, bad_frames, connections,
+                disconnections, authenticated, commands, subpackage_messages, subpackage_lost, fragments_lost,
+                msg_XXXX of each uplink message id, msg_0704_typeN and loc_0704_typeN of 0x0704 messages and location
+                datas of each data type, command_latency_avg and command_latency_max (unit: second).
+        """
+        with self.__lock:
+            stats = dict(self.__stats)
+            latency = self.__command_latency
+            stats["command_answers"] = len(latency)
+            stats["command_latency_avg"] = sum(latency) / len(latency) if latency else 0
+            stats["command_latency_max"] = max(latency) if latency else 0
+            stats["sessions"] = len(self.__sessions)
+        return stats
+
+
+def load_script(path):
+    """Load downlink script from a JSON file, a list of {"delay": 1.0, "message_id": "0x8201", "body": "hex"}."""
+    with open(path) as f:
+        items = json.load(f)
+    return [(float(item.get("delay", 0)), int(str(item["message_id"]), 0), bytes.fromhex(item.get("body", "")))
+            for item in items]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mock JT/T 808 platform server.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=7611)
+    parser.add_argument("--latency", type=float, default=0, help="answer delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0, help="max random delay added to latency in seconds")
+    parser.add_argument("--loss", type=float, default=0, help="probability of dropping a frame")
+    parser.add_argument("--reorder", type=float, default=0, help="probability of delaying a sent frame")
+    parser.add_argument("--reorder-delay", type=float, default=0.2)
+    parser.add_argument("--auth-code", default="jt808auth")
+    parser.add_argument("--script", help="JSON file of downlink commands sent after authentication")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--fragment-loss", type=float, default=0, help="probability of forgetting an answered subpackage")
+    parser.add_argument("--interval", type=float, default=5, help="stats print interval in seconds")
+    args = parser.parse_args(argv)
+    platform = MockPlatform(args.host, args.port, args.latency, args.jitter, args.loss, args.reorder,
+                            args.reorder_delay, args.auth_code, load_script(args.script) if args.script else None,
+                            args.seed, args.fragment_loss)
+    platform.start()
+    print("mock platform listen on %s:%s" % (args.host, platform.get_port()))
+    try:
+        while True:
+            time.sleep(args.interval)
+            print(json.dumps(platform.stats(), sort_keys=True))
+    except KeyboardInterrupt:
+        pass
+    platform.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
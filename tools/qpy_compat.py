@@ -0,0 +1,297 @@
+# Copyright (c) Quectel Wireless Solution, Co., Ltd.All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+@file      :qpy_compat.py
+@author    :Jack Sun (jack.sun@quectel.com)
+@brief     :Run the QuecPython modules of code/ by CPython, for load and benchmark tools on a PC
+@version   :1.0.0
+@date      :2026-10-18 19:00:00
+@copyright :Copyright (c) 2022
+
+`install()` maps the QuecPython modules used by code/ (ustruct, utime, usocket, osTimer, ql_fs...) to CPython ones
+and imports code/*.py as the `usr` package, e.g. `from usr.jtt808 import JTT808`.
+
+MicroPython does not mangle private names, a subclass sets `self.__message_id` of its base class. code/ is compiled
+with private names `__x` renamed to `_qpy__x`, so CPython keeps the same behaviour.
+
+Not supported: RSA encryption (the QuecPython `rsa` module), `_thread.stop_thread`, gc.mem_alloc.
+"""
+
+import os
+import re
+import ast
+import json
+import sys
+import time
+import types
+import select
+import socket
+import struct
+import asyncio
+import _thread
+import binascii
+import threading
+import traceback
+import importlib.abc
+import importlib.util
+
+CODE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "code")
+
+_PRIVATE = re.compile(r"^__[A-Za-z_]\w*$")
+_TICKS_PERIOD = 0x40000000
+
+
+def _private(name):
+    return bool(_PRIVATE.match(name)) and not name.endswith("__")
+
+
+class _Unmangle(ast.NodeTransformer):
+    """Rename private names `__x` to `_qpy__x`, out of CPython name mangling."""
+
+    def visit_Attribute(self, node):
+        self.generic_visit(node)
+        if _private(node.attr):
+            node.attr = "_qpy" + node.attr
+        return node
+
+    def visit_Name(self, node):
+        if _private(node.id):
+            node.id = "_qpy" + node.id
+        return node
+
+    def visit_FunctionDef(self, node):
+        self.generic_visit(node)
+        if _private(node.name):
+            node.name = "_qpy" + node.name
+        return node
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Constant(self, node):
+        # `__slots__` and getattr names.
+        if isinstance(node.value, str) and _private(node.value):
+            node.value = "_qpy" + node.value
+        return node
+
+
+class _UsrFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    """Import code/*.py as `usr.*`."""
+
+    def __init__(self, code_dir):
+        self.code_dir = code_dir
+
+    def find_spec(self, name, path, target=None):
+        if name == "usr":
+            return importlib.util.spec_from_loader(name, self, is_package=True)
+        if name.startswith("usr.") and name.count(".") == 1:
+            filename = os.path.join(self.code_dir, name[4:] + ".py")
+            if os.path.exists(filename):
+                return importlib.util.spec_from_loader(name, self, origin=filename)
+        return None
+
+    def create_module(self, spec):
+        return None
+
+    def exec_module(self, module):
+        if module.__name__ == "usr":
+            module.__path__ = []
+            return
+        filename = module.__spec__.origin
+        with open(filename, encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename)
+        tree = ast.fix_missing_locations(_Unmangle().visit(tree))
+        module.__file__ = filename
+        exec(compile(tree, filename, "exec"), module.__dict__)
+
+
+def _module(name, **attrs):
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    sys.modules[name] = module
+    return module
+
+
+def _print_exception(e, file=None):
+    traceback.print_exception(type(e), e, e.__traceback__, file=file)
+
+
+_start = time.monotonic()
+
+
+def _ticks_ms():
+    return int((time.monotonic() - _start) * 1000) % _TICKS_PERIOD
+
+
+def _ticks_us():
+    return int((time.monotonic() - _start) * 1000000) % _TICKS_PERIOD
+
+
+def _ticks_diff(end, start):
+    return ((end - start + _TICKS_PERIOD // 2) % _TICKS_PERIOD) - _TICKS_PERIOD // 2
+
+
+def _ticks_add(ticks, delta):
+    return (ticks + delta) % _TICKS_PERIOD
+
+
+class _Socket(socket.socket):
+    """usocket.socket, receive timeout raises OSError 110 and `getsocketsta` reports a closed peer."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__closed_by_peer = False
+
+    def recv(self, bufsize, *args):
+        try:
+            data = super().recv(bufsize, *args)
+        except socket.timeout:
+            raise OSError(110, "ETIMEDOUT")
+        except ConnectionError:
+            data = b""
+        except OSError as e:
+            # Closed by `disconnect` while the downlink thread is reading.
+            if e.errno != 9:
+                raise
+            data = b""
+        if not data and bufsize:
+            self.__closed_by_peer = True
+        return data
+
+    def write(self, data):
+        try:
+            self.sendall(data)
+        except ConnectionError:
+            self.__closed_by_peer = True
+            raise
+        return len(data)
+
+    def getsocketsta(self):
+        """TCP state as QuecPython, 4 - established, 8 - close wait."""
+        if self.__closed_by_peer or self.fileno() == -1:
+            return 8
+        try:
+            self.getpeername()
+        except OSError:
+            return 0
+        return 4
+
+
+class _Poll(object):
+    """uselect.poll, `poll` returns registered objects instead of file descriptors."""
+
+    def __init__(self):
+        self.__poll = select.poll()
+        self.__objects = {}
+
+    def register(self, obj, eventmask=select.POLLIN | select.POLLOUT):
+        self.__objects[obj.fileno()] = obj
+        self.__poll.register(obj, eventmask)
+
+    def modify(self, obj, eventmask):
+        self.__poll.modify(obj, eventmask)
+
+    def unregister(self, obj):
+        self.__objects.pop(obj.fileno(), None)
+        self.__poll.unregister(obj)
+
+    def poll(self, timeout=-1):
+        return [(self.__objects.get(fd, fd), event) for fd, event in self.__poll.poll(timeout)]
+
+
+class _OSTimer(object):
+    """osTimer by threading.Timer."""
+
+    def __init__(self):
+        self.__timer = None
+        self.__lock = threading.Lock()
+
+    def start(self, period, repeat, callback):
+        self.stop()
+
+        def run():
+            if repeat:
+                with self.__lock:
+                    self.__schedule(period, run)
+            callback(None)
+
+        with self.__lock:
+            self.__schedule(period, run)
+        return 0
+
+    def __schedule(self, period, run):
+        self.__timer = threading.Timer(period / 1000, run)
+        self.__timer.daemon = True
+        self.__timer.start()
+
+    def stop(self):
+        with self.__lock:
+            if self.__timer is not None:
+                self.__timer.cancel()
+                self.__timer = None
+        return 0
+
+    def delete_timer(self):
+        return self.stop()
+
+
+def _thread_is_running(tid):
+    return any(thread.ident == tid for thread in threading.enumerate())
+
+
+def _stack_size(size=0):
+    # QuecPython thread stacks are much smaller than CPython limit, keep the CPython default.
+    return 0
+
+
+def _unsupported(*args, **kwargs):
+    raise NotImplementedError("QuecPython rsa module is not supported by CPython.")
+
+
+_installed = False
+
+
+def install(code_dir=CODE_DIR):
+    """Install QuecPython modules and `usr` package importer.
+
+    Args:
+        code_dir(str): directory of QuecPython modules. (default: {code/ of this repository})
+    """
+    global _installed
+    if _installed:
+        return
+    _installed = True
+    _module("ustruct", **{k: getattr(struct, k) for k in dir(struct) if not k.startswith("_")})
+    _module("ubinascii", hexlify=binascii.hexlify, unhexlify=binascii.unhexlify, crc32=binascii.crc32,
+            a2b_base64=binascii.a2b_base64, b2a_base64=binascii.b2a_base64)
+    _module("utime", sleep=time.sleep, sleep_ms=lambda ms: time.sleep(ms / 1000), sleep_us=lambda us: time.sleep(us / 1e6),
+            ticks_ms=_ticks_ms, ticks_us=_ticks_us, ticks_diff=_ticks_diff, ticks_add=_ticks_add, time=time.time,
+            localtime=time.localtime, mktime=time.mktime)
+    _module("ujson", dumps=json.dumps, loads=json.loads, dump=json.dump, load=json.load)
+    _module("ure", search=re.search, match=re.match, compile=re.compile, sub=re.sub)
+    usocket = _module("usocket", **{k: getattr(socket, k) for k in dir(socket) if not k.startswith("_")})
+    usocket.socket = _Socket
+    _module("uselect", poll=_Poll, **{k: getattr(select, k) for k in dir(select) if k.startswith("POLL")})
+    _module("uos", listdir=os.listdir, remove=os.remove, rename=os.rename, stat=os.stat, mkdir=os.mkdir)
+    _module("usys", print_exception=_print_exception, platform=sys.platform, implementation=sys.implementation)
+    sys.print_exception = _print_exception
+    _module("ql_fs", path_exists=os.path.exists, path_getsize=os.path.getsize, file_size=os.path.getsize,
+            mkdirs=lambda path: os.makedirs(path, exist_ok=True))
+    _module("rsa", encrypt=_unsupported, decrypt=_unsupported)
+    sys.modules["osTimer"] = _OSTimer
+    sys.modules["uasyncio"] = asyncio
+    _thread.threadIsRunning = _thread_is_running
+    _thread.stop_thread = lambda tid: None
+    _thread.stack_size = _stack_size
+    sys.meta_path.insert(0, _UsrFinder(code_dir))
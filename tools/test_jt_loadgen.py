@@ -0,0 +1,51 @@
+# Copyright (c) Quectel Wireless Solution, Co., Ltd.All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+@file      :test_jt_loadgen.py
+@author    :Jack Sun (jack.sun@quectel.com)
+@brief     :CPython test of the load generator, run by `python3 tools/test_jt_loadgen.py` or pytest
+@version   :1.0.0
+@date      :2026-10-18 19:00:00
+@copyright :Copyright (c) 2022
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import jt_loadgen  # noqa: E402
+
+
+def test_loadgen():
+    args = jt_loadgen.parse_args([
+        "--terminals", "3", "--duration", "4", "--heart_beat", "1", "--location", "1", "--alarm", "2",
+        "--bulk", "2", "--bulk-size", "3", "--can", "2", "--media", "2", "--media-size", "300", "--seed", "1",
+    ])
+    res = jt_loadgen.run(args)
+    assert res["logins"] == 3
+    assert res["reconnects"] == 0
+    assert res["failures"] == 0
+    assert res["frames"] >= res["acks"] > 0
+    assert set(res["reports"].keys()) == set(jt_loadgen.REPORTS)
+    assert 0 < res["p50_ms"] <= res["p99_ms"]
+    platform = res["platform"]
+    assert platform["authenticated"] == 3
+    assert platform["msg_0704"] > 0 and platform["msg_0705"] > 0 and platform["msg_0801"] > 0
+
+
+if __name__ == "__main__":
+    test_loadgen()
+    print("ok")
@@ -0,0 +1,285 @@
+# Copyright (c) Quectel Wireless Solution, Co., Ltd.All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+@file      :test_jt_platform.py
+@author    :Jack Sun (jack.sun@quectel.com)
+@brief     :CPython tests of the mock platform, run by `python3 tools/test_jt_platform.py` or pytest
+@version   :1.0.0
+@date      :2026-10-18 18:20:00
+@copyright :Copyright (c) 2022
+"""
+
+import os
+import sys
+import shutil
+import socket
+import struct
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from jt_platform import MockPlatform, encode_frame, decode_frame, split_frames  # noqa: E402
+
+CLIENT_ID = bytes.fromhex("00000000018888888888")
+
+
+class Terminal(object):
+    """Raw socket terminal of 2019 version."""
+
+    def __init__(self, port):
+        self.sock = socket.create_connection(("127.0.0.1", port), timeout=2)
+        self.buf = bytearray()
+        self.serial_no = 0
+
+    def send(self, message_id, body, package=None, serial_no=None):
+        if serial_no is None:
+            serial_no = self.serial_no
+            self.serial_no += 1
+        self.sock.sendall(encode_frame(message_id, body, CLIENT_ID, serial_no, 1, package))
+        return serial_no
+
+    def recv(self, count=1, timeout=2):
+        frames = []
+        end = time.monotonic() + timeout
+        while len(frames) < count and time.monotonic() < end:
+            frames.extend(decode_frame(frame) for frame in split_frames(self.buf))
+            if len(frames) >= count:
+                break
+            self.sock.settimeout(max(end - time.monotonic(), 0.01))
+            try:
+                data = self.sock.recv(4096)
+            except socket.timeout:
+                break
+            if not data:
+                break
+            self.buf.extend(data)
+        return frames
+
+    def login(self):
+        serial_no = self.send(0x0100, b"\x00" * 8)
+        register = self.recv()[0]
+        assert register["message_id"] == 0x8100 and struct.unpack_from(">HB", register["body"]) == (serial_no, 0)
+        auth_code = register["body"][3:]
+        serial_no = self.send(0x0102, bytes((len(auth_code),)) + auth_code + b"8" * 15 + b"1.0.0".ljust(20, b"\x00"))
+        answer = self.recv()[0]
+        assert answer["message_id"] == 0x8001 and answer["body"] == struct.pack(">HHB", serial_no, 0x0102, 0)
+
+    def close(self):
+        self.sock.close()
+
+
+def test_frame():
+    body = b"\x7e\x7d\x01\x02"
+    frame = encode_frame(0x0200, body, CLIENT_ID, 0x7e7d, 1)
+    assert frame.count(b"\x7e") == 2
+    header = decode_frame(frame)
+    assert header["message_id"] == 0x0200 and header["serial_no"] == 0x7e7d and header["body"] == body
+    buf = bytearray(b"\x7e" + frame + frame[:5])
+    assert split_frames(buf) == [frame] and buf == frame[:5]
+
+
+def test_platform():
+    script = [(0, 0x8201, b"")]
+    platform = MockPlatform(port=0, script=script)
+    platform.start()
+    terminal = Terminal(platform.get_port())
+    try:
+        terminal.login()
+        command = terminal.recv()[0]
+        assert command["message_id"] == 0x8201
+        terminal.send(0x0001, struct.pack(">HHB", command["serial_no"], 0x8201, 0))
+        # Subpackage 2 of 3 is lost, the platform asks it again after the last one.
+        first = terminal.serial_no
+        terminal.send(0x0900, b"\x01" * 10, (3, 1), first)
+        terminal.send(0x0900, b"\x03" * 10, (3, 3), first + 2)
+        frames = terminal.recv(3)
+        assert [frame["message_id"] for frame in frames] == [0x8001, 0x8001, 0x8003]
+        assert frames[2]["body"] == struct.pack(">HHH", first, 1, 2)
+        terminal.send(0x0900, b"\x02" * 10, (3, 2), first + 1)
+        assert terminal.recv()[0]["message_id"] == 0x8001
+        # A lost media package is listed by 0x8800, an empty list after it is sent again.
+        terminal.send(0x0801, struct.pack(">I", 7) + b"\x00" * 10, (3, 1), 100)
+        terminal.send(0x0801, b"\x00" * 10, (3, 3), 102)
+        frames = terminal.recv(3)
+        assert frames[2]["message_id"] == 0x8800 and frames[2]["body"] == struct.pack(">IBH", 7, 1, 2)
+        terminal.send(0x0801, b"\x00" * 10, (3, 2), 101)
+        frames = terminal.recv(2)
+        assert frames[1]["message_id"] == 0x8800 and frames[1]["body"] == struct.pack(">IB", 7, 0)
+        stats = platform.stats()
+        assert stats["authenticated"] == 1 and stats["command_answers"] == 1
+        assert stats["subpackage_messages"] == 2 and stats["subpackage_lost"] == 2
+    finally:
+        terminal.close()
+        platform.stop()
+
+
+def test_platform_fault_injection():
+    platform = MockPlatform(port=0, latency=0.05, loss=0.5, reorder=0.5, reorder_delay=0.1, seed=1)
+    platform.start()
+    terminal = Terminal(platform.get_port())
+    try:
+        start = time.monotonic()
+        for i in range(40):
+            terminal.send(0x0002, b"")
+        frames = terminal.recv(40, timeout=1)
+        assert time.monotonic() - start >= 0.05
+        serials = [struct.unpack_from(">H", frame["body"])[0] for frame in frames]
+        stats = platform.stats()
+        assert stats["dropped_in"] + stats["dropped_out"] + len(frames) == 40
+        assert 0 < len(frames) < 40 and serials != sorted(serials)
+    finally:
+        terminal.close()
+        platform.stop()
+
+
+def test_media_retransmit():
+    import qpy_compat
+    qpy_compat.install()
+    from usr.jtt808 import JTT808
+    from usr.logging import setLogDebug, setLogLevel
+    setLogDebug(False)
+    setLogLevel("CRITICAL")
+
+    platform = MockPlatform(port=0, fragment_loss=0.3, seed=3)
+    platform.start()
+    media = os.urandom(3000)
+    fd, path = tempfile.mkstemp()
+    with os.fdopen(fd, "wb") as f:
+        f.write(media)
+    terminal = JTT808(ip="127.0.0.1", port=platform.get_port(), timeout=5, client_id="13800000001")
+    terminal.set_callback(lambda args: None)
+    try:
+        assert terminal.connect()
+        res = terminal.register(31, 100, "QUECT", "TESTER", "0000001", 1, "TEST0001")
+        terminal.authentication(res["auth_code"], "860000000000001", "1.0.0")
+        loc = (0, 3, 31.82, 117.24, 120, 36.5, 90, "220601120000")
+        res = terminal.media_data_stream_upload(9, 0, 0, 4, 1, path, loc, fragment_size=500)
+        assert res["result_code"] == 0
+        end = time.monotonic() + 20
+        # The media is dropped from retransmission by the empty 0x8800 after all packages arrive.
+        while terminal.get_media_retransmit_stats()["kept"] and time.monotonic() < end:
+            time.sleep(0.1)
+        stats = platform.stats()
+        lost = stats["fragments_lost"]
+        # 3036 bytes body is 7 packages, only the lost ones are sent again, each once.
+        assert stats["subpackage_messages"] == 1 and stats["subpackage_lost"] == lost > 0
+        assert stats["msg_0801"] == 7 + lost
+        assert terminal.get_media_retransmit_stats() == {"kept": 0, "requests": 1, "packages": lost, "failures": 0}
+    finally:
+        terminal.disconnect()
+        platform.stop()
+        os.remove(path)
+
+
+def test_media_resend_worker():
+    import qpy_compat
+    qpy_compat.install()
+    from usr.jtt808 import JTT808
+    from usr.logging import setLogDebug, setLogLevel
+    setLogDebug(False)
+    setLogLevel("CRITICAL")
+
+    platform = MockPlatform(port=0)
+    platform.start()
+    fd, path = tempfile.mkstemp()
+    with os.fdopen(fd, "wb") as f:
+        f.write(os.urandom(3000))
+    terminal = JTT808(ip="127.0.0.1", port=platform.get_port(), timeout=5, client_id="13800000001")
+    terminal.set_callback(lambda args: None)
+    try:
+        assert terminal.connect()
+        res = terminal.register(31, 100, "QUECT", "TESTER", "0000001", 1, "TEST0001")
+        terminal.authentication(res["auth_code"], "860000000000001", "1.0.0")
+        loc = (0, 3, 31.82, 117.24, 120, 36.5, 90, "220601120000")
+        # A file object of the caller is not kept, it may be closed once the upload returns.
+        with open(path, "rb") as f:
+            res = terminal.media_data_stream_upload(9, 0, 0, 4, 1, f, loc, media_size=3000, fragment_size=500)
+        assert res["result_code"] == 0
+        assert terminal.get_media_retransmit_stats()["kept"] == 0
+        # A burst of retransmission requests is handled in order by one worker.
+        client_id = bytes.fromhex("00000000013800000001")
+        for _ in range(5):
+            assert platform.send_command(client_id, 0x8800, struct.pack(">IBHH", 9, 2, 1, 2))
+        end = time.monotonic() + 10
+        while terminal.get_media_retransmit_stats()["requests"] < 5 and time.monotonic() < end:
+            time.sleep(0.1)
+        assert terminal.get_media_retransmit_stats() == {"kept": 0, "requests": 5, "packages": 0, "failures": 10}
+    finally:
+        terminal.disconnect()
+        platform.stop()
+        os.remove(path)
+
+
+def test_offline_report():
+    import qpy_compat
+    qpy_compat.install()
+    from usr.jtt808 import JTT808
+    from usr.jt_store import OfflineStore
+    from usr.logging import setLogDebug, setLogLevel
+    setLogDebug(False)
+    setLogLevel("CRITICAL")
+
+    def wait_count(count):
+        end = time.monotonic() + 10
+        while store.count() != count and time.monotonic() < end:
+            time.sleep(0.1)
+        return store.count()
+
+    platform = MockPlatform(port=0)
+    platform.start()
+    path = tempfile.mkdtemp()
+    store = OfflineStore(os.path.join(path, "offline"))
+    terminal = JTT808(ip="127.0.0.1", port=platform.get_port(), timeout=5, client_id="13800000001")
+    terminal.set_callback(lambda args: None)
+    loc = (0, 3, 31.82, 117.24, 120, 36.5, 90, "220601120000", "")
+    try:
+        assert terminal.connect()
+        res = terminal.register(31, 100, "QUECT", "TESTER", "0000001", 1, "TEST0001")
+        terminal.authentication(res["auth_code"], "860000000000001", "1.0.0")
+        terminal.set_retransmit_params({0x0002: {"value": 1}, 0x0003: {"value": 0}})
+        terminal.set_send_window(4)
+        terminal.set_offline_store(store, interval=0)
+        # In windowed send mode the report is saved when its future gets no server response.
+        platform.set_loss(1)
+        future = terminal.loction_report(None, None, *loc)
+        assert future.wait(5) == {}
+        assert wait_count(1) == 1
+        # The report is saved at once when server is not connected. Replays sent before are all lost, the link is
+        # fixed while disconnected, so the platform gets the saved reports by the first replay after authentication.
+        terminal.disconnect()
+        assert terminal.loction_report(None, None, *loc) == {}
+        assert store.count() == 2
+        platform.set_loss(0)
+        assert terminal.connect()
+        terminal.authentication(res["auth_code"], "860000000000001", "1.0.0")
+        assert wait_count(0) == 0
+        stats = platform.stats()
+        assert stats["loc_0704_type1"] == 2 and stats["msg_0704_type1"] == 1 and "msg_0200" not in stats
+    finally:
+        terminal.set_offline_store(None)
+        terminal.disconnect()
+        platform.stop()
+        shutil.rmtree(path)
+
+
+if __name__ == "__main__":
+    test_frame()
+    test_platform()
+    test_platform_fault_injection()
+    test_media_retransmit()
+    test_media_resend_worker()
+    test_offline_report()
+    print("ok")